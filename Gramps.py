@@ -27,4 +27,5 @@ From this position, import gramps works great
 """
 import gramps.grampsapp as app
 
-app.main()
+if __name__ == "__main__":
+    app.main()
@@ -70,6 +70,7 @@ from gramps.gen.plug.menu import (
     EnumeratedListOption,
     StringOption,
 )
+from gramps.gen.config import config
 from gramps.gen.display.name import displayer as name_displayer
 from gramps.gen.errors import ReportError, FilterError
 from gramps.gen.plug.report import (
@@ -81,6 +82,7 @@ from gramps.gen.plug.report import (
     CATEGORY_CODE,
     ReportOptions,
     append_styles,
+    write_book_parallel,
 )
 from gramps.gen.plug.report._paper import paper_sizes
 from gramps.gen.const import USER_HOME, DOCGEN_OPTIONS
@@ -876,7 +878,6 @@ def cl_book(database, name, book, options_str_dict):
         ),
     )
     user = User()
-    rptlist = []
     selected_style = StyleSheet()
     for item in book.get_item_list():
         # The option values were loaded magically by the book parser.
@@ -889,13 +890,22 @@ def cl_book(database, name, book, options_str_dict):
                 menu_option.set_value(opt_dict[optname])
 
         item.option_class.set_document(doc)
-        report_class = item.get_write_item()
-        obj = (
-            write_book_item(database, report_class, item.option_class, user),
-            item.get_translated_name(),
+        append_styles(selected_style, item)
+
+    rptlist = None
+    processes = config.get("behavior.book-processes")
+    if processes > 1:
+        rptlist = write_book_parallel(
+            database, book.get_item_list(), doc, selected_style, processes
         )
-        if obj:
-            append_styles(selected_style, item)
+    if rptlist is None:
+        rptlist = []
+        for item in book.get_item_list():
+            report_class = item.get_write_item()
+            obj = (
+                write_book_item(database, report_class, item.option_class, user),
+                item.get_translated_name(),
+            )
             rptlist.append(obj)
 
     doc.set_style_sheet(selected_style)
@@ -159,6 +159,8 @@ register("behavior.do-not-show-previously-seen-addon-updates", True)
 register("behavior.date-about-range", 50)
 register("behavior.date-after-range", 50)
 register("behavior.date-before-range", 50)
+register("behavior.book-processes", 1)
+register("behavior.filter-processes", 1)
 register("behavior.generation-depth", 15)
 register("behavior.max-age-prob-alive", 110)
 register("behavior.max-sib-age-diff", 20)
@@ -174,6 +176,7 @@ register("behavior.surname-guessing", 0)
 register("behavior.translator-needed", True)
 register("behavior.use-tips", False)
 register("behavior.welcome", 100)
+register("behavior.website-processes", 1)
 register("behavior.web-search-url", "http://google.com/#&q=%(text)s")
 register(
     "behavior.addons-url",
@@ -202,6 +205,7 @@ register("database.autobackup", 0)
 register("database.path", os.path.join(USER_DATA, "grampsdb"))
 register("database.host", "")
 register("database.port", "")
+register("database.undo-memory", 64)  # megabytes
 
 register(
     "export.proxy-order",
@@ -38,9 +38,10 @@ import logging
 #
 # -------------------------------------------------------------------------
 from ..const import GRAMPS_LOCALE as glocale
-from ..db.dbconst import DBLOGNAME
+from ..db.dbconst import CLASS_TO_KEY_MAP, DBLOGNAME
 from ..lib.childref import ChildRef
 from ..lib.childreftype import ChildRefType
+from ..soundex import soundex
 from .exceptions import DbTransactionCancel
 from .txn import DbTxn
 
@@ -120,6 +121,100 @@ class DbReadBase:
         """
         raise NotImplementedError
 
+    def find_reference_map_errors(self, callback=None):
+        """
+        Compare the reference map, which :meth:`find_backlink_handles` reads,
+        with the references held by the objects.
+
+        Returns a tuple of two lists of (obj_class, obj_handle, ref_class,
+        ref_handle) tuples: the references of the objects which are missing
+        from the map, and the references in the map which the objects do not
+        hold.
+
+        This default implementation reads the backlinks of each object.
+        Backends can override it to compare the whole map at once.
+
+        :param callback: function called once for each object checked.
+        :type callback: function
+        """
+        expected = set()
+        found = set()
+        for obj_class in CLASS_TO_KEY_MAP:
+            for handle in self.method("iter_%s_handles", obj_class)():
+                obj = self.method("get_%s_from_handle", obj_class)(handle)
+                for ref_class, ref_handle in obj.get_referenced_handles_recursively():
+                    expected.add((obj_class, handle, ref_class, ref_handle))
+                for ref_obj_class, ref_obj_handle in self.find_backlink_handles(handle):
+                    found.add((ref_obj_class, ref_obj_handle, obj_class, handle))
+                if callback:
+                    callback()
+        return (sorted(expected - found), sorted(found - expected))
+
+    def get_person_family_handles(self, handle):
+        """
+        Return the handles of the families in which the person with the given
+        handle is a parent, in the order of the person's family list.
+
+        This default implementation loads the person. Backends can override
+        it to read an index instead, for use when walking the family tree.
+
+        :param handle: handle of the person.
+        :type handle: str
+        """
+        person = self.get_person_from_handle(handle)
+        if person is None:
+            return []
+        return person.get_family_handle_list()
+
+    def get_person_parent_family_handles(self, handle):
+        """
+        Return the handles of the families in which the person with the given
+        handle is a child, in the order of the person's parent family list.
+        The first one is the main parents family.
+
+        This default implementation loads the person. Backends can override
+        it to read an index instead, for use when walking the family tree.
+
+        :param handle: handle of the person.
+        :type handle: str
+        """
+        person = self.get_person_from_handle(handle)
+        if person is None:
+            return []
+        return person.get_parent_family_handle_list()
+
+    def get_family_parent_handles(self, handle):
+        """
+        Return a tuple of the father and mother handles of the family with
+        the given handle. A missing parent is returned as None.
+
+        This default implementation loads the family. Backends can override
+        it to read an index instead, for use when walking the family tree.
+
+        :param handle: handle of the family.
+        :type handle: str
+        """
+        family = self.get_family_from_handle(handle)
+        if family is None:
+            return (None, None)
+        return (family.get_father_handle(), family.get_mother_handle())
+
+    def get_family_child_handles(self, handle):
+        """
+        Return the handles of the children of the family with the given
+        handle, in the order of the family's child reference list.
+
+        This default implementation loads the family. Backends can override
+        it to read an index instead, for use when walking the family tree.
+
+        :param handle: handle of the family.
+        :type handle: str
+        """
+        family = self.get_family_from_handle(handle)
+        if family is None:
+            return []
+        return [child_ref.ref for child_ref in family.get_child_ref_list()]
+
     def find_initial_person(self):
         """
         Returns first person in the database
@@ -1141,6 +1236,49 @@ class DbReadBase:
         """
         raise NotImplementedError
 
+    def iter_objects_by_handle(self, class_name):
+        """
+        Return an iterator over the objects of a primary class, in handle
+        order.
+
+        This default implementation sorts the handles and gets each object
+        by its handle, so proxies filter and sanitize the objects as usual.
+        Backends can override it to read the objects from a single ordered
+        cursor.
+
+        :param class_name: name of the primary object class, eg "Person"
+        :type class_name: str
+        """
+        get_object = self.method("get_%s_from_handle", class_name)
+        for handle in sorted(self.method("get_%s_handles", class_name)()):
+            obj = get_object(handle)
+            if obj:
+                yield obj
+
+    def iter_objects_by_id(self, class_name):
+        """
+        Return an iterator over the objects of a primary class, in Gramps ID
+        order. Objects with the same Gramps ID are returned in handle order.
+
+        This default implementation gets the objects by their handles, so
+        proxies filter and sanitize them as usual. It sorts their Gramps IDs
+        and handles, then gets each object again as it is returned, so that
+        only one object is held at a time. Backends can override it to read
+        the objects from a single cursor ordered on the gramps_id column.
+
+        :param class_name: name of the primary object class, eg "Person"
+        :type class_name: str
+        """
+        get_object = self.method("get_%s_from_handle", class_name)
+        keys = []
+        for handle in self.method("get_%s_handles", class_name)():
+            obj = get_object(handle)
+            if obj:
+                keys.append((obj.gramps_id, handle))
+        keys.sort()
+        for dummy_gramps_id, handle in keys:
+            yield get_object(handle)
+
     def iter_citations(self):
         """
         Return an iterator over objects for Citations in the database
@@ -1237,6 +1375,47 @@ class DbReadBase:
         """
         raise NotImplementedError
 
+    def iter_person_soundex_keys(self):
+        """
+        Return an iterator over tuples of the handle, the gender and the
+        soundex code of the surnames of the primary name of each Person in
+        the database.
+
+        This default implementation loads each person. Backends can override
+        it to read a stored column instead.
+        """
+        for person in self.iter_people():
+            surnames = " ".join(
+                surname.get_surname()
+                for surname in person.get_primary_name().get_surname_list()
+            )
+            yield (person.handle, person.gender, soundex(surnames))
+
+    def get_sort_keys(self, class_name, column):
+        """
+        Return the list of the (sort key, handle) tuples of all the objects
+        of a class, sorted, for one of the sort key columns given in
+        :data:`~gramps.gen.utils.db.SORT_KEY_COLUMNS`. The sort keys are
+        those the views sort the objects on.
+
+        This default implementation computes the sort keys from each object.
+        Backends can override it to read stored columns instead.
+        """
+        from ..utils.db import SORT_KEY_COLUMNS
+
+        sort_value = dict(SORT_KEY_COLUMNS[class_name])[column]
+        get_cursor = {
+            "Person": self.get_person_cursor,
+            "Place": self.get_place_cursor,
+        }[class_name]
+        with get_cursor() as cursor:
+            sort_keys = [
+                (glocale.sort_key(sort_value(self, data)), handle)
+                for handle, data in cursor
+            ]
+        sort_keys.sort()
+        return sort_keys
+
     def iter_place_handles(self):
         """
         Return an iterator over handles for Places in the database
@@ -1431,6 +1610,23 @@ class DbReadBase:
         """
         raise NotImplementedError
 
+    def select_handles(self, class_name, condition, params):
+        """
+        Return a list of handles of the objects of the given class for which
+        an SQL condition on the object's table holds.
+
+        Returns None if the database cannot evaluate SQL conditions, in which
+        case the caller must test every object itself.
+
+        :param class_name: name of the primary object class, eg "Person"
+        :type class_name: str
+        :param condition: SQL condition, using "?" for parameters
+        :type condition: str
+        :param params: parameter values for the condition
+        :type params: list
+        """
+        return None
+
     def requires_login(self):
         """
         Returns True for backends that require a login dialog, else False.
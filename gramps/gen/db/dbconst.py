@@ -83,6 +83,8 @@ DBLOCKS = 100000  # Maximum number of locks supported
 DBOBJECTS = 100000  # Maximum number of simultaneously locked objects
 DBUNDO = 1000  # Maximum size of undo buffer
 ARRAYSIZE = 1000  # The arraysize for a SQL cursor
+BATCHSIZE = 10000  # Number of objects buffered by a batch transaction
+CACHESIZE = 16383  # Number of objects of each type held in the object cache
 
 PERSON_KEY = 0
 FAMILY_KEY = 1
@@ -36,7 +36,9 @@ import os
 import pickle
 import random
 import re
+import tempfile
 import time
+from collections import defaultdict
 from pathlib import Path
 from typing import Any
 
@@ -45,6 +47,7 @@ from typing import Any
 # Gramps modules
 #
 # ------------------------------------------------------------------------
+from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
 from ..errors import HandleError
 from ..lib import (
@@ -66,6 +69,7 @@ from ..lib.researcher import Researcher
 from ..updatecallback import UpdateCallback
 from ..utils.callback import Callback
 from ..utils.id import create_id
+from ..utils.lru import LRU
 from . import (
     CITATION_KEY,
     DBLOGNAME,
@@ -91,6 +95,7 @@ from . import (
     DbWriteBase,
 )
 from .bookmarks import DbBookmarks
+from .dbconst import CACHESIZE
 from .exceptions import DbUpgradeRequiredError, DbVersionError
 from .utils import clear_lock_file, write_lock_file
 
@@ -112,6 +117,65 @@ SIGBASE = (
     "citation",
 )
 
+# The signal suffix for each type of change, in the order they are emitted
+_SIGNAL_ACTIONS = ((TXNDEL, "-delete"), (TXNADD, "-add"), (TXNUPD, "-update"))
+
+# Undoing a record swaps its adds and deletes
+_UNDO_TRANS_TYPE = {TXNADD: TXNDEL, TXNUPD: TXNUPD, TXNDEL: TXNADD}
+
+# ------------------------------------------------------------------------
+#
+# Undo record differences
+#
+# ------------------------------------------------------------------------
+# Kinds of changes
+_DIFF_SET = 0  # replace the value
+_DIFF_DICT = 1  # change, add or remove some keys of a dict
+_DIFF_LIST = 2  # change some items of a list of the same length
+
+
+def _diff(data, other):
+    """
+    Return the changes turning the serialized object data into other, for
+    _patch.
+    """
+    if isinstance(data, dict) and isinstance(other, dict):
+        changes = {}
+        for key, value in other.items():
+            if key not in data:
+                changes[key] = (_DIFF_SET, value)
+            elif data[key] != value:
+                changes[key] = _diff(data[key], value)
+        removed = [key for key in data if key not in other]
+        return (_DIFF_DICT, changes, removed)
+    if isinstance(data, list) and isinstance(other, list) and len(data) == len(other):
+        changes = {
+            index: _diff(item, other_item)
+            for index, (item, other_item) in enumerate(zip(data, other))
+            if item != other_item
+        }
+        return (_DIFF_LIST, changes)
+    return (_DIFF_SET, other)
+
+
+def _patch(data, changes):
+    """
+    Return a copy of the serialized object data with the changes made.
+    """
+    if changes[0] == _DIFF_DICT:
+        result = dict(data)
+        for key, change in changes[1].items():
+            result[key] = _patch(data.get(key), change)
+        for key in changes[2]:
+            del result[key]
+        return result
+    if changes[0] == _DIFF_LIST:
+        result = list(data)
+        for index, change in changes[1].items():
+            result[index] = _patch(data[index], change)
+        return result
+    return changes[1]
+
 
 # ------------------------------------------------------------------------
 #
@@ -121,48 +185,136 @@ SIGBASE = (
 class DbGenericUndo(DbUndo):
     """
     Generic undo/redo handler
+
+    The records of the transactions are pickled, and the old data of an
+    update is kept as its difference from the new data. The records are kept
+    in memory up to the size set by the "database.undo-memory" option, in
+    megabytes. The oldest ones are then moved to a file, which is removed
+    when the database is closed.
     """
 
     def __init__(self, grampsdb, path):
         super().__init__(grampsdb)
+        self.path = path
         self.undodb = []
+        # The leading records are in the file, as (offset, size) tuples
+        self._in_file = 0
+        self._file = None
+        self._memory = 0
+        self._memory_limit = config.get("database.undo-memory") * 1024 * 1024
 
     def open(self, value=None):
         """
-        Open the backing storage.  Needs to be overridden in the derived
-        class.
+        Open the backing storage.  The file is only created when the records
+        no longer fit in memory.
         """
+        self.close()
 
     def close(self):
         """
-        Close the backing storage.  Needs to be overridden in the derived
-        class.
+        Close the backing storage, removing the file.
         """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            if self.path is not None:
+                try:
+                    os.remove(self.path)
+                except OSError as msg:
+                    LOG.warning("Could not remove the undo file: %s", msg)
+        self.undodb = []
+        self._in_file = 0
+        self._memory = 0
+
+    def _encode(self, value):
+        """
+        Return the stored form of a (obj_type, trans_type, handle, old_data,
+        new_data) record.
+        """
+        (obj_type, trans_type, handle, old_data, new_data) = value
+        if old_data is not None and new_data is not None:
+            record = (obj_type, trans_type, handle, _diff(new_data, old_data), new_data)
+            diff = True
+        else:
+            record = tuple(value)
+            diff = False
+        return pickle.dumps((diff,) + record, pickle.HIGHEST_PROTOCOL)
+
+    def _store(self, index, data):
+        """
+        Keep the stored form of a record in memory, moving the oldest records
+        to the file when they take too much memory.
+        """
+        if index < self._in_file:
+            # the records in the file are not rewritten
+            self._file.seek(0, os.SEEK_END)
+            self.undodb[index] = (self._file.tell(), len(data))
+            self._file.write(data)
+            return
+        if index < len(self.undodb):
+            self._memory -= len(self.undodb[index])
+            self.undodb[index] = data
+        else:
+            self.undodb.append(data)
+        self._memory += len(data)
+        if self._memory > self._memory_limit:
+            self._move_to_file()
+
+    def _move_to_file(self):
+        """
+        Move the oldest records in memory to the file, until those left take
+        half of the memory allowed.
+        """
+        if self._file is None:
+            if self.path is None:
+                self._file = tempfile.TemporaryFile()
+            else:
+                self._file = open(self.path, "w+b")
+        self._file.seek(0, os.SEEK_END)
+        while self._memory > self._memory_limit // 2 and self._in_file < len(
+            self.undodb
+        ):
+            data = self.undodb[self._in_file]
+            self.undodb[self._in_file] = (self._file.tell(), len(data))
+            self._file.write(data)
+            self._memory -= len(data)
+            self._in_file += 1
 
     def append(self, value):
         """
-        Add a new entry on the end.  Needs to be overridden in the derived
-        class.
+        Add a new (obj_type, trans_type, handle, old_data, new_data) record
+        on the end, and return its index.
         """
-        self.undodb.append(value)
+        self._store(len(self.undodb), self._encode(value))
+        return len(self.undodb) - 1
 
     def __getitem__(self, index):
         """
-        Returns an entry by index number.  Needs to be overridden in the
-        derived class.
+        Returns a (obj_type, trans_type, handle, old_data, new_data) record
+        by index number.
         """
-        return self.undodb[index]
+        data = self.undodb[index]
+        if isinstance(data, tuple):
+            offset, size = data
+            self._file.seek(offset)
+            data = self._file.read(size)
+        (diff, obj_type, trans_type, handle, old_data, new_data) = pickle.loads(data)
+        if diff:
+            old_data = _patch(new_data, old_data)
+        return (obj_type, trans_type, handle, old_data, new_data)
 
     def __setitem__(self, index, value):
         """
-        Set an entry to a value.  Needs to be overridden in the derived class.
+        Set a record to a (obj_type, trans_type, handle, old_data, new_data)
+        value.
         """
-        self.undodb[index] = value
+        if index < 0:
+            index += len(self.undodb)
+        self._store(index, self._encode(value))
 
     def __len__(self):
         """
-        Returns the number of entries.  Needs to be overridden in the derived
-        class.
+        Returns the number of entries.
         """
         return len(self.undodb)
 
@@ -176,22 +328,21 @@ class DbGenericUndo(DbUndo):
         transaction = txn
         db = self.db
         subitems = transaction.get_recnos()
-        # sigs[obj_type][trans_type]
-        sigs = [[[] for trans_type in range(3)] for key in range(11)]
+        # sigs[(obj_type, trans_type)] is an ordered set of handles
+        sigs = defaultdict(dict)
 
         # Process all records in the transaction
         try:
             self.db._txn_begin()
             for record_id in subitems:
-                (key, trans_type, handle, _, new_data) = pickle.loads(
-                    self.undodb[record_id]
-                )
+                (key, trans_type, handle, _, new_data) = self[record_id]
 
                 if key == REFERENCE_KEY:
                     self.db.undo_reference(new_data, handle)
                 else:
                     self.db.undo_data(new_data, handle, key)
-                    sigs[key][trans_type].append(handle)
+                    self.db._discard_cached(key, handle)
+                    sigs[(key, trans_type)][handle] = None
             # now emit the signals
             self.undo_sigs(sigs, False)
 
@@ -225,22 +376,21 @@ class DbGenericUndo(DbUndo):
         transaction = txn
         db = self.db
         subitems = transaction.get_recnos(reverse=True)
-        # sigs[obj_type][trans_type]
-        sigs = [[[] for trans_type in range(3)] for key in range(11)]
+        # sigs[(obj_type, trans_type)] is an ordered set of handles
+        sigs = defaultdict(dict)
 
         # Process all records in the transaction
         try:
             self.db._txn_begin()
             for record_id in subitems:
-                (key, trans_type, handle, old_data, x) = pickle.loads(
-                    self.undodb[record_id]
-                )
+                (key, trans_type, handle, old_data, x) = self[record_id]
 
                 if key == REFERENCE_KEY:
                     self.db.undo_reference(old_data, handle)
                 else:
                     self.db.undo_data(old_data, handle, key)
-                    sigs[key][trans_type].append(handle)
+                    self.db._discard_cached(key, handle)
+                    sigs[(key, trans_type)][handle] = None
             # now emit the signals
             self.undo_sigs(sigs, True)
 
@@ -266,37 +416,17 @@ class DbGenericUndo(DbUndo):
     def undo_sigs(self, sigs, undo):
         """
         Helper method to undo/redo the signals for changes made
-        We want to do deletes and adds first
-        Note that if 'undo' we swap emits
-        """
-        for trans_type in [TXNDEL, TXNADD, TXNUPD]:
-            for obj_type in range(11):
-                handles = sigs[obj_type][trans_type]
-                if handles:
-                    if (
-                        not undo
-                        and trans_type == TXNDEL
-                        or undo
-                        and trans_type == TXNADD
-                    ):
-                        typ = "-delete"
-                    else:
-                        # don't update a handle if its been deleted, and note
-                        # that 'deleted' handles are in the 'add' list if we
-                        # are undoing
-                        handles = [
-                            handle
-                            for handle in handles
-                            if handle not in sigs[obj_type][TXNADD if undo else TXNDEL]
-                        ]
-                        if ((not undo) and trans_type == TXNADD) or (
-                            undo and trans_type == TXNDEL
-                        ):
-                            typ = "-add"
-                        else:  # TXNUPD
-                            typ = "-update"
-                    if handles:
-                        self.db.emit(KEY_TO_NAME_MAP[obj_type] + typ, (handles,))
+        Note that if 'undo' we swap the adds and the deletes.
+
+        sigs maps the (obj_type, trans_type) of the records to the handles
+        of the objects changed.
+        """
+        if undo:
+            sigs = {
+                (obj_type, _UNDO_TRANS_TYPE[trans_type]): handles
+                for (obj_type, trans_type), handles in sigs.items()
+            }
+        self.db.emit_changes(sigs)
 
 
 # ------------------------------------------------------------------------
@@ -393,7 +523,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
 
     __callback_map = {}
 
-    VERSION = (21, 0, 0)
+    VERSION = (22, 0, 0)
 
     def __init__(self, directory=None):
         DbReadBase.__init__(self)
@@ -616,6 +746,12 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         self.surname_list = []
         self.genderStats = GenderStats()  # can pass in loaded stats as dict
         self.owner = Researcher()
+        # Cache of serialized objects, for each primary object type
+        self._cache = dict((obj_key, LRU(CACHESIZE)) for obj_key in KEY_TO_NAME_MAP)
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # Shared probably alive estimators, see utils.alive.get_estimator()
+        self._estimators = {}
         if directory:
             self.load(directory)
 
@@ -637,6 +773,23 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         """
         raise NotImplementedError
 
+    def upgrade_family_links(self):
+        """
+        Overload this method to add the index of the links between people
+        and families, and fill it.
+        """
+
+    def upgrade_surname_soundex(self):
+        """
+        Overload this method to add the soundex codes of the surnames of
+        the people, and fill them.
+        """
+
+    def upgrade_sort_keys(self):
+        """
+        Overload this method to add the sort keys of the people and places.
+        """
+
     def __check_readonly(self, name):
         """
         Return True if we don't have read/write access to the database,
@@ -857,6 +1010,10 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             except IOError:
                 pass
 
+        if self.undodb is not None:
+            self.undodb.close()
+        self._clear_cache()
+        self._estimators.clear()
         self.db_is_open = False
         self._directory = None
 
@@ -1387,7 +1544,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             raise HandleError("Handle is None")
         if not handle:
             raise HandleError("Handle is empty")
-        data = self._get_raw_data(obj_key, handle)
+        data = self._get_cached_raw_data(obj_key, handle)
         if data:
             return self.serializer.data_to_object(obj_class, data)
 
@@ -1783,35 +1940,83 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         """
         raise NotImplementedError
 
+    def _get_raw_string(self, obj_key, handle):
+        """
+        Return the serialized string of an object from handle, or None.
+
+        Backends which store the string should override this, so that it is
+        not encoded again to be cached.
+        """
+        data = self._get_raw_data(obj_key, handle)
+        if data:
+            return self.serializer.data_to_string(data)
+        return None
+
+    def _get_cached_raw_data(self, obj_key, handle):
+        """
+        Return the raw data for the given handle, using the object cache.
+
+        The cache holds the serialized strings, so every call returns new
+        data which the caller may modify.
+        """
+        cache = self._cache[obj_key]
+        if handle in cache:
+            self._cache_hits += 1
+            string = cache[handle]
+            # Move the entry to the most recently used position
+            cache[handle] = string
+        else:
+            self._cache_misses += 1
+            string = self._get_raw_string(obj_key, handle)
+            if string is None:
+                return None
+            cache[handle] = string
+        return self.serializer.string_to_data(string)
+
+    def _discard_cached(self, obj_key, handle):
+        """
+        Remove an object from the cache after it has been changed.
+        """
+        cache = self._cache[obj_key]
+        if handle in cache:
+            del cache[handle]
+
+    def _clear_cache(self):
+        """
+        Remove all objects from the cache.
+        """
+        for cache in self._cache.values():
+            cache.clear()
+
     def get_raw_person_data(self, handle):
-        return self._get_raw_data(PERSON_KEY, handle)
+        return self._get_cached_raw_data(PERSON_KEY, handle)
 
     def get_raw_family_data(self, handle):
-        return self._get_raw_data(FAMILY_KEY, handle)
+        return self._get_cached_raw_data(FAMILY_KEY, handle)
 
     def get_raw_source_data(self, handle):
-        return self._get_raw_data(SOURCE_KEY, handle)
+        return self._get_cached_raw_data(SOURCE_KEY, handle)
 
     def get_raw_citation_data(self, handle):
-        return self._get_raw_data(CITATION_KEY, handle)
+        return self._get_cached_raw_data(CITATION_KEY, handle)
 
     def get_raw_event_data(self, handle):
-        return self._get_raw_data(EVENT_KEY, handle)
+        return self._get_cached_raw_data(EVENT_KEY, handle)
 
     def get_raw_media_data(self, handle):
-        return self._get_raw_data(MEDIA_KEY, handle)
+        return self._get_cached_raw_data(MEDIA_KEY, handle)
 
     def get_raw_place_data(self, handle):
-        return self._get_raw_data(PLACE_KEY, handle)
+        return self._get_cached_raw_data(PLACE_KEY, handle)
 
     def get_raw_repository_data(self, handle):
-        return self._get_raw_data(REPOSITORY_KEY, handle)
+        return self._get_cached_raw_data(REPOSITORY_KEY, handle)
 
     def get_raw_note_data(self, handle):
-        return self._get_raw_data(NOTE_KEY, handle)
+        return self._get_cached_raw_data(NOTE_KEY, handle)
 
     def get_raw_tag_data(self, handle):
-        return self._get_raw_data(TAG_KEY, handle)
+        return self._get_cached_raw_data(TAG_KEY, handle)
 
     ################################################################
     #
@@ -1968,6 +2173,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         part of the transaction.
         """
         old_data = self._commit_base(person, PERSON_KEY, transaction, change_time)
+        self._discard_cached(PERSON_KEY, person.handle)
 
         if old_data:
             old_person = from_dict(old_data)
@@ -2033,6 +2239,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         part of the transaction.
         """
         self._commit_base(family, FAMILY_KEY, transaction, change_time)
+        self._discard_cached(FAMILY_KEY, family.handle)
 
         # Misc updates:
         self.family_attributes.update(
@@ -2073,6 +2280,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         part of the transaction.
         """
         self._commit_base(citation, CITATION_KEY, transaction, change_time)
+        self._discard_cached(CITATION_KEY, citation.handle)
 
         # Misc updates:
         attr_list = []
@@ -2098,6 +2306,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         part of the transaction.
         """
         self._commit_base(source, SOURCE_KEY, transaction, change_time)
+        self._discard_cached(SOURCE_KEY, source.handle)
 
         # Misc updates:
         self.source_media_types.update(
@@ -2130,6 +2339,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         as part of the transaction.
         """
         self._commit_base(repository, REPOSITORY_KEY, transaction, change_time)
+        self._discard_cached(REPOSITORY_KEY, repository.handle)
 
         # Misc updates:
         if repository.type.is_custom():
@@ -2145,6 +2355,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         of the transaction.
         """
         self._commit_base(note, NOTE_KEY, transaction, change_time)
+        self._discard_cached(NOTE_KEY, note.handle)
 
         # Misc updates:
         if note.type.is_custom():
@@ -2156,6 +2367,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         part of the transaction.
         """
         self._commit_base(place, PLACE_KEY, transaction, change_time)
+        self._discard_cached(PLACE_KEY, place.handle)
 
         # Misc updates:
         if place.get_type().is_custom():
@@ -2180,6 +2392,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         part of the transaction.
         """
         self._commit_base(event, EVENT_KEY, transaction, change_time)
+        self._discard_cached(EVENT_KEY, event.handle)
 
         # Misc updates:
         self.event_attributes.update(
@@ -2206,6 +2419,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         part of the transaction.
         """
         self._commit_base(tag, TAG_KEY, transaction, change_time)
+        self._discard_cached(TAG_KEY, tag.handle)
 
     def commit_media(self, media, transaction, change_time=None):
         """
@@ -2213,6 +2427,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         as part of the transaction.
         """
         self._commit_base(media, MEDIA_KEY, transaction, change_time)
+        self._discard_cached(MEDIA_KEY, media.handle)
 
         # Misc updates:
         self.media_attributes.update(
@@ -2223,6 +2438,27 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             ]
         )
 
+    def emit_changes(self, changes):
+        """
+        Emit the signals for the changes made by a transaction.
+
+        changes maps (obj_type, trans_type) to the handles of the objects
+        changed, as a dict or set. A single signal is emitted for each type of
+        object and change: the deletes first, then the adds and updates of the
+        objects which were not deleted.
+        """
+        for trans_type, action in _SIGNAL_ACTIONS:
+            for obj_type, name in sorted(KEY_TO_NAME_MAP.items()):
+                handles = changes.get((obj_type, trans_type))
+                if not handles:
+                    continue
+                deleted = changes.get((obj_type, TXNDEL))
+                if trans_type != TXNDEL and deleted:
+                    handles = [handle for handle in handles if handle not in deleted]
+                    if not handles:
+                        continue
+                self.emit(name + action, (list(handles),))
+
     def _after_commit(self, transaction):
         """
         Post-transaction commit processing
@@ -2252,6 +2488,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         database, preserving the change in the passed transaction.
         """
         self._do_remove(handle, transaction, PERSON_KEY)
+        self._discard_cached(PERSON_KEY, handle)
 
     def remove_source(self, handle, transaction):
         """
@@ -2259,6 +2496,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         database, preserving the change in the passed transaction.
         """
         self._do_remove(handle, transaction, SOURCE_KEY)
+        self._discard_cached(SOURCE_KEY, handle)
 
     def remove_citation(self, handle, transaction):
         """
@@ -2266,6 +2504,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         database, preserving the change in the passed transaction.
         """
         self._do_remove(handle, transaction, CITATION_KEY)
+        self._discard_cached(CITATION_KEY, handle)
 
     def remove_event(self, handle, transaction):
         """
@@ -2273,6 +2512,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         database, preserving the change in the passed transaction.
         """
         self._do_remove(handle, transaction, EVENT_KEY)
+        self._discard_cached(EVENT_KEY, handle)
 
     def remove_media(self, handle, transaction):
         """
@@ -2280,6 +2520,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         database, preserving the change in the passed transaction.
         """
         self._do_remove(handle, transaction, MEDIA_KEY)
+        self._discard_cached(MEDIA_KEY, handle)
 
     def remove_place(self, handle, transaction):
         """
@@ -2287,6 +2528,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         database, preserving the change in the passed transaction.
         """
         self._do_remove(handle, transaction, PLACE_KEY)
+        self._discard_cached(PLACE_KEY, handle)
 
     def remove_family(self, handle, transaction):
         """
@@ -2294,6 +2536,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         database, preserving the change in the passed transaction.
         """
         self._do_remove(handle, transaction, FAMILY_KEY)
+        self._discard_cached(FAMILY_KEY, handle)
 
     def remove_repository(self, handle, transaction):
         """
@@ -2301,6 +2544,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         database, preserving the change in the passed transaction.
         """
         self._do_remove(handle, transaction, REPOSITORY_KEY)
+        self._discard_cached(REPOSITORY_KEY, handle)
 
     def remove_note(self, handle, transaction):
         """
@@ -2308,6 +2552,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         database, preserving the change in the passed transaction.
         """
         self._do_remove(handle, transaction, NOTE_KEY)
+        self._discard_cached(NOTE_KEY, handle)
 
     def remove_tag(self, handle, transaction):
         """
@@ -2315,6 +2560,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         database, preserving the change in the passed transaction.
         """
         self._do_remove(handle, transaction, TAG_KEY)
+        self._discard_cached(TAG_KEY, handle)
 
     ################################################################
     #
@@ -2633,6 +2879,8 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             _("Number of notes"): self.get_number_of_notes(),
             _("Number of tags"): self.get_number_of_tags(),
             _("Schema version"): ".".join([str(v) for v in self.VERSION]),
+            _("Object cache hits"): self._cache_hits,
+            _("Object cache misses"): self._cache_misses,
         }
 
     def _order_by_person_key(self, person):
@@ -2699,6 +2947,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             gramps_upgrade_19,
             gramps_upgrade_20,
             gramps_upgrade_21,
+            gramps_upgrade_22,
         )
 
         if version < 14:
@@ -2717,10 +2966,13 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             gramps_upgrade_20(self)
         if version < 21:
             gramps_upgrade_21(self)
+        if version < 22:
+            gramps_upgrade_22(self)
 
         self.rebuild_secondary(callback)
         self.reindex_reference_map(callback)
         self.reset()
+        self._clear_cache()
 
         self.set_schema_version(self.VERSION[0])
         LOG.debug("Upgrade time: %d seconds", int(time.time() - start))
@@ -2737,6 +2989,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         """
         Set the serializer to 'blob' or 'json'
         """
+        self._clear_cache()
         if serializer_name == "blob":
             self.serializer = BlobSerializer
         elif serializer_name == "json":
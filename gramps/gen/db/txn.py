@@ -31,7 +31,6 @@ database.
 import inspect
 import logging
 import os
-import pickle
 import time
 from collections import defaultdict
 
@@ -128,10 +127,9 @@ class DbTxn(defaultdict):
             transaction type = a numeric representation of the type of
                           transaction: TXNADD = 0, TXNUPD = 1, TXNDEL = 2
 
-        data = Python list where:
-            list element = (handle, data) where:
-                handle = handle (database key) of the object in the transaction
-                data = pickled representation of the object
+        data = Python dict whose keys are the handles (database keys) of the
+               objects in the transaction, in the order they were first
+               committed. Their data is kept by the undo database.
         """
 
         # Conditional on __debug__ because all that frame stuff may be slow
@@ -157,7 +155,7 @@ class DbTxn(defaultdict):
                 caller_frame[2],
                 caller_frame[3],
             )
-        defaultdict.__init__(self, list, {})
+        defaultdict.__init__(self, dict, {})
 
         self.msg = msg
         self.commitdb = grampsdb.get_undodb()
@@ -192,14 +190,14 @@ class DbTxn(defaultdict):
         data is the tuple returned by the object's serialize method.
         """
         self.last = self.commitdb.append(
-            pickle.dumps((obj_type, trans_type, handle, old_data, new_data), 1)
+            (obj_type, trans_type, handle, old_data, new_data)
         )
         if self.last is None:
             self.last = len(self.commitdb) - 1
         if self.first is None:
             self.first = self.last
         _LOG.debug("added to trans: %d %d %s", obj_type, trans_type, handle)
-        self[(obj_type, trans_type)] += [(handle, new_data)]
+        self[(obj_type, trans_type)][handle] = None
 
     def get_recnos(self, reverse=False):
         """
@@ -221,7 +219,7 @@ class DbTxn(defaultdict):
         for the PrimaryObject, and a tuple representing the data created by
         the object's serialize method.
         """
-        return pickle.loads(self.commitdb[recno])
+        return self.commitdb[recno]
 
     def __len__(self):
         """
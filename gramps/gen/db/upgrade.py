@@ -63,6 +63,24 @@ _ = glocale.translation.gettext
 LOG = logging.getLogger(".upgrade")
 
 
+def gramps_upgrade_22(self):
+    """
+    Add the index of the links between people and families, the soundex
+    codes of the surnames of the people and the sort keys of the people
+    and places.
+
+    Older versions did not keep them up to date, so they are made again
+    even if they exist.
+    """
+    self._txn_begin()
+    self.upgrade_family_links()
+    self.upgrade_surname_soundex()
+    self.upgrade_sort_keys()
+    self._txn_commit()
+    # Bump up database version. Separate transaction to save metadata.
+    self._set_metadata("version", 22)
+
+
 def gramps_upgrade_21(self):
     """
     Add json_data field to tables.
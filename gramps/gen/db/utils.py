@@ -141,6 +141,20 @@ def get_dbid_from_path(dirpath):
     return dbid
 
 
+def get_dbid_from_database(database):
+    """
+    Return the id of the database backend plugin that made a database, so
+    that another process can open the same tree with :func:`make_database`.
+    Return None if the database was not made by a registered plugin.
+    """
+    cls = database.__class__
+    pmgr = BasePluginManager.get_instance()
+    for pdata in pmgr.get_reg_databases():
+        if pdata.databaseclass == cls.__name__ and pdata.mod_name == cls.__module__:
+            return pdata.id
+    return None
+
+
 def import_as_dict(filename, user, skp_imp_adds=True):
     """
     Import the filename into a InMemoryDB and return it.
@@ -24,11 +24,25 @@
 Package providing filtering framework for Gramps.
 """
 
+# ------------------------------------------------------------------------
+#
+# Standard Python modules
+#
+# ------------------------------------------------------------------------
+import io
+import logging
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+
 # ------------------------------------------------------------------------
 #
 # Gramps imports
 #
 # ------------------------------------------------------------------------
+import gramps.gen.filters
 from ..lib.person import Person
 from ..lib.family import Family
 from ..lib.src import Source
@@ -39,11 +53,84 @@ from ..lib.repo import Repository
 from ..lib.media import Media
 from ..lib.note import Note
 from ..lib.tag import Tag
-from ..lib.serialize import from_dict
+from ..lib.serialize import lazy_from_dict
+from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
+from ..db.base import DbReadBase, DbWriteBase
+from ..db.dbconst import DBMODE_R
+from ..db.utils import get_dbid_from_database, make_database
+from ..utils.config import apply_config_snapshot, get_config_snapshot
 
 _ = glocale.translation.gettext
 
+LOG = logging.getLogger(".filter")
+
+# Number of handles sent to a worker process at a time
+CHUNKSIZE = 1000
+
+
+# -------------------------------------------------------------------------
+#
+# Parallel filter evaluation
+#
+# -------------------------------------------------------------------------
+class FilterPickler(pickle.Pickler):
+    """
+    Pickle prepared filters for worker processes. The database they were
+    prepared with is replaced by a reference to the database of the worker.
+    """
+
+    def __init__(self, file, db):
+        pickle.Pickler.__init__(self, file)
+        self.db = db
+
+    def persistent_id(self, obj):
+        if obj is self.db:
+            return "db"
+        if isinstance(obj, DbReadBase):
+            raise pickle.PicklingError("Cannot pickle database %r" % obj)
+        return None
+
+
+class FilterUnpickler(pickle.Unpickler):
+    """
+    Unpickle prepared filters in a worker process, using its own database.
+    """
+
+    def __init__(self, file, db):
+        pickle.Unpickler.__init__(self, file)
+        self.db = db
+
+    def persistent_load(self, pid):
+        if pid == "db":
+            return self.db
+        raise pickle.UnpicklingError("Unknown persistent id %r" % pid)
+
+
+_worker = {}
+
+
+def _init_worker(dbid, directory, snapshot, data):
+    """
+    Open the database read-only, apply the settings of the main process and
+    unpickle the prepared filter and custom filters in a worker process.
+    """
+    db = make_database(dbid)
+    db.load(directory, mode=DBMODE_R)
+    apply_config_snapshot(snapshot, db)
+    filter_, custom_filters = FilterUnpickler(io.BytesIO(data), db).load()
+    gramps.gen.filters.CustomFilters = custom_filters
+    _worker["db"] = db
+    _worker["filter"] = filter_
+
+
+def _check_chunk(id_list, tupleind):
+    """
+    Apply the prepared filter to part of the id_list in a worker process.
+    """
+    filter_ = _worker["filter"]
+    return filter_.get_check_func()(_worker["db"], id_list, None, tupleind)
+
 
 # -------------------------------------------------------------------------
 #
@@ -85,6 +172,29 @@ class GenericFilter:
             len(self.flist) == 1 and ((self.flist[0].is_empty() and not self.invert))
         )
 
+    def narrows(self, other):
+        """
+        Return True if the filter can only match objects that the other
+        filter matches, so that it only needs to be applied to the objects
+        matched by the other filter.
+
+        This is the case for two filters combining their rules with "and"
+        if each rule of the other filter is narrowed by one of the rules of
+        this filter.
+        """
+        if (
+            self.__class__ is not other.__class__
+            or self.logical_op != "and"
+            or other.logical_op != "and"
+            or self.invert
+            or other.invert
+        ):
+            return False
+        return all(
+            any(rule.narrows(other_rule) for rule in self.flist)
+            for other_rule in other.flist
+        )
+
     def set_logical_op(self, val):
         if val in GenericFilter.logical_functions:
             self.logical_op = val
@@ -146,7 +256,7 @@ class GenericFilter:
         if id_list is None:
             with self.get_tree_cursor(db) if tree else self.get_cursor(db) as cursor:
                 for handle, data in cursor:
-                    person = from_dict(data)
+                    person = lazy_from_dict(data)
                     if user:
                         user.step_progress()
                     if task(db, person) != self.invert:
@@ -166,15 +276,59 @@ class GenericFilter:
             user.end_progress()
         return final_list
 
+    def select_handles(self, db):
+        """
+        Let the database evaluate the rules that can be expressed in SQL.
+
+        Return a tuple of the handles of the objects matching those rules and
+        a list of the remaining rules, or None if the database cannot evaluate
+        any of the rules.
+        """
+        conditions = []
+        params = []
+        flist = []
+        for rule in self.flist:
+            sql = rule.to_sql()
+            if sql is None:
+                flist.append(rule)
+            else:
+                conditions.append("(%s)" % sql[0])
+                params.extend(sql[1])
+        if not conditions:
+            return None
+        class_name = self.make_obj().__class__.__name__
+        handles = db.select_handles(class_name, " AND ".join(conditions), params)
+        if handles is None:
+            return None
+        return handles, flist
+
     def check_and(self, db, id_list, user=None, tupleind=None, tree=False):
         final_list = []
         flist = self.flist
+        selected = None
+        if id_list is None and not tree and not self.invert:
+            selected = self.select_handles(db)
+        if selected is not None:
+            handles, flist = selected
+            if user:
+                user.begin_progress(_("Filter"), _("Applying ..."), len(handles))
+            for handle in handles:
+                if user:
+                    user.step_progress()
+                if flist:
+                    obj = self.find_from_handle(db, handle)
+                    if not all(rule.apply(db, obj) for rule in flist):
+                        continue
+                final_list.append(handle)
+            if user:
+                user.end_progress()
+            return final_list
         if user:
             user.begin_progress(_("Filter"), _("Applying ..."), self.get_number(db))
         if id_list is None:
             with self.get_tree_cursor(db) if tree else self.get_cursor(db) as cursor:
                 for handle, data in cursor:
-                    person = from_dict(data)
+                    person = lazy_from_dict(data)
                     if user:
                         user.step_progress()
                     val = all(rule.apply(db, person) for rule in flist)
@@ -233,7 +387,69 @@ class GenericFilter:
     def check(self, db, handle):
         return self.get_check_func()(db, [handle])
 
-    def apply(self, db, id_list=None, tupleind=None, user=None, tree=False):
+    def check_parallel(self, db, id_list, user, tupleind, processes):
+        """
+        Apply the prepared filter in a pool of worker processes, each of which
+        opens the database read-only.
+
+        The id_list, or the list of all handles of the database if it is not
+        given, is split into chunks which are checked in order, so matching
+        items keep their order. The database is opened in the workers with
+        its backend plugin. Returns None if the filter cannot be applied in
+        parallel.
+        """
+        if not isinstance(db, DbWriteBase):
+            # Proxies must be applied in this process
+            return None
+        directory = db.get_save_path()
+        if not directory or directory == ":memory:":
+            return None
+        dbid = get_dbid_from_database(db)
+        if dbid is None:
+            return None
+        if id_list is None:
+            class_name = self.make_obj().__class__.__name__
+            id_list = db.method("get_%s_handles", class_name)()
+            tupleind = None
+        if len(id_list) <= CHUNKSIZE:
+            return None
+        data = io.BytesIO()
+        try:
+            FilterPickler(data, db).dump((self, gramps.gen.filters.CustomFilters))
+        except (pickle.PicklingError, TypeError, AttributeError) as err:
+            LOG.debug("Cannot apply filter in parallel: %s", err)
+            return None
+
+        chunks = [
+            id_list[index : index + CHUNKSIZE]
+            for index in range(0, len(id_list), CHUNKSIZE)
+        ]
+        final_list = []
+        if user:
+            user.begin_progress(_("Filter"), _("Applying ..."), len(id_list))
+        try:
+            with ProcessPoolExecutor(
+                processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(dbid, directory, get_config_snapshot(), data.getvalue()),
+            ) as executor:
+                results = executor.map(_check_chunk, chunks, repeat(tupleind))
+                for chunk, result in zip(chunks, results):
+                    if user:
+                        for dummy in chunk:
+                            user.step_progress()
+                    final_list.extend(result)
+        except BrokenProcessPool as err:
+            LOG.warning("Cannot apply filter in parallel: %s", err)
+            final_list = None
+        if user:
+            user.end_progress()
+        return final_list
+
+    def apply(
+        self, db, id_list=None, tupleind=None, user=None, tree=False, processes=None
+    ):
         """
         Apply the filter using db.
         If id_list given, the handles in id_list are used. If not given
@@ -245,6 +461,10 @@ class GenericFilter:
 
         user is optional. If present it must be an instance of a User class.
 
+        If processes is greater than one, large filters on a database
+        stored on disk are applied in that many worker processes. If not
+        given, the "behavior.filter-processes" preference is used.
+
         :Returns: if id_list given, it is returned with the items that
                 do not match the filter, filtered out.
                 if id_list not given, all items in the database that
@@ -253,7 +473,13 @@ class GenericFilter:
         m = self.get_check_func()
         for rule in self.flist:
             rule.requestprepare(db, user)
-        res = m(db, id_list, user, tupleind, tree)
+        if processes is None:
+            processes = config.get("behavior.filter-processes")
+        res = None
+        if processes > 1 and not tree:
+            res = self.check_parallel(db, id_list, user, tupleind, processes)
+        if res is None:
+            res = m(db, id_list, user, tupleind, tree)
         for rule in self.flist:
             rule.requestreset()
         return res
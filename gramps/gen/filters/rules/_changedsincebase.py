@@ -112,3 +112,12 @@ class ChangedSinceBase(Rule):
         if self.before:
             return obj_time < self.before
         return False
+
+    def to_sql(self):
+        if self.since:
+            if self.before:
+                return "change >= ? AND change < ?", [self.since, self.before]
+            return "change >= ?", [self.since]
+        if self.before:
+            return "change < ?", [self.before]
+        return "0 = 1", []
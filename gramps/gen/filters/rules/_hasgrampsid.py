@@ -55,3 +55,6 @@ class HasGrampsId(Rule):
         return true if the rule passes, false otherwise.
         """
         return obj.gramps_id == self.list[0]
+
+    def to_sql(self):
+        return "gramps_id = ?", [self.list[0]]
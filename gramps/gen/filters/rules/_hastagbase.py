@@ -69,3 +69,11 @@ class HasTagBase(Rule):
         if self.tag_handle is None:
             return False
         return self.tag_handle in obj.get_tag_list()
+
+    def to_sql(self):
+        if self.tag_handle is None:
+            return "0 = 1", []
+        return (
+            "handle IN (SELECT obj_handle FROM reference WHERE ref_handle = ?)",
+            [self.tag_handle],
+        )
@@ -58,3 +58,6 @@ class RegExpIdBase(Rule):
 
     def apply(self, db, obj):
         return self.match_substring(0, obj.gramps_id)
+
+    def narrows(self, other):
+        return self.narrows_substring(other)
@@ -69,6 +69,23 @@ class Rule:
         self.use_case = use_case
         self.nrprepare = 0
 
+    def __getstate__(self):
+        """
+        Return the state of a prepared rule, so that it can be applied in
+        another process. The bound matching method is stored as a flag.
+        """
+        state = self.__dict__.copy()
+        state["match_substring"] = self.match_substring == self.match_regex
+        return state
+
+    def __setstate__(self, state):
+        use_match_regex = state.pop("match_substring")
+        self.__dict__.update(state)
+        if use_match_regex:
+            self.match_substring = self.match_regex
+        else:
+            self.match_substring = self.__match_substring
+
     def is_empty(self):
         return False
 
@@ -155,6 +172,54 @@ class Rule:
         """Apply the rule to some database entry; must be overwritten."""
         return True
 
+    def to_sql(self):
+        """
+        Return the rule as an SQL condition on the secondary columns of the
+        object's table, as a tuple of the condition and a list of parameter
+        values, or None if the rule can only be applied in Python.
+
+        Called after prepare. The condition must match exactly the objects
+        for which apply returns True.
+        """
+        return None
+
+    def narrows(self, other):
+        """
+        Return True if the rule can only match objects that the other rule
+        matches, given the same database.
+
+        Most rules read other objects than the one they are applied to, which
+        may have changed since the other rule was applied, so this is False
+        by default. Rules which only read the object itself may override it.
+        """
+        return False
+
+    def narrows_substring(self, other):
+        """
+        Return True if the rule narrows the other rule, for rules matching all
+        of their values as substrings. Without regular expressions, a value
+        that contains the value of the other rule matches fewer objects.
+        """
+        if self.__class__ is not other.__class__:
+            return False
+        if self.use_regex or other.use_regex:
+            return (
+                self.list == other.list
+                and self.use_regex == other.use_regex
+                and self.use_case == other.use_case
+            )
+        if self.use_case != other.use_case:
+            return False
+        if self.use_case:
+            return len(self.list) == len(other.list) and all(
+                str(other_value) in str(value)
+                for value, other_value in zip(self.list, other.list)
+            )
+        return len(self.list) == len(other.list) and all(
+            str(other_value).upper() in str(value).upper()
+            for value, other_value in zip(self.list, other.list)
+        )
+
     def display_values(self):
         """Return the labels and values of this rule."""
         l_v = (
@@ -54,3 +54,9 @@ class HasSourceIdOf(HasGrampsId):
         if HasGrampsId.apply(self, dbase, source):
             return True
         return False
+
+    def to_sql(self):
+        return (
+            "source_handle IN (SELECT handle FROM source WHERE gramps_id = ?)",
+            [self.list[0]],
+        )
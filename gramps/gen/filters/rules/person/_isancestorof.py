@@ -71,18 +71,15 @@ class IsAncestorOf(Rule):
     def init_ancestor_list(self, db, person, first):
         if not person:
             return
-        if person.handle in self.map:
-            return
-        if not first:
-            self.map.add(person.handle)
-        fam_id = person.get_main_parents_family_handle()
-        if fam_id:
-            fam = db.get_family_from_handle(fam_id)
-            if fam:
-                f_id = fam.get_father_handle()
-                m_id = fam.get_mother_handle()
-
-                if f_id:
-                    self.init_ancestor_list(db, db.get_person_from_handle(f_id), 0)
-                if m_id:
-                    self.init_ancestor_list(db, db.get_person_from_handle(m_id), 0)
+        todo = [(person.handle, first)]
+        while todo:
+            handle, first = todo.pop()
+            if handle in self.map:
+                continue
+            if not first:
+                self.map.add(handle)
+            fam_ids = db.get_person_parent_family_handles(handle)
+            if fam_ids:
+                for parent_id in db.get_family_parent_handles(fam_ids[0]):
+                    if parent_id:
+                        todo.append((parent_id, 0))
@@ -69,14 +69,17 @@ class IsDescendantOf(Rule):
         return person.handle in self.map
 
     def init_list(self, person, first):
-        if not person or person.handle in self.map:
-            # if we have been here before, skip
+        if not person:
             return
-        if not first:
-            self.map.add(person.handle)
+        todo = [(person.handle, first)]
+        while todo:
+            handle, first = todo.pop()
+            if handle in self.map:
+                # if we have been here before, skip
+                continue
+            if not first:
+                self.map.add(handle)
 
-        for fam_id in person.get_family_handle_list():
-            fam = self.db.get_family_from_handle(fam_id)
-            if fam:
-                for child_ref in fam.get_child_ref_list():
-                    self.init_list(self.db.get_person_from_handle(child_ref.ref), 0)
+            for fam_id in self.db.get_person_family_handles(handle):
+                for child_id in self.db.get_family_child_handles(fam_id):
+                    todo.append((child_id, 0))
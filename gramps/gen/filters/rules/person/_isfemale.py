@@ -50,3 +50,6 @@ class IsFemale(Rule):
 
     def apply(self, db, person):
         return person.gender == Person.FEMALE
+
+    def to_sql(self):
+        return "gender = ?", [Person.FEMALE]
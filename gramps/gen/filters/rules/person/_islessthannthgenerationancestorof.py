@@ -71,18 +71,14 @@ class IsLessThanNthGenerationAncestorOf(Rule):
             self.map.add(handle)
             gen += 1
             if gen <= int(self.list[1]):
-                p = self.db.get_person_from_handle(handle)
-                fam_id = p.get_main_parents_family_handle()
-                if fam_id:
-                    fam = self.db.get_family_from_handle(fam_id)
-                    if fam:
-                        f_id = fam.get_father_handle()
-                        m_id = fam.get_mother_handle()
-                        # append to back of queue:
-                        if f_id:
-                            queue.append((f_id, gen))
-                        if m_id:
-                            queue.append((m_id, gen))
+                fam_ids = self.db.get_person_parent_family_handles(handle)
+                if fam_ids:
+                    f_id, m_id = self.db.get_family_parent_handles(fam_ids[0])
+                    # append to back of queue:
+                    if f_id:
+                        queue.append((f_id, gen))
+                    if m_id:
+                        queue.append((m_id, gen))
 
     def reset(self):
         self.map.clear()
@@ -50,3 +50,6 @@ class IsMale(Rule):
 
     def apply(self, db, person):
         return person.gender == Person.MALE
+
+    def to_sql(self):
+        return "gender = ?", [Person.MALE]
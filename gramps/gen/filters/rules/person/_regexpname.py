@@ -67,3 +67,6 @@ class RegExpName(Rule):
                 if self.match_substring(0, field):
                     return True
         return False
+
+    def narrows(self, other):
+        return self.narrows_substring(other)
@@ -22,15 +22,18 @@
 Unittest that tests person-specific filter rules
 """
 import unittest
+import io
 import os
 from time import perf_counter
 import inspect
+import tempfile
 
 from ....filters import reload_custom_filters
 
 reload_custom_filters()
-from ....db.utils import import_as_dict
+from ....db.utils import import_as_dict, import_from_filename, make_database
 from ....filters import GenericFilter, CustomFilters
+from ....filters._genericfilter import FilterPickler, FilterUnpickler
 from ....const import DATA_DIR
 from ....user import User
 from ....utils.unittest import localize_date
@@ -55,6 +58,7 @@ from ..person import (
     HasNameOriginType,
     HasNameType,
     HasNickname,
+    HasNoteRegexp,
     HasRelationship,
     HasSoundexName,
     HasSourceOf,
@@ -1105,6 +1109,84 @@ class BaseTest(unittest.TestCase):
         # too many to list out to test explicitly
         self.assertEqual(len(self.filter_with_rule(rule)), 1168)
 
+    def test_sql_rules(self):
+        """
+        Test that rules evaluated by the database match the same rules
+        applied to each person.
+        """
+        handles = self.db.get_person_handles()
+        for rules in (
+            [IsMale([])],
+            [IsFemale([]), HasUnknownGender([])],
+            [HasIdOf(["I0044"])],
+            [IsMale([]), HasAddress(["0", "greater than"])],
+        ):
+            filter_ = GenericFilter()
+            filter_.set_rules(rules)
+            self.assertIsNotNone(filter_.select_handles(self.db))
+            self.assertEqual(
+                set(filter_.apply(self.db)), set(filter_.apply(self.db, handles))
+            )
+
+    def test_pickle_prepared(self):
+        """
+        Test that a prepared filter gives the same results after being
+        pickled for a worker process.
+        """
+        filter_ = GenericFilter()
+        filter_.set_rules(
+            [
+                IsLessThanNthGenerationAncestorOf(["I0005", 10]),
+                RegExpName(["^[A-M]"], use_regex=True),
+            ]
+        )
+        for rule in filter_.flist:
+            rule.requestprepare(self.db, None)
+        data = io.BytesIO()
+        FilterPickler(data, self.db).dump(filter_)
+        data.seek(0)
+        copy = FilterUnpickler(data, self.db).load()
+        self.assertIs(copy.flist[0].db, self.db)
+        handles = self.db.get_person_handles()
+        self.assertEqual(
+            filter_.check_and(self.db, handles), copy.check_and(self.db, handles)
+        )
+        for rule in filter_.flist:
+            rule.requestreset()
+
+    def test_narrows(self):
+        """
+        Test that a filter narrowing another one matches a subset of it.
+        """
+
+        def make_filter(rules):
+            filter_ = GenericFilter()
+            filter_.set_rules(rules)
+            return filter_
+
+        broad = make_filter([RegExpName(["jo"])])
+        for rules in (
+            [RegExpName(["jo"])],
+            [RegExpName(["JOH"])],
+            [RegExpName(["John"]), IsMale([])],
+        ):
+            narrow = make_filter(rules)
+            self.assertTrue(narrow.narrows(broad))
+            self.assertLessEqual(set(narrow.apply(self.db)), set(broad.apply(self.db)))
+        self.assertFalse(make_filter([RegExpName(["j"])]).narrows(broad))
+        self.assertFalse(make_filter([IsMale([])]).narrows(broad))
+        self.assertFalse(
+            make_filter([RegExpName(["john"], use_regex=True)]).narrows(broad)
+        )
+        # the notes may have changed since the other filter was applied
+        self.assertFalse(
+            make_filter([HasNoteRegexp(["the"])]).narrows(
+                make_filter([HasNoteRegexp(["the"])])
+            )
+        )
+        broad.set_invert(True)
+        self.assertFalse(make_filter([RegExpName(["john"])]).narrows(broad))
+
     def test_missingparent(self):
         """
         Test MissingParent rule.
@@ -1271,5 +1353,50 @@ class BaseTest(unittest.TestCase):
         self.assertEqual(self.filter_with_rule(rule), set(["GNUJQCL9MD64AM56OH"]))
 
 
+class ParallelTest(unittest.TestCase):
+    """
+    Test filters applied in worker processes.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Import example database into a tree on disk.
+        """
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.db = make_database("sqlite")
+        cls.db.load(cls.tmpdir.name)
+        import_from_filename(cls.db, EXAMPLE, User())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        cls.tmpdir.cleanup()
+
+    def test_check_parallel(self):
+        """
+        Test that a filter applied in a pool of worker processes matches the
+        same people, in the same order, as when applied serially to the
+        handles of the database.
+        """
+        filter_ = GenericFilter()
+        filter_.set_rules(
+            [
+                IsLessThanNthGenerationAncestorOf(["I0005", 10]),
+                RegExpName(["^[A-M]"], use_regex=True),
+            ]
+        )
+        filter_.set_logical_op("or")
+        for rule in filter_.flist:
+            rule.requestprepare(self.db, None)
+        handles = self.db.get_person_handles()
+        serial = filter_.check_or(self.db, handles)
+        parallel = filter_.check_parallel(self.db, None, None, None, 2)
+        for rule in filter_.flist:
+            rule.requestreset()
+        self.assertIsNotNone(parallel)
+        self.assertEqual(parallel, serial)
+
+
 if __name__ == "__main__":
     unittest.main()
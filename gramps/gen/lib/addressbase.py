@@ -42,6 +42,8 @@ class AddressBase:
     Base class for address-aware objects.
     """
 
+    __slots__ = ()
+
     def __init__(self, source=None):
         """
         Initialize a AddressBase.
@@ -62,6 +62,8 @@ class AttributeRoot(SecondaryObject, PrivacyBase):
     Gramps at the moment does not support this GEDCOM Attribute structure.
     """
 
+    __slots__ = ("private", "type", "value")
+
     def __init__(self, source=None):
         """
         Create a new Attribute object, copying from the source if provided.
@@ -192,6 +194,8 @@ class Attribute(AttributeRoot, CitationBase, NoteBase):
     An attribute class that supports citation and note annotations.
     """
 
+    __slots__ = ("citation_list", "note_list")
+
     def __init__(self, source=None):
         """
         Create a new Attribute object, copying from the source if provided.
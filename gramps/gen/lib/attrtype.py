@@ -49,6 +49,8 @@ class AttributeType(GrampsType):
     Class describing the type of an attribute.
     """
 
+    __slots__ = ()
+
     UNKNOWN = -1
     CUSTOM = 0
     CASTE = 1
@@ -31,6 +31,25 @@ Base Object class for Gramps
 import re
 from abc import ABCMeta, abstractmethod
 
+# The public attributes kept in the slots of each class
+_STATE_ATTRIBUTES = {}
+
+
+def _get_state_attributes(cls):
+    """
+    Return the names of the public attributes kept in the slots of a class
+    and of its bases, the attributes of the bases first.
+    """
+    names = _STATE_ATTRIBUTES.get(cls)
+    if names is None:
+        names = []
+        for base in reversed(cls.__mro__):
+            for name in base.__dict__.get("__slots__", ()):
+                if not name.startswith("_") and name not in names:
+                    names.append(name)
+        names = _STATE_ATTRIBUTES[cls] = tuple(names)
+    return names
+
 
 # -------------------------------------------------------------------------
 #
@@ -44,8 +63,15 @@ class BaseObject(metaclass=ABCMeta):
 
     Its main goal is to provide common capabilites to all objects, such as
     searching through all available information.
+
+    The attributes of the objects are kept in slots, which each class
+    declares in its ``__slots__``.  The base classes which are mixed into
+    several classes declare none, their attributes are declared by the
+    classes using them.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def serialize(self):
         """
@@ -62,9 +88,9 @@ class BaseObject(metaclass=ABCMeta):
         """
         Get the current object state as a dictionary.
 
-        By default this returns the public attributes of the instance.  This
-        method can be overridden if the class requires other attributes or
-        properties to be saved.
+        By default this returns the public attributes of the instance, those
+        which do not start with an underscore.  This method can be overridden
+        if the class requires other attributes or properties to be saved.
 
         This method is called to provide the information required to serialize
         the object.
@@ -73,11 +99,21 @@ class BaseObject(metaclass=ABCMeta):
                   of the object.
         :rtype: dict
         """
-        attr_dict = dict(
-            (key, value)
-            for key, value in self.__dict__.items()
-            if not key.startswith("_")
-        )
+        attr_dict = {}
+        for key in _get_state_attributes(self.__class__):
+            try:
+                attr_dict[key] = getattr(self, key)
+            except AttributeError:
+                # not set yet
+                pass
+        # subclasses without slots
+        instance_dict = getattr(self, "__dict__", None)
+        if instance_dict:
+            attr_dict.update(
+                (key, value)
+                for key, value in instance_dict.items()
+                if not key.startswith("_")
+            )
         attr_dict["_class"] = self.__class__.__name__
         return attr_dict
 
@@ -97,7 +133,22 @@ class BaseObject(metaclass=ABCMeta):
                           the object.
         :type attr_dict: dict
         """
-        self.__dict__.update(attr_dict)
+        for key, value in attr_dict.items():
+            if key != "_class":
+                setattr(self, key, value)
+
+    def __setstate__(self, state):
+        """
+        Restore the attributes of an unpickled object.
+
+        The state is a (dict, slots) tuple, or the dictionary of the attributes
+        of an object pickled before the classes had slots.
+        """
+        if isinstance(state, tuple):
+            instance_dict, slots = state
+            state = dict(instance_dict or {}, **(slots or {}))
+        for key, value in state.items():
+            setattr(self, key, value)
 
     def matches_string(self, pattern, case_sensitive=False):
         """
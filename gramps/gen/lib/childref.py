@@ -53,6 +53,8 @@ class ChildRef(SecondaryObject, PrivacyBase, CitationBase, NoteBase, RefBase):
     A class for tracking information about how a child relates to their parents.
     """
 
+    __slots__ = ("private", "citation_list", "note_list", "ref", "frel", "mrel")
+
     def __init__(self, source=None):
         PrivacyBase.__init__(self, source)
         CitationBase.__init__(self, source)
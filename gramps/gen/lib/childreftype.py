@@ -58,6 +58,8 @@ class ChildRefType(GrampsType):
     .. attribute CUSTOM : Custom - a relationship given by the user
     """
 
+    __slots__ = ()
+
     NONE = 0
     BIRTH = 1
     ADOPTED = 2
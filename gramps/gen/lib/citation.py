@@ -72,6 +72,16 @@ class Citation(
     information specific to the data being cited.
     """
 
+    __slots__ = (
+        "media_list",
+        "note_list",
+        "date",
+        "source_handle",
+        "page",
+        "confidence",
+        "attribute_list",
+    )
+
     CONF_VERY_HIGH = 4
     CONF_HIGH = 3
     CONF_NORMAL = 2
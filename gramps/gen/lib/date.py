@@ -577,6 +577,17 @@ class Date(BaseObject):
     Date( year, month, day ) - create an exact date
     """
 
+    __slots__ = (
+        "format",
+        "calendar",
+        "modifier",
+        "quality",
+        "dateval",
+        "text",
+        "sortval",
+        "newyear",
+    )
+
     MOD_NONE = 0  # CODE
     MOD_BEFORE = 1
     MOD_AFTER = 2
@@ -1782,8 +1793,8 @@ class Date(BaseObject):
                 except DateError as err:
                     LOG.debug(
                         "Sanity check failed - self: %s, sanity: %s",
-                        self.__dict__,
-                        sanity.__dict__,
+                        self.get_object_state(),
+                        sanity.get_object_state(),
                     )
                     err.date = self
                     raise
@@ -40,6 +40,8 @@ class DateBase:
     Base class for storing date information.
     """
 
+    __slots__ = ()
+
     def __init__(self, source=None):
         """
         Create a new DateBase, copying from source if not None.
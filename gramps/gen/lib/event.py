@@ -79,6 +79,17 @@ class Event(
     Compare this with attribute: :class:`~.attribute.Attribute`
     """
 
+    __slots__ = (
+        "citation_list",
+        "note_list",
+        "media_list",
+        "attribute_list",
+        "date",
+        "place",
+        "__description",
+        "__type",
+    )
+
     def __init__(self, source=None):
         """
         Create a new Event instance, copying from the source if present.
@@ -44,6 +44,8 @@ class EventBase:
     Base class for storing event references.
     """
 
+    __slots__ = ()
+
     def __init__(self, source=None):
         """
         Create a new EventBase, copying from source if not None.
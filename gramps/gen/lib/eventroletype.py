@@ -43,6 +43,8 @@ class EventRoleType(GrampsType):
     Class representing role a participant played in an event.
     """
 
+    __slots__ = ()
+
     UNKNOWN = -1
     CUSTOM = 0
     PRIMARY = 1
@@ -99,6 +99,8 @@ class EventType(GrampsType):
     .. attribute STILLBIRTH:      Stillbirth
     """
 
+    __slots__ = ()
+
     UNKNOWN = -1
     CUSTOM = 0
     MARRIAGE = 1
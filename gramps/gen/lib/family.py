@@ -87,6 +87,20 @@ class Family(
     or the changes will be lost.
     """
 
+    __slots__ = (
+        "citation_list",
+        "note_list",
+        "media_list",
+        "event_ref_list",
+        "attribute_list",
+        "lds_ord_list",
+        "father_handle",
+        "mother_handle",
+        "child_ref_list",
+        "type",
+        "complete",
+    )
+
     def __init__(self):
         """
         Create a new Family instance.
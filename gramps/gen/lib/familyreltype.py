@@ -44,6 +44,8 @@ class FamilyRelType(GrampsType):
     Class for type of relationship between two partners forming the family.
     """
 
+    __slots__ = ()
+
     MARRIED = 0
     UNMARRIED = 1
     CIVIL_UNION = 2
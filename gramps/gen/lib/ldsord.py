@@ -65,6 +65,18 @@ class LdsOrd(SecondaryObject, CitationBase, NoteBase, DateBase, PlaceBase, Priva
     source of genealogical information in the United States.
     """
 
+    __slots__ = (
+        "citation_list",
+        "note_list",
+        "date",
+        "place",
+        "private",
+        "type",
+        "famc",
+        "temple",
+        "status",
+    )
+
     BAPTISM = 0
     ENDOWMENT = 1
     SEAL_TO_PARENTS = 2
@@ -52,6 +52,18 @@ class Location(SecondaryObject, LocationBase):
     of cities, counties, states, and even countries can change with time.
     """
 
+    __slots__ = (
+        "street",
+        "locality",
+        "city",
+        "county",
+        "state",
+        "country",
+        "postal",
+        "phone",
+        "parish",
+    )
+
     def __init__(self, source=None):
         """
         Create a Location object, copying from the source object if it exists.
@@ -34,6 +34,8 @@ class LocationBase:
     Base class for all things Address.
     """
 
+    __slots__ = ()
+
     def __init__(self, source=None):
         """
         Create a LocationBase object, copying from the source object if it
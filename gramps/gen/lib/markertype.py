@@ -46,6 +46,8 @@ class MarkerType(GrampsType):
     Class for handling data markers.
     """
 
+    __slots__ = ()
+
     NONE = -1
     CUSTOM = 0
     COMPLETE = 1
@@ -63,6 +63,18 @@ class Media(CitationBase, NoteBase, DateBase, AttributeBase, PrimaryObject):
     description and privacy.
     """
 
+    __slots__ = (
+        "citation_list",
+        "note_list",
+        "date",
+        "attribute_list",
+        "path",
+        "mime",
+        "desc",
+        "checksum",
+        "thumb",
+    )
+
     def __init__(self, source=None):
         """
         Initialize a Media.
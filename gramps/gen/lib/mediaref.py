@@ -55,6 +55,15 @@ class MediaRef(
     Media reference class.
     """
 
+    __slots__ = (
+        "private",
+        "citation_list",
+        "note_list",
+        "ref",
+        "attribute_list",
+        "rect",
+    )
+
     def __init__(self, source=None):
         PrivacyBase.__init__(self, source)
         CitationBase.__init__(self, source)
@@ -58,6 +58,24 @@ class Name(SecondaryObject, PrivacyBase, SurnameBase, CitationBase, NoteBase, Da
     object stores one of them
     """
 
+    __slots__ = (
+        "private",
+        "surname_list",
+        "citation_list",
+        "note_list",
+        "date",
+        "first_name",
+        "suffix",
+        "title",
+        "type",
+        "group_as",
+        "sort_as",
+        "display_as",
+        "call",
+        "nick",
+        "famnick",
+    )
+
     DEF = 0  # Default format (determined by gramps-wide prefs)
     LNFN = 1  # last name first name
     FNLN = 2  # first name last name
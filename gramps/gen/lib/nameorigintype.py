@@ -58,6 +58,8 @@ class NameOriginType(GrampsType):
     .. attribute LOCATION:   name follows from the location of the person
     """
 
+    __slots__ = ()
+
     UNKNOWN = -1
     CUSTOM = 0
     NONE = 1
@@ -43,6 +43,8 @@ class NameType(GrampsType):
     Class encapsulating the type of name.
     """
 
+    __slots__ = ()
+
     UNKNOWN = -1
     CUSTOM = 0
     AKA = 1
@@ -65,6 +65,8 @@ class Note(BasicPrimaryObject):
     :cvar FORMATTED: indicates formatted format (respecting whitespace needed)
     """
 
+    __slots__ = ("text", "format", "type")
+
     (FLOWED, FORMATTED) = list(range(2))
 
     def __init__(self, text=""):
@@ -43,6 +43,8 @@ class NoteType(GrampsType):
     Class encapsulating the type of note.
     """
 
+    __slots__ = ()
+
     UNKNOWN = -1
     CUSTOM = 0
     GENERAL = 1
@@ -84,6 +84,25 @@ class Person(
 
     """
 
+    __slots__ = (
+        "citation_list",
+        "note_list",
+        "media_list",
+        "event_ref_list",
+        "attribute_list",
+        "address_list",
+        "urls",
+        "lds_ord_list",
+        "primary_name",
+        "family_list",
+        "parent_family_list",
+        "alternate_names",
+        "person_ref_list",
+        "__gender",
+        "death_ref_index",
+        "birth_ref_index",
+    )
+
     OTHER = 3
     UNKNOWN = 2
     MALE = 1
@@ -58,6 +58,22 @@ class Place(CitationBase, NoteBase, MediaBase, UrlBase, PrimaryObject):
     a collection of images and URLs, a note and a source.
     """
 
+    __slots__ = (
+        "citation_list",
+        "note_list",
+        "media_list",
+        "urls",
+        "long",
+        "lat",
+        "title",
+        "name",
+        "alt_names",
+        "placeref_list",
+        "place_type",
+        "code",
+        "alt_loc",
+    )
+
     def __init__(self, source=None):
         """
         Create a new Place object, copying from the source if present.
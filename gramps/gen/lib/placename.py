@@ -48,6 +48,8 @@ class PlaceName(SecondaryObject, DateBase):
     This class is for keeping information about place names.
     """
 
+    __slots__ = ("date", "value", "lang")
+
     def __init__(self, source=None, **kwargs):
         """
         Create a new PlaceName instance, copying from the source if present.
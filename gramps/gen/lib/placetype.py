@@ -43,6 +43,8 @@ class PlaceType(GrampsType):
     Class encapsulating the type of a place.
     """
 
+    __slots__ = ()
+
     UNKNOWN = -1
     CUSTOM = 0
     COUNTRY = 1
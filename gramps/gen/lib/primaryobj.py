@@ -61,6 +61,8 @@ class BasicPrimaryObject(TableObject, PrivacyBase, TagBase):
     ID is the user visible version.
     """
 
+    __slots__ = ("private", "tag_list", "gramps_id")
+
     def __init__(self, source=None):
         """
         Initialize a PrimaryObject.
@@ -221,6 +223,8 @@ class PrimaryObject(BasicPrimaryObject):
     ID is the user visible version.
     """
 
+    __slots__ = ()
+
     def __init__(self, source=None):
         """
         Initialize a PrimaryObject.
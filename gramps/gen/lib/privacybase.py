@@ -34,6 +34,8 @@ class PrivacyBase:
     Base class for privacy-aware objects.
     """
 
+    __slots__ = ()
+
     def __init__(self, source=None):
         """
         Initialize a PrivacyBase.
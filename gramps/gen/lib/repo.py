@@ -50,6 +50,8 @@ _ = glocale.translation.gettext
 class Repository(NoteBase, AddressBase, UrlBase, IndirectCitationBase, PrimaryObject):
     """A location where collections of Sources are found."""
 
+    __slots__ = ("note_list", "address_list", "urls", "type", "name")
+
     def __init__(self):
         """
         Create a new Repository instance.
@@ -43,6 +43,8 @@ class RepositoryType(GrampsType):
     Class encapsulating the type of repository.
     """
 
+    __slots__ = ()
+
     UNKNOWN = -1
     CUSTOM = 0
     LIBRARY = 1
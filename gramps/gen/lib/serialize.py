@@ -38,6 +38,7 @@ import logging
 #
 # ------------------------------------------------------------------------
 import gramps.gen.lib as lib
+from .tableobj import TableObject
 
 LOG = logging.getLogger(".serialize")
 
@@ -50,7 +51,7 @@ class DataDict(dict):
 
     def __str__(self):
         if "_object" not in self:
-            self["_object"] = from_dict(self)
+            self["_object"] = lazy_from_dict(self)
         return str(self["_object"])
 
     def __getattr__(self, key):
@@ -61,7 +62,7 @@ class DataDict(dict):
             value = self[key]
         else:
             if "_object" not in self:
-                self["_object"] = from_dict(self)
+                self["_object"] = lazy_from_dict(self)
             return getattr(self["_object"], key)
 
         if isinstance(value, dict):
@@ -87,6 +88,103 @@ class DataList(list):
             return value
 
 
+class LazyObject:
+    """
+    A primary object built on demand from its data dict.
+
+    The attributes are only made into objects the first time they are used,
+    and are then kept like those of any object: the names of a person are not
+    built when only its events are used. The object is otherwise a normal
+    object of its class, which can be changed and committed.
+
+    The classes are made by :func:`lazy_from_dict` for each class of primary
+    object; copying or pickling one of these objects gives an object of the
+    class itself.
+    """
+
+    __slots__ = ()
+
+    # attribute name -> key in the data dict
+    _lazy_keys = {}
+
+    def __getattr__(self, name):
+        key = self._lazy_keys.get(name)
+        if key is None:
+            raise AttributeError(
+                "%r object has no attribute %r" % (self.__class__.__name__, name)
+            )
+        try:
+            data = self._lazy_data[key]
+        except KeyError:
+            raise AttributeError(name) from None
+        value = from_dict(data)
+        setattr(self, name, value)
+        return value
+
+    def __reduce__(self):
+        return (from_dict, (to_dict(self),))
+
+
+__LAZY_CLASSES = {}
+
+
+def __lazy_class(class_name):
+    """
+    Return the lazy class of a class of primary object, or None.
+    """
+    if class_name in __LAZY_CLASSES:
+        return __LAZY_CLASSES[class_name]
+    cls = lib.__dict__.get(class_name)
+    if cls is None or not issubclass(cls, TableObject):
+        lazy_cls = None
+    else:
+        keys = {}
+        for base in cls.__mro__:
+            for name in base.__dict__.get("__slots__", ()):
+                if name.startswith("__"):
+                    # private attribute, e.g. the gender of a person
+                    keys["_%s%s" % (base.__name__.lstrip("_"), name)] = name[2:]
+                else:
+                    keys[name] = name
+        lazy_cls = type(
+            class_name,
+            (LazyObject, cls),
+            {
+                "__slots__": ("_lazy_data",),
+                "__module__": cls.__module__,
+                "__qualname__": cls.__qualname__,
+                "_lazy_keys": keys,
+            },
+        )
+    __LAZY_CLASSES[class_name] = lazy_cls
+    return lazy_cls
+
+
+def lazy_from_dict(data):
+    """
+    Convert a dictionary into a Gramps object, whose attributes are only
+    made into objects when they are used.
+
+    This is cheaper than :func:`from_dict` when only part of the object is
+    used, e.g. to display a column or to apply a filter rule. Secondary
+    objects, and data of other types, are converted by :func:`from_dict`.
+    The dictionary is kept by the object and must not be modified.
+
+    :param data: The dictionary of a primary object.
+    :type data: dict
+    :returns: A Gramps object.
+    :rtype: object
+    """
+    if not isinstance(data, dict):
+        return from_dict(data)
+    lazy_cls = __lazy_class(data.get("_class"))
+    if lazy_cls is None:
+        return from_dict(data)
+    obj = lazy_cls.__new__(lazy_cls)
+    obj._lazy_data = data
+    return obj
+
+
 def __object_hook(obj_dict):
     _class = obj_dict.pop("_class")
     cls = lib.__dict__[_class]
@@ -123,28 +221,83 @@ def from_json(data):
     return json.loads(data, object_hook=__object_hook)
 
 
+__SCALARS = frozenset((str, int, float, bool, type(None)))
+
+
+def __object_to_struct(value):
+    if isinstance(value, (list, tuple)):
+        return [
+            (item if type(item) in __SCALARS else __object_to_struct(item))
+            for item in value
+        ]
+    if isinstance(value, dict):
+        state = {key: item for key, item in value.items() if key != "_object"}
+    else:
+        # get_object_state always returns a new dictionary
+        state = value.get_object_state()
+    for key, item in state.items():
+        if type(item) not in __SCALARS:
+            state[key] = __object_to_struct(item)
+    return state
+
+
+def __struct_to_object(value):
+    if isinstance(value, (list, tuple)):
+        return [
+            (item if type(item) in __SCALARS else __struct_to_object(item))
+            for item in value
+        ]
+    state = {}
+    for key, item in value.items():
+        if type(item) in __SCALARS:
+            state[key] = item
+        elif key == "_object":
+            continue
+        elif item:
+            state[key] = __struct_to_object(item)
+        else:
+            state[key] = [] if isinstance(item, (list, tuple)) else {}
+    class_name = state.pop("_class", None)
+    if class_name is None:
+        return state
+    cls = lib.__dict__[class_name]
+    obj = cls.__new__(cls)
+    obj.set_object_state(state)
+    return obj
+
+
 def to_dict(obj):
     """
     Convert a Gramps object into a struct.
 
+    The struct is identical to the result of decoding the JSON produced by
+    :func:`to_json`, but is built directly from the object state.
+
     :param obj: The object to be serialized.
     :type obj: object
     :returns: A dictionary.
     :rtype: dict
     """
-    return json.loads(to_json(obj))
+    if type(obj) in __SCALARS:
+        return obj
+    return __object_to_struct(obj)
 
 
 def from_dict(dict):
     """
     Convert a dictionary into a Gramps object.
 
+    The object is built directly from the struct, without encoding it as a
+    JSON string first.  The dictionary is not modified.
+
     :param dict: The dictionary to be unserialized.
     :type dict: dict
     :returns: A Gramps object.
     :rtype: object
     """
-    return from_json(json.dumps(dict))
+    if type(dict) in __SCALARS:
+        return dict
+    return __struct_to_object(dict)
 
 
 class BlobSerializer:
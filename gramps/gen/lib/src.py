@@ -56,6 +56,17 @@ class Source(
     A record of a source of information.
     """
 
+    __slots__ = (
+        "media_list",
+        "note_list",
+        "attribute_list",
+        "title",
+        "author",
+        "pubinfo",
+        "abbrev",
+        "reporef_list",
+    )
+
     def __init__(self):
         """Create a new Source instance."""
         PrimaryObject.__init__(self)
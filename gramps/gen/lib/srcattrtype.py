@@ -43,6 +43,8 @@ class SrcAttributeType(GrampsType):
     Class encapsulating the type of source attribute.
     """
 
+    __slots__ = ()
+
     UNKNOWN = -1
     CUSTOM = 0
 
@@ -43,6 +43,8 @@ class SourceMediaType(GrampsType):
     Class encapsulating the media type for a source.
     """
 
+    __slots__ = ()
+
     UNKNOWN = -1
     CUSTOM = 0
     AUDIO = 1
@@ -54,6 +54,8 @@ class StyledTextTag(BaseObject):
 
     """
 
+    __slots__ = ("name", "value", "ranges")
+
     def __init__(self, name=None, value=None, ranges=None):
         """Setup initial instance variable values.
 
@@ -46,6 +46,8 @@ class StyledTextTagType(GrampsType):
     :class:`~gen.lib.grampstype.GrampsType`.
     """
 
+    __slots__ = ()
+
     NONE_TYPE = -1
     BOLD = 0
     ITALIC = 1
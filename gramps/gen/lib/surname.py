@@ -49,6 +49,8 @@ class Surname(SecondaryObject):
     A person may have more that one surname in his name
     """
 
+    __slots__ = ("surname", "prefix", "primary", "origintype", "connector")
+
     def __init__(self, source=None, data=None):
         """
         Create a new Surname instance, copying from the source if provided.
@@ -58,6 +58,8 @@ class TableObject(BaseObject):
     It is the base class for the BasicPrimaryObject class and Tag class.
     """
 
+    __slots__ = ("handle", "change")
+
     def __init__(self, source=None):
         """
         Initialize a TableObject.
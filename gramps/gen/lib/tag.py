@@ -45,6 +45,8 @@ class Tag(TableObject):
     attached to a primary object.
     """
 
+    __slots__ = ("__name", "__color", "__priority")
+
     def __init__(self, source=None):
         """
         Create a new Tag instance, copying from the source if present.
@@ -33,6 +33,8 @@ class TagBase:
     Base class for tag-aware objects.
     """
 
+    __slots__ = ()
+
     def __init__(self, source=None):
         """
         Initialize a TagBase.
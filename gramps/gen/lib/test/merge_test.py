@@ -62,17 +62,59 @@ from .. import (
     Url,
     UrlType,
 )
-from ..addressbase import AddressBase
-from ..attrbase import AttributeBase
-from ..citationbase import CitationBase
+from ..addressbase import AddressBase as _AddressBase
+from ..attrbase import AttributeBase as _AttributeBase
+from ..citationbase import CitationBase as _CitationBase
 from ..const import DIFFERENT, EQUAL, IDENTICAL
-from ..ldsordbase import LdsOrdBase
-from ..mediabase import MediaBase
-from ..notebase import NoteBase
-from ..privacybase import PrivacyBase
-from ..surnamebase import SurnameBase
-from ..tagbase import TagBase
-from ..urlbase import UrlBase
+from ..ldsordbase import LdsOrdBase as _LdsOrdBase
+from ..mediabase import MediaBase as _MediaBase
+from ..notebase import NoteBase as _NoteBase
+from ..privacybase import PrivacyBase as _PrivacyBase
+from ..surnamebase import SurnameBase as _SurnameBase
+from ..tagbase import TagBase as _TagBase
+from ..urlbase import UrlBase as _UrlBase
+
+
+# The base classes have no instance dictionary (see BaseObject): the tests
+# below use them on their own, through subclasses which have one.
+class AddressBase(_AddressBase):
+    pass
+
+
+class AttributeBase(_AttributeBase):
+    pass
+
+
+class CitationBase(_CitationBase):
+    pass
+
+
+class LdsOrdBase(_LdsOrdBase):
+    pass
+
+
+class MediaBase(_MediaBase):
+    pass
+
+
+class NoteBase(_NoteBase):
+    pass
+
+
+class PrivacyBase(_PrivacyBase):
+    pass
+
+
+class SurnameBase(_SurnameBase):
+    pass
+
+
+class TagBase(_TagBase):
+    pass
+
+
+class UrlBase(_UrlBase):
+    pass
 
 
 class PrivacyBaseTest:
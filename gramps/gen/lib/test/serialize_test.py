@@ -20,8 +20,14 @@
 
 """ Unittest for to_json, from_json """
 
+import copy
+import json
 import os
+import pickle
+import sys
 import unittest
+from timeit import repeat
+from unittest.mock import patch
 
 from ...const import DATA_DIR
 from ...db.utils import import_as_dict
@@ -31,6 +37,7 @@ from .. import (
     Event,
     Family,
     Media,
+    Name,
     Note,
     Person,
     Place,
@@ -38,10 +45,12 @@ from .. import (
     Source,
     Tag,
 )
-from ..serialize import from_json, to_json
+from ..baseobj import BaseObject
+from ..serialize import from_dict, from_json, lazy_from_dict, to_dict, to_json
 
 TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
 EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+BENCHMARK_SIZE = 100000
 
 
 class BaseCheck:
@@ -50,6 +59,13 @@ class BaseCheck:
         obj = from_json(data)
         self.assertEqual(self.object.serialize(), obj.serialize())
 
+    def test_from_dict(self):
+        data = to_dict(self.object)
+        self.assertEqual(data, json.loads(to_json(self.object)))
+        obj = from_dict(data)
+        self.assertEqual(self.object.serialize(), obj.serialize())
+        self.assertEqual(data, to_dict(self.object))
+
 
 class PersonCheck(unittest.TestCase, BaseCheck):
     def setUp(self):
@@ -115,6 +131,181 @@ class DatabaseCheck(unittest.TestCase):
     maxDiff = None
 
 
+class CodecCheck(unittest.TestCase):
+    """
+    Compare the direct dict codec with a JSON round trip.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.objects = []
+        for obj_class in ("Person", "Family", "Event", "Place", "Citation"):
+            for handle in db.method("get_%s_handles", obj_class)():
+                cls.objects.append(db.method("get_%s_from_handle", obj_class)(handle))
+
+    def test_to_dict(self):
+        for obj in self.objects:
+            self.assertEqual(to_dict(obj), json.loads(to_json(obj)))
+
+    def test_from_dict(self):
+        for obj in self.objects:
+            data = json.loads(to_json(obj))
+            copied = copy.deepcopy(data)
+            self.assertEqual(
+                from_dict(data).serialize(), from_json(json.dumps(data)).serialize()
+            )
+            self.assertEqual(data, copied)
+
+    def test_from_dict_tuples(self):
+        """
+        Test a struct holding tuples, like a dateval, where JSON has lists.
+        """
+
+        def to_tuples(value):
+            if isinstance(value, list):
+                return tuple(to_tuples(item) for item in value)
+            if isinstance(value, dict):
+                return {key: to_tuples(item) for key, item in value.items()}
+            return value
+
+        for obj in self.objects:
+            data = json.loads(to_json(obj))
+            self.assertEqual(
+                from_dict(to_tuples(data)).serialize(),
+                from_json(json.dumps(data)).serialize(),
+            )
+
+
+def nested_objects(obj):
+    """
+    Yield an object and all the objects it contains.
+    """
+    yield obj
+    for value in obj.get_object_state().values():
+        for item in value if isinstance(value, (list, tuple)) else [value]:
+            if isinstance(item, BaseObject):
+                yield from nested_objects(item)
+
+
+class MemoryCheck(unittest.TestCase):
+    """
+    Check the objects, which keep their attributes in slots.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.people = [
+            db.get_person_from_handle(handle) for handle in db.get_person_handles()
+        ]
+
+    def test_no_instance_dict(self):
+        for person in self.people:
+            for obj in nested_objects(person):
+                self.assertFalse(hasattr(obj, "__dict__"), obj.__class__.__name__)
+
+    def test_pickle(self):
+        for person in self.people:
+            copied = pickle.loads(pickle.dumps(person))
+            self.assertEqual(copied.serialize(), person.serialize())
+            copied = copy.deepcopy(person)
+            self.assertEqual(copied.serialize(), person.serialize())
+
+    def test_unpickle_dict(self):
+        # the state of an object pickled when the classes had no slots
+        person = self.people[0]
+        legacy = Person.__new__(Person)
+        legacy.__setstate__(
+            {
+                key: value
+                for key, value in person.get_object_state().items()
+                if key != "_class"
+            }
+        )
+        self.assertEqual(legacy.serialize(), person.serialize())
+
+
+class LazyCheck(unittest.TestCase):
+    """
+    Check the objects made from their data dict on demand.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.data = []
+        for obj_class in (
+            "Person",
+            "Family",
+            "Event",
+            "Place",
+            "Repository",
+            "Source",
+            "Citation",
+            "Media",
+            "Note",
+        ):
+            for handle in db.method("get_%s_handles", obj_class)():
+                cls.data.append(db.method("get_raw_%s_data", obj_class)(handle))
+
+    def test_same_object(self):
+        for data in self.data:
+            obj = from_dict(data)
+            lazy = lazy_from_dict(data)
+            self.assertIsInstance(lazy, obj.__class__)
+            self.assertEqual(lazy.__class__.__name__, data["_class"])
+            self.assertEqual(lazy.serialize(), obj.serialize())
+            self.assertEqual(to_dict(lazy), to_dict(obj))
+
+    def test_on_demand(self):
+        person = lazy_from_dict(db.get_raw_person_data(db.get_person_handles()[0]))
+        self.assertRaises(
+            AttributeError, object.__getattribute__, person, "primary_name"
+        )
+        name = person.get_primary_name()
+        self.assertIs(object.__getattribute__(person, "primary_name"), name)
+        self.assertIs(person.get_primary_name(), name)
+        self.assertRaises(
+            AttributeError, object.__getattribute__, person, "event_ref_list"
+        )
+        self.assertRaises(AttributeError, getattr, person, "no_such_attribute")
+
+    def test_change(self):
+        data = db.get_raw_person_data(db.get_person_handles()[0])
+        person = lazy_from_dict(data)
+        person.set_gramps_id("I9999")
+        self.assertEqual(from_dict(to_dict(person)).get_gramps_id(), "I9999")
+        self.assertNotEqual(data["gramps_id"], "I9999")
+
+    def test_copy(self):
+        data = db.get_raw_person_data(db.get_person_handles()[0])
+        for copied in (
+            copy.copy(lazy_from_dict(data)),
+            copy.deepcopy(lazy_from_dict(data)),
+            pickle.loads(pickle.dumps(lazy_from_dict(data))),
+        ):
+            self.assertIs(copied.__class__, Person)
+            self.assertEqual(copied.serialize(), from_dict(data).serialize())
+
+    def test_secondary(self):
+        data = db.get_raw_person_data(db.get_person_handles()[0])
+        name = lazy_from_dict(data["primary_name"])
+        self.assertIs(name.__class__, Name)
+        self.assertIsNone(lazy_from_dict(None))
+
+    def test_unmaterialized(self):
+        for data in self.data:
+            obj = lazy_from_dict(data)
+            with patch(
+                "gramps.gen.lib.serialize.from_dict", wraps=from_dict
+            ) as convert:
+                self.assertEqual(obj.get_handle(), data["handle"])
+                self.assertEqual(obj.get_handle(), data["handle"])
+            convert.assert_called_once_with(data["handle"])
+            for name in obj._lazy_keys:
+                if name == "handle":
+                    continue
+                self.assertRaises(AttributeError, object.__getattribute__, obj, name)
+
+
 def generate_cases(obj, data):
     """
     Dynamically generate tests and attach to DatabaseCheck.
@@ -167,5 +358,34 @@ for obj_class in (
         data = db.method("get_raw_%s_data", obj_class)(handle)
         generate_cases(obj, data)
 
+
+def benchmark_codec():
+    """
+    Print the time taken to convert objects to and from dicts directly and
+    through a JSON round trip. This is not a unit test: run this module
+    with --benchmark.
+    """
+    objects = []
+    for obj_class in ("Person", "Family", "Event", "Place", "Citation"):
+        for handle in db.method("get_%s_handles", obj_class)():
+            objects.append(db.method("get_%s_from_handle", obj_class)(handle))
+    objects = [objects[index % len(objects)] for index in range(BENCHMARK_SIZE)]
+    data = [to_dict(obj) for obj in objects]
+    for name, convert in (
+        ("to_dict", lambda: [to_dict(obj) for obj in objects]),
+        ("to_json round trip", lambda: [json.loads(to_json(obj)) for obj in objects]),
+        ("from_dict", lambda: [from_dict(item) for item in data]),
+        (
+            "from_json round trip",
+            lambda: [from_json(json.dumps(item)) for item in data],
+        ),
+    ):
+        seconds = min(repeat(convert, number=1, repeat=3))
+        print("%s, %d objects: %.4f s" % (name, len(objects), seconds))
+
+
 if __name__ == "__main__":
-    unittest.main()
+    if "--benchmark" in sys.argv:
+        benchmark_codec()
+    else:
+        unittest.main()
@@ -43,6 +43,8 @@ class UrlType(GrampsType):
     Class encapsulating the type of a url.
     """
 
+    __slots__ = ()
+
     UNKNOWN = -1
     CUSTOM = 0
     EMAIL = 1
@@ -35,10 +35,13 @@ importers, exporters, quick reports, and document generators.
 # Python modules
 #
 # -------------------------------------------------------------------------
+from collections import defaultdict
+from heapq import heapify, heappop, heappush
 import importlib
 import logging
 import os
 import sys
+import time
 
 # -------------------------------------------------------------------------
 #
@@ -64,6 +67,34 @@ _ = glocale.translation.gettext
 _UNAVAILABLE = _("No description was provided")
 
 
+def sort_on_dependencies(plugins):
+    """
+    Sort plugins so that each plugin comes after the plugins it depends on,
+    keeping the given order where the dependencies allow it.
+
+    :param plugins: a list of :class:`.PluginData`
+    :returns: a tuple of the sorted plugins and of the plugins whose
+              dependencies are not in the list
+    """
+    waiting = [len(set(plugin.depends_on)) for plugin in plugins]
+    dependants = defaultdict(list)
+    for ind, plugin in enumerate(plugins):
+        for depend in set(plugin.depends_on):
+            dependants[depend].append(ind)
+    ready = [ind for ind, count in enumerate(waiting) if count == 0]
+    heapify(ready)
+    plugins_sorted = []
+    while ready:
+        plugin = plugins[heappop(ready)]
+        plugins_sorted.append(plugin)
+        for ind in dependants.pop(plugin.id, []):
+            waiting[ind] -= 1
+            if waiting[ind] == 0:
+                heappush(ready, ind)
+    unresolved = [plugin for ind, plugin in enumerate(plugins) if waiting[ind]]
+    return plugins_sorted, unresolved
+
+
 # -------------------------------------------------------------------------
 #
 # BasePluginManager
@@ -140,6 +171,7 @@ class BasePluginManager:
         #             " been_here=%s, pahte exists:%s", direct, load_on_reg,
         #             direct in self.__scanned_dirs, os.path.isdir(direct))
 
+        start = time.perf_counter()
         if os.path.isdir(direct):
             for dirpath, dirnames, filenames in os.walk(direct, topdown=True):
                 for dirname in dirnames[:]:
@@ -152,8 +184,15 @@ class BasePluginManager:
                         dirnames.remove(dirname)
                 # LOG.warning("Plugin dir scanned: %s", dirpath)
                 if dirpath not in self.__scanned_dirs:
+                    dir_start = time.perf_counter()
                     self.__pgr.scan_dir(dirpath, filenames, uistate=uistate)
                     self.__scanned_dirs.append(dirpath)
+                    LOG.debug(
+                        "Registered %s in %.1f ms",
+                        dirpath,
+                        (time.perf_counter() - dir_start) * 1000,
+                    )
+            self.__pgr.save_code_cache()
 
         if load_on_reg:
             # Run plugins that request to be loaded on startup and
@@ -166,32 +205,11 @@ class BasePluginManager:
                     continue
                 plugins_to_load.append(plugin)
             # next, sort on dependencies
-            # Probably a more efficient method to get dependency graph:
-            plugins_sorted = []
-            count = 0
-            max_count = len(plugins_to_load)
-            while plugins_to_load:
-                for plugin in plugins_to_load[:]:  # copy of list
-                    # LOG.warning("\nDependencies for %s at registration",
-                    #             plugin.id)
-                    delay = False
-                    for depend in plugin.depends_on:
-                        if depend not in [p.id for p in plugins_sorted]:
-                            delay = True
-                            break
-                    if delay:
-                        pass  # wait till next loop
-                    else:
-                        if plugin not in plugins_sorted:
-                            plugins_sorted.append(plugin)
-                        if plugin in plugins_to_load:
-                            plugins_to_load.remove(plugin)
-                count += 1
-                if count > max_count:
-                    print("Cannot resolve the following plugin dependencies:")
-                    for plugin in plugins_to_load:
-                        print(f"   Plugin '{plugin.id}' requires: {plugin.depends_on}")
-                    break
+            plugins_sorted, unresolved = sort_on_dependencies(plugins_to_load)
+            if unresolved:
+                print("Cannot resolve the following plugin dependencies:")
+                for plugin in unresolved:
+                    print(f"   Plugin '{plugin.id}' requires: {plugin.depends_on}")
             # now load them:
             for plugin in plugins_sorted:
                 # next line shouldn't be necessary, but this gets called a lot
@@ -226,6 +244,11 @@ class BasePluginManager:
             setattr(obj_rules, plugin.ruleclass, r_class)
             # and add it to the correct fiter editor list
             obj_rules.editor_rule_list.append(r_class)
+        LOG.debug(
+            "Registered plugins of %s in %.1f ms",
+            direct,
+            (time.perf_counter() - start) * 1000,
+        )
 
     def is_loaded(self, pdata_id):
         """
@@ -30,7 +30,9 @@ and a register for the data of all plugins .
 # Python modules
 #
 # -------------------------------------------------------------------------
+from importlib.util import MAGIC_NUMBER
 import logging
+import marshal
 import os
 import re
 import sys
@@ -42,7 +44,7 @@ import traceback
 #
 # -------------------------------------------------------------------------
 from ...version import VERSION as GRAMPSVERSION, VERSION_TUPLE
-from ..const import IMAGE_DIR
+from ..const import IMAGE_DIR, USER_CACHE
 from ..const import GRAMPS_LOCALE as glocale
 from ..utils.requirements import Requirements
 
@@ -53,6 +55,9 @@ LOG = logging.getLogger("._manager")
 # Fix DEBUG for AIO built with cx_Freeze
 DEBUG = __debug__ and not hasattr(sys, "frozen")
 
+# Compiled registration files, reused while their mtime and size are unchanged
+CODE_CACHE = os.path.join(USER_CACHE, "plugin-registry.cache")
+
 # -------------------------------------------------------------------------
 #
 # PluginData
@@ -1372,6 +1377,8 @@ class PluginRegister:
         self.__plugindata = []
         self.__id_to_pdata = {}
         self.__req = Requirements()
+        self.__code_cache = None
+        self.__code_cache_changed = False
 
     def add_plugindata(self, plugindata):
         """This is used to add an entry to the registration list.  The way it
@@ -1400,8 +1407,12 @@ class PluginRegister:
             lenpd = len(self.__plugindata)
             full_filename = os.path.join(directory, filename)
             try:
-                with open(full_filename, "r", encoding="utf-8") as file_descriptor:
-                    stream = file_descriptor.read()
+                stat = os.stat(full_filename)
+                key = (stat.st_mtime_ns, stat.st_size)
+                code = self.__get_cached_code(full_filename, key)
+                if code is None:
+                    with open(full_filename, "r", encoding="utf-8") as file_descriptor:
+                        stream = file_descriptor.read()
             except Exception as msg:
                 print(
                     _("ERROR: Failed reading plugin registration %(filename)s")
@@ -1425,8 +1436,11 @@ class PluginRegister:
             else:
                 local_gettext = glocale.translation.gettext
             try:
+                if code is None:
+                    code = compile(stream, filename, "exec")
+                    self.__set_cached_code(full_filename, key, code)
                 exec(
-                    compile(stream, filename, "exec"),
+                    code,
                     make_environment(_=local_gettext),
                     {"uistate": uistate},
                 )
@@ -1523,6 +1537,68 @@ class PluginRegister:
                 del self.__id_to_pdata[self.__plugindata[ind].id]
                 del self.__plugindata[ind]
 
+    def __get_code_cache(self):
+        """
+        Return the cache of compiled registration files, reading it from disk
+        the first time. A cache written by another Gramps version or another
+        Python bytecode format is ignored.
+        """
+        if self.__code_cache is None:
+            self.__code_cache = {}
+            try:
+                with open(CODE_CACHE, "rb") as cache_file:
+                    header, cache = marshal.load(cache_file)
+                if header == (GRAMPSVERSION, MAGIC_NUMBER):
+                    self.__code_cache = cache
+            except (OSError, EOFError, ValueError, TypeError):
+                pass
+        return self.__code_cache
+
+    def __get_cached_code(self, filename, key):
+        """
+        Return the compiled code of a registration file, or None if it has
+        not been cached for the given (mtime, size) key.
+        """
+        entry = self.__get_code_cache().get(filename)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        return None
+
+    def __set_cached_code(self, filename, key, code):
+        """
+        Store the compiled code of a registration file in the cache.
+        """
+        self.__get_code_cache()[filename] = (key, code)
+        self.__code_cache_changed = True
+
+    def save_code_cache(self):
+        """
+        Write the cache of compiled registration files to disk, if a file was
+        compiled since it was read. Entries of removed files are dropped.
+        """
+        if not self.__code_cache_changed:
+            return
+        cache = {
+            filename: entry
+            for filename, entry in self.__code_cache.items()
+            if os.path.isfile(filename)
+        }
+        temp_name = "%s.%d" % (CODE_CACHE, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(CODE_CACHE), exist_ok=True)
+            with open(temp_name, "wb") as cache_file:
+                marshal.dump(((GRAMPSVERSION, MAGIC_NUMBER), cache), cache_file)
+            os.replace(temp_name, CODE_CACHE)
+        except OSError as msg:
+            # The cache only saves compiling the files at the next start
+            LOG.debug("Cannot write the plugin registry cache: %s", msg)
+            try:
+                os.remove(temp_name)
+            except OSError:
+                pass
+            return
+        self.__code_cache_changed = False
+
     def get_plugin(self, plugin_id):
         """
         Return the :class:`PluginData` for the plugin with id
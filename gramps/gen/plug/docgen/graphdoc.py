@@ -37,6 +37,7 @@ from abc import ABCMeta, abstractmethod
 import os
 from io import BytesIO
 import tempfile
+import weakref
 from subprocess import Popen, PIPE
 
 # -------------------------------------------------------------------------
@@ -51,6 +52,7 @@ from ...utils.file import search_for, where_is
 from . import BaseDoc
 from ..menu import NumberOption, TextOption, EnumeratedListOption, BooleanOption
 from ...constfunc import win
+from ...errors import ReportError
 
 # -------------------------------------------------------------------------
 #
@@ -122,6 +124,40 @@ else:
     _DOT_FOUND = search_for("dot")
     _GS_CMD = where_is("gs")
 
+if win():
+    CREATE_NO_WINDOW = 0x8000000
+else:
+    CREATE_NO_WINDOW = 0
+
+_DOT_VERSION = None
+
+
+def dot_version():
+    """
+    Return the version banner of dot, running "dot -V" only the first time.
+    """
+    global _DOT_VERSION
+    if _DOT_VERSION is None:
+        _DOT_VERSION = str(
+            Popen(
+                ["dot", "-V"], stderr=PIPE, creationflags=CREATE_NO_WINDOW
+            ).communicate(input=None)[1]
+        )
+    return _DOT_VERSION
+
+
+def _stop_dot(process):
+    """
+    Stop a dot process whose document cannot be completed, e.g. because the
+    report failed, and close its input.
+    """
+    try:
+        process.stdin.close()
+    except BrokenPipeError:
+        pass
+    process.kill()
+    process.wait()
+
 
 def esc(id_txt):
     return id_txt.replace('"', '\\"')
@@ -466,8 +502,10 @@ class GVDoc(metaclass=ABCMeta):
 class GVDocBase(BaseDoc, GVDoc):
     """
     Base document generator for all Graphviz document generators. Classes that
-    inherit from this class will only need to implement the close function.
-    The close function will generate the actual file of the appropriate type.
+    inherit from this class will only need to implement the open and close
+    functions. The graph is kept in memory until the document is opened;
+    from then on it is streamed into dot, which generates the actual file of
+    the appropriate type while the report is still writing the graph.
     """
 
     def __init__(self, options, paper_style, uistate=None):
@@ -475,6 +513,9 @@ class GVDocBase(BaseDoc, GVDoc):
 
         self._filename = None
         self._dot = BytesIO()
+        self._process = None
+        self._stop = None
+        self._outputs = []
         self._paper = paper_style
 
         get_option = options.menu.get_option_by_name
@@ -563,12 +604,66 @@ class GVDocBase(BaseDoc, GVDoc):
 
     def write(self, text):
         """Write text to the dot file"""
-        self._dot.write(text.encode("utf8", "xmlcharrefreplace"))
+        try:
+            self._dot.write(text.encode("utf8", "xmlcharrefreplace"))
+        except BrokenPipeError:
+            self._stop()
+            raise ReportError(
+                _("Report could not be created"),
+                _("Could not create %s") % self._filename,
+            )
 
     def open(self, filename):
         """Implement GVDocBase.open()"""
         self._filename = os.path.normpath(os.path.abspath(filename))
 
+    def add_output(self, output_format, filename):
+        """
+        Also generate the graph in another Graphviz output format, eg "png",
+        from the same layout. This must be called before the document is
+        opened.
+        """
+        self._outputs.append((output_format, filename))
+
+    def _start_dot(self, output_format, filename):
+        """
+        Start dot to generate the file, and the files of the other output
+        formats, and write the graph to it from now on. dot is stopped if the
+        document is not closed, e.g. when the report fails.
+        """
+        command = ["dot", "-T%s" % output_format, "-o%s" % filename]
+        for extra_format, extra_filename in self._outputs:
+            command += ["-T%s" % extra_format, "-o%s" % extra_filename]
+        try:
+            self._process = Popen(command, stdin=PIPE, creationflags=CREATE_NO_WINDOW)
+        except OSError as msg:
+            raise ReportError(
+                _("Report could not be created"),
+                _("Could not create %s") % self._filename,
+            ) from msg
+        self._stop = weakref.finalize(self, _stop_dot, self._process)
+        header = self._dot.getvalue()
+        self._dot = self._process.stdin
+        try:
+            self._dot.write(header)
+        except BrokenPipeError:
+            pass
+
+    def _end_dot(self):
+        """
+        Wait for dot to generate the file from the complete graph.
+        """
+        self._stop.detach()
+        try:
+            self._dot.close()
+        except BrokenPipeError:
+            pass
+        if self._process.wait() != 0:
+            raise ReportError(
+                _("Report could not be created"),
+                _("Could not create %s") % self._filename,
+            )
+
     def close(self):
         """
         This isn't useful by itself. Other classes need to override this and
@@ -728,16 +823,25 @@ class GVDocBase(BaseDoc, GVDoc):
 class GVDotDoc(GVDocBase):
     """GVDoc implementation that generates a .gv text file."""
 
-    def close(self):
-        """Implements GVDotDoc.close()"""
-        GVDocBase.close(self)
+    def open(self, filename):
+        """Implements GVDotDoc.open()"""
+        GVDocBase.open(self, filename)
 
         # Make sure the extension is correct
         if self._filename[-3:] != ".gv":
             self._filename += ".gv"
 
-        with open(self._filename, "wb") as dotfile:
-            dotfile.write(self._dot.getvalue())
+        header = self._dot.getvalue()
+        self._dot = open(self._filename, "wb")
+        self._stop = weakref.finalize(self, self._dot.close)
+        self._dot.write(header)
+
+    def close(self):
+        """Implements GVDotDoc.close()"""
+        try:
+            GVDocBase.close(self)
+        finally:
+            self._stop()
 
 
 # ------------------------------------------------------------------------------
@@ -761,20 +865,14 @@ class GVPsDoc(GVDocBase):
         options.menu.get_option_by_name("h_pages").set_value(1)
         GVDocBase.__init__(self, options, paper_style)
 
-    def close(self):
-        """Implements GVPsDoc.close()"""
-        GVDocBase.close(self)
+    def open(self, filename):
+        """Implements GVPsDoc.open()"""
+        GVDocBase.open(self, filename)
 
         # Make sure the extension is correct
         if self._filename[-3:] != ".ps":
             self._filename += ".ps"
 
-        # Create a temporary dot file
-        (handle, tmp_dot) = tempfile.mkstemp(".gv")
-        dotfile = os.fdopen(handle, "wb")
-        dotfile.write(self._dot.getvalue())
-        dotfile.close()
-
         # Generate the PS file.
         # Reason for using -Tps:cairo. Needed for Non Latin-1 letters
         # Some testing with Tps:cairo. Non Latin-1 letters are OK i all cases:
@@ -790,18 +888,21 @@ class GVPsDoc(GVDocBase):
         # recent versions of Graphviz doesn't even try, just puts out a single
         # large page.
 
-        command = 'dot -Tps:cairo -o"%s" "%s"' % (self._filename, tmp_dot)
-        dotversion = str(Popen(["dot", "-V"], stderr=PIPE).communicate(input=None)[1])
+        output_format = "ps:cairo"
+        dotversion = dot_version()
         # Problem with dot 2.26.3 and later and multiple pages, which gives
         # "cairo: out of memory" If the :cairo is skipped for these cases it
         # gives bad result for non-Latin-1 characters (utf-8).
         if (dotversion.find("2.26.3") or dotversion.find("2.28.0") != -1) and (
             self.vpages * self.hpages
         ) > 1:
-            command = command.replace(":cairo", "")
-        os.system(command)
-        # Delete the temporary dot file
-        os.remove(tmp_dot)
+            output_format = "ps"
+        self._start_dot(output_format, self._filename)
+
+    def close(self):
+        """Implements GVPsDoc.close()"""
+        GVDocBase.close(self)
+        self._end_dot()
 
 
 # ------------------------------------------------------------------------------
@@ -819,24 +920,21 @@ class GVSvgDoc(GVDocBase):
         options.menu.get_option_by_name("h_pages").set_value(1)
         GVDocBase.__init__(self, options, paper_style)
 
-    def close(self):
-        """Implements GVSvgDoc.close()"""
-        GVDocBase.close(self)
+    def open(self, filename):
+        """Implements GVSvgDoc.open()"""
+        GVDocBase.open(self, filename)
 
         # Make sure the extension is correct
         if self._filename[-4:] != ".svg":
             self._filename += ".svg"
 
-        # Create a temporary dot file
-        (handle, tmp_dot) = tempfile.mkstemp(".gv")
-        dotfile = os.fdopen(handle, "wb")
-        dotfile.write(self._dot.getvalue())
-        dotfile.close()
         # Generate the SVG file.
-        os.system('dot -Tsvg:cairo -o"%s" "%s"' % (self._filename, tmp_dot))
+        self._start_dot("svg:cairo", self._filename)
 
-        # Delete the temporary dot file
-        os.remove(tmp_dot)
+    def close(self):
+        """Implements GVSvgDoc.close()"""
+        GVDocBase.close(self)
+        self._end_dot()
 
 
 # ------------------------------------------------------------------------------
@@ -854,24 +952,21 @@ class GVSvgzDoc(GVDocBase):
         options.menu.get_option_by_name("h_pages").set_value(1)
         GVDocBase.__init__(self, options, paper_style)
 
-    def close(self):
-        """Implements GVSvgzDoc.close()"""
-        GVDocBase.close(self)
+    def open(self, filename):
+        """Implements GVSvgzDoc.open()"""
+        GVDocBase.open(self, filename)
 
         # Make sure the extension is correct
         if self._filename[-5:] != ".svgz":
             self._filename += ".svgz"
 
-        # Create a temporary dot file
-        (handle, tmp_dot) = tempfile.mkstemp(".gv")
-        dotfile = os.fdopen(handle, "wb")
-        dotfile.write(self._dot.getvalue())
-        dotfile.close()
         # Generate the SVGZ file.
-        os.system('dot -Tsvgz -o"%s" "%s"' % (self._filename, tmp_dot))
+        self._start_dot("svgz", self._filename)
 
-        # Delete the temporary dot file
-        os.remove(tmp_dot)
+    def close(self):
+        """Implements GVSvgzDoc.close()"""
+        GVDocBase.close(self)
+        self._end_dot()
 
 
 # ------------------------------------------------------------------------------
@@ -889,24 +984,21 @@ class GVPngDoc(GVDocBase):
         options.menu.get_option_by_name("h_pages").set_value(1)
         GVDocBase.__init__(self, options, paper_style)
 
-    def close(self):
-        """Implements GVPngDoc.close()"""
-        GVDocBase.close(self)
+    def open(self, filename):
+        """Implements GVPngDoc.open()"""
+        GVDocBase.open(self, filename)
 
         # Make sure the extension is correct
         if self._filename[-4:] != ".png":
             self._filename += ".png"
 
-        # Create a temporary dot file
-        (handle, tmp_dot) = tempfile.mkstemp(".gv")
-        dotfile = os.fdopen(handle, "wb")
-        dotfile.write(self._dot.getvalue())
-        dotfile.close()
         # Generate the PNG file.
-        os.system('dot -Tpng -o"%s" "%s"' % (self._filename, tmp_dot))
+        self._start_dot("png", self._filename)
 
-        # Delete the temporary dot file
-        os.remove(tmp_dot)
+    def close(self):
+        """Implements GVPngDoc.close()"""
+        GVDocBase.close(self)
+        self._end_dot()
 
 
 # ------------------------------------------------------------------------------
@@ -924,24 +1016,21 @@ class GVJpegDoc(GVDocBase):
         options.menu.get_option_by_name("h_pages").set_value(1)
         GVDocBase.__init__(self, options, paper_style)
 
-    def close(self):
-        """Implements GVJpegDoc.close()"""
-        GVDocBase.close(self)
+    def open(self, filename):
+        """Implements GVJpegDoc.open()"""
+        GVDocBase.open(self, filename)
 
         # Make sure the extension is correct
         if self._filename[-4:] != ".jpg":
             self._filename += ".jpg"
 
-        # Create a temporary dot file
-        (handle, tmp_dot) = tempfile.mkstemp(".gv")
-        dotfile = os.fdopen(handle, "wb")
-        dotfile.write(self._dot.getvalue())
-        dotfile.close()
         # Generate the JPEG file.
-        os.system('dot -Tjpg -o"%s" "%s"' % (self._filename, tmp_dot))
+        self._start_dot("jpg", self._filename)
 
-        # Delete the temporary dot file
-        os.remove(tmp_dot)
+    def close(self):
+        """Implements GVJpegDoc.close()"""
+        GVDocBase.close(self)
+        self._end_dot()
 
 
 # ------------------------------------------------------------------------------
@@ -959,24 +1048,21 @@ class GVGifDoc(GVDocBase):
         options.menu.get_option_by_name("h_pages").set_value(1)
         GVDocBase.__init__(self, options, paper_style)
 
-    def close(self):
-        """Implements GVGifDoc.close()"""
-        GVDocBase.close(self)
+    def open(self, filename):
+        """Implements GVGifDoc.open()"""
+        GVDocBase.open(self, filename)
 
         # Make sure the extension is correct
         if self._filename[-4:] != ".gif":
             self._filename += ".gif"
 
-        # Create a temporary dot file
-        (handle, tmp_dot) = tempfile.mkstemp(".gv")
-        dotfile = os.fdopen(handle, "wb")
-        dotfile.write(self._dot.getvalue())
-        dotfile.close()
         # Generate the GIF file.
-        os.system('dot -Tgif -o"%s" "%s"' % (self._filename, tmp_dot))
+        self._start_dot("gif", self._filename)
 
-        # Delete the temporary dot file
-        os.remove(tmp_dot)
+    def close(self):
+        """Implements GVGifDoc.close()"""
+        GVDocBase.close(self)
+        self._end_dot()
 
 
 # ------------------------------------------------------------------------------
@@ -997,26 +1083,21 @@ class GVPdfGvDoc(GVDocBase):
         options.menu.get_option_by_name("h_pages").set_value(1)
         GVDocBase.__init__(self, options, paper_style)
 
-    def close(self):
-        """Implements GVPdfGvDoc.close()"""
-        GVDocBase.close(self)
+    def open(self, filename):
+        """Implements GVPdfGvDoc.open()"""
+        GVDocBase.open(self, filename)
 
         # Make sure the extension is correct
         if self._filename[-4:] != ".pdf":
             self._filename += ".pdf"
 
-        # Create a temporary dot file
-        (handle, tmp_dot) = tempfile.mkstemp(".gv")
-        dotfile = os.fdopen(handle, "wb")
-        dotfile.write(self._dot.getvalue())
-        dotfile.close()
-        fname = self._filename
-
         # Generate the PDF file.
-        os.system('dot -Tpdf -o"%s" "%s"' % (fname, tmp_dot))
+        self._start_dot("pdf", self._filename)
 
-        # Delete the temporary dot file
-        os.remove(tmp_dot)
+    def close(self):
+        """Implements GVPdfGvDoc.close()"""
+        GVDocBase.close(self)
+        self._end_dot()
 
 
 # ------------------------------------------------------------------------------
@@ -1033,22 +1114,16 @@ class GVPdfGsDoc(GVDocBase):
         options.menu.get_option_by_name("dpi").set_value(72)
         GVDocBase.__init__(self, options, paper_style)
 
-    def close(self):
-        """Implements GVPdfGsDoc.close()"""
-        GVDocBase.close(self)
+    def open(self, filename):
+        """Implements GVPdfGsDoc.open()"""
+        GVDocBase.open(self, filename)
 
         # Make sure the extension is correct
         if self._filename[-4:] != ".pdf":
             self._filename += ".pdf"
 
-        # Create a temporary dot file
-        (handle, tmp_dot) = tempfile.mkstemp(".gv")
-        dotfile = os.fdopen(handle, "wb")
-        dotfile.write(self._dot.getvalue())
-        dotfile.close()
-
         # Create a temporary PostScript file
-        (handle, tmp_ps) = tempfile.mkstemp(".ps")
+        (handle, self._tmp_ps) = tempfile.mkstemp(".ps")
         os.close(handle)
 
         # Generate PostScript using dot
@@ -1057,9 +1132,17 @@ class GVPdfGsDoc(GVDocBase):
         # :cairo does not work with with multi-page See issue 4164
         # recent versions of Graphviz doesn't even try, just puts out a single
         # large page, so we use Ghostscript to split it up.
+        self._start_dot("ps:cairo", self._tmp_ps)
 
-        command = 'dot -Tps:cairo -o"%s" "%s"' % (tmp_ps, tmp_dot)
-        os.system(command)
+    def close(self):
+        """Implements GVPdfGsDoc.close()"""
+        GVDocBase.close(self)
+        tmp_ps = self._tmp_ps
+        try:
+            self._end_dot()
+        except ReportError:
+            os.remove(tmp_ps)
+            raise
 
         # Add .5 to remove rounding errors.
         paper_size = self._paper.get_size()
@@ -1141,7 +1224,6 @@ class GVPdfGsDoc(GVDocBase):
         os.remove(tmp_ps)
         for tmp_pdf_piece in list_of_pieces:
             os.remove(tmp_pdf_piece)
-        os.remove(tmp_dot)
 
 
 # ------------------------------------------------------------------------------
@@ -0,0 +1,129 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the Graphviz documents
+"""
+
+import gc
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from ...menu import Menu
+from .. import PaperSize, PaperStyle
+from ..graphdoc import GVDotDoc, GVOptions, GVPngDoc
+
+
+class GraphOptions:
+    """
+    The options of a graph report, with the default Graphviz options.
+    """
+
+    def __init__(self):
+        self.menu = Menu()
+        GVOptions().add_menu_options(self.menu)
+
+
+class GVDotDocTest(unittest.TestCase):
+    """
+    Test the Graphviz file, which is written without running dot.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "test")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def open_doc(self):
+        """
+        Return a new Graphviz document, open on the test file.
+        """
+        paper = PaperStyle(PaperSize("A4", 29.7, 21.0), 0)
+        doc = GVDotDoc(GraphOptions(), paper)
+        doc.open(self.path)
+        doc.add_node("I1", "Parent")
+        doc.add_node("I2", "Child")
+        doc.add_link("I1", "I2")
+        return doc
+
+    def test_graph(self):
+        """
+        Test that the header, the nodes and the edges are in the file.
+        """
+        doc = self.open_doc()
+        doc.close()
+        self.assertTrue(doc._dot.closed)
+        with open(self.path + ".gv", encoding="utf-8") as file:
+            graph = file.read()
+        self.assertTrue(graph.startswith("digraph GRAMPS_graph\n{\n"))
+        self.assertIn('  "I1" [ label="Parent" ];\n', graph)
+        self.assertIn('  "I1" -> "I2";\n', graph)
+        self.assertTrue(graph.endswith("}\n\n"))
+
+    def test_failed_report(self):
+        """
+        Test that the file is closed when a report fails before closing the
+        document.
+        """
+        doc = self.open_doc()
+        file = doc._dot
+        self.assertFalse(file.closed)
+        del doc
+        gc.collect()
+        self.assertTrue(file.closed)
+
+
+class GVPngDocTest(unittest.TestCase):
+    """
+    Test the graph streamed into dot, which is replaced by a mock.
+    """
+
+    def test_outputs(self):
+        """
+        Test that the other output formats are generated by the same dot
+        process, which reads the whole graph.
+        """
+        # dot is not run, so no file is written
+        path = os.path.join(tempfile.gettempdir(), "test")
+        paper = PaperStyle(PaperSize("A4", 29.7, 21.0), 0)
+        doc = GVPngDoc(GraphOptions(), paper)
+        doc.add_output("svg", path + ".svg")
+        with patch("gramps.gen.plug.docgen.graphdoc.Popen") as popen:
+            popen.return_value.wait.return_value = 0
+            doc.open(path)
+            doc.add_node("I1", "Parent")
+            doc.close()
+        popen.assert_called_once()
+        self.assertEqual(
+            popen.call_args[0][0],
+            ["dot", "-Tpng", "-o%s.png" % path, "-Tsvg", "-o%s.svg" % path],
+        )
+        stdin = popen.return_value.stdin
+        graph = b"".join(args[0] for args, kwargs in stdin.write.call_args_list)
+        self.assertTrue(graph.startswith(b"digraph GRAMPS_graph\n{\n"))
+        self.assertIn(b'  "I1" [ label="Parent" ];\n', graph)
+        self.assertTrue(graph.endswith(b"}\n\n"))
+        stdin.close.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
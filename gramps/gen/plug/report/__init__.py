@@ -34,3 +34,4 @@ from ._bibliography import Bibliography, Citation
 from ._options import MenuReportOptions, ReportOptions, DocOptions
 
 from ._book import BookList, Book, BookItem, append_styles
+from ._parallelbook import write_book_parallel
@@ -0,0 +1,390 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Write the items of a book in a pool of worker processes.
+
+Each worker opens the database read-only and writes a book item into a
+:class:`RecordDoc`, which records the calls the report makes on its document.
+The recorded calls are then replayed, in book order, into the document of
+the book.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard Python modules
+#
+# -------------------------------------------------------------------------
+import logging
+import multiprocessing
+import pickle
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ...const import GRAMPS_LOCALE as glocale
+from ...const import PLUGINS_DIR, USER_PLUGINS
+from ...db.base import DbWriteBase
+from ...db.dbconst import DBMODE_R
+from ...db.utils import get_dbid_from_database, make_database
+from ...errors import FilterError, ReportError
+from ...user import User
+from ...utils.config import apply_config_snapshot, get_config_snapshot
+from ..docgen import BaseDoc, DrawDoc, TextDoc
+from .. import BasePluginManager
+
+_ = glocale.translation.gettext
+
+LOG = logging.getLogger(".Book")
+
+# Methods of the document that the reports use to measure the page and
+# the text. They must give the same results in the worker processes.
+_MEASURES = (
+    "get_usable_width",
+    "get_usable_height",
+    "string_width",
+    "string_multiline_width",
+)
+
+
+# -------------------------------------------------------------------------
+#
+# RecordDoc
+#
+# -------------------------------------------------------------------------
+class RecordDoc(BaseDoc, TextDoc, DrawDoc):
+    """
+    A document which records the calls made to it, so that they can be
+    replayed into another document with :func:`replay`.
+
+    The style sheet and the paper are kept, so that a report can measure
+    its output as it would on the actual document. Attributes set on the
+    document by a report, like the title of the table of contents, are
+    recorded too. Opening and closing the document is left to the document
+    it is replayed into.
+    """
+
+    def __init__(self, styles, paper_style):
+        BaseDoc.__init__(self, styles, paper_style)
+        self._records = []
+
+    def __setattr__(self, name, value):
+        if not name.startswith("_") and "_records" in self.__dict__:
+            self._records.append(("__setattr__", (name, value)))
+        BaseDoc.__setattr__(self, name, value)
+
+    def take_records(self):
+        """
+        Return the calls recorded so far, and start a new list.
+        """
+        records, self._records = self._records, []
+        return records
+
+    def _record(self, name, *args):
+        self._records.append((name, args))
+
+    def open(self, filename):
+        pass
+
+    def close(self):
+        pass
+
+    def set_rtl_doc(self, value):
+        BaseDoc.set_rtl_doc(self, value)
+        self._record("set_rtl_doc", value)
+
+    def set_creator(self, name):
+        BaseDoc.set_creator(self, name)
+        self._record("set_creator", name)
+
+    def set_style_sheet(self, style_sheet):
+        BaseDoc.set_style_sheet(self, style_sheet)
+        self._record("set_style_sheet", style_sheet)
+
+    def page_break(self):
+        self._record("page_break")
+
+    def start_bold(self):
+        self._record("start_bold")
+
+    def end_bold(self):
+        self._record("end_bold")
+
+    def start_superscript(self):
+        self._record("start_superscript")
+
+    def end_superscript(self):
+        self._record("end_superscript")
+
+    def start_paragraph(self, style_name, leader=None):
+        self._record("start_paragraph", style_name, leader)
+
+    def end_paragraph(self):
+        self._record("end_paragraph")
+
+    def start_table(self, name, style_name):
+        self._record("start_table", name, style_name)
+
+    def end_table(self):
+        self._record("end_table")
+
+    def start_row(self):
+        self._record("start_row")
+
+    def end_row(self):
+        self._record("end_row")
+
+    def start_cell(self, style_name, span=1):
+        self._record("start_cell", style_name, span)
+
+    def end_cell(self):
+        self._record("end_cell")
+
+    def write_text(self, text, mark=None, links=False):
+        self._record("write_text", text, mark, links)
+
+    def write_markup(self, text, s_tags, mark=None):
+        self._record("write_markup", text, s_tags, mark)
+
+    def write_styled_note(
+        self, styledtext, format, style_name, contains_html=False, links=False
+    ):
+        self._record(
+            "write_styled_note", styledtext, format, style_name, contains_html, links
+        )
+
+    def write_text_citation(self, text, mark=None, links=None):
+        self._record("write_text_citation", text, mark, links)
+
+    def add_media(self, name, align, w_cm, h_cm, alt="", style_name=None, crop=None):
+        self._record("add_media", name, align, w_cm, h_cm, alt, style_name, crop)
+
+    def start_link(self, link):
+        self._record("start_link", link)
+
+    def stop_link(self):
+        self._record("stop_link")
+
+    def start_underline(self):
+        self._record("start_underline")
+
+    def stop_underline(self):
+        self._record("stop_underline")
+
+    def insert_toc(self):
+        self._record("insert_toc")
+
+    def insert_index(self):
+        self._record("insert_index")
+
+    def start_page(self):
+        self._record("start_page")
+
+    def end_page(self):
+        self._record("end_page")
+
+    def draw_path(self, style, path):
+        self._record("draw_path", style, path)
+
+    def draw_box(self, style, text, x, y, w, h, mark=None):
+        self._record("draw_box", style, text, x, y, w, h, mark)
+
+    def draw_text(self, style, text, x1, y1, mark=None):
+        self._record("draw_text", style, text, x1, y1, mark)
+
+    def center_text(self, style, text, x1, y1, mark=None):
+        self._record("center_text", style, text, x1, y1, mark)
+
+    def rotate_text(self, style, text, x, y, angle, mark=None):
+        self._record("rotate_text", style, text, x, y, angle, mark)
+
+    def draw_line(self, style, x1, y1, x2, y2):
+        self._record("draw_line", style, x1, y1, x2, y2)
+
+
+def replay(doc, records):
+    """
+    Replay the calls recorded by a :class:`RecordDoc` into a document.
+    """
+    for name, args in records:
+        getattr(doc, name)(*args)
+
+
+# -------------------------------------------------------------------------
+#
+# RecordedReport
+#
+# -------------------------------------------------------------------------
+class RecordedReport:
+    """
+    A book item written in a worker process. Like a report, it writes its
+    output to the document of the book when write_report is called, and
+    raises the error the report met, if any.
+    """
+
+    def __init__(self, doc, records, error):
+        self.doc = doc
+        self.records = records
+        self.error = error
+
+    def begin_report(self):
+        pass
+
+    def write_report(self):
+        replay(self.doc, self.records)
+        if self.error:
+            error_class, msg1, msg2 = self.error
+            raise error_class(msg1, msg2)
+
+
+# -------------------------------------------------------------------------
+#
+# Worker processes
+#
+# -------------------------------------------------------------------------
+_worker = {}
+
+
+def _init_worker(dbid, directory, snapshot):
+    """
+    Register the plugins and open the database read-only in a worker process.
+    The settings of the main process are applied before any report is made.
+    """
+    from ...filters import reload_custom_filters
+
+    pmgr = BasePluginManager.get_instance()
+    pmgr.reg_plugins(PLUGINS_DIR)
+    pmgr.reg_plugins(USER_PLUGINS, load_on_reg=True)
+    reload_custom_filters()
+    db = make_database(dbid)
+    db.load(directory, mode=DBMODE_R)
+    apply_config_snapshot(snapshot, db)
+    _worker["db"] = db
+
+
+def _write_item(name, values, style_sheet, paper_style):
+    """
+    Write a book item into a :class:`RecordDoc` in a worker process.
+
+    Return the calls recorded while the report was created, the calls
+    recorded while it was written, and the error it met, if any.
+    """
+    from ._book import BookItem
+
+    db = _worker["db"]
+    doc = RecordDoc(None, paper_style)
+    init_records = []
+    error = None
+    try:
+        item = BookItem(db, name)
+        menu = item.option_class.menu
+        for optname, value in values.items():
+            item.option_class.options_dict[optname] = value
+            menu_option = menu.get_option_by_name(optname)
+            if menu_option:
+                menu_option.set_value(value)
+        item.option_class.set_document(doc)
+        report = item.get_write_item()(db, item.option_class, User())
+        init_records = doc.take_records()
+        BaseDoc.set_style_sheet(doc, style_sheet)
+        report.begin_report()
+        report.write_report()
+    except (ReportError, FilterError) as msg:
+        msg1, msg2 = msg.messages()
+        error = (msg.__class__, msg1, msg2)
+    except Exception:
+        LOG.error("Failed to write book item.", exc_info=True)
+        error = (
+            ReportError,
+            _("Failed to make '%s' report.") % name,
+            traceback.format_exc(),
+        )
+    return init_records, doc.take_records(), error
+
+
+def _item_values(item):
+    """
+    Return the values of the options of a book item.
+    """
+    values = dict(item.option_class.options_dict)
+    menu = item.option_class.menu
+    for optname in menu.get_all_option_names():
+        values[optname] = menu.get_option_by_name(optname).get_value()
+    return values
+
+
+def write_book_parallel(database, items, doc, style_sheet, processes):
+    """
+    Write the book items in a pool of worker processes, each of which opens
+    the database read-only.
+
+    Return a list of (report, translated name) pairs, to be written to the
+    document of the book in the same way as the reports of the items. The
+    calls the reports made on their document while being created are
+    replayed into the document at once, as creating the reports would have
+    done. Return None if the book cannot be written in parallel.
+    """
+    if not isinstance(database, DbWriteBase):
+        return None
+    directory = database.get_save_path()
+    if not directory or directory == ":memory:":
+        return None
+    dbid = get_dbid_from_database(database)
+    if dbid is None:
+        return None
+    for method in _MEASURES:
+        measure = getattr(type(doc), method, None)
+        if measure is not None and measure is not getattr(RecordDoc, method):
+            # The reports would measure their output differently
+            return None
+    jobs = [
+        (item.get_name(), _item_values(item), style_sheet, doc.paper) for item in items
+    ]
+    try:
+        pickle.dumps(jobs)
+    except (pickle.PicklingError, TypeError, AttributeError) as err:
+        LOG.debug("Cannot write book in parallel: %s", err)
+        return None
+
+    results = []
+    try:
+        with ProcessPoolExecutor(
+            min(processes, len(jobs)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(dbid, directory, get_config_snapshot()),
+        ) as executor:
+            futures = [executor.submit(_write_item, *job) for job in jobs]
+            for future in futures:
+                results.append(future.result())
+    except (BrokenProcessPool, pickle.PicklingError) as err:
+        LOG.warning("Cannot write book in parallel: %s", err)
+        return None
+
+    rptlist = []
+    for item, (init_records, records, error) in zip(items, results):
+        replay(doc, init_records)
+        rptlist.append(
+            (RecordedReport(doc, records, error), item.get_translated_name())
+        )
+    return rptlist
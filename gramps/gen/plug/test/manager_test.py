@@ -0,0 +1,66 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the plugin manager.
+"""
+
+import unittest
+
+from .. import PluginData
+from .._manager import sort_on_dependencies
+
+
+def make_plugin(plugin_id, *depends_on):
+    """
+    Return a plugin with the given id and dependencies.
+    """
+    plugin = PluginData()
+    plugin.id = plugin_id
+    plugin.depends_on = list(depends_on)
+    return plugin
+
+
+class SortOnDependenciesTest(unittest.TestCase):
+    def sort(self, plugins):
+        plugins_sorted, unresolved = sort_on_dependencies(plugins)
+        return [p.id for p in plugins_sorted], [p.id for p in unresolved]
+
+    def test_order(self):
+        plugins = [
+            make_plugin("a", "c"),
+            make_plugin("b"),
+            make_plugin("c", "b"),
+            make_plugin("d"),
+            make_plugin("e", "a", "b", "a"),
+        ]
+        self.assertEqual(self.sort(plugins), (["b", "c", "a", "d", "e"], []))
+
+    def test_unresolved(self):
+        plugins = [
+            make_plugin("a", "missing"),
+            make_plugin("b", "a"),
+            make_plugin("c", "d"),
+            make_plugin("d", "c"),
+            make_plugin("e"),
+        ]
+        self.assertEqual(self.sort(plugins), (["e"], ["a", "b", "c", "d"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
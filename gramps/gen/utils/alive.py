@@ -43,7 +43,6 @@ from ..lib.date import Date, Today
 from ..lib.person import Person
 from ..errors import DatabaseError
 from ..const import GRAMPS_LOCALE as glocale
-from ..proxy.proxybase import ProxyDbBase
 
 LOG = logging.getLogger(".gen.utils.alive")
 
@@ -71,6 +70,22 @@ except ImportError:
     _MIN_GENERATION_YEARS = 13
 
 
+# Signals after which the shared estimates of a database are out of date
+_CHANGE_SIGNALS = [
+    obj + "-" + op
+    for obj in ("person", "family", "event")
+    for op in ("add", "update", "delete", "rebuild")
+]
+
+
+def _copy_dates(result):
+    """
+    Return a result of the estimator with copies of its dates, so that a
+    caller changing them does not change the remembered result.
+    """
+    return tuple(Date(value) if isinstance(value, Date) else value for value in result)
+
+
 # -------------------------------------------------------------------------
 #
 # ProbablyAlive class
@@ -103,8 +118,166 @@ class ProbablyAlive:
         self.AVG_GENERATION_GAP = avg_generation_gap
         self.MIN_GENERATION_YEARS = min_generation_years
         self.pset = set()
+        self.bd_cache = {}
+        self.range_cache = {}
+
+    def clear_cache(self, *args):
+        """
+        Forget the dates and ranges found so far, after a change to the
+        database.
+        """
+        self.bd_cache.clear()
+        self.range_cache.clear()
+
+    def get_person_bd(self, class_or_handle):
+        """
+        Return the recorded birth and death dates of a person, as
+        :meth:`_get_person_bd` does, remembering them by the person's handle.
+        The dates returned are copies, which the caller may change.
+        """
+        if isinstance(class_or_handle, Person):
+            handle = class_or_handle.handle
+        elif isinstance(class_or_handle, str):
+            handle = class_or_handle
+        else:
+            handle = None
+        if handle in self.bd_cache:
+            return _copy_dates(self.bd_cache[handle])
+        result = self._get_person_bd(class_or_handle)
+        if handle:
+            self.bd_cache[handle] = result
+            return _copy_dates(result)
+        return result
+
+    def _get_person_bd(self, class_or_handle):
+        """
+        Looks up birth and death events for referenced person,
+        using fallback dates if necessary.
+        The dates will always be either None or valid values, avoiding EMPTYs.
+        Only actual recorded dates are returned - there are no inferred
+        limit values supplied for missing dates.
+
+        returns  (birth_date, death_date, death_found, explain_birth, explain_death)
+                 for the referenced person
+        """
+        birth_date = None
+        death_date = None
+        death_found = False
+        explain_birth = ""
+        explain_death = ""
+
+        if not class_or_handle:
+            return (
+                birth_date,
+                death_date,
+                death_found,
+                explain_birth,
+                explain_death,
+            )
+
+        if isinstance(class_or_handle, Person):
+            thisperson = class_or_handle
+        elif isinstance(class_or_handle, str):
+            thisperson = self.db.get_person_from_handle(class_or_handle)
+        else:
+            thisperson = None
+
+        if not thisperson:
+            LOG.debug("    get_person_bd(): null person called")
+            return (
+                birth_date,
+                death_date,
+                death_found,
+                explain_birth,
+                explain_death,
+            )
+        # is there an actual death record?  Even if yes, there may be no date,
+        # in which case the EMPTY date is reported for the event.
+        death_ref = thisperson.get_death_ref()
+        if death_ref and death_ref.get_role().is_primary():
+            evnt = self.db.get_event_from_handle(death_ref.ref)
+            if evnt:
+                death_found = True
+                dateobj = evnt.get_date_object()
+                if dateobj and dateobj.is_valid():
+                    death_date = dateobj
+                    explain_death = _("date")
+
+        # at this stage death_date is None or a valid date.
+        # death_found is true if thisperson is known to be dead,
+        #        whether or not a date was found.
+        # If we have no death_date then look for fallback event such as Burial.
+        # These fallbacks are fairly good indications that someone's not alive.
+        # If the fallback death event does not have a valid date then it means
+        # we know they are dead but not when they died.
+        # So keep checking in case we get a date.
+        if not death_date:
+            for ev_ref in thisperson.get_primary_event_ref_list():
+                if ev_ref:
+                    evnt = self.db.get_event_from_handle(ev_ref.ref)
+                    if evnt and evnt.type.is_death_fallback():
+                        death_date_fb = evnt.get_date_object()
+                        death_found = True
+                        if death_date_fb.is_valid():
+                            death_date = death_date_fb
+                            explain_death = _("date fallback")
+                            if death_date.get_modifier() == Date.MOD_NONE:
+                                death_date.set_modifier(Date.MOD_BEFORE)
+                            break  # we found a valid date, stop looking.
+        # At this point:
+        # * death_found is False: (no death indication found); or
+        # * death_found is True. (death confirmed somehow);  In which case:
+        #       * (death_date is valid) some form of death date found; or
+        #       * (death_date is None and no date was recorded)
+        # now repeat, looking for birth date
+        birth_ref = thisperson.get_birth_ref()
+        if birth_ref and birth_ref.get_role().is_primary():
+            evnt = self.db.get_event_from_handle(birth_ref.ref)
+            if evnt:
+                dateobj = evnt.get_date_object()
+                if dateobj and dateobj.is_valid():
+                    birth_date = dateobj
+                    explain_birth = _("date")
+
+        # to here:
+        #   birth_date is None: either no birth record or else no date reported; or
+        #   birth_date is a valid date
+        # Look for Baptism, etc events.
+        # These are fairly good indications of someone's birth date.
+        if not birth_date:
+            for ev_ref in thisperson.get_primary_event_ref_list():
+                evnt = self.db.get_event_from_handle(ev_ref.ref)
+                if evnt and evnt.type.is_birth_fallback():
+                    birth_date_fb = evnt.get_date_object()
+                    if birth_date_fb and birth_date_fb.is_valid():
+                        birth_date = birth_date_fb
+                        explain_birth = _("date fallback")
+                        break
+        if DEBUGLEVEL > 3:
+            LOG.debug(
+                "           << get_person_bd for [%s], birth %s, death %s",
+                thisperson.get_gramps_id(),
+                birth_date,
+                death_date,
+            )
+        return (birth_date, death_date, death_found, explain_birth, explain_death)
 
     def probably_alive_range(self, person, is_spouse=False, immediate_fam_only=False):
+        """
+        Return the likely birth and death date ranges of a person, as
+        :meth:`_probably_alive_range` does, remembering them by the person's
+        handle. The dates returned are copies, which the caller may change.
+        """
+        if person is None or not person.handle:
+            return self._probably_alive_range(person, is_spouse, immediate_fam_only)
+        key = (person.handle, is_spouse, immediate_fam_only)
+        if key not in self.range_cache:
+            self.range_cache[key] = self._probably_alive_range(
+                person, is_spouse, immediate_fam_only
+            )
+        return _copy_dates(self.range_cache[key])
+
+    def _probably_alive_range(self, person, is_spouse=False, immediate_fam_only=False):
         """
         Find likely birth and death date ranges, either from dates of actual
         events recorded in the db or else estimating range limits from
@@ -132,119 +305,7 @@ class ProbablyAlive:
         explain_birth_min = ""
         explain_birth_max = ""
         explain_death = ""
-
-        def get_person_bd(class_or_handle):
-            """
-                Looks up birth and death events for referenced person,
-                using fallback dates if necessary.
-                The dates will always be either None or valid values, avoiding EMPTYs.
-                Only actual recorded dates are returned - there are no inferred
-                limit values supplied for missing dates.
-
-            returns  (birth_date, death_date, death_found, explain_birth, explain_death)
-                                 for the referenced person
-            """
-            birth_date = None
-            death_date = None
-            death_found = False
-            explain_birth = ""
-            explain_death = ""
-
-            if not class_or_handle:
-                return (
-                    birth_date,
-                    death_date,
-                    death_found,
-                    explain_birth,
-                    explain_death,
-                )
-
-            if isinstance(class_or_handle, Person):
-                thisperson = class_or_handle
-            elif isinstance(class_or_handle, str):
-                thisperson = self.db.get_person_from_handle(class_or_handle)
-            else:
-                thisperson = None
-
-            if not thisperson:
-                LOG.debug("    get_person_bd(): null person called")
-                return (
-                    birth_date,
-                    death_date,
-                    death_found,
-                    explain_birth,
-                    explain_death,
-                )
-            # is there an actual death record?  Even if yes, there may be no date,
-            # in which case the EMPTY date is reported for the event.
-            death_ref = thisperson.get_death_ref()
-            if death_ref and death_ref.get_role().is_primary():
-                evnt = self.db.get_event_from_handle(death_ref.ref)
-                if evnt:
-                    death_found = True
-                    dateobj = evnt.get_date_object()
-                    if dateobj and dateobj.is_valid():
-                        death_date = dateobj
-                        explain_death = _("date")
-
-            # at this stage death_date is None or a valid date.
-            # death_found is true if thisperson is known to be dead,
-            #        whether or not a date was found.
-            # If we have no death_date then look for fallback event such as Burial.
-            # These fallbacks are fairly good indications that someone's not alive.
-            # If the fallback death event does not have a valid date then it means
-            # we know they are dead but not when they died.
-            # So keep checking in case we get a date.
-            if not death_date:
-                for ev_ref in thisperson.get_primary_event_ref_list():
-                    if ev_ref:
-                        evnt = self.db.get_event_from_handle(ev_ref.ref)
-                        if evnt and evnt.type.is_death_fallback():
-                            death_date_fb = evnt.get_date_object()
-                            death_found = True
-                            if death_date_fb.is_valid():
-                                death_date = death_date_fb
-                                explain_death = _("date fallback")
-                                if death_date.get_modifier() == Date.MOD_NONE:
-                                    death_date.set_modifier(Date.MOD_BEFORE)
-                                break  # we found a valid date, stop looking.
-            # At this point:
-            # * death_found is False: (no death indication found); or
-            # * death_found is True. (death confirmed somehow);  In which case:
-            #       * (death_date is valid) some form of death date found; or
-            #       * (death_date is None and no date was recorded)
-            # now repeat, looking for birth date
-            birth_ref = thisperson.get_birth_ref()
-            if birth_ref and birth_ref.get_role().is_primary():
-                evnt = self.db.get_event_from_handle(birth_ref.ref)
-                if evnt:
-                    dateobj = evnt.get_date_object()
-                    if dateobj and dateobj.is_valid():
-                        birth_date = dateobj
-                        explain_birth = _("date")
-
-            # to here:
-            #   birth_date is None: either no birth record or else no date reported; or
-            #   birth_date is a valid date
-            # Look for Baptism, etc events.
-            # These are fairly good indications of someone's birth date.
-            if not birth_date:
-                for ev_ref in thisperson.get_primary_event_ref_list():
-                    evnt = self.db.get_event_from_handle(ev_ref.ref)
-                    if evnt and evnt.type.is_birth_fallback():
-                        birth_date_fb = evnt.get_date_object()
-                        if birth_date_fb and birth_date_fb.is_valid():
-                            birth_date = birth_date_fb
-                            explain_birth = _("date fallback")
-                            break
-            if DEBUGLEVEL > 3:
-                LOG.debug(
-                    "           << get_person_bd for [%s], birth %s, death %s",
-                    thisperson.get_gramps_id(),
-                    birth_date,
-                    death_date,
-                )
-            return (birth_date, death_date, death_found, explain_birth, explain_death)
+        get_person_bd = self.get_person_bd
 
         birth_date, death_date, known_to_be_dead, explain_birth_min, explain_death = (
             get_person_bd(person)
@@ -1048,18 +1109,64 @@ def probably_alive_range(
     Computes estimated birth and death date ranges.
     Returns: (birth_date, death_date, explain_text, related_person)
     """
+    # Imported here, as the proxies use this module
+    from ..proxy.proxybase import ProxyDbBase
+
     # First, find the real database to use all people
     # for determining alive status:
     basedb = db
     while isinstance(basedb, ProxyDbBase):
         basedb = basedb.db
-    # Now, we create a wrapper for doing work:
-    pbac = ProbablyAlive(
+    # Now, we get the wrapper for doing work:
+    pbac = get_estimator(
         basedb, max_sib_age_diff, max_age_prob_alive, avg_generation_gap
     )
+    if (
+        person
+        and person.handle
+        and (person.handle, False, False) not in pbac.range_cache
+    ):
+        # estimate from the real database's copy of the person, so that the
+        # remembered range does not depend on the proxy it was asked through
+        person = basedb.get_person_from_handle(person.handle) or person
     return pbac.probably_alive_range(person)
 
 
+def get_estimator(
+    db, max_sib_age_diff=None, max_age_prob_alive=None, avg_generation_gap=None
+):
+    """
+    Return the :class:`ProbablyAlive` object shared by all estimates made on
+    the database with the given parameters. The dates and ranges it finds are
+    remembered until a person, family or event of the database changes, so
+    that estimating everybody in a tree does not look up the same relatives
+    over and over again. The database keeps the object until it is closed.
+    """
+    params = (
+        _MAX_SIB_AGE_DIFF if max_sib_age_diff is None else max_sib_age_diff,
+        _MAX_AGE_PROB_ALIVE if max_age_prob_alive is None else max_age_prob_alive,
+        _AVG_GENERATION_GAP if avg_generation_gap is None else avg_generation_gap,
+        _MIN_GENERATION_YEARS,
+    )
+    estimators = getattr(db, "_estimators", None)
+    if estimators is None or not hasattr(db, "connect"):
+        # changes to the database cannot be watched, so remember nothing
+        return ProbablyAlive(db, *params)
+    # signals are not emitted for batch transactions, so also check the
+    # number of commits
+    commits = getattr(db, "has_changed", 0)
+    if params in estimators:
+        pbac, pbac_commits = estimators[params]
+        if pbac_commits != commits:
+            pbac.clear_cache()
+    else:
+        pbac = ProbablyAlive(db, *params)
+        for signal in _CHANGE_SIGNALS:
+            db.connect(signal, pbac.clear_cache)
+    estimators[params] = (pbac, commits)
+    return pbac
+
+
 def update_constants():
     """
     Used to update the constants that are cached in this module.
@@ -24,6 +24,13 @@
 Configuration based utilities
 """
 
+# -------------------------------------------------------------------------
+#
+# Standard Python modules
+#
+# -------------------------------------------------------------------------
+import copy
+
 # -------------------------------------------------------------------------
 #
 # Gramps modules
@@ -64,3 +71,55 @@ def get_researcher():
     owner.set_email(email)
 
     return owner
+
+
+def get_config_snapshot():
+    """
+    Return a copy of the settings of the running session, to be applied in
+    another process with :func:`apply_config_snapshot`.
+
+    Preferences changed in a session are only saved when Gramps quits, so
+    a worker process reading the config file would not see them.
+    """
+    return {
+        section: {
+            setting: copy.deepcopy(config.get(section + "." + setting))
+            for setting in config.get_section_settings(section)
+        }
+        for section in config.get_sections()
+    }
+
+
+def apply_config_snapshot(snapshot, db=None):
+    """
+    Apply the settings returned by :func:`get_config_snapshot` in a worker
+    process, and bring the date, name and place displayers and the
+    constants of the probably alive estimates up to date with them.
+
+    The custom name formats of the database, if given, are set up as when
+    it is loaded, so that the default name format may be one of them.
+    """
+    # Imported here, as these modules use the config
+    from ..datehandler import displayer as date_displayer
+    from ..display.name import displayer as name_displayer
+    from ..display.place import displayer as place_displayer
+    from .alive import update_constants
+
+    sections = config.get_sections()
+    for section, settings in snapshot.items():
+        if section not in sections:
+            # registered by a plugin which is not loaded in this process
+            continue
+        known = config.get_section_settings(section)
+        for setting, value in settings.items():
+            key = section + "." + setting
+            if setting in known and config.get(key) != value:
+                config.set(key, value)
+
+    date_displayer.set_format(config.get("preferences.date-format"))
+    if db is not None:
+        name_displayer.clear_custom_formats()
+        name_displayer.set_name_format(db.name_formats)
+    name_displayer.set_default_format(config.get("preferences.name-format"))
+    place_displayer.default_format = config.get("preferences.place-format")
+    update_constants()
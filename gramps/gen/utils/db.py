@@ -34,10 +34,14 @@ import logging
 # Gramps modules
 #
 # -------------------------------------------------------------------------
+from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
+from ..datehandler import get_date, get_date_valid
 from ..display.name import displayer as name_displayer
 from ..display.place import displayer as place_displayer
+from ..errors import HandleError
 from ..lib import EventType, EventRoleType, NameOriginType, Surname
+from ..lib.serialize import from_dict, lazy_from_dict
 
 _ = glocale.translation.sgettext
 
@@ -167,6 +171,124 @@ def get_timeperiod(db, person):
     return None
 
 
+# -------------------------------------------------------------------------
+#
+# Sort keys
+#
+# -------------------------------------------------------------------------
+def get_sorted_name(db, data):
+    """
+    Return the value a person is sorted on by name in the person views.
+
+    :param data: raw data of the person
+    """
+    return name_displayer.raw_sorted_name(data["primary_name"])
+
+
+def _get_event_sort_value(db, data, index, is_fallback):
+    """
+    Return the value a person is sorted on by the date of an event in the
+    person views: the event at the given index of its event references or
+    else the first primary fallback event with a date.
+    """
+    if index != -1:
+        try:
+            event_ref = from_dict(data["event_ref_list"][index])
+            event = db.get_event_from_handle(event_ref.ref)
+            value = "%09d" % event.get_date_object().get_sort_value()
+            if not get_date_valid(event):
+                return config.get("preferences.invalid-date-format") % value
+            return value
+        except (HandleError, IndexError, AttributeError):
+            # no such event reference, or its event is not committed yet
+            return ""
+
+    for event_ref in data["event_ref_list"]:
+        event_ref = from_dict(event_ref)
+        try:
+            event = db.get_event_from_handle(event_ref.ref)
+        except HandleError:
+            # not committed yet, e.g. while importing
+            continue
+        if (
+            is_fallback(event.get_type())
+            and event_ref.get_role() == EventRoleType.PRIMARY
+            and get_date(event) != ""
+        ):
+            value = "%09d" % event.get_date_object().get_sort_value()
+            if not get_date_valid(event):
+                return config.get("preferences.invalid-date-format") % value
+            return value
+    return ""
+
+
+def get_birth_sort_value(db, data):
+    """
+    Return the value a person is sorted on by birth date in the person views.
+
+    :param data: raw data of the person
+    """
+    return _get_event_sort_value(
+        db, data, data["birth_ref_index"], EventType.is_birth_fallback
+    )
+
+
+def get_death_sort_value(db, data):
+    """
+    Return the value a person is sorted on by death date in the person views.
+
+    :param data: raw data of the person
+    """
+    return _get_event_sort_value(
+        db, data, data["death_ref_index"], EventType.is_death_fallback
+    )
+
+
+def get_place_sort_title(db, data):
+    """
+    Return the value a place is sorted on by title in the place views.
+
+    :param data: raw data of the place
+    """
+    return place_displayer.display(db, lazy_from_dict(data))
+
+
+# The sort key columns which databases can keep, by class name: the column
+# names and the functions returning the values they are the sort keys of.
+SORT_KEY_COLUMNS = {
+    "Person": (
+        ("sort_name", get_sorted_name),
+        ("sort_birth", get_birth_sort_value),
+        ("sort_death", get_death_sort_value),
+    ),
+    "Place": (("sort_title", get_place_sort_title),),
+}
+
+
+def get_sort_key_format():
+    """
+    Return a description of everything the sort keys of SORT_KEY_COLUMNS
+    depend on, besides the objects: the collation and the display formats.
+    Sort keys kept under another format must be computed again.
+    """
+    place_format = None
+    if config.get("preferences.place-auto"):
+        fmt = place_displayer.get_formats()[config.get("preferences.place-format")]
+        place_format = [fmt.levels, fmt.language, fmt.street, fmt.reverse]
+    return [
+        glocale.get_collation(),
+        name_displayer.get_default_format(),
+        [
+            [index, fmt_str, active]
+            for index, dummy_name, fmt_str, active in name_displayer.get_name_format(
+                also_default=True, only_active=False
+            )
+        ],
+        place_format,
+        config.get("preferences.invalid-date-format"),
+    ]
+
+
 def get_event_ref(db, family, event_type):
     """
     Return a reference to a primary family event of the given event type.
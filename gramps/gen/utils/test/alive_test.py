@@ -0,0 +1,119 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the probably alive estimates.
+"""
+
+import gc
+import os
+import unittest
+import weakref
+
+from ...const import DATA_DIR
+from ...db import DbTxn
+from ...db.utils import import_as_dict
+from ...lib import Date, Event, EventRef, EventType
+from ...proxy import LivingProxyDb
+from ...user import User
+from ..alive import ProbablyAlive, get_estimator, probably_alive
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class ProbablyAliveTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def test_shared(self):
+        """
+        The shared estimates are the same as fresh ones.
+        """
+        pbac = get_estimator(self.db)
+        self.assertIs(get_estimator(self.db), pbac)
+        for person in self.db.iter_people():
+            fresh = ProbablyAlive(self.db).probably_alive_range(person)
+            shared = pbac.probably_alive_range(person)
+            self.assertEqual(
+                [str(date) for date in fresh[:2]] + list(fresh[2:]),
+                [str(date) for date in shared[:2]] + list(shared[2:]),
+            )
+
+    def test_close(self):
+        """
+        The shared estimates are forgotten when the database is closed.
+        """
+        db = import_as_dict(EXAMPLE, User())
+        pbac = get_estimator(db)
+        self.assertIs(get_estimator(db), pbac)
+        db.close()
+        self.assertIsNot(get_estimator(db), pbac)
+        ref = weakref.ref(db)
+        del db, pbac
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_change(self):
+        """
+        The shared estimates follow a change to the database, and its undo.
+        """
+        living = LivingProxyDb(self.db, LivingProxyDb.MODE_EXCLUDE_ALL)
+        person = next(
+            person
+            for person in self.db.iter_people()
+            if probably_alive(person, self.db)
+        )
+        with DbTxn("Add death", self.db) as trans:
+            event = Event()
+            event.set_type(EventType.DEATH)
+            event.get_date_object().set_yr_mon_day(1990, 1, 1)
+            self.db.add_event(event, trans)
+            ref = EventRef()
+            ref.ref = event.handle
+            person.add_event_ref(ref)
+            person.set_death_ref(ref)
+            self.db.commit_person(person, trans)
+        self.assertFalse(probably_alive(person, self.db))
+        self.assertIsNotNone(living.get_person_from_handle(person.handle))
+        self.db.undo()
+        person = self.db.get_person_from_handle(person.handle)
+        self.assertTrue(probably_alive(person, self.db))
+        self.assertIsNone(living.get_person_from_handle(person.handle))
+
+    def test_copies(self):
+        """
+        A caller changing the dates of an estimate does not change the
+        shared estimates.
+        """
+        pbac = ProbablyAlive(self.db)
+        for person in self.db.iter_people():
+            for estimate in (pbac.get_person_bd, pbac.probably_alive_range):
+                first = estimate(person)
+                expected = [str(date) for date in first[:2]]
+                for date in first[:2]:
+                    if date is not None:
+                        date.set_yr_mon_day(1, 1, 1, remove_stop_date=True)
+                        date.set_modifier(Date.MOD_AFTER)
+                second = estimate(person)
+                self.assertEqual([str(date) for date in second[:2]], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
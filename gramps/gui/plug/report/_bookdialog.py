@@ -56,6 +56,7 @@ from gi.repository import GObject
 # Gramps modules
 #
 # -------------------------------------------------------------------------
+from gramps.gen.config import config
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
@@ -75,6 +76,7 @@ from .. import make_gui_option
 
 # Import from specific modules in ReportBase
 from gramps.gen.plug.report import BookList, Book, BookItem, append_styles
+from gramps.gen.plug.report import write_book_parallel
 from gramps.gen.plug.report import CATEGORY_BOOK, book_categories
 from gramps.gen.plug.report._options import ReportOptions
 from ._reportdialog import ReportDialog
@@ -1033,14 +1035,31 @@ class BookDialog(DocReportDialog):
 
         for item in self.book.get_item_list():
             item.option_class.set_document(self.doc)
-            report_class = item.get_write_item()
-            obj = (
-                write_book_item(self.database, report_class, item.option_class, user),
-                item.get_translated_name(),
-            )
-            self.rptlist.append(obj)
             append_styles(selected_style, item)
 
+        rptlist = None
+        processes = config.get("behavior.book-processes")
+        if processes > 1:
+            rptlist = write_book_parallel(
+                self.database,
+                self.book.get_item_list(),
+                self.doc,
+                selected_style,
+                processes,
+            )
+        if rptlist is not None:
+            self.rptlist = rptlist
+        else:
+            for item in self.book.get_item_list():
+                report_class = item.get_write_item()
+                obj = (
+                    write_book_item(
+                        self.database, report_class, item.option_class, user
+                    ),
+                    item.get_translated_name(),
+                )
+                self.rptlist.append(obj)
+
         self.doc.set_style_sheet(selected_style)
         self.doc.open(self.target_path)
 
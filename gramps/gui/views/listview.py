@@ -77,6 +77,7 @@ from ..plug.quick import create_quickreport_menu, create_web_connect_menu
 from ..utils import is_right_click
 from ..widgets.interactivesearchbox import InteractiveSearchBox
 from ..widgets.persistenttreeview import PersistentTreeView
+from .treemodels.flatbasemodel import FlatBaseModel
 
 # ----------------------------------------------------------------
 #
@@ -796,6 +797,14 @@ class ListView(NavigationView):
                 self.list.set_model(None)
                 self.model.reverse_order()
                 self.list.set_model(self.model)
+        elif isinstance(self.model, FlatBaseModel):
+            # the model keeps the sort keys of the columns sorted on before
+            self.list.set_model(None)
+            self.model.set_search(filter_info)
+            self.model.set_sort_column(
+                self.sort_col, self.sort_order, sort_map=self.column_order()
+            )
+            self.list.set_model(self.model)
         else:
             self.model = self.make_model(
                 self.dbstate.db,
@@ -43,7 +43,7 @@ from gi.repository import Gtk
 # -------------------------------------------------------------------------
 from gramps.gen.datehandler import format_time, get_date, get_date_valid
 from gramps.gen.lib import Event, EventType
-from gramps.gen.lib.serialize import from_dict
+from gramps.gen.lib.serialize import lazy_from_dict
 from gramps.gen.utils.db import get_participant_from_event
 from gramps.gen.display.place import displayer as place_displayer
 from gramps.gen.config import config
@@ -137,7 +137,7 @@ class EventModel(FlatBaseModel):
         if data["place"]:
             cached, value = self.get_cached_value(data["handle"], "PLACE")
             if not cached:
-                event = from_dict(data)
+                event = lazy_from_dict(data)
                 value = place_displayer.display_event(self.db, event)
                 self.set_cached_value(data["handle"], "PLACE", value)
             return value
@@ -152,7 +152,7 @@ class EventModel(FlatBaseModel):
 
     def column_date(self, data):
         if data["date"]:
-            event = from_dict(data)
+            event = lazy_from_dict(data)
             date_str = get_date(event)
             if date_str != "":
                 retval = escape(date_str)
@@ -166,7 +166,7 @@ class EventModel(FlatBaseModel):
 
     def sort_date(self, data):
         if data["date"]:
-            event = from_dict(data)
+            event = lazy_from_dict(data)
             retval = "%09d" % event.get_date_object().get_sort_value()
             if not get_date_valid(event):
                 return INVALID_DATE_FORMAT % retval
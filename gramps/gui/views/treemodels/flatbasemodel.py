@@ -174,6 +174,12 @@ class FlatNodeMap:
         self._reverse = reverse
         self.reverse_order()
 
+    def srtkey_hndl_map(self):
+        """
+        The list of (sortkey, handle) tuples that are shown.
+        """
+        return self._index2hndl
+
     def full_srtkey_hndl_map(self):
         """
         The list of all possible (sortkey, handle) tuples.
@@ -449,6 +455,10 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             so as to have localized sort
     """
 
+    # The (class name, column) of the sort keys kept by the database, by
+    # model column. See DbReadBase.get_sort_keys.
+    db_sort_keys = {}
+
     def __init__(
         self,
         db,
@@ -472,6 +482,34 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         # self.set_property("leak_references", False)
 
         self.db = db
+        # the sorted (sortkey, handle) lists of the columns sorted on so far,
+        # by model column
+        self._sort_keys = {}
+        self._set_sort_column(scol, sort_map)
+        self.skip = skip
+        self._in_build = False
+
+        self.node_map = FlatNodeMap()
+        # whether the shown rows can be filtered to apply the search, as it
+        # narrows the search they were built with
+        self._shown_valid = False
+        self._narrowed = False
+        self._search_args = None
+        self.search = None
+        self.rebuild_data = self._rebuild_search
+        self.set_search(search)
+
+        self._reverse = order == Gtk.SortType.DESCENDING
+
+        self.rebuild_data()
+        _LOG.debug(
+            self.__class__.__name__ + " __init__ " + str(perf_counter() - cput) + " sec"
+        )
+
+    def _set_sort_column(self, scol, sort_map):
+        """
+        Set the column to sort on.
+        """
         # normally sort on first column, so scol=0
         if sort_map:
             # sort_map is the stored order of the columns and if they are
@@ -484,18 +522,21 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         # get the function that maps data to sort_keys
         self.sort_func = lambda x: glocale.sort_key(self.smap[col](x))
         self.sort_col = scol
-        self.skip = skip
-        self._in_build = False
-
-        self.node_map = FlatNodeMap()
-        self.set_search(search)
+        self._sort_key_col = col
 
+    def set_sort_column(self, scol, order=Gtk.SortType.ASCENDING, sort_map=None):
+        """
+        Sort on another column and rebuild the model. The sort keys of the
+        columns sorted on before are kept, so sorting on them again does not
+        need to read the database.
+        """
+        self._set_sort_column(scol, sort_map)
         self._reverse = order == Gtk.SortType.DESCENDING
-
+        self.node_map.clear_map()
+        # the rows shown are gone, so the search must be applied to all rows
+        self._shown_valid = False
+        self._narrowed = False
         self.rebuild_data()
-        _LOG.debug(
-            self.__class__.__name__ + " __init__ " + str(perf_counter() - cput) + " sec"
-        )
 
     def destroy(self):
         """
@@ -504,6 +545,7 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         BaseModel.destroy(self)
         self.db = None
         self.sort_func = None
+        self._sort_keys = None
         if self.node_map:
             self.node_map.destroy()
         self.node_map = None
@@ -519,11 +561,20 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         # you reattach the model to the treeview so that the treeview updates
           with the new entries
         """
+        old_search = self.search if self.rebuild_data == self._rebuild_filter else None
+        old_args = self._search_args
+        self._search_args = None
+        self._narrowed = False
         if search:
             if search[0]:
                 # following is None if no data given in filter sidebar
                 self.search = search[1]
                 self.rebuild_data = self._rebuild_filter
+                self._narrowed = (
+                    self.search is not None
+                    and old_search is not None
+                    and self.search.narrows(old_search)
+                )
             else:
                 if search[1]:  # Search from topbar in columns
                     # we have search[1] = (index, text_unicode, inversion)
@@ -535,12 +586,33 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
                         self.search = ExactSearchFilter(func, text, inv)
                     else:
                         self.search = SearchFilter(func, text, inv)
+                    self._search_args = (col, search[2], inv, text.upper())
+                    self._narrowed = self._search_narrows(old_args)
                 else:
                     self.search = None
                 self.rebuild_data = self._rebuild_search
         else:
             self.search = None
             self.rebuild_data = self._rebuild_search
+        self._narrowed = self._narrowed and self._shown_valid
+
+    def _search_narrows(self, old_args):
+        """
+        Return True if the search from the topbar can only match rows that
+        the search with the given arguments matched.
+        """
+        if old_args is None:
+            return False
+        col, exact, inv, text = self._search_args
+        old_col, old_exact, old_inv, old_text = old_args
+        if (col, exact, inv) != (old_col, old_exact, old_inv):
+            return False
+        if exact:
+            return text == old_text
+        if inv:
+            # rows not containing the text also do not contain a longer text
+            return text in old_text
+        return old_text in text
 
     def total(self):
         """
@@ -572,13 +644,46 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         Return the (sort_key, handle) list of all data that can maximally
         be shown.
         This list is sorted ascending, via localized string sort.
+        It is kept for the sort column, and updated as rows change.
         """
-        # use cursor as a context manager
-        with self.gen_cursor() as cursor:
-            # loop over database and store the sort field, and the handle
-            srt_keys = [(self.sort_func(data), key) for key, data in cursor]
-            srt_keys.sort()
+        srt_keys = self._sort_keys.get(self._sort_key_col)
+        if srt_keys is not None:
             return srt_keys
+        db_sort_key = self.db_sort_keys.get(self._sort_key_col)
+        if db_sort_key is not None:
+            # the database has the sort keys of this column
+            srt_keys = self.db.get_sort_keys(*db_sort_key)
+        else:
+            # use cursor as a context manager
+            with self.gen_cursor() as cursor:
+                # loop over database and store the sort field, and the handle
+                srt_keys = [(self.sort_func(data), key) for key, data in cursor]
+                srt_keys.sort()
+        self._sort_keys[self._sort_key_col] = srt_keys
+        return srt_keys
+
+    def _add_sort_keys(self, handle, data):
+        """
+        Add a row to the kept sort keys of the columns other than the sort
+        column, which are updated by the node map.
+        """
+        for col, srt_keys in self._sort_keys.items():
+            if col != self._sort_key_col:
+                bisect.insort_left(
+                    srt_keys, (glocale.sort_key(self.smap[col](data)), handle)
+                )
+
+    def _remove_sort_keys(self, handle):
+        """
+        Remove a row from the kept sort keys of the columns other than the
+        sort column.
+        """
+        for col, srt_keys in self._sort_keys.items():
+            if col != self._sort_key_col:
+                for index, (dummy_srt_key, hndl) in enumerate(srt_keys):
+                    if hndl == handle:
+                        del srt_keys[index]
+                        break
 
     def _rebuild_search(self, ignore=None):
         """function called when view must be build, given a search text
@@ -590,10 +695,15 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             allkeys = self.node_map.full_srtkey_hndl_map()
             if not allkeys:
                 allkeys = self.sort_keys()
+            if self._narrowed and ignore is None:
+                # only the rows shown can match
+                keys = self.node_map.srtkey_hndl_map()
+            else:
+                keys = allkeys
             if self.search and self.search.text:
                 dlist = [
                     h
-                    for h in allkeys
+                    for h in keys
                     if self.search.match(h[1], self.db)
                     and h[1] not in self.skip
                     and h[1] != ignore
@@ -611,6 +721,8 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             )
         else:
             self.node_map.clear_map()
+        self._shown_valid = ignore is None
+        self._narrowed = False
         self._in_build = False
 
     def _rebuild_filter(self, ignore=None):
@@ -627,7 +739,12 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             if self.search:
                 ident = False
                 if ignore is None:
-                    dlist = self.search.apply(cdb, allkeys, tupleind=1, user=self.user)
+                    if self._narrowed:
+                        # only the rows shown can match
+                        keys = self.node_map.srtkey_hndl_map()
+                    else:
+                        keys = allkeys
+                    dlist = self.search.apply(cdb, keys, tupleind=1, user=self.user)
                 else:
                     dlist = self.search.apply(
                         cdb, [k for k in allkeys if k[1] != ignore], tupleind=1
@@ -643,6 +760,8 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             )
         else:
             self.node_map.clear_map()
+        self._shown_valid = ignore is None
+        self._narrowed = False
         self._in_build = False
 
     def add_row_by_handle(self, handle):
@@ -653,7 +772,10 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         assert isinstance(handle, str)
         if self.node_map.get_path_from_handle(handle) is not None:
             return  # row is already displayed
+        # rows matching a filter may change with the data
+        self._shown_valid = False
         data = self.map(handle)
+        self._add_sort_keys(handle, data)
         insert_val = (self.sort_func(data), handle)
         if not self.search or (self.search and self.search.match(handle, self.db)):
             # row needs to be added to the model
@@ -669,6 +791,8 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         """
         Delete a row, called after the object with handle is deleted
         """
+        self._shown_valid = False
+        self._remove_sort_keys(handle)
         delete_path = self.node_map.delete(handle)
         # delete_path is an integer from 0 to n-1
         if delete_path is not None:
@@ -679,8 +803,12 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         """
         Update a row, called after the object with handle is changed
         """
+        self._shown_valid = False
         if self.node_map.get_path_from_handle(handle) is None:
-            return  # row is not currently displayed
+            # row is not currently displayed
+            self._remove_sort_keys(handle)
+            self._add_sort_keys(handle, self.map(handle))
+            return
         self.clear_cache(handle)
         oldsortkey = self.node_map.get_sortkey(handle)
         newsortkey = self.sort_func(self.map(handle))
@@ -691,6 +819,8 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             self.add_row_by_handle(handle)
         else:
             # the row is visible in the view, is changed, but the order is fixed
+            self._remove_sort_keys(handle)
+            self._add_sort_keys(handle, self.map(handle))
             path = self.node_map.get_path_from_handle(handle)
             node = self.do_get_iter(path)[1]
             self.row_changed(path, node)
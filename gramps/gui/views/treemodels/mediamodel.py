@@ -46,7 +46,7 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 from gramps.gen.datehandler import displayer, format_time
 from gramps.gen.lib import Date, Media
-from gramps.gen.lib.serialize import from_dict
+from gramps.gen.lib.serialize import from_dict, lazy_from_dict
 from .flatbasemodel import FlatBaseModel
 
 
@@ -140,7 +140,7 @@ class MediaModel(FlatBaseModel):
         return ""
 
     def sort_date(self, data):
-        obj = from_dict(data)
+        obj = lazy_from_dict(data)
         d = obj.get_date_object()
         if d:
             return "%09d" % d.get_sort_value()
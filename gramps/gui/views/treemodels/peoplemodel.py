@@ -71,6 +71,11 @@ from gramps.gen.lib.serialize import from_dict
 from gramps.gen.display.name import displayer as name_displayer
 from gramps.gen.display.place import displayer as place_displayer
 from gramps.gen.datehandler import format_time, get_date, get_date_valid
+from gramps.gen.utils.db import (
+    get_birth_sort_value,
+    get_death_sort_value,
+    get_sorted_name,
+)
 from .flatbasemodel import FlatBaseModel
 from .treebasemodel import TreeBaseModel
 from .basemodel import BaseModel
@@ -93,6 +98,12 @@ class PeopleBaseModel(BaseModel):
 
     _GENDER = [_("female"), _("male"), _("unknown"), _("other")]
 
+    db_sort_keys = {
+        0: ("Person", "sort_name"),
+        3: ("Person", "sort_birth"),
+        5: ("Person", "sort_death"),
+    }
+
     def __init__(self, db):
         """
         Initialize the model building the initial data
@@ -164,7 +175,7 @@ class PeopleBaseModel(BaseModel):
         handle = data["handle"]
         cached, name = self.get_cached_value(handle, "SORT_NAME")
         if not cached:
-            name = name_displayer.raw_sorted_name(data["primary_name"])
+            name = get_sorted_name(self.db, data)
             self.set_cached_value(handle, "SORT_NAME", name)
         return name
 
@@ -222,7 +233,7 @@ class PeopleBaseModel(BaseModel):
         handle = data["handle"]
         cached, value = self.get_cached_value(handle, "BIRTH_DAY")
         if not cached:
-            value = self._get_birth_data(data, False)
+            value = self._get_birth_data(data)
             self.set_cached_value(handle, "BIRTH_DAY", value)
         return value
 
@@ -230,23 +241,20 @@ class PeopleBaseModel(BaseModel):
         handle = data["handle"]
         cached, value = self.get_cached_value(handle, "SORT_BIRTH_DAY")
         if not cached:
-            value = self._get_birth_data(data, True)
+            value = get_birth_sort_value(self.db, data)
             self.set_cached_value(handle, "SORT_BIRTH_DAY", value)
         return value
 
-    def _get_birth_data(self, data, sort_mode):
+    def _get_birth_data(self, data):
         index = data["birth_ref_index"]
         if index != -1:
             try:
                 local = data["event_ref_list"][index]
                 b = from_dict(local)
                 birth = self.db.get_event_from_handle(b.ref)
-                if sort_mode:
-                    retval = "%09d" % birth.get_date_object().get_sort_value()
-                else:
-                    date_str = get_date(birth)
-                    if date_str != "":
-                        retval = escape(date_str)
+                date_str = get_date(birth)
+                if date_str != "":
+                    retval = escape(date_str)
                 if not get_date_valid(birth):
                     return invalid_date_format % retval
                 else:
@@ -264,10 +272,7 @@ class PeopleBaseModel(BaseModel):
                 and er.get_role() == EventRoleType.PRIMARY
                 and date_str != ""
             ):
-                if sort_mode:
-                    retval = "%09d" % event.get_date_object().get_sort_value()
-                else:
-                    retval = "<i>%s</i>" % escape(date_str)
+                retval = "<i>%s</i>" % escape(date_str)
                 if not get_date_valid(event):
                     return invalid_date_format % retval
                 else:
@@ -279,7 +284,7 @@ class PeopleBaseModel(BaseModel):
         handle = data["handle"]
         cached, value = self.get_cached_value(handle, "DEATH_DAY")
         if not cached:
-            value = self._get_death_data(data, False)
+            value = self._get_death_data(data)
             self.set_cached_value(handle, "DEATH_DAY", value)
         return value
 
@@ -287,23 +292,20 @@ class PeopleBaseModel(BaseModel):
         handle = data["handle"]
         cached, value = self.get_cached_value(handle, "SORT_DEATH_DAY")
         if not cached:
-            value = self._get_death_data(data, True)
+            value = get_death_sort_value(self.db, data)
             self.set_cached_value(handle, "SORT_DEATH_DAY", value)
         return value
 
-    def _get_death_data(self, data, sort_mode):
+    def _get_death_data(self, data):
         index = data["death_ref_index"]
         if index != -1:
             try:
                 local = data["event_ref_list"][index]
                 ref = from_dict(local)
                 event = self.db.get_event_from_handle(ref.ref)
-                if sort_mode:
-                    retval = "%09d" % event.get_date_object().get_sort_value()
-                else:
-                    date_str = get_date(event)
-                    if date_str != "":
-                        retval = escape(date_str)
+                date_str = get_date(event)
+                if date_str != "":
+                    retval = escape(date_str)
                 if not get_date_valid(event):
                     return invalid_date_format % retval
                 else:
@@ -321,10 +323,7 @@ class PeopleBaseModel(BaseModel):
                 and er.get_role() == EventRoleType.PRIMARY
                 and date_str
             ):
-                if sort_mode:
-                    retval = "%09d" % event.get_date_object().get_sort_value()
-                else:
-                    retval = "<i>%s</i>" % escape(date_str)
+                retval = "<i>%s</i>" % escape(date_str)
                 if not get_date_valid(event):
                     return invalid_date_format % retval
                 else:
@@ -47,7 +47,7 @@ from gi.repository import Gtk
 #
 # -------------------------------------------------------------------------
 from gramps.gen.lib import Place, PlaceType
-from gramps.gen.lib.serialize import from_dict
+from gramps.gen.lib.serialize import lazy_from_dict
 from gramps.gen.datehandler import format_time
 from gramps.gen.utils.place import conv_lat_lon, coord_formats
 from gramps.gen.display.place import displayer as place_displayer
@@ -71,6 +71,8 @@ _ = glocale.translation.gettext
 #
 # -------------------------------------------------------------------------
 class PlaceBaseModel:
+    db_sort_keys = {2: ("Place", "sort_title")}
+
     def __init__(self, db):
         self.gen_cursor = db.get_place_cursor
         self.map = db.get_raw_place_data
@@ -127,7 +129,7 @@ class PlaceBaseModel:
         handle = data["handle"]
         cached, value = self.get_cached_value(handle, "PLACE")
         if not cached:
-            place = from_dict(data)
+            place = lazy_from_dict(data)
             value = place_displayer.display(self.db, place)
             self.set_cached_value(handle, "PLACE", value)
         return value
@@ -0,0 +1,108 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the flat models of the list views.
+"""
+
+import os
+import unittest
+from types import SimpleNamespace
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.filters import GenericFilterFactory
+from gramps.gen.filters.rules.event import HasNoteRegexp
+from gramps.gen.user import User
+from ..eventmodel import EventModel
+from ..notemodel import NoteModel
+
+EXAMPLE = os.path.join(DATA_DIR, "tests", "example.gramps")
+
+# the search from the topbar for the notes whose preview contains "the"
+SEARCH = (False, (0, "the", False), False)
+
+
+class FlatBaseModelTest(unittest.TestCase):
+    """
+    Test the rows of a flat model, searched and sorted on several columns.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+        cls.uistate = SimpleNamespace(window=None)
+
+    @staticmethod
+    def rows(model):
+        """
+        Return the handles of the rows of a model, in the order shown.
+        """
+        return [model.node_map.get_handle(path) for path in range(len(model.node_map))]
+
+    def test_sort_searched(self):
+        """
+        Test that sorting on another column keeps the rows of the search,
+        in the order of that column.
+        """
+        model = NoteModel(self.db, self.uistate, scol=1, search=SEARCH)
+        searched = self.rows(model)
+        self.assertTrue(searched)
+        self.assertLess(len(searched), self.db.get_number_of_notes())
+
+        # a column click searches again before sorting
+        model.set_search(SEARCH)
+        model.set_sort_column(0)
+        expected = NoteModel(self.db, self.uistate, scol=0, search=SEARCH)
+        self.assertEqual(self.rows(model), self.rows(expected))
+        self.assertCountEqual(self.rows(model), searched)
+
+    def test_filter_related_change(self):
+        """
+        Test that finding again with the same sidebar filter finds the rows
+        matching it since a change to another object, which the view is not
+        told about.
+        """
+        db = import_as_dict(EXAMPLE, User())
+        event = next(event for event in db.iter_events() if event.get_note_list())
+        note = db.get_note_from_handle(event.get_note_list()[0])
+
+        def make_search():
+            # the sidebar makes a new filter on each search
+            filter_ = GenericFilterFactory("Event")()
+            filter_.add_rule(HasNoteRegexp(["Zebracorn"]))
+            return (True, filter_, False)
+
+        model = EventModel(db, self.uistate)
+        # the progress of the filter is not shown
+        model.user = User()
+        model.set_search(make_search())
+        model.rebuild_data()
+        self.assertEqual(self.rows(model), [])
+
+        with DbTxn("Edit note", db) as trans:
+            note.set(note.get() + " Zebracorn")
+            db.commit_note(note, trans)
+        model.set_search(make_search())
+        model.rebuild_data()
+        self.assertIn(event.handle, self.rows(model))
+
+
+if __name__ == "__main__":
+    unittest.main()
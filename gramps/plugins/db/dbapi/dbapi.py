@@ -40,9 +40,14 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # ------------------------------------------------------------------------
 from gramps.gen.db.dbconst import (
+    BATCHSIZE,
+    CLASS_TO_KEY_MAP,
     DBLOGNAME,
+    EVENT_KEY,
     KEY_TO_CLASS_MAP,
     KEY_TO_NAME_MAP,
+    PERSON_KEY,
+    PLACE_KEY,
     REFERENCE_KEY,
     TXNADD,
     TXNDEL,
@@ -63,11 +68,18 @@ from gramps.gen.lib import (
 )
 from gramps.gen.lib.serialize import from_dict, to_dict
 from gramps.gen.lib.genderstats import GenderStats
+from gramps.gen.soundex import soundex
 from gramps.gen.updatecallback import UpdateCallback
+from gramps.gen.utils.db import SORT_KEY_COLUMNS, get_sort_key_format
 
 LOG = logging.getLogger(".dbapi")
 _LOG = logging.getLogger(DBLOGNAME)
 
+# Types of rows in the family_link table
+LINK_FAMILY = 0  # person to the families in which it is a parent
+LINK_PARENT_FAMILY = 1  # person to the families in which it is a child
+LINK_CHILD = 2  # family to its children
+
 
 # -------------------------------------------------------------------------
 #
@@ -79,6 +91,30 @@ class DBAPI(DbGeneric):
     Database backends class for DB-API 2.0 databases
     """
 
+    def __init__(self, directory=None):
+        # Buffers used by batch transactions.  They are None outside of a
+        # batch transaction.
+        self._batch_rows = None
+        self._batch_ids = None
+        self._batch_refs = None
+        self._batch_links = None
+        self._batch_handles = None
+        self._batch_count = 0
+        # Whether the family_link table exists, None until checked
+        self._family_links = None
+        # Whether the person table has a surname_soundex column
+        self._surname_soundex = None
+        # Whether the person and place tables have sort key columns, None
+        # until checked, and the format of their sort keys
+        self._sort_keys = None
+        self._sort_key_format = None
+        # Whether sort keys were computed, and the events and places changed,
+        # since the sort keys which depend on them were last updated
+        self._sort_keys_changed = False
+        self._sort_key_events = set()
+        self._sort_key_places = set()
+        super().__init__(directory)
+
     def _initialize(self, directory, username, password):
         raise NotImplementedError
 
@@ -121,6 +157,10 @@ class DBAPI(DbGeneric):
             "handle VARCHAR(50) PRIMARY KEY NOT NULL, "
             "given_name TEXT, "
             "surname TEXT, "
+            "surname_soundex TEXT, "
+            "sort_name TEXT, "
+            "sort_birth TEXT, "
+            "sort_death TEXT, "
             "json_data TEXT"
             ")"
         )
@@ -164,6 +204,7 @@ class DBAPI(DbGeneric):
             "("
             "handle VARCHAR(50) PRIMARY KEY NOT NULL, "
             "enclosed_by VARCHAR(50), "
+            "sort_title TEXT, "
             "json_data TEXT"
             ")"
         )
@@ -223,11 +264,16 @@ class DBAPI(DbGeneric):
         )
 
         self._create_secondary_columns()
+        self._create_family_link_table()
 
         ## Indices:
         self.dbapi.execute("CREATE INDEX person_gramps_id ON person(gramps_id)")
         self.dbapi.execute("CREATE INDEX person_surname ON person(surname)")
         self.dbapi.execute("CREATE INDEX person_given_name ON person(given_name)")
+        self.dbapi.execute(
+            "CREATE INDEX person_surname_soundex ON person(surname_soundex)"
+        )
+        self._create_sort_key_indexes()
         self.dbapi.execute("CREATE INDEX source_title ON source(title)")
         self.dbapi.execute("CREATE INDEX source_gramps_id ON source(gramps_id)")
         self.dbapi.execute("CREATE INDEX citation_page ON citation(page)")
@@ -247,7 +293,19 @@ class DBAPI(DbGeneric):
 
         self.dbapi.commit()
 
+    def load(self, directory, *args, **kwargs):
+        """
+        Open the database, and read the format of its sort keys.
+        """
+        super().load(directory, *args, **kwargs)
+        if self._has_sort_keys():
+            self._sort_key_format = self._get_metadata("sort-key-format", None)
+
     def _close(self):
+        self._family_links = None
+        self._surname_soundex = None
+        self._sort_keys = None
+        self._sort_key_format = None
         self.dbapi.close()
 
     def _txn_begin(self):
@@ -266,6 +324,7 @@ class DBAPI(DbGeneric):
         """
         if self.transaction is None:
             _LOG.debug("    DBAPI %s transaction commit", hex(id(self)))
+            self._update_sort_key_dependents()
             self.dbapi.commit()
 
     def _txn_abort(self):
@@ -274,6 +333,9 @@ class DBAPI(DbGeneric):
         Executes a db ROLLBACK;
         """
         if self.transaction is None:
+            self._sort_keys_changed = False
+            self._sort_key_events.clear()
+            self._sort_key_places.clear()
             self.dbapi.rollback()
 
     def _collation(self, locale):
@@ -300,6 +362,11 @@ class DBAPI(DbGeneric):
             # A batch transaction does not store the commits
             # Aborting the session completely will become impossible.
             self.abort_possible = False
+            self._batch_rows = {}
+            self._batch_ids = {}
+            self._batch_refs = {}
+            self._batch_links = {}
+            self._batch_handles = {}
         self.transaction = transaction
         self.dbapi.begin()
         return transaction
@@ -315,35 +382,12 @@ class DBAPI(DbGeneric):
             transaction.get_description(),
         )
 
-        action = {TXNADD: "-add", TXNUPD: "-update", TXNDEL: "-delete", None: "-delete"}
+        self._flush_batch()
+        self._end_batch()
+        self._update_sort_key_dependents()
         self.dbapi.commit()
         if not transaction.batch:
-            # Now, emit signals:
-            # do deletes and adds first
-            for trans_type in [TXNDEL, TXNADD, TXNUPD]:
-                for obj_type in range(11):
-                    if (
-                        obj_type != REFERENCE_KEY
-                        and (obj_type, trans_type) in transaction
-                    ):
-                        if trans_type == TXNDEL:
-                            handles = [
-                                handle
-                                for (handle, data) in transaction[
-                                    (obj_type, trans_type)
-                                ]
-                            ]
-                        else:
-                            handles = [
-                                handle
-                                for (handle, data) in transaction[
-                                    (obj_type, trans_type)
-                                ]
-                                if (handle, None) not in transaction[(obj_type, TXNDEL)]
-                            ]
-                        if handles:
-                            signal = KEY_TO_NAME_MAP[obj_type] + action[trans_type]
-                            self.emit(signal, (handles,))
+            self.emit_changes(transaction)
         self.transaction = None
         msg = transaction.get_description()
         self.undodb.commit(transaction, msg)
@@ -355,7 +399,12 @@ class DBAPI(DbGeneric):
         """
         Executed after a batch operation abort.
         """
+        self._end_batch()
+        self._sort_keys_changed = False
+        self._sort_key_events.clear()
+        self._sort_key_places.clear()
         self.dbapi.rollback()
+        self._clear_cache()
         self.transaction = None
         transaction.clear()
         transaction.first = None
@@ -441,6 +490,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM person "
@@ -461,6 +511,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT family.handle "
@@ -488,6 +539,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Event in the
         database.
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT handle FROM event")
         return [row[0] for row in self.dbapi.fetchall()]
 
@@ -501,6 +553,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM citation "
@@ -521,6 +574,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM source "
@@ -541,6 +595,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM place "
@@ -556,6 +611,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Repository in
         the database.
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT handle FROM repository")
         return [row[0] for row in self.dbapi.fetchall()]
 
@@ -569,6 +625,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM media "
@@ -584,6 +641,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Note in the
         database.
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT handle FROM note")
         return [row[0] for row in self.dbapi.fetchall()]
 
@@ -597,6 +655,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM tag "
@@ -613,6 +672,7 @@ class DBAPI(DbGeneric):
 
         If no such Tag exists, None is returned.
         """
+        self._flush_batch()
         self.dbapi.execute(
             f"SELECT {self.serializer.data_field} FROM tag WHERE name = ?", [name]
         )
@@ -622,11 +682,31 @@ class DBAPI(DbGeneric):
         return None
 
     def _get_number_of(self, obj_key):
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
         self.dbapi.execute(f"SELECT count(1) FROM {table}")
         row = self.dbapi.fetchone()
         return row[0]
 
+    def select_handles(self, class_name, condition, params):
+        """
+        Return a list of handles of the objects of the given class for which
+        an SQL condition on the object's table holds.
+
+        :param class_name: name of the primary object class, eg "Person"
+        :type class_name: str
+        :param condition: SQL condition, using "?" for parameters
+        :type condition: str
+        :param params: parameter values for the condition
+        :type params: list
+        """
+        table = class_name.lower()
+        if table not in KEY_TO_NAME_MAP.values():
+            return None
+        self._flush_batch()
+        self.dbapi.execute(f"SELECT handle FROM {table} WHERE {condition}", params)
+        return [row[0] for row in self.dbapi.fetchall()]
+
     def has_name_group_key(self, key):
         """
         Return if a key exists in the name_group table.
@@ -666,6 +746,10 @@ class DBAPI(DbGeneric):
         old_data = None
         obj.change = int(change_time or time.time())
         table = KEY_TO_NAME_MAP[obj_key]
+        self._sort_key_changed(obj_key, obj.handle)
+
+        if trans.batch and self._batch_rows is not None:
+            return self._commit_batch(obj, obj_key)
 
         if self._has_handle(obj_key, obj.handle):
             old_data = self._get_raw_data(obj_key, obj.handle)
@@ -690,6 +774,159 @@ class DBAPI(DbGeneric):
 
         return old_data
 
+    def _commit_batch(self, obj, obj_key):
+        """
+        Buffer an object committed as part of a batch transaction.
+
+        The primary row, its secondary column values and its references are
+        held in memory and written by :meth:`_flush_batch`.  Lookups by
+        handle or Gramps ID read through the buffer, all other queries flush
+        it first.
+        """
+        handles = self._get_batch_handles(obj_key)
+        if obj.handle in handles:
+            old_data = self._get_raw_data(obj_key, obj.handle)
+        else:
+            old_data = None
+            handles.add(obj.handle)
+        rows = self._batch_rows.setdefault(obj_key, {})
+        ids = self._batch_ids.setdefault(obj_key, {})
+        if obj.handle in rows:
+            old_gramps_id = rows[obj.handle][1]
+            if ids.get(old_gramps_id) == obj.handle:
+                del ids[old_gramps_id]
+        gramps_id = getattr(obj, "gramps_id", None)
+        if gramps_id is not None:
+            ids[gramps_id] = obj.handle
+        fields, values = self._get_secondary_values(obj)
+        rows[obj.handle] = (
+            self.serializer.object_to_string(obj),
+            gramps_id,
+            fields,
+            self._sql_cast_list(values),
+        )
+        self._batch_refs[obj.handle] = (
+            obj.__class__.__name__,
+            set(obj.get_referenced_handles_recursively()),
+        )
+        links = self._get_family_links(obj)
+        if links is not None:
+            self._batch_links[obj.handle] = links
+        self._batch_count += 1
+        if self._batch_count >= BATCHSIZE:
+            self._flush_batch()
+        return old_data
+
+    def _flush_batch(self):
+        """
+        Write the objects buffered by a batch transaction to the database.
+        """
+        if not self._batch_count:
+            return
+        for obj_key, rows in self._batch_rows.items():
+            if not rows:
+                continue
+            table = KEY_TO_NAME_MAP[obj_key]
+            fields = next(iter(rows.values()))[2]
+            columns = ["handle", self.serializer.data_field] + fields
+            updates = ", ".join(
+                f"{column} = excluded.{column}" for column in columns[1:]
+            )
+            self._executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(['?'] * len(columns))}) "
+                f"ON CONFLICT(handle) DO UPDATE SET {updates}",
+                [
+                    [handle, string] + values
+                    for handle, (string, _, _, values) in rows.items()
+                ],
+            )
+        self._executemany(
+            "DELETE FROM reference WHERE obj_handle = ?",
+            [[handle] for handle in self._batch_refs],
+        )
+        self._executemany(
+            "INSERT INTO reference "
+            "(obj_handle, obj_class, ref_handle, ref_class) "
+            "VALUES(?, ?, ?, ?)",
+            [
+                [handle, obj_class, ref_handle, ref_class_name]
+                for handle, (obj_class, references) in self._batch_refs.items()
+                for ref_class_name, ref_handle in references
+            ],
+        )
+        if self._batch_links and self._has_family_links():
+            self._executemany(
+                "DELETE FROM family_link WHERE handle = ?",
+                [[handle] for handle in self._batch_links],
+            )
+            self._executemany(
+                "INSERT INTO family_link "
+                "(handle, link_type, link_handle, position) "
+                "VALUES(?, ?, ?, ?)",
+                [
+                    [handle] + link
+                    for handle, links in self._batch_links.items()
+                    for link in links
+                ],
+            )
+        self._batch_rows = {}
+        self._batch_ids = {}
+        self._batch_refs = {}
+        self._batch_links = {}
+        self._batch_count = 0
+
+    def _end_batch(self):
+        """
+        Discard the batch transaction buffers.
+        """
+        self._batch_rows = None
+        self._batch_ids = None
+        self._batch_refs = None
+        self._batch_links = None
+        self._batch_handles = None
+        self._batch_count = 0
+
+    def _get_batch_handles(self, obj_key):
+        """
+        Return the set of the handles in a table during a batch transaction.
+
+        The handles are read with a single query the first time they are
+        needed, and then kept up to date by the commits and removals of the
+        transaction, so that new objects need no query to be told apart from
+        existing ones.
+        """
+        handles = self._batch_handles.get(obj_key)
+        if handles is None:
+            table = KEY_TO_NAME_MAP[obj_key]
+            self.dbapi.execute(f"SELECT handle FROM {table}")
+            handles = set(row[0] for row in self.dbapi.fetchall())
+            self._batch_handles[obj_key] = handles
+        return handles
+
+    def _executemany(self, sql, rows):
+        """
+        Execute an SQL statement for each of the given parameter rows.
+
+        The statement is executed with a single executemany call when the
+        DB-API wrapper provides one, and row by row otherwise.
+        """
+        executemany = getattr(self.dbapi, "executemany", None)
+        if executemany is not None:
+            executemany(sql, rows)
+        else:
+            for row in rows:
+                self.dbapi.execute(sql, row)
+
+    def _get_batch_row(self, obj_key, handle):
+        """
+        Return the buffered row for the given handle, or None if the object
+        has not been committed since the last flush.
+        """
+        if self._batch_rows:
+            return self._batch_rows.get(obj_key, {}).get(handle)
+        return None
+
     def _commit_raw(self, data, obj_key):
         """
         Commit a serialized primary object to the database, storing the
@@ -710,6 +947,7 @@ class DBAPI(DbGeneric):
                 f"INSERT INTO {table} (handle, {self.serializer.data_field}) VALUES (?, ?)",
                 [handle, self.serializer.data_to_string(data)],
             )
+        self._discard_cached(obj_key, handle)
 
     def _update_backlinks(self, obj, transaction):
         if not transaction.batch:
@@ -779,12 +1017,17 @@ class DBAPI(DbGeneric):
     def _do_remove(self, handle, transaction, obj_key):
         if self.readonly or not handle:
             return
+        self._flush_batch()
         if self._has_handle(obj_key, handle):
             data = self._get_raw_data(obj_key, handle)
             obj_class = KEY_TO_CLASS_MAP[obj_key]
+            self._sort_key_changed(obj_key, handle)
             self._remove_backlinks(obj_class, handle, transaction)
+            self._remove_family_links(obj_class, handle)
             table = KEY_TO_NAME_MAP[obj_key]
             self.dbapi.execute(f"DELETE FROM {table} WHERE handle = ?", [handle])
+            if self._batch_handles is not None:
+                self._get_batch_handles(obj_key).discard(handle)
             if not transaction.batch:
                 transaction.add(obj_key, TXNDEL, handle, data, None)
 
@@ -824,6 +1067,7 @@ class DBAPI(DbGeneric):
 
             result_list = list(find_backlink_handles(handle))
         """
+        self._flush_batch()
         self.dbapi.execute(
             "SELECT obj_class, obj_handle FROM reference WHERE ref_handle = ?",
             [handle],
@@ -833,10 +1077,75 @@ class DBAPI(DbGeneric):
             if (include_classes is None) or (row[0] in include_classes):
                 yield (row[0], row[1])
 
+    def find_reference_map_errors(self, callback=None):
+        """
+        Compare the reference map with the references held by the objects.
+
+        The references of the objects are written to a temporary table, which
+        is compared with the reference map in SQL.
+        """
+        self._flush_batch()
+        self.dbapi.execute(
+            "CREATE TEMPORARY TABLE check_reference "
+            "("
+            "obj_handle VARCHAR(50), "
+            "obj_class TEXT, "
+            "ref_handle VARCHAR(50), "
+            "ref_class TEXT"
+            ")"
+        )
+        try:
+            rows = []
+            for obj_class in CLASS_TO_KEY_MAP:
+                class_func = self._get_table_func(obj_class, "class_func")
+                with self._get_table_func(obj_class, "cursor_func")() as cursor:
+                    for handle, data in cursor:
+                        obj = self.serializer.data_to_object(class_func, data)
+                        rows.extend(
+                            [handle, obj_class, ref_handle, ref_class_name]
+                            for ref_class_name, ref_handle in set(
+                                obj.get_referenced_handles_recursively()
+                            )
+                        )
+                        if len(rows) >= 10000:
+                            self.__insert_check_references(rows)
+                            rows = []
+                        if callback:
+                            callback()
+            self.__insert_check_references(rows)
+            columns = "obj_class, obj_handle, ref_class, ref_handle"
+            result = []
+            for table1, table2 in (
+                ("check_reference", "reference"),
+                ("reference", "check_reference"),
+            ):
+                self.dbapi.execute(
+                    f"SELECT {columns} FROM {table1} "
+                    f"EXCEPT SELECT {columns} FROM {table2} "
+                    f"ORDER BY {columns}"
+                )
+                result.append([tuple(row) for row in self.dbapi.fetchall()])
+        finally:
+            self.dbapi.execute("DROP TABLE check_reference")
+        return tuple(result)
+
+    def __insert_check_references(self, rows):
+        """
+        Add rows to the temporary table of the references of the objects.
+        """
+        if rows:
+            self._executemany(
+                "INSERT INTO check_reference "
+                "(obj_handle, obj_class, ref_handle, ref_class) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
     def find_initial_person(self):
         """
         Returns first person in the database
         """
+        self._flush_batch()
         handle = self.get_default_handle()
         person = None
         if handle:
@@ -853,6 +1162,7 @@ class DBAPI(DbGeneric):
         """
         Return an iterator over handles in the database
         """
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
         self.dbapi.execute(f"SELECT handle FROM {table}")
         rows = self.dbapi.fetchall()
@@ -863,6 +1173,7 @@ class DBAPI(DbGeneric):
         """
         Return an iterator over raw data in the database.
         """
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
         with self.dbapi.cursor() as cursor:
             cursor.execute(f"SELECT handle, {self.serializer.data_field} FROM {table}")
@@ -872,10 +1183,56 @@ class DBAPI(DbGeneric):
                     yield (row[0], self.serializer.string_to_data(row[1]))
                 rows = cursor.fetchmany()
 
+    def iter_objects_by_handle(self, class_name):
+        """
+        Return an iterator over the objects of a primary class, in handle
+        order, read from a single ordered cursor.
+
+        :param class_name: name of the primary object class, eg "Person"
+        :type class_name: str
+        """
+        self._flush_batch()
+        class_ = self._get_table_func(class_name, "class_func")
+        table = class_name.lower()
+        with self.dbapi.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {self.serializer.data_field} FROM {table} ORDER BY handle"
+            )
+            rows = cursor.fetchmany()
+            while rows:
+                for row in rows:
+                    data = self.serializer.string_to_data(row[0])
+                    yield self.serializer.data_to_object(class_, data)
+                rows = cursor.fetchmany()
+
+    def iter_objects_by_id(self, class_name):
+        """
+        Return an iterator over the objects of a primary class, in Gramps ID
+        order, read from a single cursor ordered on the gramps_id column.
+
+        :param class_name: name of the primary object class, eg "Person"
+        :type class_name: str
+        """
+        self._flush_batch()
+        class_ = self._get_table_func(class_name, "class_func")
+        table = class_name.lower()
+        with self.dbapi.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {self.serializer.data_field} FROM {table} "
+                "ORDER BY gramps_id, handle"
+            )
+            rows = cursor.fetchmany()
+            while rows:
+                for row in rows:
+                    data = self.serializer.string_to_data(row[0])
+                    yield self.serializer.data_to_object(class_, data)
+                rows = cursor.fetchmany()
+
     def _iter_raw_place_tree_data(self):
         """
         Return an iterator over raw data in the place hierarchy.
         """
+        self._flush_batch()
         to_do = [""]
         while to_do:
             handle = to_do.pop()
@@ -988,6 +1345,8 @@ class DBAPI(DbGeneric):
                 obj = self.method("get_%s_from_handle", obj_type)(handle)
                 self._update_secondary_values(obj)
                 self.update()
+        if self._has_sort_keys():
+            self._set_sort_key_format(get_sort_key_format())
         self._txn_commit()
 
         # Next, rebuild stats:
@@ -995,21 +1354,44 @@ class DBAPI(DbGeneric):
         self.genderStats = GenderStats(gstats)
 
     def _has_handle(self, obj_key, handle):
+        if self._batch_handles is not None:
+            return handle in self._get_batch_handles(obj_key)
         table = KEY_TO_NAME_MAP[obj_key]
         self.dbapi.execute(f"SELECT 1 FROM {table} WHERE handle = ?", [handle])
         return self.dbapi.fetchone() is not None
 
     def _has_gramps_id(self, obj_key, gramps_id):
         table = KEY_TO_NAME_MAP[obj_key]
+        if self._batch_rows:
+            # Rows for buffered objects in the table are out of date
+            if gramps_id in self._batch_ids.get(obj_key, {}):
+                return True
+            self.dbapi.execute(
+                f"SELECT handle FROM {table} WHERE gramps_id = ?", [gramps_id]
+            )
+            return any(
+                self._get_batch_row(obj_key, row[0]) is None
+                for row in self.dbapi.fetchall()
+            )
         self.dbapi.execute(f"SELECT 1 FROM {table} WHERE gramps_id = ?", [gramps_id])
         return self.dbapi.fetchone() is not None
 
     def _get_gramps_ids(self, obj_key):
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
         self.dbapi.execute(f"SELECT gramps_id FROM {table}")
         return [row[0] for row in self.dbapi.fetchall()]
 
     def _get_raw_data(self, obj_key, handle):
+        string = self._get_raw_string(obj_key, handle)
+        if string is not None:
+            return self.serializer.string_to_data(string)
+        return None
+
+    def _get_raw_string(self, obj_key, handle):
+        batch_row = self._get_batch_row(obj_key, handle)
+        if batch_row:
+            return batch_row[0]
         table = KEY_TO_NAME_MAP[obj_key]
         self.dbapi.execute(
             f"SELECT {self.serializer.data_field} FROM {table} WHERE handle = ?",
@@ -1017,11 +1399,25 @@ class DBAPI(DbGeneric):
         )
         row = self.dbapi.fetchone()
         if row:
-            return self.serializer.string_to_data(row[0])
+            return row[0]
         return None
 
     def _get_raw_from_id_data(self, obj_key, gramps_id):
         table = KEY_TO_NAME_MAP[obj_key]
+        if self._batch_rows:
+            # Rows for buffered objects in the table are out of date
+            handle = self._batch_ids.get(obj_key, {}).get(gramps_id)
+            if handle:
+                return self._get_raw_data(obj_key, handle)
+            self.dbapi.execute(
+                f"SELECT handle, {self.serializer.data_field} FROM {table} "
+                "WHERE gramps_id = ?",
+                [gramps_id],
+            )
+            for row in self.dbapi.fetchall():
+                if self._get_batch_row(obj_key, row[0]) is None:
+                    return self.serializer.string_to_data(row[1])
+            return None
         self.dbapi.execute(
             f"SELECT {self.serializer.data_field} FROM {table} WHERE gramps_id = ?",
             [gramps_id],
@@ -1078,8 +1474,10 @@ class DBAPI(DbGeneric):
         """
         cls = KEY_TO_CLASS_MAP[obj_key]
         table = cls.lower()
+        self._sort_key_changed(obj_key, handle)
         if data is None:
             self.dbapi.execute(f"DELETE FROM {table} WHERE handle = ?", [handle])
+            self._remove_family_links(cls, handle)
         else:
             if self._has_handle(obj_key, handle):
                 self.dbapi.execute(
@@ -1098,6 +1496,7 @@ class DBAPI(DbGeneric):
         """
         Return the list of locale-sorted surnames contained in the database.
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT DISTINCT surname FROM person ORDER BY surname")
         surname_list = []
         for row in self.dbapi.fetchall():
@@ -1144,38 +1543,444 @@ class DBAPI(DbGeneric):
                         f"ALTER TABLE {table_name} ADD COLUMN {field} {sql_type}"
                     )
 
-    def _update_secondary_values(self, obj):
+    def _get_secondary_values(self, obj):
         """
-        Given a primary object update its secondary field values
-        in the database.
-        Does not commit.
+        Given a primary object return the names and values of its secondary
+        columns, excluding the handle.
         """
         table = obj.__class__.__name__
-        fields = [field[0] for field in obj.get_secondary_fields()]
-        sets = []
+        fields = []
         values = []
-        for field in fields:
-            sets.append(f"{field} = ?")
-            values.append(getattr(obj, field))
+        for field in obj.get_secondary_fields():
+            if field[0] != "handle":
+                fields.append(field[0])
+                values.append(getattr(obj, field[0]))
 
         # Derived fields
         if table == "Person":
             given_name, surname = self._get_person_data(obj)
-            sets.append("given_name = ?")
+            fields.append("given_name")
             values.append(given_name)
-            sets.append("surname = ?")
+            fields.append("surname")
             values.append(surname)
+            if self._has_surname_soundex():
+                fields.append("surname_soundex")
+                values.append(self._get_surname_soundex(obj))
         if table == "Place":
             handle = self._get_place_data(obj)
-            sets.append("enclosed_by = ?")
+            fields.append("enclosed_by")
             values.append(handle)
+        if table in SORT_KEY_COLUMNS and self._has_sort_keys():
+            data = to_dict(obj)
+            for field, sort_value in SORT_KEY_COLUMNS[table]:
+                fields.append(field)
+                values.append(glocale.sort_key(sort_value(self, data)))
+        return fields, values
 
+    def _update_secondary_values(self, obj):
+        """
+        Given a primary object update its secondary field values
+        in the database.
+        Does not commit.
+        """
+        fields, values = self._get_secondary_values(obj)
         if len(values) > 0:
-            table_name = table.lower()
+            sets = [f"{field} = ?" for field in fields]
+            table_name = obj.__class__.__name__.lower()
             self.dbapi.execute(
                 f'UPDATE {table_name} SET {", ".join(sets)} where handle = ?',
                 self._sql_cast_list(values) + [obj.handle],
             )
+        self._update_family_links(obj)
+
+    def _has_surname_soundex(self):
+        """
+        Return True if the person table has a surname soundex column.
+        """
+        if self._surname_soundex is None:
+            self._surname_soundex = self.dbapi.column_exists(
+                "person", "surname_soundex"
+            )
+        return self._surname_soundex
+
+    def _get_surname_soundex(self, person):
+        """
+        Given a Person, return the soundex code of the surnames of its
+        primary name.
+        """
+        surnames = " ".join(
+            surname.get_surname()
+            for surname in person.get_primary_name().get_surname_list()
+        )
+        return soundex(surnames)
+
+    def upgrade_surname_soundex(self):
+        """
+        A DBAPI level method for adding the surname soundex column to the
+        person table, and filling it.
+        Does not commit.
+        """
+        if not self._has_surname_soundex():
+            self.dbapi.execute("ALTER TABLE person ADD COLUMN surname_soundex TEXT")
+            self.dbapi.execute(
+                "CREATE INDEX person_surname_soundex ON person(surname_soundex)"
+            )
+            self._surname_soundex = True
+        self._executemany(
+            "UPDATE person SET surname_soundex = ? WHERE handle = ?",
+            [
+                [self._get_surname_soundex(person), person.handle]
+                for person in self.iter_people()
+            ],
+        )
+
+    def iter_person_soundex_keys(self):
+        """
+        Return an iterator over tuples of the handle, the gender and the
+        soundex code of the surnames of the primary name of each Person in
+        the database, read from the secondary columns.
+        """
+        if not self._has_surname_soundex():
+            yield from super().iter_person_soundex_keys()
+            return
+        self._flush_batch()
+        with self.dbapi.cursor() as cursor:
+            cursor.execute("SELECT handle, gender, surname_soundex FROM person")
+            rows = cursor.fetchmany()
+            while rows:
+                for row in rows:
+                    yield tuple(row)
+                rows = cursor.fetchmany()
+
+    def _has_sort_keys(self):
+        """
+        Return True if the person and place tables have sort key columns.
+        """
+        if self._sort_keys is None:
+            self._sort_keys = self.dbapi.column_exists("place", "sort_title")
+        return self._sort_keys
+
+    def _create_sort_key_indexes(self):
+        """
+        Create the indexes of the sort key columns.
+        """
+        for table, columns in SORT_KEY_COLUMNS.items():
+            table = table.lower()
+            for column, dummy_sort_value in columns:
+                self.dbapi.execute(
+                    f"CREATE INDEX {table}_{column} ON {table}({column})"
+                )
+
+    def upgrade_sort_keys(self):
+        """
+        A DBAPI level method for adding the sort key columns to the person
+        and place tables. They are filled when the sort keys are first asked
+        for.
+        Does not commit.
+        """
+        if not self._has_sort_keys():
+            for table, columns in SORT_KEY_COLUMNS.items():
+                for column, dummy_sort_value in columns:
+                    self.dbapi.execute(
+                        f"ALTER TABLE {table.lower()} ADD COLUMN {column} TEXT"
+                    )
+            self._create_sort_key_indexes()
+            self._sort_keys = True
+        self._set_sort_key_format(None)
+
+    def _set_sort_key_format(self, sort_key_format):
+        """
+        Store the format of the sort keys, None if they must all be computed
+        again.
+        Does not commit.
+        """
+        self._sort_key_format = sort_key_format
+        self._set_metadata("sort-key-format", sort_key_format, use_txn=False)
+
+    def _update_sort_keys(self, table, handles):
+        """
+        Compute again the sort keys of the objects of the given table, all
+        of them if handles is None.
+        Does not commit.
+        """
+        obj_key = {"Person": PERSON_KEY, "Place": PLACE_KEY}[table]
+        columns = SORT_KEY_COLUMNS[table]
+        if handles is None:
+            rows = self._iter_raw_data(obj_key)
+        else:
+            rows = ((handle, self._get_raw_data(obj_key, handle)) for handle in handles)
+        sets = ", ".join(f"{column} = ?" for column, dummy_sort_value in columns)
+        self._executemany(
+            f"UPDATE {table.lower()} SET {sets} WHERE handle = ?",
+            [
+                [
+                    glocale.sort_key(sort_value(self, data))
+                    for dummy_column, sort_value in columns
+                ]
+                + [handle]
+                for handle, data in rows
+                if data is not None
+            ],
+        )
+
+    def _sort_key_changed(self, obj_key, handle):
+        """
+        Note that an object was changed, for the sort keys which depend on
+        it to be updated at the end of the transaction.
+        """
+        if obj_key == EVENT_KEY:
+            self._sort_key_events.add(handle)
+        elif obj_key == PLACE_KEY:
+            self._sort_key_places.add(handle)
+            self._sort_keys_changed = True
+        elif obj_key == PERSON_KEY:
+            self._sort_keys_changed = True
+
+    def _get_sort_key_referrers(self, obj_class, handles):
+        """
+        Return the handles of the objects of the given class which refer to
+        any of the given handles.
+        """
+        handles = list(handles)
+        referrers = set()
+        for start in range(0, len(handles), BATCHSIZE):
+            chunk = handles[start : start + BATCHSIZE]
+            self.dbapi.execute(
+                "SELECT DISTINCT obj_handle FROM reference "
+                f"WHERE obj_class = ? AND ref_handle IN ({', '.join('?' * len(chunk))})",
+                [obj_class] + chunk,
+            )
+            referrers.update(row[0] for row in self.dbapi.fetchall())
+        return referrers
+
+    def _update_sort_key_dependents(self):
+        """
+        Update the sort keys which depend on other objects than their own:
+        the birth and death sort keys of the people who refer to the events
+        changed, and the titles of the places enclosed by the places changed.
+        Also note when sort keys were computed with another format than the
+        one of the others.
+        Does not commit.
+        """
+        events, self._sort_key_events = self._sort_key_events, set()
+        places, self._sort_key_places = self._sort_key_places, set()
+        changed, self._sort_keys_changed = self._sort_keys_changed, False
+        if not (changed or events) or not self._has_sort_keys():
+            return
+        if (
+            self._sort_key_format is not None
+            and self._sort_key_format != get_sort_key_format()
+        ):
+            self._set_sort_key_format(None)
+        if events:
+            self._update_sort_keys(
+                "Person", self._get_sort_key_referrers("Person", events)
+            )
+        enclosed = set()
+        while places:
+            places = self._get_sort_key_referrers("Place", places) - enclosed
+            enclosed |= places
+        if enclosed:
+            self._update_sort_keys("Place", enclosed)
+
+    def get_sort_keys(self, class_name, column):
+        """
+        Return the list of the (sort key, handle) tuples of all the objects
+        of a class, sorted, for one of the sort key columns given in
+        :data:`~gramps.gen.utils.db.SORT_KEY_COLUMNS`, read from the sort
+        key column.
+
+        The sort keys are computed again when the collation or the display
+        formats they depend on have changed.
+        """
+        if column not in dict(SORT_KEY_COLUMNS[class_name]):
+            raise ValueError(column)
+        if not self._has_sort_keys():
+            return super().get_sort_keys(class_name, column)
+        self._flush_batch()
+        sort_key_format = get_sort_key_format()
+        if self._sort_key_format != sort_key_format:
+            if self.readonly:
+                return super().get_sort_keys(class_name, column)
+            LOG.debug("Computing the sort keys...")
+            self._txn_begin()
+            for table in SORT_KEY_COLUMNS:
+                self._update_sort_keys(table, None)
+            self._set_sort_key_format(sort_key_format)
+            self._txn_commit()
+        with self.dbapi.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {column}, handle FROM {class_name.lower()} "
+                f"ORDER BY {column}, handle"
+            )
+            sort_keys = []
+            rows = cursor.fetchmany()
+            while rows:
+                sort_keys.extend((row[0] or "", row[1]) for row in rows)
+                rows = cursor.fetchmany()
+        # The database may not collate the keys the way Python compares
+        # them. Sorting rows which are already in order is a single pass.
+        sort_keys.sort()
+        return sort_keys
+
+    def _create_family_link_table(self):
+        """
+        Create the family link table.
+
+        It indexes the links between people and families, so that the family
+        tree can be walked without loading people and families.
+        """
+        self.dbapi.execute(
+            "CREATE TABLE family_link "
+            "("
+            "handle VARCHAR(50), "
+            "link_type INTEGER, "
+            "link_handle VARCHAR(50), "
+            "position INTEGER"
+            ")"
+        )
+        self.dbapi.execute("CREATE INDEX family_link_handle ON family_link(handle)")
+        self._family_links = True
+
+    def upgrade_family_links(self):
+        """
+        A DBAPI level method for adding the family link table, or making its
+        rows again, from the people and families.
+        Does not commit.
+        """
+        if not self._has_family_links():
+            self._create_family_link_table()
+        self._rebuild_family_links()
+
+    def _has_family_links(self):
+        """
+        Return True if the database has a family link table.
+        """
+        if self._family_links is None:
+            self._family_links = self.dbapi.table_exists("family_link")
+        return self._family_links
+
+    def _get_family_links(self, obj):
+        """
+        Return the family link rows of a person or family, as lists of the
+        link type, linked handle and position. Returns None for other objects.
+        """
+        if isinstance(obj, Person):
+            return [
+                [LINK_FAMILY, handle, position]
+                for position, handle in enumerate(obj.family_list)
+            ] + [
+                [LINK_PARENT_FAMILY, handle, position]
+                for position, handle in enumerate(obj.parent_family_list)
+            ]
+        if isinstance(obj, Family):
+            return [
+                [LINK_CHILD, child_ref.ref, position]
+                for position, child_ref in enumerate(obj.child_ref_list)
+            ]
+        return None
+
+    def _update_family_links(self, obj):
+        """
+        Given a person or family update its rows in the family link table.
+        Does not commit.
+        """
+        links = self._get_family_links(obj)
+        if links is None or not self._has_family_links():
+            return
+        self.dbapi.execute("DELETE FROM family_link WHERE handle = ?", [obj.handle])
+        self._executemany(
+            "INSERT INTO family_link "
+            "(handle, link_type, link_handle, position) "
+            "VALUES(?, ?, ?, ?)",
+            [[obj.handle] + link for link in links],
+        )
+
+    def _remove_family_links(self, obj_class, handle):
+        """
+        Remove the family link rows of a person or family.
+        Does not commit.
+        """
+        if obj_class in ("Person", "Family") and self._has_family_links():
+            self.dbapi.execute("DELETE FROM family_link WHERE handle = ?", [handle])
+
+    def _rebuild_family_links(self):
+        """
+        Rebuild the family link table from the people and families.
+        Does not commit.
+        """
+        self.dbapi.execute("DELETE FROM family_link")
+        for person in self.iter_people():
+            self._update_family_links(person)
+        for family in self.iter_families():
+            self._update_family_links(family)
+
+    def _get_family_link_handles(self, handle, link_type):
+        """
+        Return the handles linked to a person or family, in order.
+        """
+        self._flush_batch()
+        self.dbapi.execute(
+            "SELECT link_handle FROM family_link "
+            "WHERE handle = ? AND link_type = ? ORDER BY position",
+            [handle, link_type],
+        )
+        return [row[0] for row in self.dbapi.fetchall()]
+
+    def get_person_family_handles(self, handle):
+        """
+        Return the handles of the families in which the person with the given
+        handle is a parent, in the order of the person's family list.
+
+        :param handle: handle of the person.
+        :type handle: str
+        """
+        if not self._has_family_links():
+            return super().get_person_family_handles(handle)
+        return self._get_family_link_handles(handle, LINK_FAMILY)
+
+    def get_person_parent_family_handles(self, handle):
+        """
+        Return the handles of the families in which the person with the given
+        handle is a child, in the order of the person's parent family list.
+        The first one is the main parents family.
+
+        :param handle: handle of the person.
+        :type handle: str
+        """
+        if not self._has_family_links():
+            return super().get_person_parent_family_handles(handle)
+        return self._get_family_link_handles(handle, LINK_PARENT_FAMILY)
+
+    def get_family_parent_handles(self, handle):
+        """
+        Return a tuple of the father and mother handles of the family with
+        the given handle. A missing parent is returned as None.
+
+        :param handle: handle of the family.
+        :type handle: str
+        """
+        self._flush_batch()
+        self.dbapi.execute(
+            "SELECT father_handle, mother_handle FROM family WHERE handle = ?",
+            [handle],
+        )
+        row = self.dbapi.fetchone()
+        if row is None:
+            return (None, None)
+        return (row[0] or None, row[1] or None)
+
+    def get_family_child_handles(self, handle):
+        """
+        Return the handles of the children of the family with the given
+        handle, in the order of the family's child reference list.
+
+        :param handle: handle of the family.
+        :type handle: str
+        """
+        if not self._has_family_links():
+            return super().get_family_child_handles(handle)
+        return self._get_family_link_handles(handle, LINK_CHILD)
 
     def _sql_cast_list(self, values):
         """
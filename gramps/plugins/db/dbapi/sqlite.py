@@ -138,6 +138,20 @@ class Connection:
         self.log.debug(args)
         self.__cursor.execute(*args, **kwargs)
 
+    def executemany(self, *args, **kwargs):
+        """
+        Executes an SQL statement against all parameter sequences.
+
+        :param args: arguments to be passed to the sqlite3 executemany
+                     statement
+        :type args: list
+        :param kwargs: arguments to be passed to the sqlite3 executemany
+                       statement
+        :type kwargs: list
+        """
+        self.log.debug(args[0])
+        self.__cursor.executemany(*args, **kwargs)
+
     def fetchone(self):
         """
         Fetches the next row of a query result set, returning a single sequence,
@@ -23,20 +23,39 @@
 # Standard python modules
 #
 # -------------------------------------------------------------------------
+import sys
+import tempfile
 import unittest
+from timeit import repeat
 
 # -------------------------------------------------------------------------
 #
 # Gramps modules
 #
 # -------------------------------------------------------------------------
-from gramps.gen.db import DbTxn
+from gramps.gen.db import (
+    DbReadBase,
+    DbTxn,
+    PERSON_KEY,
+    PLACE_KEY,
+    TXNADD,
+    TXNDEL,
+    TXNUPD,
+)
+from gramps.gen.db.exceptions import DbUpgradeRequiredError
 from gramps.gen.db.utils import make_database
+from gramps.gen.display.name import displayer as name_displayer
+from gramps.gen.utils.db import SORT_KEY_COLUMNS
 from gramps.gen.lib import (
     Person,
     Family,
     Event,
+    EventRef,
+    EventType,
+    Name,
     Place,
+    PlaceName,
+    PlaceRef,
     Repository,
     Source,
     Citation,
@@ -45,8 +64,11 @@ from gramps.gen.lib import (
     Tag,
     Researcher,
     Surname,
+    ChildRef,
 )
 
+BENCHMARK_SIZE = 50000
+
 
 # -------------------------------------------------------------------------
 #
@@ -694,6 +716,18 @@ class DbRandomTest(unittest.TestCase):
     def test_iter_tags(self):
         self.__iter_objects_test(Tag, self.db.iter_tags)
 
+    def test_iter_objects_by_handle(self):
+        for obj_type in self.handles:
+            handles = [obj.handle for obj in self.db.iter_objects_by_handle(obj_type)]
+            self.assertEqual(handles, sorted(self.handles[obj_type]))
+
+    def test_iter_objects_by_id(self):
+        for obj_type in self.gids:
+            gids = [obj.gramps_id for obj in self.db.iter_objects_by_id(obj_type)]
+            self.assertEqual(gids, sorted(self.gids[obj_type]))
+            objects = DbReadBase.iter_objects_by_id(self.db, obj_type)
+            self.assertEqual([obj.gramps_id for obj in objects], gids)
+
     ################################################################
     #
     # Test default and initial person methods
@@ -899,5 +933,942 @@ class DbPersonTest(unittest.TestCase):
         self.assertEqual(saved["Mary"], (1, 3, 1))
 
 
+# -------------------------------------------------------------------------
+#
+# DbBatchTest class
+#
+# -------------------------------------------------------------------------
+class DbBatchTest(unittest.TestCase):
+    """
+    Tests of objects committed in batch transactions.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = make_database("sqlite")
+        cls.db.load(":memory:")
+
+    def tearDown(self):
+        with DbTxn("Remove test objects", self.db, batch=True) as trans:
+            for handle in self.db.get_family_handles():
+                self.db.remove_family(handle, trans)
+            for handle in self.db.get_person_handles():
+                self.db.remove_person(handle, trans)
+
+    def __add_family(self, trans):
+        father = Person()
+        father.gender = Person.MALE
+        self.db.add_person(father, trans)
+        child = Person()
+        self.db.add_person(child, trans)
+        family = Family()
+        family.set_father_handle(father.handle)
+        childref = ChildRef()
+        childref.ref = child.handle
+        family.add_child_ref(childref)
+        self.db.add_family(family, trans)
+        father.add_family_handle(family.handle)
+        self.db.commit_person(father, trans)
+        child.add_parent_family_handle(family.handle)
+        self.db.commit_person(child, trans)
+        return father, child, family
+
+    def test_read_through(self):
+        with DbTxn("Add test objects", self.db, batch=True) as trans:
+            father, child, family = self.__add_family(trans)
+            self.assertTrue(self.db.has_person_handle(father.handle))
+            self.assertTrue(self.db.has_person_gramps_id(child.gramps_id))
+            person = self.db.get_person_from_handle(child.handle)
+            self.assertEqual(person.serialize(), child.serialize())
+            person = self.db.get_person_from_gramps_id(father.gramps_id)
+            self.assertEqual(person.serialize(), father.serialize())
+            self.assertEqual(self.db.get_number_of_people(), 2)
+            self.assertEqual(self.db.get_number_of_families(), 1)
+
+    def test_backlinks(self):
+        with DbTxn("Add test objects", self.db, batch=True) as trans:
+            father, child, family = self.__add_family(trans)
+        backlinks = set(self.db.find_backlink_handles(family.handle))
+        self.assertEqual(
+            backlinks, {("Person", father.handle), ("Person", child.handle)}
+        )
+        backlinks = set(self.db.find_backlink_handles(child.handle))
+        self.assertEqual(backlinks, {("Family", family.handle)})
+
+    def test_change_gramps_id(self):
+        with DbTxn("Add test objects", self.db, batch=True) as trans:
+            father, child, family = self.__add_family(trans)
+        old_id = father.gramps_id
+        with DbTxn("Edit test objects", self.db, batch=True) as trans:
+            father.gramps_id = "X0001"
+            self.db.commit_person(father, trans)
+            self.assertFalse(self.db.has_person_gramps_id(old_id))
+            self.assertTrue(self.db.has_person_gramps_id("X0001"))
+            self.assertIsNone(self.db.get_person_from_gramps_id(old_id))
+        self.assertFalse(self.db.has_person_gramps_id(old_id))
+        person = self.db.get_person_from_gramps_id("X0001")
+        self.assertEqual(person.handle, father.handle)
+
+    def test_secondary_values(self):
+        with DbTxn("Add test objects", self.db, batch=True) as trans:
+            person = Person()
+            surname = Surname()
+            surname.surname = "Smith"
+            person.primary_name.set_surname_list([surname])
+            self.db.add_person(person, trans)
+        self.assertIn("Smith", self.db.get_surname_list())
+        handles = self.db.get_person_handles(sort_handles=True)
+        self.assertEqual(handles, [person.handle])
+
+    def test_queries(self):
+        statements = []
+        execute = self.db.dbapi.execute
+
+        def log_execute(sql, *args, **kwargs):
+            statements.append(sql)
+            return execute(sql, *args, **kwargs)
+
+        self.db.dbapi.execute = log_execute
+        try:
+            with DbTxn("Add test objects", self.db, batch=True) as trans:
+                father, child, family = self.__add_family(trans)
+                self.assertTrue(self.db.has_person_handle(child.handle))
+                self.assertFalse(self.db.has_person_handle("no such handle"))
+        finally:
+            del self.db.dbapi.execute
+        # One query for the handles of each table, the people committed
+        # again are read from the buffer
+        lookups = [sql for sql in statements if sql.startswith("SELECT")]
+        self.assertEqual(lookups.count("SELECT handle FROM person"), 1)
+        self.assertEqual(lookups.count("SELECT handle FROM family"), 1)
+        self.assertEqual([sql for sql in lookups if "WHERE handle" in sql], [])
+
+    def test_remove(self):
+        with DbTxn("Add test objects", self.db, batch=True) as trans:
+            father, child, family = self.__add_family(trans)
+            self.db.remove_person(child.handle, trans)
+            self.assertFalse(self.db.has_person_handle(child.handle))
+            self.db.add_person(child, trans)
+            self.assertTrue(self.db.has_person_handle(child.handle))
+        self.assertEqual(self.db.get_number_of_people(), 2)
+
+    def test_no_executemany(self):
+        class Wrapper:
+            """A DB-API wrapper without executemany."""
+
+            def __init__(self, dbapi):
+                self.dbapi = dbapi
+
+            def __getattr__(self, name):
+                if name == "executemany":
+                    raise AttributeError(name)
+                return getattr(self.dbapi, name)
+
+        dbapi = self.db.dbapi
+        self.db.dbapi = Wrapper(dbapi)
+        try:
+            with DbTxn("Add test objects", self.db, batch=True) as trans:
+                father, child, family = self.__add_family(trans)
+            with DbTxn("Edit test objects", self.db) as trans:
+                child.add_parent_family_handle(family.handle)
+                self.db.commit_person(child, trans)
+        finally:
+            self.db.dbapi = dbapi
+        backlinks = set(self.db.find_backlink_handles(family.handle))
+        self.assertEqual(
+            backlinks, {("Person", father.handle), ("Person", child.handle)}
+        )
+
+
+# -------------------------------------------------------------------------
+#
+# DbCacheTest class
+#
+# -------------------------------------------------------------------------
+class DbCacheTest(unittest.TestCase):
+    """
+    Tests of the object cache.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = make_database("sqlite")
+        cls.db.load(":memory:")
+
+    def setUp(self):
+        self.person = Person()
+        self.person.primary_name.first_name = "John"
+        with DbTxn("Add test person", self.db) as trans:
+            self.db.add_person(self.person, trans)
+
+    def tearDown(self):
+        with DbTxn("Remove test objects", self.db) as trans:
+            for handle in self.db.get_person_handles():
+                self.db.remove_person(handle, trans)
+
+    def __rename(self, first_name):
+        person = self.db.get_person_from_handle(self.person.handle)
+        person.primary_name.first_name = first_name
+        with DbTxn("Edit test person", self.db) as trans:
+            self.db.commit_person(person, trans)
+
+    def __first_name(self):
+        person = self.db.get_person_from_handle(self.person.handle)
+        return person.primary_name.first_name
+
+    def test_hits(self):
+        self.db.get_person_from_handle(self.person.handle)
+        hits = self.db._cache_hits
+        person1 = self.db.get_person_from_handle(self.person.handle)
+        person2 = self.db.get_person_from_handle(self.person.handle)
+        self.assertEqual(self.db._cache_hits, hits + 2)
+        self.assertIsNot(person1, person2)
+        self.assertEqual(person1.serialize(), person2.serialize())
+
+    def test_commit(self):
+        self.assertEqual(self.__first_name(), "John")
+        self.__rename("Paul")
+        self.assertEqual(self.__first_name(), "Paul")
+
+    def test_undo_redo(self):
+        self.__rename("Paul")
+        self.db.undo()
+        self.assertEqual(self.__first_name(), "John")
+        self.db.redo()
+        self.assertEqual(self.__first_name(), "Paul")
+
+    def test_remove(self):
+        self.assertTrue(self.db.get_raw_person_data(self.person.handle))
+        with DbTxn("Remove test person", self.db) as trans:
+            self.db.remove_person(self.person.handle, trans)
+        self.assertIsNone(self.db.get_raw_person_data(self.person.handle))
+
+    def test_abort(self):
+        try:
+            with DbTxn("Edit test person", self.db) as trans:
+                person = self.db.get_person_from_handle(self.person.handle)
+                person.primary_name.first_name = "Paul"
+                self.db.commit_person(person, trans)
+                self.assertEqual(self.__first_name(), "Paul")
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(self.__first_name(), "John")
+
+    def test_modify_raw_data(self):
+        handle = self.person.handle
+        gramps_id = self.person.gramps_id
+        self.db.get_person_from_handle(handle)
+        raw = self.db.get_raw_person_data(handle)
+        raw["gramps_id"] = "MUTATED"
+        raw["primary_name"]["first_name"] = "Paul"
+        self.assertEqual(self.db.get_person_from_handle(handle).gramps_id, gramps_id)
+        self.assertEqual(self.__first_name(), "John")
+        self.assertEqual(self.db.get_raw_person_data(handle)["gramps_id"], gramps_id)
+
+    def test_modify_data_object(self):
+        handle = self.person.handle
+        gramps_id = self.person.gramps_id
+        raw = self.db.get_raw_person_data(handle)
+        raw.set_gramps_id("X")
+        self.assertEqual(raw.get_gramps_id(), "X")
+        raw = self.db.get_raw_person_data(handle)
+        self.assertNotIn("_object", raw)
+        self.assertEqual(raw.get_gramps_id(), gramps_id)
+        self.assertEqual(raw["gramps_id"], gramps_id)
+
+
+class DbFamilyLinkTest(unittest.TestCase):
+    """
+    Tests of the index of links between people and families.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = make_database("sqlite")
+        cls.db.load(":memory:")
+
+    def tearDown(self):
+        with DbTxn("Remove test objects", self.db, batch=True) as trans:
+            for handle in self.db.get_family_handles():
+                self.db.remove_family(handle, trans)
+            for handle in self.db.get_person_handles():
+                self.db.remove_person(handle, trans)
+
+    def __add_family(self, trans):
+        father = Person()
+        self.db.add_person(father, trans)
+        children = [Person(), Person()]
+        family = Family()
+        family.set_father_handle(father.handle)
+        for child in children:
+            self.db.add_person(child, trans)
+            childref = ChildRef()
+            childref.ref = child.handle
+            family.add_child_ref(childref)
+        self.db.add_family(family, trans)
+        father.add_family_handle(family.handle)
+        self.db.commit_person(father, trans)
+        for child in children:
+            child.add_parent_family_handle(family.handle)
+            self.db.commit_person(child, trans)
+        return father, children, family
+
+    def __check_links(self, father, children, family):
+        self.assertEqual(
+            self.db.get_person_family_handles(father.handle), [family.handle]
+        )
+        self.assertEqual(self.db.get_person_parent_family_handles(father.handle), [])
+        self.assertEqual(
+            self.db.get_person_parent_family_handles(children[0].handle),
+            [family.handle],
+        )
+        self.assertEqual(
+            self.db.get_family_parent_handles(family.handle), (father.handle, None)
+        )
+        self.assertEqual(
+            self.db.get_family_child_handles(family.handle),
+            [child.handle for child in children],
+        )
+
+    def test_links(self):
+        with DbTxn("Add test objects", self.db) as trans:
+            father, children, family = self.__add_family(trans)
+        self.__check_links(father, children, family)
+
+    def test_batch_links(self):
+        with DbTxn("Add test objects", self.db, batch=True) as trans:
+            father, children, family = self.__add_family(trans)
+            self.__check_links(father, children, family)
+        self.__check_links(father, children, family)
+
+    def test_reorder_children(self):
+        with DbTxn("Add test objects", self.db) as trans:
+            father, children, family = self.__add_family(trans)
+        family.set_child_ref_list(family.get_child_ref_list()[::-1])
+        with DbTxn("Reorder children", self.db) as trans:
+            self.db.commit_family(family, trans)
+        self.assertEqual(
+            self.db.get_family_child_handles(family.handle),
+            [child.handle for child in children[::-1]],
+        )
+        self.db.undo()
+        self.__check_links(father, children, family)
+
+    def test_remove(self):
+        with DbTxn("Add test objects", self.db) as trans:
+            father, children, family = self.__add_family(trans)
+        with DbTxn("Remove test family", self.db) as trans:
+            self.db.remove_family(family.handle, trans)
+        self.assertEqual(self.db.get_family_child_handles(family.handle), [])
+        self.assertEqual(self.db.get_family_parent_handles(family.handle), (None, None))
+        self.db.undo()
+        self.__check_links(father, children, family)
+
+
+# -------------------------------------------------------------------------
+#
+# DbSoundexKeyTest class
+#
+# -------------------------------------------------------------------------
+class DbSoundexKeyTest(unittest.TestCase):
+    """
+    Tests of the surname soundex column.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = make_database("sqlite")
+        cls.db.load(":memory:")
+
+    def tearDown(self):
+        with DbTxn("Remove test objects", self.db, batch=True) as trans:
+            for handle in self.db.get_person_handles():
+                self.db.remove_person(handle, trans)
+
+    def __add_person(self, surnames, gender, trans):
+        person = Person()
+        person.set_gender(gender)
+        for surname in surnames:
+            surname_obj = Surname()
+            surname_obj.set_surname(surname)
+            person.get_primary_name().add_surname(surname_obj)
+        self.db.add_person(person, trans)
+        return person
+
+    def __check_keys(self, expected):
+        keys = sorted(self.db.iter_person_soundex_keys())
+        self.assertEqual(keys, sorted(expected))
+        self.assertEqual(keys, sorted(DbReadBase.iter_person_soundex_keys(self.db)))
+
+    def test_keys(self):
+        with DbTxn("Add test objects", self.db) as trans:
+            person1 = self.__add_person(["Smith"], Person.MALE, trans)
+            person2 = self.__add_person(["van", "Gogh"], Person.FEMALE, trans)
+            person3 = self.__add_person([], Person.UNKNOWN, trans)
+        self.__check_keys(
+            [
+                (person1.handle, Person.MALE, "S530"),
+                (person2.handle, Person.FEMALE, "V522"),
+                (person3.handle, Person.UNKNOWN, "Z000"),
+            ]
+        )
+
+    def test_batch_keys(self):
+        with DbTxn("Add test objects", self.db, batch=True) as trans:
+            person = self.__add_person(["Smyth"], Person.MALE, trans)
+        self.__check_keys([(person.handle, Person.MALE, "S530")])
+
+    def test_update(self):
+        with DbTxn("Add test objects", self.db) as trans:
+            person = self.__add_person(["Smith"], Person.MALE, trans)
+        person.get_primary_name().get_primary_surname().set_surname("Jones")
+        with DbTxn("Rename test person", self.db) as trans:
+            self.db.commit_person(person, trans)
+        self.__check_keys([(person.handle, Person.MALE, "J520")])
+        self.db.undo()
+        self.__check_keys([(person.handle, Person.MALE, "S530")])
+
+
+# -------------------------------------------------------------------------
+#
+# DbSortKeyTest class
+#
+# -------------------------------------------------------------------------
+class DbSortKeyTest(unittest.TestCase):
+    """
+    Tests of the sort key columns.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = make_database("sqlite")
+        cls.db.load(":memory:")
+
+    def tearDown(self):
+        with DbTxn("Remove test objects", self.db, batch=True) as trans:
+            for handle in self.db.get_person_handles():
+                self.db.remove_person(handle, trans)
+            for handle in self.db.get_event_handles():
+                self.db.remove_event(handle, trans)
+            for handle in self.db.get_place_handles():
+                self.db.remove_place(handle, trans)
+
+    def __add_person(self, first_name, surname, trans, year=None):
+        person = Person()
+        person.get_primary_name().set_first_name(first_name)
+        surname_obj = Surname()
+        surname_obj.set_surname(surname)
+        person.get_primary_name().add_surname(surname_obj)
+        if year is not None:
+            event = Event()
+            event.set_type(EventType.BIRTH)
+            event.get_date_object().set_yr_mon_day(year, 1, 1)
+            self.db.add_event(event, trans)
+            event_ref = EventRef()
+            event_ref.set_reference_handle(event.handle)
+            person.add_event_ref(event_ref)
+            person.set_birth_ref(event_ref)
+        self.db.add_person(person, trans)
+        return person
+
+    def __add_place(self, name, trans, enclosed_by=None):
+        place = Place()
+        place.set_name(PlaceName(value=name))
+        if enclosed_by is not None:
+            placeref = PlaceRef()
+            placeref.set_reference_handle(enclosed_by.handle)
+            place.add_placeref(placeref)
+        self.db.add_place(place, trans)
+        return place
+
+    def __check_keys(self, class_name, column, handles):
+        """
+        Check the order of the handles, and that the stored sort keys are
+        those computed from the objects.
+        """
+        keys = self.db.get_sort_keys(class_name, column)
+        self.assertEqual([handle for dummy_key, handle in keys], handles)
+        self.assertEqual(keys, DbReadBase.get_sort_keys(self.db, class_name, column))
+
+    def test_name(self):
+        with DbTxn("Add test objects", self.db) as trans:
+            person1 = self.__add_person("John", "Smith", trans)
+            person2 = self.__add_person("Anne", "Jones", trans)
+            person3 = self.__add_person("Adam", "Smith", trans)
+        self.__check_keys(
+            "Person", "sort_name", [person2.handle, person3.handle, person1.handle]
+        )
+
+    def test_birth(self):
+        with DbTxn("Add test objects", self.db) as trans:
+            person1 = self.__add_person("John", "Smith", trans, 1900)
+            person2 = self.__add_person("Anne", "Jones", trans, 1950)
+        self.__check_keys("Person", "sort_birth", [person1.handle, person2.handle])
+        self.__check_keys("Person", "sort_death", [person1.handle, person2.handle])
+
+        # the sort key of a person follows its birth event
+        event = self.db.get_event_from_handle(person1.get_birth_ref().ref)
+        event.get_date_object().set_yr_mon_day(2000, 1, 1)
+        with DbTxn("Change test event", self.db) as trans:
+            self.db.commit_event(event, trans)
+        self.__check_keys("Person", "sort_birth", [person2.handle, person1.handle])
+        self.db.undo()
+        self.__check_keys("Person", "sort_birth", [person1.handle, person2.handle])
+
+    def test_batch_birth(self):
+        with DbTxn("Add test objects", self.db, batch=True) as trans:
+            # people are committed before their events when importing
+            person1 = Person()
+            person1.get_primary_name().set_first_name("John")
+            person2 = self.__add_person("Anne", "Jones", trans, 1950)
+            event = Event()
+            event.set_handle("E0001")
+            event.set_type(EventType.BIRTH)
+            event.get_date_object().set_yr_mon_day(1900, 1, 1)
+            event_ref = EventRef()
+            event_ref.set_reference_handle(event.handle)
+            person1.add_event_ref(event_ref)
+            person1.set_birth_ref(event_ref)
+            self.db.add_person(person1, trans)
+            self.db.add_event(event, trans)
+        self.__check_keys("Person", "sort_birth", [person1.handle, person2.handle])
+
+    def test_place_title(self):
+        with DbTxn("Add test objects", self.db) as trans:
+            country = self.__add_place("France", trans)
+            city1 = self.__add_place("Paris", trans, country)
+            city2 = self.__add_place("Lyon", trans, country)
+            other = self.__add_place("Italy", trans)
+        self.__check_keys(
+            "Place",
+            "sort_title",
+            [country.handle, other.handle, city2.handle, city1.handle],
+        )
+
+        # the titles of the enclosed places follow the enclosing place
+        country.set_name(PlaceName(value="Spain"))
+        with DbTxn("Rename test place", self.db) as trans:
+            self.db.commit_place(country, trans)
+        self.__check_keys(
+            "Place",
+            "sort_title",
+            [other.handle, city2.handle, city1.handle, country.handle],
+        )
+
+    def test_format(self):
+        with DbTxn("Add test objects", self.db) as trans:
+            person1 = self.__add_person("John", "Smith", trans)
+            person2 = self.__add_person("Anne", "Smyth", trans)
+        self.__check_keys("Person", "sort_name", [person1.handle, person2.handle])
+        old_format = name_displayer.get_default_format()
+        name_displayer.set_default_format(Name.FN)
+        try:
+            # the sort keys are computed again in the new format
+            self.__check_keys("Person", "sort_name", [person2.handle, person1.handle])
+        finally:
+            name_displayer.set_default_format(old_format)
+        self.__check_keys("Person", "sort_name", [person1.handle, person2.handle])
+
+
+# -------------------------------------------------------------------------
+#
+# DbUpgradeTest class
+#
+# -------------------------------------------------------------------------
+class DbUpgradeTest(unittest.TestCase):
+    """
+    Tests of the upgrade of databases written by an older version.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = make_database("sqlite")
+        self.db.load(self.tmpdir.name)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmpdir.cleanup()
+
+    def __reopen(self, version, *statements):
+        """
+        Make the database look as if it was written by an older version,
+        then open it again. It can only be opened with a schema upgrade.
+        """
+        for statement in statements:
+            self.db.dbapi.execute(statement)
+        self.db.dbapi.commit()
+        self.db.set_schema_version(version)
+        self.db.close()
+        self.db = make_database("sqlite")
+        with self.assertRaises(DbUpgradeRequiredError):
+            self.db.load(self.tmpdir.name)
+        self.db = make_database("sqlite")
+        self.db.load(self.tmpdir.name, force_schema_upgrade=True)
+        self.assertEqual(self.db.get_schema_version(), self.db.VERSION[0])
+
+    def __add_family(self):
+        with DbTxn("Add test objects", self.db) as trans:
+            child = Person()
+            self.db.add_person(child, trans)
+            family = Family()
+            childref = ChildRef()
+            childref.ref = child.handle
+            family.add_child_ref(childref)
+            self.db.add_family(family, trans)
+            child.add_parent_family_handle(family.handle)
+            self.db.commit_person(child, trans)
+        return child, family
+
+    def test_family_links(self):
+        child, family = self.__add_family()
+        self.__reopen(21, "DROP TABLE family_link")
+        self.assertEqual(
+            self.db.get_family_child_handles(family.handle), [child.handle]
+        )
+        self.assertEqual(
+            self.db.get_person_parent_family_handles(child.handle), [family.handle]
+        )
+
+    def test_stale_family_links(self):
+        # An older version left the rows of the family link table behind
+        child, family = self.__add_family()
+        self.__reopen(21, "DELETE FROM family_link")
+        self.assertEqual(
+            self.db.get_family_child_handles(family.handle), [child.handle]
+        )
+
+    def __add_person(self, surname):
+        with DbTxn("Add test objects", self.db) as trans:
+            person = Person()
+            person.set_gender(Person.MALE)
+            surname_obj = Surname()
+            surname_obj.set_surname(surname)
+            person.get_primary_name().add_surname(surname_obj)
+            self.db.add_person(person, trans)
+        return person
+
+    def test_surname_soundex(self):
+        person = self.__add_person("Smith")
+        self.__reopen(
+            21,
+            "DROP INDEX person_surname_soundex",
+            "ALTER TABLE person DROP COLUMN surname_soundex",
+        )
+        self.assertEqual(
+            list(self.db.iter_person_soundex_keys()),
+            [(person.handle, Person.MALE, "S530")],
+        )
+
+    def test_stale_surname_soundex(self):
+        person = self.__add_person("Smith")
+        self.__reopen(21, "UPDATE person SET surname_soundex = NULL")
+        self.assertEqual(
+            list(self.db.iter_person_soundex_keys()),
+            [(person.handle, Person.MALE, "S530")],
+        )
+
+    def __check_sort_keys(self, handles):
+        keys = self.db.get_sort_keys("Person", "sort_name")
+        self.assertEqual([handle for dummy_key, handle in keys], handles)
+        self.assertEqual(keys, DbReadBase.get_sort_keys(self.db, "Person", "sort_name"))
+
+    def test_sort_keys(self):
+        person1 = self.__add_person("Smith")
+        person2 = self.__add_person("Jones")
+        statements = []
+        for table, columns in SORT_KEY_COLUMNS.items():
+            table = table.lower()
+            for column, dummy_sort_value in columns:
+                statements.append(f"DROP INDEX {table}_{column}")
+                statements.append(f"ALTER TABLE {table} DROP COLUMN {column}")
+        self.__reopen(21, *statements)
+        self.__check_sort_keys([person2.handle, person1.handle])
+
+    def test_stale_sort_keys(self):
+        person1 = self.__add_person("Smith")
+        person2 = self.__add_person("Jones")
+        self.__check_sort_keys([person2.handle, person1.handle])
+        self.__reopen(21, "UPDATE person SET sort_name = NULL")
+        self.__check_sort_keys([person2.handle, person1.handle])
+
+    def test_steps(self):
+        # Each step reads the raw data written by the previous one
+        with DbTxn("Add test objects", self.db) as trans:
+            place = Place()
+            self.db.add_place(place, trans)
+        self.db.get_raw_place_data(place.handle)
+
+        def upgrade_step(suffix):
+            self.db._txn_begin()
+            for handle in self.db.get_place_handles():
+                data = self.db.get_raw_place_data(handle)
+                data["title"] += suffix
+                self.db._commit_raw(data, PLACE_KEY)
+            self.db._txn_commit()
+
+        upgrade_step("first")
+        upgrade_step(", second")
+        self.assertEqual(
+            self.db.get_raw_place_data(place.handle)["title"], "first, second"
+        )
+
+
+# -------------------------------------------------------------------------
+#
+# DbReferenceMapTest class
+#
+# -------------------------------------------------------------------------
+class DbReferenceMapTest(unittest.TestCase):
+    """
+    Tests of the comparison of the reference map with the objects.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn("Add test objects", self.db) as trans:
+            self.event = Event()
+            self.db.add_event(self.event, trans)
+            self.person = Person()
+            event_ref = EventRef()
+            event_ref.ref = self.event.handle
+            self.person.add_event_ref(event_ref)
+            self.db.add_person(self.person, trans)
+            self.family = Family()
+            self.family.set_father_handle(self.person.handle)
+            self.db.add_family(self.family, trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def __check_errors(self, errors):
+        self.steps = 0
+        self.assertEqual(self.db.find_reference_map_errors(self.__step), errors)
+        self.assertEqual(self.steps, 3)
+        self.assertEqual(DbReadBase.find_reference_map_errors(self.db), errors)
+
+    def __step(self):
+        self.steps += 1
+
+    def test_no_errors(self):
+        self.__check_errors(([], []))
+
+    def test_errors(self):
+        self.db.dbapi.execute(
+            "DELETE FROM reference WHERE ref_handle = ?", [self.event.handle]
+        )
+        self.db.dbapi.execute(
+            "INSERT INTO reference (obj_handle, obj_class, ref_handle, ref_class) "
+            "VALUES (?, ?, ?, ?)",
+            ["N0001", "Note", self.person.handle, "Person"],
+        )
+        self.__check_errors(
+            (
+                [("Person", self.person.handle, "Event", self.event.handle)],
+                [("Note", "N0001", "Person", self.person.handle)],
+            )
+        )
+
+
+# -------------------------------------------------------------------------
+#
+# DbUndoTest class
+#
+# -------------------------------------------------------------------------
+class DbUndoTest(unittest.TestCase):
+    """
+    Tests of the undo database.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+
+    def tearDown(self):
+        self.db.close()
+
+    def __rename(self, person, first_name):
+        person.get_primary_name().set_first_name(first_name)
+        with DbTxn("Rename test person", self.db) as trans:
+            self.db.commit_person(person, trans)
+
+    def __check_undo(self):
+        with DbTxn("Add test person", self.db) as trans:
+            person = Person()
+            person.get_primary_name().set_first_name("John")
+            self.db.add_person(person, trans)
+        for first_name in ("Anne", "Adam", "Mary"):
+            self.__rename(person, first_name)
+        names = []
+        for dummy_undo in range(3):
+            self.db.undo()
+            person = self.db.get_person_from_handle(person.handle)
+            names.append(person.get_primary_name().get_first_name())
+        self.db.redo()
+        person = self.db.get_person_from_handle(person.handle)
+        names.append(person.get_primary_name().get_first_name())
+        self.assertEqual(names, ["Adam", "Anne", "John", "Anne"])
+
+    def test_records(self):
+        with DbTxn("Add test person", self.db) as trans:
+            person = Person()
+            self.db.add_person(person, trans)
+        old_data = self.db.get_raw_person_data(person.handle)
+        self.__rename(person, "Anne")
+        txn = self.db.undodb.undoq[-1]
+        record = txn.get_record(txn.last)
+        self.assertEqual(record[:3], (0, 1, person.handle))
+        self.assertEqual(record[3], old_data)
+        self.assertEqual(record[4], self.db.get_raw_person_data(person.handle))
+
+    def test_undo(self):
+        self.__check_undo()
+
+    def test_undo_from_file(self):
+        # keep no record in memory
+        self.db.undodb._memory_limit = 0
+        self.__check_undo()
+        self.assertEqual(self.db.undodb._in_file, len(self.db.undodb))
+
+
+# -------------------------------------------------------------------------
+#
+# DbSignalTest class
+#
+# -------------------------------------------------------------------------
+class DbSignalTest(unittest.TestCase):
+    """
+    Tests of the signals emitted for the changes of a transaction.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.signals = []
+        for action in ("add", "update", "delete"):
+            self.db.connect("person-" + action, self.__log(action))
+
+    def tearDown(self):
+        self.db.close()
+
+    def __log(self, action):
+        return lambda handles: self.signals.append((action, handles))
+
+    def __changes(self):
+        with DbTxn("Change test people", self.db) as trans:
+            person1 = Person()
+            person2 = Person()
+            self.db.add_person(person1, trans)
+            self.db.add_person(person2, trans)
+            for first_name in ("Anne", "Mary"):
+                person1.get_primary_name().set_first_name(first_name)
+                self.db.commit_person(person1, trans)
+            self.db.remove_person(person2.handle, trans)
+        return person1.handle, person2.handle
+
+    def test_commit(self):
+        handle1, handle2 = self.__changes()
+        self.assertEqual(
+            self.signals,
+            [("delete", [handle2]), ("add", [handle1]), ("update", [handle1])],
+        )
+
+    def test_undo(self):
+        handle1, handle2 = self.__changes()
+        self.signals = []
+        self.db.undo()
+        self.assertEqual(self.signals, [("delete", [handle2, handle1])])
+        self.signals = []
+        self.db.redo()
+        self.assertEqual(
+            self.signals,
+            [("delete", [handle2]), ("add", [handle1]), ("update", [handle1])],
+        )
+
+    def test_duplicates(self):
+        """
+        Each object is in a signal once, in the order of its first change,
+        however many times it was changed.
+        """
+        trans = DbTxn("Change test people", self.db)
+        handles = ["H%04d" % index for index in range(100)]
+        for trans_type in (TXNADD, TXNUPD, TXNUPD):
+            for handle in handles:
+                trans.add(PERSON_KEY, trans_type, handle, None, None)
+        for handle in handles[::2] + handles[::4]:
+            trans.add(PERSON_KEY, TXNDEL, handle, None, None)
+        self.db.emit_changes(trans)
+        self.assertEqual(
+            self.signals,
+            [
+                ("delete", handles[::2]),
+                ("add", handles[1::2]),
+                ("update", handles[1::2]),
+            ],
+        )
+
+
+def benchmark_signals():
+    """
+    Print the time taken by the signals of transactions of growing sizes,
+    which should grow linearly. This is not a unit test: run this module
+    with --benchmark.
+    """
+    database = make_database("sqlite")
+    database.load(":memory:")
+    for size in (BENCHMARK_SIZE // 10, BENCHMARK_SIZE):
+        trans = DbTxn("Benchmark", database)
+        handles = ["H%08d" % index for index in range(size)]
+        for trans_type in (TXNADD, TXNUPD):
+            for handle in handles:
+                trans.add(PERSON_KEY, trans_type, handle, None, None)
+        for handle in handles[::2]:
+            trans.add(PERSON_KEY, TXNDEL, handle, None, None)
+        seconds = min(repeat(lambda: database.emit_changes(trans), number=1, repeat=3))
+        print("%d objects: %.4f s" % (size, seconds))
+    database.close()
+
+
+def benchmark_cache():
+    """
+    Print the time taken to get people from a database on disk, reading
+    their rows, and then from the object cache. This is not a unit test:
+    run this module with --benchmark.
+    """
+    size = BENCHMARK_SIZE // 10
+    with tempfile.TemporaryDirectory() as dirpath:
+        database = make_database("sqlite")
+        database.load(dirpath)
+        with DbTxn("Benchmark", database) as trans:
+            for index in range(size):
+                person = Person()
+                name = Name()
+                name.set_first_name("Given %d" % index)
+                surname = Surname()
+                surname.set_surname("Surname %d" % (index % 100))
+                name.add_surname(surname)
+                person.set_primary_name(name)
+                database.add_person(person, trans)
+        handles = database.get_person_handles()
+
+        def read():
+            for handle in handles:
+                database.get_person_from_handle(handle)
+
+        def read_rows():
+            database._clear_cache()
+            read()
+
+        for name, func in (("rows", read_rows), ("cache", read)):
+            seconds = min(repeat(func, number=1, repeat=5))
+            print("%d people from %s: %.4f s" % (size, name, seconds))
+        database.close()
+
+
 if __name__ == "__main__":
-    unittest.main()
+    if "--benchmark" in sys.argv:
+        benchmark_signals()
+        benchmark_cache()
+    else:
+        unittest.main()
@@ -162,29 +162,6 @@ PEDIGREE_TYPES = {
 NOTES_PER_PERSON = 104  # fudge factor to make progress meter a bit smoother
 
 
-# -------------------------------------------------------------------------
-#
-# sort_handles_by_id
-#
-# -------------------------------------------------------------------------
-def sort_handles_by_id(handle_list, handle_to_object):
-    """
-    Sort a list of handles by the Gramps ID.
-
-    The function that returns the object from the handle needs to be supplied
-    so that we get the right object.
-
-    """
-    sorted_list = []
-    for handle in handle_list:
-        obj = handle_to_object(handle)
-        if obj:
-            data = (obj.get_gramps_id(), handle)
-            sorted_list.append(data)
-    sorted_list.sort()
-    return sorted_list
-
-
 # -------------------------------------------------------------------------
 #
 # breakup
@@ -257,6 +234,10 @@ class GedcomWriter(UpdateCallback):
         self.dirname = None
         self.gedcom_file = None
         self.progress_cnt = 0
+        self.citations = {}
+        self.families = {}
+        self.sources = {}
+        self.places = {}
         self.setup(option_box)
 
     def setup(self, option_box):
@@ -275,6 +256,10 @@ class GedcomWriter(UpdateCallback):
         """
 
         self.dirname = os.path.dirname(filename)
+        self.citations.clear()
+        self.families.clear()
+        self.sources.clear()
+        self.places.clear()
         with open(filename, "w", encoding="utf-8") as self.gedcom_file:
             person_len = self.dbase.get_number_of_people()
             family_len = self.dbase.get_number_of_families()
@@ -295,8 +280,24 @@ class GedcomWriter(UpdateCallback):
 
             self._writeln(0, "TRLR")
 
+        self.citations.clear()
+        self.families.clear()
+        self.sources.clear()
+        self.places.clear()
         return True
 
+    @staticmethod
+    def _lookup(cache, get_object, handle):
+        """
+        Return the object of a handle, getting it from the database only the
+        first time it is referenced during the export.
+        """
+        try:
+            return cache[handle]
+        except KeyError:
+            obj = cache[handle] = get_object(handle)
+            return obj
+
     def _writeln(self, level, token, textlines="", limit=72):
         """
         Write a line of text to the output file in the form of:
@@ -430,25 +431,14 @@ class GedcomWriter(UpdateCallback):
         """
         Write the individual people to the gedcom file.
 
-        Since people like to have the list sorted by ID value, we need to go
-        through a sorting step. We need to reset the progress bar, otherwise,
-        people will be confused when the progress bar is idle.
+        Since people like to have the list sorted by ID value, the people
+        are read from the database in Gramps ID order.
 
         """
         self.set_text(_("Writing individuals"))
-        phandles = self.dbase.iter_person_handles()
-
-        sorted_list = []
-        for handle in phandles:
-            person = self.dbase.get_person_from_handle(handle)
-            if person:
-                data = (person.get_gramps_id(), handle)
-                sorted_list.append(data)
-        sorted_list.sort()
-
-        for data in sorted_list:
+        for person in self.dbase.iter_objects_by_id("Person"):
             self.update()
-            self._person(self.dbase.get_person_from_handle(data[1]))
+            self._person(person)
 
     def _person(self, person):
         """
@@ -661,7 +651,7 @@ class GedcomWriter(UpdateCallback):
         adoptions = []
 
         for family in [
-            self.dbase.get_family_from_handle(fh)
+            self._lookup(self.families, self.dbase.get_family_from_handle, fh)
             for fh in person.get_parent_family_handle_list()
         ]:
             if family is None:
@@ -767,7 +757,7 @@ class GedcomWriter(UpdateCallback):
 
         # get the list of familes from the handle list
         family_list = [
-            self.dbase.get_family_from_handle(hndl)
+            self._lookup(self.families, self.dbase.get_family_from_handle, hndl)
             for hndl in person.get_parent_family_handle_list()
         ]
 
@@ -822,7 +812,7 @@ class GedcomWriter(UpdateCallback):
 
         # get the list of familes from the handle list
         family_list = [
-            self.dbase.get_family_from_handle(hndl)
+            self._lookup(self.families, self.dbase.get_family_from_handle, hndl)
             for hndl in person.get_family_handle_list()
         ]
 
@@ -874,18 +864,9 @@ class GedcomWriter(UpdateCallback):
         Write out the list of families, sorting by Gramps ID.
         """
         self.set_text(_("Writing families"))
-        # generate a list of (GRAMPS_ID, HANDLE) pairs. This list
-        # can then be sorted by the sort routine, which will use the
-        # first value of the tuple as the sort key.
-        sorted_list = sort_handles_by_id(
-            self.dbase.get_family_handles(), self.dbase.get_family_from_handle
-        )
-
-        # loop through the sorted list, pulling of the handle. This list
-        # has already been sorted by GRAMPS_ID
-        for family_handle in [hndl[1] for hndl in sorted_list]:
+        for family in self.dbase.iter_objects_by_id("Family"):
             self.update()
-            self._family(self.dbase.get_family_from_handle(family_handle))
+            self._family(family)
 
     def _family(self, family):
         """
@@ -1041,16 +1022,9 @@ class GedcomWriter(UpdateCallback):
         Write out the list of sources, sorting by Gramps ID.
         """
         self.set_text(_("Writing sources"))
-        sorted_list = sort_handles_by_id(
-            self.dbase.get_source_handles(), self.dbase.get_source_from_handle
-        )
-
-        for source_id, handle in sorted_list:
+        for source in self.dbase.iter_objects_by_id("Source"):
             self.update()
-            source = self.dbase.get_source_from_handle(handle)
-            if source is None:
-                continue
-            self._writeln(0, "@%s@" % source_id, "SOUR")
+            self._writeln(0, "@%s@" % source.get_gramps_id(), "SOUR")
             if source.get_title():
                 self._writeln(1, "TITL", source.get_title())
 
@@ -1083,18 +1057,11 @@ class GedcomWriter(UpdateCallback):
         """
         self.set_text(_("Writing notes"))
         note_cnt = 0
-        sorted_list = sort_handles_by_id(
-            self.dbase.get_note_handles(), self.dbase.get_note_from_handle
-        )
-
-        for note_handle in [hndl[1] for hndl in sorted_list]:
+        for note in self.dbase.iter_objects_by_id("Note"):
             # the following makes the progress bar a bit smoother
             if not note_cnt % NOTES_PER_PERSON:
                 self.update()
             note_cnt += 1
-            note = self.dbase.get_note_from_handle(note_handle)
-            if note is None:
-                continue
             self._note_record(note)
 
     def _note_record(self, note):
@@ -1125,18 +1092,12 @@ class GedcomWriter(UpdateCallback):
         +1 <<CHANGE_DATE>> {0:1}
         """
         self.set_text(_("Writing repositories"))
-        sorted_list = sort_handles_by_id(
-            self.dbase.get_repository_handles(), self.dbase.get_repository_from_handle
-        )
 
         # GEDCOM only allows for a single repository per source
 
-        for repo_id, handle in sorted_list:
+        for repo in self.dbase.iter_objects_by_id("Repository"):
             self.update()
-            repo = self.dbase.get_repository_from_handle(handle)
-            if repo is None:
-                continue
-            self._writeln(0, "@%s@" % repo_id, "REPO")
+            self._writeln(0, "@%s@" % repo.get_gramps_id(), "REPO")
             if repo.get_name():
                 self._writeln(1, "NAME", repo.get_name())
             for addr in repo.get_address_list():
@@ -1237,7 +1198,9 @@ class GedcomWriter(UpdateCallback):
         place = None
 
         if event.get_place_handle():
-            place = self.dbase.get_place_from_handle(event.get_place_handle())
+            place = self._lookup(
+                self.places, self.dbase.get_place_from_handle, event.get_place_handle()
+            )
             self._place(place, dateobj, 2)
 
         for attr in event.get_attribute_list():
@@ -1314,13 +1277,19 @@ class GedcomWriter(UpdateCallback):
         self._date(index + 1, lds_ord.get_date_object())
         if lds_ord.get_family_handle():
             family_handle = lds_ord.get_family_handle()
-            family = self.dbase.get_family_from_handle(family_handle)
+            family = self._lookup(
+                self.families, self.dbase.get_family_from_handle, family_handle
+            )
             if family:
                 self._writeln(index + 1, "FAMC", "@%s@" % family.get_gramps_id())
         if lds_ord.get_temple():
             self._writeln(index + 1, "TEMP", lds_ord.get_temple())
         if lds_ord.get_place_handle():
-            place = self.dbase.get_place_from_handle(lds_ord.get_place_handle())
+            place = self._lookup(
+                self.places,
+                self.dbase.get_place_from_handle,
+                lds_ord.get_place_handle(),
+            )
             self._place(place, lds_ord.get_date_object(), 2)
         if lds_ord.get_status() != LdsOrd.STATUS_NONE:
             self._writeln(2, "STAT", LDS_STATUS[lds_ord.get_status()])
@@ -1434,7 +1403,9 @@ class GedcomWriter(UpdateCallback):
         +1 <<NOTE_STRUCTURE>> {0:M}
         """
 
-        citation = self.dbase.get_citation_from_handle(citation_handle)
+        citation = self._lookup(
+            self.citations, self.dbase.get_citation_from_handle, citation_handle
+        )
         if citation is None:  # removed by proxy
             return
 
@@ -1442,7 +1413,7 @@ class GedcomWriter(UpdateCallback):
         if src_handle is None:
             return
 
-        src = self.dbase.get_source_from_handle(src_handle)
+        src = self._lookup(self.sources, self.dbase.get_source_from_handle, src_handle)
         if src is None:
             return
 
@@ -1523,18 +1494,9 @@ class GedcomWriter(UpdateCallback):
         Write out the list of media, sorting by Gramps ID.
         """
         self.set_text(_("Writing media"))
-        # generate a list of (GRAMPS_ID, HANDLE) pairs. This list
-        # can then be sorted by the sort routine, which will use the
-        # first value of the tuple as the sort key.
-        sorted_list = sort_handles_by_id(
-            self.dbase.get_media_handles(), self.dbase.get_media_from_handle
-        )
-
-        # loop through the sorted list, pulling of the handle. This list
-        # has already been sorted by GRAMPS_ID
-        for media_handle in [hndl[1] for hndl in sorted_list]:
+        for media in self.dbase.iter_objects_by_id("Media"):
             self.update()
-            self._media(self.dbase.get_media_from_handle(media_handle))
+            self._media(media)
 
     def _media(self, media):
         """
@@ -0,0 +1,108 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the Gramps XML export.
+"""
+
+import io
+import os
+import unittest
+from contextlib import ExitStack
+from unittest.mock import patch
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.proxy.proxybase import ProxyDbBase
+from gramps.gen.user import User
+from ..exportxml import GrampsXmlWriter
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+CLASSES = (
+    "Tag",
+    "Event",
+    "Person",
+    "Family",
+    "Citation",
+    "Source",
+    "Place",
+    "Media",
+    "Repository",
+    "Note",
+)
+
+
+class ExportXmlCheck(unittest.TestCase):
+    """
+    Compare the export streamed from the database with the export of the
+    same database through a proxy, which gets each object by its handle.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def export(self, db):
+        """
+        Export the database to XML, returning the output.
+        """
+        output = io.BytesIO()
+        output.close = lambda: None
+        writer = GrampsXmlWriter(db, 0, 0, "test", User())
+        writer.write_handle(output)
+        return output.getvalue()
+
+    def test_export(self):
+        self.assertEqual(self.export(self.db), self.export(ProxyDbBase(self.db)))
+
+    def test_cursor(self):
+        """
+        Test that the objects are read from one cursor per class, instead of
+        being got one by one by their handles.
+        """
+        with ExitStack() as stack:
+            iterate = stack.enter_context(
+                patch.object(
+                    self.db,
+                    "iter_objects_by_handle",
+                    wraps=self.db.iter_objects_by_handle,
+                )
+            )
+            getters = {}
+            for class_name in CLASSES:
+                method = "get_%s_from_handle" % class_name.lower()
+                getters[class_name] = stack.enter_context(
+                    patch.object(self.db, method, wraps=getattr(self.db, method))
+                )
+            self.export(self.db)
+        self.assertCountEqual(
+            [args for args, kwargs in iterate.call_args_list],
+            [(class_name,) for class_name in CLASSES],
+        )
+        # Only the home person is got by its handle
+        expected = dict.fromkeys(CLASSES, 0)
+        expected["Person"] = 1
+        self.assertEqual(
+            {class_name: getter.call_count for class_name, getter in getters.items()},
+            expected,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -525,20 +525,19 @@ class VCardParser:
                     else:
                         addr.set_street(strng)
 
-            addr._add_street = add_street
             set_func = [
-                "_add_street",
-                "_add_street",
-                "_add_street",
-                "set_city",
-                "set_state",
-                "set_postal_code",
-                "set_country",
+                add_street,
+                add_street,
+                add_street,
+                addr.set_city,
+                addr.set_state,
+                addr.set_postal_code,
+                addr.set_country,
             ]
             for i, data in enumerate(data_fields):
                 if i >= len(set_func):
                     break
-                getattr(addr, set_func[i])(data)
+                set_func[i](data)
             self.person.add_address(addr)
 
     def add_phone(self, fields, data):
@@ -2739,7 +2739,7 @@ class GrampsParser(UpdateCallback):
         # but you may re-order them if needed.
         LOG.warning(
             _("Invalid date {date} in XML {xml}, preserving XML as text").format(
-                date=date_error.date.__dict__, xml=xml
+                date=date_error.date.get_object_state(), xml=xml
             )
         )
         date_value.set(modifier=Date.MOD_TEXTONLY, text=xml)
@@ -2765,7 +2765,8 @@ class GrampsParser(UpdateCallback):
         date_value.set_as_text(attrs["val"])
 
     def start_pos(self, attrs):
-        self.person.position = (int(attrs["x"]), int(attrs["y"]))
+        # The position of a person in old files is not kept
+        pass
 
     def stop_attribute(self, *tag):
         self.attribute = None
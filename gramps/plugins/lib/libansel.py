@@ -0,0 +1,627 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+ANSEL codec.
+
+Importing this module registers the "ansel" encoding with Python's codecs,
+so that ANSEL text can be read and written like any other encoding::
+
+    text = data.decode("ansel")
+    stream = TextIOWrapper(binary_file, encoding="ansel")
+
+ANSEL references:
+http://lcweb2.loc.gov/diglib/codetables/45.html
+http://www.gymel.com/charsets/ANSEL.html
+
+ASCII bytes stand for themselves. In ANSEL, the combining forms precede the
+character they modify, whereas in Unicode the combining character follows
+it; only a printable ASCII character can be modified. Unicode allows several
+combining characters, but ANSEL may not, so only the last of several
+combining forms is kept. A byte that is not defined, or a combining form
+that modifies nothing, is an error handled as the errors argument says.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+import codecs
+import re
+import unicodedata
+
+# -------------------------------------------------------------------------
+#
+# Tables
+#
+# -------------------------------------------------------------------------
+# mappings of single byte ANSEL codes to unicode
+ONEBYTE = {
+    b"\xa1": "\u0141",
+    b"\xa2": "\u00d8",
+    b"\xa3": "\u0110",
+    b"\xa4": "\u00de",
+    b"\xa5": "\u00c6",
+    b"\xa6": "\u0152",
+    b"\xa7": "\u02b9",
+    b"\xa8": "\u00b7",
+    b"\xa9": "\u266d",
+    b"\xaa": "\u00ae",
+    b"\xab": "\u00b1",
+    b"\xac": "\u01a0",
+    b"\xad": "\u01af",
+    b"\xae": "\u02bc",
+    b"\xb0": "\u02bb",
+    b"\xb1": "\u0142",
+    b"\xb2": "\u00f8",
+    b"\xb3": "\u0111",
+    b"\xb4": "\u00fe",
+    b"\xb5": "\u00e6",
+    b"\xb6": "\u0153",
+    b"\xb7": "\u02ba",
+    b"\xb8": "\u0131",
+    b"\xb9": "\u00a3",
+    b"\xba": "\u00f0",
+    b"\xbc": "\u01a1",
+    b"\xbd": "\u01b0",
+    b"\xbe": "\u25a1",
+    b"\xbf": "\u25a0",
+    b"\xc0": "\u00b0",
+    b"\xc1": "\u2113",
+    b"\xc2": "\u2117",
+    b"\xc3": "\u00a9",
+    b"\xc4": "\u266f",
+    b"\xc5": "\u00bf",
+    b"\xc6": "\u00a1",
+    b"\xc7": "\u00df",
+    b"\xc8": "\u20ac",
+    b"\xcd": "\u0065",
+    b"\xce": "\u006f",
+    b"\xcf": "\u00df",
+}
+
+# combining forms (in ANSEL, they precede the modified ASCII character
+# whereas the unicode combining term follows the character modified
+# Note: unicode allows multiple modifiers, but ANSEL may not (TDB?),
+# so we ignore multiple combining forms in this module
+#  8d & 8e are zero-width joiner (ZWJ), and zero-width non-joiner ZWNJ
+#  (strange things) probably not commonly found in our needs, unless one
+#   starts writing persian (or???) poetry in ANSEL
+COMBINERS = {
+    b"\x8d": "\u200d",
+    b"\x8e": "\u200c",
+    b"\xe0": "\u0309",
+    b"\xe1": "\u0300",
+    b"\xe2": "\u0301",
+    b"\xe3": "\u0302",
+    b"\xe4": "\u0303",
+    b"\xe5": "\u0304",
+    b"\xe6": "\u0306",
+    b"\xe7": "\u0307",
+    b"\xe8": "\u0308",
+    b"\xe9": "\u030c",
+    b"\xea": "\u030a",
+    b"\xeb": "\ufe20",
+    b"\xec": "\ufe21",
+    b"\xed": "\u0315",
+    b"\xee": "\u030b",
+    b"\xef": "\u0310",
+    b"\xf0": "\u0327",
+    b"\xf1": "\u0328",
+    b"\xf2": "\u0323",
+    b"\xf3": "\u0324",
+    b"\xf4": "\u0325",
+    b"\xf5": "\u0333",
+    b"\xf6": "\u0332",
+    b"\xf7": "\u0326",
+    b"\xf8": "\u031c",
+    b"\xf9": "\u032e",
+    b"\xfa": "\ufe22",
+    b"\xfb": "\ufe23",
+    b"\xfc": "\u0338",
+    b"\xfe": "\u0313",
+}
+
+# mappings of two byte (precomposed forms) ANSEL codes to unicode
+TWOBYTE = {
+    b"\xe0\x41": "\u1ea2",
+    b"\xe0\x45": "\u1eba",
+    b"\xe0\x49": "\u1ec8",
+    b"\xe0\x4f": "\u1ece",
+    b"\xe0\x55": "\u1ee6",
+    b"\xe0\x59": "\u1ef6",
+    b"\xe0\x61": "\u1ea3",
+    b"\xe0\x65": "\u1ebb",
+    b"\xe0\x69": "\u1ec9",
+    b"\xe0\x6f": "\u1ecf",
+    b"\xe0\x75": "\u1ee7",
+    b"\xe0\x79": "\u1ef7",
+    b"\xe1\x41": "\u00c0",
+    b"\xe1\x45": "\u00c8",
+    b"\xe1\x49": "\u00cc",
+    b"\xe1\x4f": "\u00d2",
+    b"\xe1\x55": "\u00d9",
+    b"\xe1\x57": "\u1e80",
+    b"\xe1\x59": "\u1ef2",
+    b"\xe1\x61": "\u00e0",
+    b"\xe1\x65": "\u00e8",
+    b"\xe1\x69": "\u00ec",
+    b"\xe1\x6f": "\u00f2",
+    b"\xe1\x75": "\u00f9",
+    b"\xe1\x77": "\u1e81",
+    b"\xe1\x79": "\u1ef3",
+    b"\xe2\x41": "\u00c1",
+    b"\xe2\x43": "\u0106",
+    b"\xe2\x45": "\u00c9",
+    b"\xe2\x47": "\u01f4",
+    b"\xe2\x49": "\u00cd",
+    b"\xe2\x4b": "\u1e30",
+    b"\xe2\x4c": "\u0139",
+    b"\xe2\x4d": "\u1e3e",
+    b"\xe2\x4e": "\u0143",
+    b"\xe2\x4f": "\u00d3",
+    b"\xe2\x50": "\u1e54",
+    b"\xe2\x52": "\u0154",
+    b"\xe2\x53": "\u015a",
+    b"\xe2\x55": "\u00da",
+    b"\xe2\x57": "\u1e82",
+    b"\xe2\x59": "\u00dd",
+    b"\xe2\x5a": "\u0179",
+    b"\xe2\x61": "\u00e1",
+    b"\xe2\x63": "\u0107",
+    b"\xe2\x65": "\u00e9",
+    b"\xe2\x67": "\u01f5",
+    b"\xe2\x69": "\u00ed",
+    b"\xe2\x6b": "\u1e31",
+    b"\xe2\x6c": "\u013a",
+    b"\xe2\x6d": "\u1e3f",
+    b"\xe2\x6e": "\u0144",
+    b"\xe2\x6f": "\u00f3",
+    b"\xe2\x70": "\u1e55",
+    b"\xe2\x72": "\u0155",
+    b"\xe2\x73": "\u015b",
+    b"\xe2\x75": "\u00fa",
+    b"\xe2\x77": "\u1e83",
+    b"\xe2\x79": "\u00fd",
+    b"\xe2\x7a": "\u017a",
+    b"\xe2\xa5": "\u01fc",
+    b"\xe2\xb5": "\u01fd",
+    b"\xe3\x41": "\u00c2",
+    b"\xe3\x43": "\u0108",
+    b"\xe3\x45": "\u00ca",
+    b"\xe3\x47": "\u011c",
+    b"\xe3\x48": "\u0124",
+    b"\xe3\x49": "\u00ce",
+    b"\xe3\x4a": "\u0134",
+    b"\xe3\x4f": "\u00d4",
+    b"\xe3\x53": "\u015c",
+    b"\xe3\x55": "\u00db",
+    b"\xe3\x57": "\u0174",
+    b"\xe3\x59": "\u0176",
+    b"\xe3\x5a": "\u1e90",
+    b"\xe3\x61": "\u00e2",
+    b"\xe3\x63": "\u0109",
+    b"\xe3\x65": "\u00ea",
+    b"\xe3\x67": "\u011d",
+    b"\xe3\x68": "\u0125",
+    b"\xe3\x69": "\u00ee",
+    b"\xe3\x6a": "\u0135",
+    b"\xe3\x6f": "\u00f4",
+    b"\xe3\x73": "\u015d",
+    b"\xe3\x75": "\u00fb",
+    b"\xe3\x77": "\u0175",
+    b"\xe3\x79": "\u0177",
+    b"\xe3\x7a": "\u1e91",
+    b"\xe4\x41": "\u00c3",
+    b"\xe4\x45": "\u1ebc",
+    b"\xe4\x49": "\u0128",
+    b"\xe4\x4e": "\u00d1",
+    b"\xe4\x4f": "\u00d5",
+    b"\xe4\x55": "\u0168",
+    b"\xe4\x56": "\u1e7c",
+    b"\xe4\x59": "\u1ef8",
+    b"\xe4\x61": "\u00e3",
+    b"\xe4\x65": "\u1ebd",
+    b"\xe4\x69": "\u0129",
+    b"\xe4\x6e": "\u00f1",
+    b"\xe4\x6f": "\u00f5",
+    b"\xe4\x75": "\u0169",
+    b"\xe4\x76": "\u1e7d",
+    b"\xe4\x79": "\u1ef9",
+    b"\xe5\x41": "\u0100",
+    b"\xe5\x45": "\u0112",
+    b"\xe5\x47": "\u1e20",
+    b"\xe5\x49": "\u012a",
+    b"\xe5\x4f": "\u014c",
+    b"\xe5\x55": "\u016a",
+    b"\xe5\x61": "\u0101",
+    b"\xe5\x65": "\u0113",
+    b"\xe5\x67": "\u1e21",
+    b"\xe5\x69": "\u012b",
+    b"\xe5\x6f": "\u014d",
+    b"\xe5\x75": "\u016b",
+    b"\xe5\xa5": "\u01e2",
+    b"\xe5\xb5": "\u01e3",
+    b"\xe6\x41": "\u0102",
+    b"\xe6\x45": "\u0114",
+    b"\xe6\x47": "\u011e",
+    b"\xe6\x49": "\u012c",
+    b"\xe6\x4f": "\u014e",
+    b"\xe6\x55": "\u016c",
+    b"\xe6\x61": "\u0103",
+    b"\xe6\x65": "\u0115",
+    b"\xe6\x67": "\u011f",
+    b"\xe6\x69": "\u012d",
+    b"\xe6\x6f": "\u014f",
+    b"\xe6\x75": "\u016d",
+    b"\xe7\x42": "\u1e02",
+    b"\xe7\x43": "\u010a",
+    b"\xe7\x44": "\u1e0a",
+    b"\xe7\x45": "\u0116",
+    b"\xe7\x46": "\u1e1e",
+    b"\xe7\x47": "\u0120",
+    b"\xe7\x48": "\u1e22",
+    b"\xe7\x49": "\u0130",
+    b"\xe7\x4d": "\u1e40",
+    b"\xe7\x4e": "\u1e44",
+    b"\xe7\x50": "\u1e56",
+    b"\xe7\x52": "\u1e58",
+    b"\xe7\x53": "\u1e60",
+    b"\xe7\x54": "\u1e6a",
+    b"\xe7\x57": "\u1e86",
+    b"\xe7\x58": "\u1e8a",
+    b"\xe7\x59": "\u1e8e",
+    b"\xe7\x5a": "\u017b",
+    b"\xe7\x62": "\u1e03",
+    b"\xe7\x63": "\u010b",
+    b"\xe7\x64": "\u1e0b",
+    b"\xe7\x65": "\u0117",
+    b"\xe7\x66": "\u1e1f",
+    b"\xe7\x67": "\u0121",
+    b"\xe7\x68": "\u1e23",
+    b"\xe7\x6d": "\u1e41",
+    b"\xe7\x6e": "\u1e45",
+    b"\xe7\x70": "\u1e57",
+    b"\xe7\x72": "\u1e59",
+    b"\xe7\x73": "\u1e61",
+    b"\xe7\x74": "\u1e6b",
+    b"\xe7\x77": "\u1e87",
+    b"\xe7\x78": "\u1e8b",
+    b"\xe7\x79": "\u1e8f",
+    b"\xe7\x7a": "\u017c",
+    b"\xe8\x41": "\u00c4",
+    b"\xe8\x45": "\u00cb",
+    b"\xe8\x48": "\u1e26",
+    b"\xe8\x49": "\u00cf",
+    b"\xe8\x4f": "\u00d6",
+    b"\xe8\x55": "\u00dc",
+    b"\xe8\x57": "\u1e84",
+    b"\xe8\x58": "\u1e8c",
+    b"\xe8\x59": "\u0178",
+    b"\xe8\x61": "\u00e4",
+    b"\xe8\x65": "\u00eb",
+    b"\xe8\x68": "\u1e27",
+    b"\xe8\x69": "\u00ef",
+    b"\xe8\x6f": "\u00f6",
+    b"\xe8\x74": "\u1e97",
+    b"\xe8\x75": "\u00fc",
+    b"\xe8\x77": "\u1e85",
+    b"\xe8\x78": "\u1e8d",
+    b"\xe8\x79": "\u00ff",
+    b"\xe9\x41": "\u01cd",
+    b"\xe9\x43": "\u010c",
+    b"\xe9\x44": "\u010e",
+    b"\xe9\x45": "\u011a",
+    b"\xe9\x47": "\u01e6",
+    b"\xe9\x49": "\u01cf",
+    b"\xe9\x4b": "\u01e8",
+    b"\xe9\x4c": "\u013d",
+    b"\xe9\x4e": "\u0147",
+    b"\xe9\x4f": "\u01d1",
+    b"\xe9\x52": "\u0158",
+    b"\xe9\x53": "\u0160",
+    b"\xe9\x54": "\u0164",
+    b"\xe9\x55": "\u01d3",
+    b"\xe9\x5a": "\u017d",
+    b"\xe9\x61": "\u01ce",
+    b"\xe9\x63": "\u010d",
+    b"\xe9\x64": "\u010f",
+    b"\xe9\x65": "\u011b",
+    b"\xe9\x67": "\u01e7",
+    b"\xe9\x69": "\u01d0",
+    b"\xe9\x6a": "\u01f0",
+    b"\xe9\x6b": "\u01e9",
+    b"\xe9\x6c": "\u013e",
+    b"\xe9\x6e": "\u0148",
+    b"\xe9\x6f": "\u01d2",
+    b"\xe9\x72": "\u0159",
+    b"\xe9\x73": "\u0161",
+    b"\xe9\x74": "\u0165",
+    b"\xe9\x75": "\u01d4",
+    b"\xe9\x7a": "\u017e",
+    b"\xea\x41": "\u00c5",
+    b"\xea\x61": "\u00e5",
+    b"\xea\x75": "\u016f",
+    b"\xea\x77": "\u1e98",
+    b"\xea\x79": "\u1e99",
+    b"\xea\xad": "\u016e",
+    b"\xee\x4f": "\u0150",
+    b"\xee\x55": "\u0170",
+    b"\xee\x6f": "\u0151",
+    b"\xee\x75": "\u0171",
+    b"\xf0\x20": "\u00b8",
+    b"\xf0\x43": "\u00c7",
+    b"\xf0\x44": "\u1e10",
+    b"\xf0\x47": "\u0122",
+    b"\xf0\x48": "\u1e28",
+    b"\xf0\x4b": "\u0136",
+    b"\xf0\x4c": "\u013b",
+    b"\xf0\x4e": "\u0145",
+    b"\xf0\x52": "\u0156",
+    b"\xf0\x53": "\u015e",
+    b"\xf0\x54": "\u0162",
+    b"\xf0\x63": "\u00e7",
+    b"\xf0\x64": "\u1e11",
+    b"\xf0\x67": "\u0123",
+    b"\xf0\x68": "\u1e29",
+    b"\xf0\x6b": "\u0137",
+    b"\xf0\x6c": "\u013c",
+    b"\xf0\x6e": "\u0146",
+    b"\xf0\x72": "\u0157",
+    b"\xf0\x73": "\u015f",
+    b"\xf0\x74": "\u0163",
+    b"\xf1\x41": "\u0104",
+    b"\xf1\x45": "\u0118",
+    b"\xf1\x49": "\u012e",
+    b"\xf1\x4f": "\u01ea",
+    b"\xf1\x55": "\u0172",
+    b"\xf1\x61": "\u0105",
+    b"\xf1\x65": "\u0119",
+    b"\xf1\x69": "\u012f",
+    b"\xf1\x6f": "\u01eb",
+    b"\xf1\x75": "\u0173",
+    b"\xf2\x41": "\u1ea0",
+    b"\xf2\x42": "\u1e04",
+    b"\xf2\x44": "\u1e0c",
+    b"\xf2\x45": "\u1eb8",
+    b"\xf2\x48": "\u1e24",
+    b"\xf2\x49": "\u1eca",
+    b"\xf2\x4b": "\u1e32",
+    b"\xf2\x4c": "\u1e36",
+    b"\xf2\x4d": "\u1e42",
+    b"\xf2\x4e": "\u1e46",
+    b"\xf2\x4f": "\u1ecc",
+    b"\xf2\x52": "\u1e5a",
+    b"\xf2\x53": "\u1e62",
+    b"\xf2\x54": "\u1e6c",
+    b"\xf2\x55": "\u1ee4",
+    b"\xf2\x56": "\u1e7e",
+    b"\xf2\x57": "\u1e88",
+    b"\xf2\x59": "\u1ef4",
+    b"\xf2\x5a": "\u1e92",
+    b"\xf2\x61": "\u1ea1",
+    b"\xf2\x62": "\u1e05",
+    b"\xf2\x64": "\u1e0d",
+    b"\xf2\x65": "\u1eb9",
+    b"\xf2\x68": "\u1e25",
+    b"\xf2\x69": "\u1ecb",
+    b"\xf2\x6b": "\u1e33",
+    b"\xf2\x6c": "\u1e37",
+    b"\xf2\x6d": "\u1e43",
+    b"\xf2\x6e": "\u1e47",
+    b"\xf2\x6f": "\u1ecd",
+    b"\xf2\x72": "\u1e5b",
+    b"\xf2\x73": "\u1e63",
+    b"\xf2\x74": "\u1e6d",
+    b"\xf2\x75": "\u1ee5",
+    b"\xf2\x76": "\u1e7f",
+    b"\xf2\x77": "\u1e89",
+    b"\xf2\x79": "\u1ef5",
+    b"\xf2\x7a": "\u1e93",
+    b"\xf3\x55": "\u1e72",
+    b"\xf3\x75": "\u1e73",
+    b"\xf4\x41": "\u1e00",
+    b"\xf4\x61": "\u1e01",
+    b"\xf9\x48": "\u1e2a",
+    b"\xf9\x68": "\u1e2b",
+}
+
+_PRINTABLE_ASCII = [chr(byte) for byte in range(32, 127)]
+
+# Decoding works on the bytes read as latin-1 text. Each byte above 127,
+# together with the printable ASCII character that follows it if any, is
+# replaced at once; sequences that are not in the table are errors. A few
+# precomposed forms modify a character above 127, they are matched first.
+_HIGH_BYTE = re.compile(
+    "|".join(re.escape(key.decode("latin-1")) for key in TWOBYTE if key[1] > 127)
+    + "|[\x80-\xff][\x20-\x7e]?"
+)
+_DECODING_TABLE = {
+    key.decode("latin-1"): char for key, char in TWOBYTE.items() if key[1] > 127
+}
+for _byte in range(128, 256):
+    _char = chr(_byte)
+    _key = bytes([_byte])
+    if _key in COMBINERS:
+        for _next in _PRINTABLE_ASCII:
+            _DECODING_TABLE[_char + _next] = TWOBYTE.get(
+                _key + _next.encode("ascii"), _next + COMBINERS[_key]
+            )
+    elif _key in ONEBYTE:
+        _DECODING_TABLE[_char] = ONEBYTE[_key]
+        for _next in _PRINTABLE_ASCII:
+            _DECODING_TABLE[_char + _next] = ONEBYTE[_key] + _next
+
+_ENCODING_TABLE = {chr(byte): bytes([byte]) for byte in range(128)}
+for _key, _char in ONEBYTE.items():
+    _ENCODING_TABLE.setdefault(_char, _key)
+_ENCODING_COMBINERS = {_char: _key for _key, _char in COMBINERS.items()}
+_COMBINER_BYTES = {_key[0] for _key in COMBINERS}
+
+
+# -------------------------------------------------------------------------
+#
+# Functions
+#
+# -------------------------------------------------------------------------
+def decode(data, errors="strict", final=True):
+    """
+    Decode ANSEL bytes.
+
+    :param data: the bytes to decode
+    :param errors: the name of the error handler
+    :param final: if False, a combining form at the end of the data is not
+                  decoded, as it modifies the first character of the next
+                  data
+    :returns: a tuple of the text and of the number of bytes consumed
+    """
+    data = bytes(data)
+    size = len(data)
+    if not final and size and data[-1] in _COMBINER_BYTES:
+        size -= 1
+    text = data[:size].decode("latin-1")
+    if text.isascii():
+        return text, size
+
+    def replace(match):
+        sequence = match.group()
+        if sequence in _DECODING_TABLE:
+            return _DECODING_TABLE[sequence]
+        if ord(sequence[0]) in _COMBINER_BYTES:
+            reason = "combining form modifies nothing"
+        else:
+            reason = "undefined byte"
+        start = match.start()
+        handler = codecs.lookup_error(errors)
+        error = UnicodeDecodeError("ansel", data, start, start + 1, reason)
+        return handler(error)[0] + sequence[1:]
+
+    return _HIGH_BYTE.sub(replace, text), size
+
+
+def encode(text, errors="strict"):
+    """
+    Encode text to ANSEL. Precomposed characters are decomposed first.
+
+    :param text: the text to encode
+    :param errors: the name of the error handler
+    :returns: a tuple of the bytes and of the number of characters consumed
+    """
+    size = len(text)
+    if text.isascii():
+        return text.encode("ascii"), size
+    text = unicodedata.normalize("NFD", text)
+    result = bytearray()
+    pos = 0
+    while pos < len(text):
+        end = pos + 1
+        while end < len(text) and text[end] in _ENCODING_COMBINERS:
+            end += 1
+        if text[pos] in _ENCODING_TABLE:
+            for char in text[pos + 1 : end]:
+                result += _ENCODING_COMBINERS[char]
+            result += _ENCODING_TABLE[text[pos]]
+            pos = end
+            continue
+        handler = codecs.lookup_error(errors)
+        error = UnicodeEncodeError(
+            "ansel", text, pos, pos + 1, "character maps to <undefined>"
+        )
+        replacement, pos = handler(error)
+        if isinstance(replacement, str):
+            replacement = encode(replacement, "strict")[0]
+        result += replacement
+    return bytes(result), size
+
+
+# -------------------------------------------------------------------------
+#
+# Codec classes
+#
+# -------------------------------------------------------------------------
+class IncrementalEncoder(codecs.IncrementalEncoder):
+    """
+    Encode text to ANSEL piece by piece. The combining characters that may
+    follow the end of the text are kept until the next piece.
+    """
+
+    def __init__(self, errors="strict"):
+        codecs.IncrementalEncoder.__init__(self, errors)
+        self.pending = ""
+
+    def encode(self, input, final=False):
+        text = self.pending + input
+        self.pending = ""
+        if not final:
+            # keep the last base character with its combining characters
+            pos = len(text)
+            while pos and text[pos - 1] in _ENCODING_COMBINERS:
+                pos -= 1
+            pos = max(pos - 1, 0)
+            text, self.pending = text[:pos], text[pos:]
+        return encode(text, self.errors)[0]
+
+    def reset(self):
+        self.pending = ""
+
+    def getstate(self):
+        return self.pending
+
+    def setstate(self, state):
+        self.pending = state
+
+
+class IncrementalDecoder(codecs.BufferedIncrementalDecoder):
+    """
+    Decode ANSEL bytes piece by piece. A combining form at the end of a piece
+    is kept until the next piece.
+    """
+
+    def _buffer_decode(self, input, errors, final):
+        return decode(input, errors, final)
+
+
+class StreamWriter(codecs.StreamWriter):
+    def encode(self, input, errors="strict"):
+        return encode(input, errors)
+
+
+class StreamReader(codecs.StreamReader):
+    def decode(self, input, errors="strict"):
+        return decode(input, errors, final=False)
+
+
+def search(name):
+    """
+    Find the ANSEL codec, for :func:`codecs.register`.
+    """
+    if name != "ansel":
+        return None
+    return codecs.CodecInfo(
+        name="ansel",
+        encode=encode,
+        decode=decode,
+        incrementalencoder=IncrementalEncoder,
+        incrementaldecoder=IncrementalDecoder,
+        streamwriter=StreamWriter,
+        streamreader=StreamReader,
+    )
+
+
+codecs.register(search)
@@ -0,0 +1,588 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2000-2007  Donald N. Allingham
+# Copyright (C) 2008       Brian G. Matherly
+# Copyright (C) 2010       Jakim Friant
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Find possible duplicate people.
+
+People are only compared with people of the same gender and with the same
+surname key, the soundex code of their surnames by default. Within such a
+block, people with birth dates in different years are not compared, as their
+birth dates would never match. The comparisons work on summaries of the
+people, so that they can be made in worker processes.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard Python modules
+#
+# -------------------------------------------------------------------------
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import combinations
+import logging
+import multiprocessing
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.lib import Date, Person
+from gramps.gen.soundex import compare
+
+LOG = logging.getLogger(".finddupes")
+
+# The number of people compared in each task given to a worker process
+CHUNKSIZE = 1000
+
+NameSummary = namedtuple("NameSummary", "surnames suffix first_name")
+EventSummary = namedtuple("EventSummary", "date place_handle place_title")
+PersonSummary = namedtuple(
+    "PersonSummary", "handle gender name birth death birth_year parents families"
+)
+
+EMPTY_EVENT = EventSummary(Date(), "", "")
+
+
+# -------------------------------------------------------------------------
+#
+# Functions
+#
+# -------------------------------------------------------------------------
+def is_initial(name):
+    if len(name) > 2:
+        return 0
+    elif len(name) == 2:
+        if name[0] == name[0].upper() and name[1] == ".":
+            return 1
+    else:
+        return name[0] == name[0].upper()
+
+
+def get_surnames(name):
+    """Construct a full surname of the surnames"""
+    return " ".join([surn.get_surname() for surn in name.get_surname_list()])
+
+
+def summarize_name(name):
+    """
+    Return the parts of a name used to compare people.
+    """
+    return NameSummary(get_surnames(name), name.get_suffix(), name.get_first_name())
+
+
+# -------------------------------------------------------------------------
+#
+# PersonSummaries
+#
+# -------------------------------------------------------------------------
+class PersonSummaries:
+    """
+    Build summaries of people, caching the names of their relatives and the
+    titles of places.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.names = {}
+        self.place_titles = {}
+
+    def get_name(self, handle):
+        """
+        Return the summary of the primary name of the person with the given
+        handle, or None if there is no such person.
+        """
+        if not handle:
+            return None
+        if handle not in self.names:
+            person = self.db.get_person_from_handle(handle)
+            if person:
+                self.names[handle] = summarize_name(person.get_primary_name())
+            else:
+                self.names[handle] = None
+        return self.names[handle]
+
+    def get_place_title(self, handle):
+        """
+        Return the title of the place with the given handle.
+        """
+        if not handle:
+            return ""
+        if handle not in self.place_titles:
+            place = self.db.get_place_from_handle(handle)
+            self.place_titles[handle] = place.get_title() if place else ""
+        return self.place_titles[handle]
+
+    def get_event(self, event_ref):
+        """
+        Return the summary of the event referenced by event_ref.
+        """
+        if event_ref is None:
+            return EMPTY_EVENT
+        event = self.db.get_event_from_handle(event_ref.ref)
+        if event is None:
+            return EMPTY_EVENT
+        place_handle = event.get_place_handle()
+        return EventSummary(
+            event.get_date_object(), place_handle, self.get_place_title(place_handle)
+        )
+
+    def summarize(self, person):
+        """
+        Return the summary of a person.
+        """
+        name = summarize_name(person.get_primary_name())
+        self.names[person.handle] = name
+        birth = self.get_event(person.get_birth_ref())
+        death = self.get_event(person.get_death_ref())
+        date = birth.date
+        if date.is_empty() or date.is_compound():
+            birth_year = None
+        else:
+            birth_year = date.get_year()
+
+        family_handle = person.get_main_parents_family_handle()
+        if family_handle:
+            father_handle, mother_handle = self.db.get_family_parent_handles(
+                family_handle
+            )
+            parents = (self.get_name(father_handle), self.get_name(mother_handle))
+        else:
+            parents = None
+
+        families = []
+        for family_handle in person.get_family_handle_list():
+            father_handle, mother_handle = self.db.get_family_parent_handles(
+                family_handle
+            )
+            families.append(
+                (
+                    father_handle,
+                    mother_handle,
+                    self.get_name(father_handle),
+                    self.get_name(mother_handle),
+                )
+            )
+
+        return PersonSummary(
+            person.handle,
+            person.get_gender(),
+            name,
+            birth,
+            death,
+            birth_year,
+            parents,
+            families,
+        )
+
+
+# -------------------------------------------------------------------------
+#
+# Matcher
+#
+# -------------------------------------------------------------------------
+class Matcher:
+    """
+    Compare the summaries of people. Instances are sent to worker processes.
+    """
+
+    def __init__(self, threshold, use_soundex=True):
+        self.threshold = threshold
+        self.use_soundex = use_soundex
+
+    def compare_blocks(self, blocks):
+        """
+        Compare the people within each of a list of blocks.
+        """
+        return [self.compare_block(block) for block in blocks]
+
+    def compare_block(self, block):
+        """
+        Compare the people within a block of summaries. Returns a list of
+        the indexes of each pair of people that may be duplicates, and the
+        chance of a match in both directions.
+        """
+        by_year = {}
+        unknown = []
+        for index, summary in enumerate(block):
+            if summary.birth_year is None:
+                unknown.append(index)
+            else:
+                by_year.setdefault(summary.birth_year, []).append(index)
+
+        pairs = list(combinations(unknown, 2))
+        for indexes in by_year.values():
+            pairs.extend(combinations(indexes, 2))
+            pairs.extend(
+                (min(index1, index2), max(index1, index2))
+                for index1 in indexes
+                for index2 in unknown
+            )
+
+        matches = []
+        for index1, index2 in pairs:
+            p1 = block[index1]
+            p2 = block[index2]
+            chance = self.compare_people(p1, p2)
+            if p1.gender == p2.gender:
+                reverse = chance
+            else:
+                reverse = self.compare_people(p2, p1)
+            if chance >= self.threshold or reverse >= self.threshold:
+                matches.append((index1, index2, chance, reverse))
+        return matches
+
+    def compare_people(self, p1, p2):
+        """
+        Return the chance that two people are the same person, or -1 if they
+        are not. Whether one is an ancestor of the other is not checked.
+        """
+        chance = self.name_match(p1.name, p2.name)
+        if chance == -1:
+            return -1
+
+        value = self.date_match(p1.birth.date, p2.birth.date)
+        if value == -1:
+            return -1
+        chance += value
+
+        value = self.date_match(p1.death.date, p2.death.date)
+        if value == -1:
+            return -1
+        chance += value
+
+        value = self.place_match(p1.birth, p2.birth)
+        if value == -1:
+            return -1
+        chance += value
+
+        value = self.place_match(p1.death, p2.death)
+        if value == -1:
+            return -1
+        chance += value
+
+        if p1.parents and p2.parents:
+            value = self.name_match(p1.parents[0], p2.parents[0])
+            if value == -1:
+                return -1
+            chance += value
+
+            value = self.name_match(p1.parents[1], p2.parents[1])
+            if value == -1:
+                return -1
+            chance += value
+
+        for family1 in p1.families:
+            for family2 in p2.families:
+                if p1.gender == Person.FEMALE:
+                    index = 0
+                else:
+                    index = 1
+                spouse1_id = family1[index]
+                spouse2_id = family2[index]
+                if spouse1_id and spouse2_id:
+                    if spouse1_id == spouse2_id:
+                        chance += 1
+                    else:
+                        value = self.name_match(family1[index + 2], family2[index + 2])
+                        if value != -1:
+                            chance += value
+        return chance
+
+    def name_compare(self, s1, s2):
+        if self.use_soundex:
+            try:
+                return compare(s1, s2)
+            except UnicodeEncodeError:
+                return s1 == s2
+        else:
+            return s1 == s2
+
+    def date_match(self, date1, date2):
+        if date1.is_empty() or date2.is_empty():
+            return 0
+        if date1.is_equal(date2):
+            return 1
+
+        if date1.is_compound() or date2.is_compound():
+            return self.range_compare(date1, date2)
+
+        if date1.get_year() == date2.get_year():
+            if date1.get_month() == date2.get_month():
+                return 0.75
+            if not date1.get_month_valid() or not date2.get_month_valid():
+                return 0.75
+            else:
+                return -1
+        else:
+            return -1
+
+    def range_compare(self, date1, date2):
+        start_date_1 = date1.get_start_date()[0:3]
+        start_date_2 = date2.get_start_date()[0:3]
+        stop_date_1 = date1.get_stop_date()[0:3]
+        stop_date_2 = date2.get_stop_date()[0:3]
+        if date1.is_compound() and date2.is_compound():
+            if (
+                start_date_2 <= start_date_1 <= stop_date_2
+                or start_date_1 <= start_date_2 <= stop_date_1
+                or start_date_2 <= stop_date_1 <= stop_date_2
+                or start_date_1 <= stop_date_2 <= stop_date_1
+            ):
+                return 0.5
+            else:
+                return -1
+        elif date2.is_compound():
+            if start_date_2 <= start_date_1 <= stop_date_2:
+                return 0.5
+            else:
+                return -1
+        else:
+            if start_date_1 <= start_date_2 <= stop_date_1:
+                return 0.5
+            else:
+                return -1
+
+    def name_match(self, name, name1):
+        if not name1 or not name:
+            return 0
+
+        if not self.name_compare(name.surnames, name1.surnames):
+            return -1
+        sfx1 = name.suffix
+        sfx2 = name1.suffix
+        if sfx1 != sfx2:
+            if sfx1 != "" and sfx2 != "":
+                return -1
+
+        if name.first_name == name1.first_name:
+            return 1
+        else:
+            list1 = name.first_name.split()
+            list2 = name1.first_name.split()
+
+            if len(list1) < len(list2):
+                return self.list_reduce(list1, list2)
+            else:
+                return self.list_reduce(list2, list1)
+
+    def place_match(self, event1, event2):
+        if event1.place_handle == event2.place_handle:
+            return 1
+
+        name1 = event1.place_title
+        name2 = event2.place_title
+        if not (name1 and name2):
+            return 0
+        if name1 == name2:
+            return 1
+
+        list1 = name1.replace(",", " ").split()
+        list2 = name2.replace(",", " ").split()
+
+        value = 0
+        for name in list1:
+            for name2 in list2:
+                if name == name2:
+                    value += 0.5
+                elif name[0] == name2[0] and self.name_compare(name, name2):
+                    value += 0.25
+        return min(value, 1) if value else -1
+
+    def list_reduce(self, list1, list2):
+        value = 0
+        for name in list1:
+            for name2 in list2:
+                if is_initial(name) and name[0] == name2[0]:
+                    value += 0.25
+                elif is_initial(name2) and name2[0] == name[0]:
+                    value += 0.25
+                elif name == name2:
+                    value += 0.5
+                elif name[0] == name2[0] and self.name_compare(name, name2):
+                    value += 0.25
+        return min(value, 1) if value else -1
+
+
+# -------------------------------------------------------------------------
+#
+# DuplicateFinder
+#
+# -------------------------------------------------------------------------
+class DuplicateFinder:
+    """
+    Find the people of a database that may be duplicates.
+    """
+
+    def __init__(self, db, threshold, use_soundex=True, processes=1):
+        self.db = db
+        self.threshold = threshold
+        self.use_soundex = use_soundex
+        self.processes = processes
+        self.order = {}
+        self.main_parents = {}
+
+    def get_blocks(self, step=None):
+        """
+        Return lists of the handles of people of the same gender and with the
+        same surname key. People alone in their block are left out.
+
+        :param step: called once for each person.
+        """
+        blocks = {}
+        if self.use_soundex:
+            keys = self.db.iter_person_soundex_keys()
+        else:
+            keys = (
+                (person.handle, person.gender, get_surnames(person.get_primary_name()))
+                for person in self.db.iter_people()
+            )
+        for handle, gender, key in keys:
+            if step:
+                step()
+            self.order[handle] = len(self.order)
+            blocks.setdefault((gender == Person.MALE, key), []).append(handle)
+        return [block for block in blocks.values() if len(block) > 1]
+
+    def find(self, blocks, step=None):
+        """
+        Compare the people within each block. Returns a dictionary mapping
+        the handle of a person to a tuple of the handle of a possible
+        duplicate and the chance of a match.
+
+        :param step: called twice for each person in the blocks.
+        """
+        summaries = PersonSummaries(self.db)
+        block_summaries = []
+        for block in blocks:
+            block_summary = []
+            for handle in block:
+                if step:
+                    step()
+                person = self.db.get_person_from_handle(handle)
+                block_summary.append(summaries.summarize(person))
+            block_summaries.append(block_summary)
+
+        results = None
+        if self.processes > 1 and len(self.order) > CHUNKSIZE:
+            results = self.compare_parallel(block_summaries, step)
+        if results is None:
+            results = []
+            matcher = Matcher(self.threshold, self.use_soundex)
+            for block in block_summaries:
+                results.append(matcher.compare_block(block))
+                if step:
+                    for dummy in block:
+                        step()
+
+        matches = {}
+        for block, result in zip(blocks, results):
+            for index1, index2, chance, reverse in result:
+                if chance >= self.threshold:
+                    matches.setdefault(block[index1], []).append(
+                        (block[index2], chance)
+                    )
+                if reverse >= self.threshold:
+                    matches.setdefault(block[index2], []).append(
+                        (block[index1], reverse)
+                    )
+
+        the_map = {}
+        for p1key in sorted(matches, key=self.order.get):
+            for p2key, chance in sorted(
+                matches[p1key], key=lambda match: self.order[match[0]]
+            ):
+                if p2key in the_map and the_map[p2key][0] == p1key:
+                    continue
+                if self.is_ancestor(p1key, p2key) or self.is_ancestor(p2key, p1key):
+                    continue
+                if p1key in the_map:
+                    val = the_map[p1key]
+                    if val[1] > chance:
+                        the_map[p1key] = (p2key, chance)
+                else:
+                    the_map[p1key] = (p2key, chance)
+        return the_map
+
+    def compare_parallel(self, block_summaries, step=None):
+        """
+        Compare the people within each block in a pool of worker processes.
+        Returns None if the pool cannot be used.
+        """
+        tasks = [[]]
+        size = 0
+        for block in block_summaries:
+            if size + len(block) > CHUNKSIZE and tasks[-1]:
+                tasks.append([])
+                size = 0
+            tasks[-1].append(block)
+            size += len(block)
+
+        matcher = Matcher(self.threshold, self.use_soundex)
+        results = []
+        try:
+            with ProcessPoolExecutor(
+                self.processes, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                for task, result in zip(
+                    tasks, executor.map(matcher.compare_blocks, tasks)
+                ):
+                    results.extend(result)
+                    if step:
+                        for block in task:
+                            for dummy in block:
+                                step()
+        except BrokenProcessPool as err:
+            LOG.warning("Cannot compare people in parallel: %s", err)
+            return None
+        return results
+
+    def get_main_parents(self, handle):
+        """
+        Return the handles of the father and mother in the main parents
+        family of a person.
+        """
+        if handle not in self.main_parents:
+            family_handles = self.db.get_person_parent_family_handles(handle)
+            if family_handles:
+                parents = self.db.get_family_parent_handles(family_handles[0])
+            else:
+                parents = (None, None)
+            self.main_parents[handle] = parents
+        return self.main_parents[handle]
+
+    def is_ancestor(self, handle, ancestor_handle):
+        """
+        Return True if a person is an ancestor of another person, following
+        the main parents families.
+        """
+        seen = {handle}
+        todo = [handle]
+        while todo:
+            for parent_handle in self.get_main_parents(todo.pop()):
+                if parent_handle == ancestor_handle:
+                    return True
+                if parent_handle and parent_handle not in seen:
+                    seen.add(parent_handle)
+                    todo.append(parent_handle)
+        return False
@@ -97,7 +97,7 @@ import time
 from collections import defaultdict, OrderedDict
 import string
 import mimetypes
-from io import StringIO, TextIOWrapper
+from io import TextIOWrapper
 from urllib.parse import urlparse
 
 # ------------------------------------------------------------------------
@@ -170,6 +170,7 @@ from gramps.gen.db.dbconst import EVENT_KEY
 from gramps.gen.lib.const import IDENTICAL
 from gramps.gen.lib import StyledText, StyledTextTag, StyledTextTagType
 from gramps.gen.lib.urlbase import UrlBase
+from gramps.plugins.lib import libansel
 from gramps.plugins.lib.libplaceimport import PlaceImport
 from gramps.gen.display.place import displayer as _pd
 from gramps.gen.utils.grampslocale import GrampsLocale
@@ -761,6 +762,10 @@ STRIP_DICT = dict.fromkeys(list(range(9)) + list(range(11, 13)) + list(range(14,
 # undefined, but if they have been used, the file is probably supposed to be
 # cp1252
 DEL_AND_C1 = dict.fromkeys(list(range(0x7F, 0x9F)))
+# The ASCII control characters not allowed in ANSEL, and the bytes escaped
+# by the ansel codec because it could not decode them
+ANSEL_ILLEGAL = re.compile("[\x00-\x09\x0b\x0c\x0e-\x1a\x1c\x7f\udc80-\udcff]")
+ANSEL_COMBINERS = {key[0] for key in libansel.COMBINERS}
 
 # -------------------------------------------------------------------------
 #
@@ -1414,14 +1419,8 @@ class CP1252Reader(BaseReader):
 
 class AnselReader(BaseReader):
     """
-    ANSEL to Unicode Conversion
+    The ANSEL reader, uses the ansel codec of libansel for char handling.
 
-    ANSEL references:
-    http://lcweb2.loc.gov/diglib/codetables/45.html
-    http://www.gymel.com/charsets/ANSEL.html
-
-    list of ANSEL codes that replicate ASCII
-    note that DEL (127=0x7F) is a control char
     Note: spec allows control-chars that Gramps probably doesn't use
     but 10=0x0A _is_ needed (!)
     ---
@@ -1431,464 +1430,38 @@ class AnselReader(BaseReader):
     ?: should we allow TAB, as a Gramps extension?
     """
 
-    __printable_ascii = list(map(chr, list(range(32, 127))))  # up thru 126
-    #                            LF  CR  Esc GS  RS  US
-    __use_ASCII = list(map(chr, [10, 13, 27, 29, 30, 31])) + __printable_ascii
-
-    # mappings of single byte ANSEL codes to unicode
-    __onebyte = {
-        b"\xA1": "\u0141",
-        b"\xA2": "\u00d8",
-        b"\xA3": "\u0110",
-        b"\xA4": "\u00de",
-        b"\xA5": "\u00c6",
-        b"\xA6": "\u0152",
-        b"\xA7": "\u02b9",
-        b"\xA8": "\u00b7",
-        b"\xA9": "\u266d",
-        b"\xAA": "\u00ae",
-        b"\xAB": "\u00b1",
-        b"\xAC": "\u01a0",
-        b"\xAD": "\u01af",
-        b"\xAE": "\u02bc",
-        b"\xB0": "\u02bb",
-        b"\xB1": "\u0142",
-        b"\xB2": "\u00f8",
-        b"\xB3": "\u0111",
-        b"\xB4": "\u00fe",
-        b"\xB5": "\u00e6",
-        b"\xB6": "\u0153",
-        b"\xB7": "\u02ba",
-        b"\xB8": "\u0131",
-        b"\xB9": "\u00a3",
-        b"\xBA": "\u00f0",
-        b"\xBC": "\u01a1",
-        b"\xBD": "\u01b0",
-        b"\xBE": "\u25a1",
-        b"\xBF": "\u25a0",
-        b"\xC0": "\u00b0",
-        b"\xC1": "\u2113",
-        b"\xC2": "\u2117",
-        b"\xC3": "\u00a9",
-        b"\xC4": "\u266f",
-        b"\xC5": "\u00bf",
-        b"\xC6": "\u00a1",
-        b"\xC7": "\u00df",
-        b"\xC8": "\u20ac",
-        b"\xCD": "\u0065",
-        b"\xCE": "\u006f",
-        b"\xCF": "\u00df",
-    }
-
-    # combining forms (in ANSEL, they precede the modified ASCII character
-    # whereas the unicode combining term follows the character modified
-    # Note: unicode allows multiple modifiers, but ANSEL may not (TDB?),
-    # so we ignore multiple combining forms in this module
-    #  8d & 8e are zero-width joiner (ZWJ), and zero-width non-joiner ZWNJ
-    #  (strange things) probably not commonly found in our needs, unless one
-    #   starts writing persian (or???) poetry in ANSEL
-    __acombiners = {
-        b"\x8D": "\u200d",
-        b"\x8E": "\u200c",
-        b"\xE0": "\u0309",
-        b"\xE1": "\u0300",
-        b"\xE2": "\u0301",
-        b"\xE3": "\u0302",
-        b"\xE4": "\u0303",
-        b"\xE5": "\u0304",
-        b"\xE6": "\u0306",
-        b"\xE7": "\u0307",
-        b"\xE8": "\u0308",
-        b"\xE9": "\u030c",
-        b"\xEA": "\u030a",
-        b"\xEB": "\ufe20",
-        b"\xEC": "\ufe21",
-        b"\xED": "\u0315",
-        b"\xEE": "\u030b",
-        b"\xEF": "\u0310",
-        b"\xF0": "\u0327",
-        b"\xF1": "\u0328",
-        b"\xF2": "\u0323",
-        b"\xF3": "\u0324",
-        b"\xF4": "\u0325",
-        b"\xF5": "\u0333",
-        b"\xF6": "\u0332",
-        b"\xF7": "\u0326",
-        b"\xF8": "\u031c",
-        b"\xF9": "\u032e",
-        b"\xFA": "\ufe22",
-        b"\xFB": "\ufe23",
-        b"\xFC": "\u0338",
-        b"\xFE": "\u0313",
-    }
-
-    # mappings of two byte (precomposed forms) ANSEL codes to unicode
-    __twobyte = {
-        b"\xE0\x41": "\u1ea2",
-        b"\xE0\x45": "\u1eba",
-        b"\xE0\x49": "\u1ec8",
-        b"\xE0\x4F": "\u1ece",
-        b"\xE0\x55": "\u1ee6",
-        b"\xE0\x59": "\u1ef6",
-        b"\xE0\x61": "\u1ea3",
-        b"\xE0\x65": "\u1ebb",
-        b"\xE0\x69": "\u1ec9",
-        b"\xE0\x6F": "\u1ecf",
-        b"\xE0\x75": "\u1ee7",
-        b"\xE0\x79": "\u1ef7",
-        b"\xE1\x41": "\u00c0",
-        b"\xE1\x45": "\u00c8",
-        b"\xE1\x49": "\u00cc",
-        b"\xE1\x4F": "\u00d2",
-        b"\xE1\x55": "\u00d9",
-        b"\xE1\x57": "\u1e80",
-        b"\xE1\x59": "\u1ef2",
-        b"\xE1\x61": "\u00e0",
-        b"\xE1\x65": "\u00e8",
-        b"\xE1\x69": "\u00ec",
-        b"\xE1\x6F": "\u00f2",
-        b"\xE1\x75": "\u00f9",
-        b"\xE1\x77": "\u1e81",
-        b"\xE1\x79": "\u1ef3",
-        b"\xE2\x41": "\u00c1",
-        b"\xE2\x43": "\u0106",
-        b"\xE2\x45": "\u00c9",
-        b"\xE2\x47": "\u01f4",
-        b"\xE2\x49": "\u00cd",
-        b"\xE2\x4B": "\u1e30",
-        b"\xE2\x4C": "\u0139",
-        b"\xE2\x4D": "\u1e3e",
-        b"\xE2\x4E": "\u0143",
-        b"\xE2\x4F": "\u00d3",
-        b"\xE2\x50": "\u1e54",
-        b"\xE2\x52": "\u0154",
-        b"\xE2\x53": "\u015a",
-        b"\xE2\x55": "\u00da",
-        b"\xE2\x57": "\u1e82",
-        b"\xE2\x59": "\u00dd",
-        b"\xE2\x5A": "\u0179",
-        b"\xE2\x61": "\u00e1",
-        b"\xE2\x63": "\u0107",
-        b"\xE2\x65": "\u00e9",
-        b"\xE2\x67": "\u01f5",
-        b"\xE2\x69": "\u00ed",
-        b"\xE2\x6B": "\u1e31",
-        b"\xE2\x6C": "\u013a",
-        b"\xE2\x6D": "\u1e3f",
-        b"\xE2\x6E": "\u0144",
-        b"\xE2\x6F": "\u00f3",
-        b"\xE2\x70": "\u1e55",
-        b"\xE2\x72": "\u0155",
-        b"\xE2\x73": "\u015b",
-        b"\xE2\x75": "\u00fa",
-        b"\xE2\x77": "\u1e83",
-        b"\xE2\x79": "\u00fd",
-        b"\xE2\x7A": "\u017a",
-        b"\xE2\xA5": "\u01fc",
-        b"\xE2\xB5": "\u01fd",
-        b"\xE3\x41": "\u00c2",
-        b"\xE3\x43": "\u0108",
-        b"\xE3\x45": "\u00ca",
-        b"\xE3\x47": "\u011c",
-        b"\xE3\x48": "\u0124",
-        b"\xE3\x49": "\u00ce",
-        b"\xE3\x4A": "\u0134",
-        b"\xE3\x4F": "\u00d4",
-        b"\xE3\x53": "\u015c",
-        b"\xE3\x55": "\u00db",
-        b"\xE3\x57": "\u0174",
-        b"\xE3\x59": "\u0176",
-        b"\xE3\x5A": "\u1e90",
-        b"\xE3\x61": "\u00e2",
-        b"\xE3\x63": "\u0109",
-        b"\xE3\x65": "\u00ea",
-        b"\xE3\x67": "\u011d",
-        b"\xE3\x68": "\u0125",
-        b"\xE3\x69": "\u00ee",
-        b"\xE3\x6A": "\u0135",
-        b"\xE3\x6F": "\u00f4",
-        b"\xE3\x73": "\u015d",
-        b"\xE3\x75": "\u00fb",
-        b"\xE3\x77": "\u0175",
-        b"\xE3\x79": "\u0177",
-        b"\xE3\x7A": "\u1e91",
-        b"\xE4\x41": "\u00c3",
-        b"\xE4\x45": "\u1ebc",
-        b"\xE4\x49": "\u0128",
-        b"\xE4\x4E": "\u00d1",
-        b"\xE4\x4F": "\u00d5",
-        b"\xE4\x55": "\u0168",
-        b"\xE4\x56": "\u1e7c",
-        b"\xE4\x59": "\u1ef8",
-        b"\xE4\x61": "\u00e3",
-        b"\xE4\x65": "\u1ebd",
-        b"\xE4\x69": "\u0129",
-        b"\xE4\x6E": "\u00f1",
-        b"\xE4\x6F": "\u00f5",
-        b"\xE4\x75": "\u0169",
-        b"\xE4\x76": "\u1e7d",
-        b"\xE4\x79": "\u1ef9",
-        b"\xE5\x41": "\u0100",
-        b"\xE5\x45": "\u0112",
-        b"\xE5\x47": "\u1e20",
-        b"\xE5\x49": "\u012a",
-        b"\xE5\x4F": "\u014c",
-        b"\xE5\x55": "\u016a",
-        b"\xE5\x61": "\u0101",
-        b"\xE5\x65": "\u0113",
-        b"\xE5\x67": "\u1e21",
-        b"\xE5\x69": "\u012b",
-        b"\xE5\x6F": "\u014d",
-        b"\xE5\x75": "\u016b",
-        b"\xE5\xA5": "\u01e2",
-        b"\xE5\xB5": "\u01e3",
-        b"\xE6\x41": "\u0102",
-        b"\xE6\x45": "\u0114",
-        b"\xE6\x47": "\u011e",
-        b"\xE6\x49": "\u012c",
-        b"\xE6\x4F": "\u014e",
-        b"\xE6\x55": "\u016c",
-        b"\xE6\x61": "\u0103",
-        b"\xE6\x65": "\u0115",
-        b"\xE6\x67": "\u011f",
-        b"\xE6\x69": "\u012d",
-        b"\xE6\x6F": "\u014f",
-        b"\xE6\x75": "\u016d",
-        b"\xE7\x42": "\u1e02",
-        b"\xE7\x43": "\u010a",
-        b"\xE7\x44": "\u1e0a",
-        b"\xE7\x45": "\u0116",
-        b"\xE7\x46": "\u1e1e",
-        b"\xE7\x47": "\u0120",
-        b"\xE7\x48": "\u1e22",
-        b"\xE7\x49": "\u0130",
-        b"\xE7\x4D": "\u1e40",
-        b"\xE7\x4E": "\u1e44",
-        b"\xE7\x50": "\u1e56",
-        b"\xE7\x52": "\u1e58",
-        b"\xE7\x53": "\u1e60",
-        b"\xE7\x54": "\u1e6a",
-        b"\xE7\x57": "\u1e86",
-        b"\xE7\x58": "\u1e8a",
-        b"\xE7\x59": "\u1e8e",
-        b"\xE7\x5A": "\u017b",
-        b"\xE7\x62": "\u1e03",
-        b"\xE7\x63": "\u010b",
-        b"\xE7\x64": "\u1e0b",
-        b"\xE7\x65": "\u0117",
-        b"\xE7\x66": "\u1e1f",
-        b"\xE7\x67": "\u0121",
-        b"\xE7\x68": "\u1e23",
-        b"\xE7\x6D": "\u1e41",
-        b"\xE7\x6E": "\u1e45",
-        b"\xE7\x70": "\u1e57",
-        b"\xE7\x72": "\u1e59",
-        b"\xE7\x73": "\u1e61",
-        b"\xE7\x74": "\u1e6b",
-        b"\xE7\x77": "\u1e87",
-        b"\xE7\x78": "\u1e8b",
-        b"\xE7\x79": "\u1e8f",
-        b"\xE7\x7A": "\u017c",
-        b"\xE8\x41": "\u00c4",
-        b"\xE8\x45": "\u00cb",
-        b"\xE8\x48": "\u1e26",
-        b"\xE8\x49": "\u00cf",
-        b"\xE8\x4F": "\u00d6",
-        b"\xE8\x55": "\u00dc",
-        b"\xE8\x57": "\u1e84",
-        b"\xE8\x58": "\u1e8c",
-        b"\xE8\x59": "\u0178",
-        b"\xE8\x61": "\u00e4",
-        b"\xE8\x65": "\u00eb",
-        b"\xE8\x68": "\u1e27",
-        b"\xE8\x69": "\u00ef",
-        b"\xE8\x6F": "\u00f6",
-        b"\xE8\x74": "\u1e97",
-        b"\xE8\x75": "\u00fc",
-        b"\xE8\x77": "\u1e85",
-        b"\xE8\x78": "\u1e8d",
-        b"\xE8\x79": "\u00ff",
-        b"\xE9\x41": "\u01cd",
-        b"\xE9\x43": "\u010c",
-        b"\xE9\x44": "\u010e",
-        b"\xE9\x45": "\u011a",
-        b"\xE9\x47": "\u01e6",
-        b"\xE9\x49": "\u01cf",
-        b"\xE9\x4B": "\u01e8",
-        b"\xE9\x4C": "\u013d",
-        b"\xE9\x4E": "\u0147",
-        b"\xE9\x4F": "\u01d1",
-        b"\xE9\x52": "\u0158",
-        b"\xE9\x53": "\u0160",
-        b"\xE9\x54": "\u0164",
-        b"\xE9\x55": "\u01d3",
-        b"\xE9\x5A": "\u017d",
-        b"\xE9\x61": "\u01ce",
-        b"\xE9\x63": "\u010d",
-        b"\xE9\x64": "\u010f",
-        b"\xE9\x65": "\u011b",
-        b"\xE9\x67": "\u01e7",
-        b"\xE9\x69": "\u01d0",
-        b"\xE9\x6A": "\u01f0",
-        b"\xE9\x6B": "\u01e9",
-        b"\xE9\x6C": "\u013e",
-        b"\xE9\x6E": "\u0148",
-        b"\xE9\x6F": "\u01d2",
-        b"\xE9\x72": "\u0159",
-        b"\xE9\x73": "\u0161",
-        b"\xE9\x74": "\u0165",
-        b"\xE9\x75": "\u01d4",
-        b"\xE9\x7A": "\u017e",
-        b"\xEA\x41": "\u00c5",
-        b"\xEA\x61": "\u00e5",
-        b"\xEA\x75": "\u016f",
-        b"\xEA\x77": "\u1e98",
-        b"\xEA\x79": "\u1e99",
-        b"\xEA\xAD": "\u016e",
-        b"\xEE\x4F": "\u0150",
-        b"\xEE\x55": "\u0170",
-        b"\xEE\x6F": "\u0151",
-        b"\xEE\x75": "\u0171",
-        b"\xF0\x20": "\u00b8",
-        b"\xF0\x43": "\u00c7",
-        b"\xF0\x44": "\u1e10",
-        b"\xF0\x47": "\u0122",
-        b"\xF0\x48": "\u1e28",
-        b"\xF0\x4B": "\u0136",
-        b"\xF0\x4C": "\u013b",
-        b"\xF0\x4E": "\u0145",
-        b"\xF0\x52": "\u0156",
-        b"\xF0\x53": "\u015e",
-        b"\xF0\x54": "\u0162",
-        b"\xF0\x63": "\u00e7",
-        b"\xF0\x64": "\u1e11",
-        b"\xF0\x67": "\u0123",
-        b"\xF0\x68": "\u1e29",
-        b"\xF0\x6B": "\u0137",
-        b"\xF0\x6C": "\u013c",
-        b"\xF0\x6E": "\u0146",
-        b"\xF0\x72": "\u0157",
-        b"\xF0\x73": "\u015f",
-        b"\xF0\x74": "\u0163",
-        b"\xF1\x41": "\u0104",
-        b"\xF1\x45": "\u0118",
-        b"\xF1\x49": "\u012e",
-        b"\xF1\x4F": "\u01ea",
-        b"\xF1\x55": "\u0172",
-        b"\xF1\x61": "\u0105",
-        b"\xF1\x65": "\u0119",
-        b"\xF1\x69": "\u012f",
-        b"\xF1\x6F": "\u01eb",
-        b"\xF1\x75": "\u0173",
-        b"\xF2\x41": "\u1ea0",
-        b"\xF2\x42": "\u1e04",
-        b"\xF2\x44": "\u1e0c",
-        b"\xF2\x45": "\u1eb8",
-        b"\xF2\x48": "\u1e24",
-        b"\xF2\x49": "\u1eca",
-        b"\xF2\x4B": "\u1e32",
-        b"\xF2\x4C": "\u1e36",
-        b"\xF2\x4D": "\u1e42",
-        b"\xF2\x4E": "\u1e46",
-        b"\xF2\x4F": "\u1ecc",
-        b"\xF2\x52": "\u1e5a",
-        b"\xF2\x53": "\u1e62",
-        b"\xF2\x54": "\u1e6c",
-        b"\xF2\x55": "\u1ee4",
-        b"\xF2\x56": "\u1e7e",
-        b"\xF2\x57": "\u1e88",
-        b"\xF2\x59": "\u1ef4",
-        b"\xF2\x5A": "\u1e92",
-        b"\xF2\x61": "\u1ea1",
-        b"\xF2\x62": "\u1e05",
-        b"\xF2\x64": "\u1e0d",
-        b"\xF2\x65": "\u1eb9",
-        b"\xF2\x68": "\u1e25",
-        b"\xF2\x69": "\u1ecb",
-        b"\xF2\x6B": "\u1e33",
-        b"\xF2\x6C": "\u1e37",
-        b"\xF2\x6D": "\u1e43",
-        b"\xF2\x6E": "\u1e47",
-        b"\xF2\x6F": "\u1ecd",
-        b"\xF2\x72": "\u1e5b",
-        b"\xF2\x73": "\u1e63",
-        b"\xF2\x74": "\u1e6d",
-        b"\xF2\x75": "\u1ee5",
-        b"\xF2\x76": "\u1e7f",
-        b"\xF2\x77": "\u1e89",
-        b"\xF2\x79": "\u1ef5",
-        b"\xF2\x7A": "\u1e93",
-        b"\xF3\x55": "\u1e72",
-        b"\xF3\x75": "\u1e73",
-        b"\xF4\x41": "\u1e00",
-        b"\xF4\x61": "\u1e01",
-        b"\xF9\x48": "\u1e2a",
-        b"\xF9\x68": "\u1e2b",
-    }
-
-    def __ansel_to_unicode(self, text):
-        """Convert an ANSEL encoded text to unicode"""
-
-        buff = StringIO()
-        error = ""
-        while text:
-            if text[0] < 128:
-                if chr(text[0]) in AnselReader.__use_ASCII:
-                    head = chr(text[0])
-                else:
-                    # substitute space for disallowed (control) chars
-                    error += " (%#X)" % text[0]
-                    head = " "
-                text = text[1:]
-            else:
-                if text[0:2] in AnselReader.__twobyte:
-                    head = AnselReader.__twobyte[text[0:2]]
-                    text = text[2:]
-                elif bytes([text[0]]) in AnselReader.__onebyte:
-                    head = AnselReader.__onebyte[bytes([text[0]])]
-                    text = text[1:]
-                elif bytes([text[0]]) in AnselReader.__acombiners:
-                    cmb = AnselReader.__acombiners[bytes([text[0]])]
-                    # always consume the combiner
-                    text = text[1:]
-                    next_byte = text[0]
-                    if (
-                        next_byte < 128
-                        and chr(next_byte) in AnselReader.__printable_ascii
-                    ):
-                        # consume next as well
-                        text = text[1:]
-                        # unicode: combiner follows base-char
-                        head = chr(next_byte) + cmb
-                    else:
-                        # just drop the unexpected combiner
-                        error += " (%#X)" % text[0]
-                        continue
-                else:
-                    error += " (%#X)" % text[0]
-                    head = "\ufffd"  # "Replacement Char"
-                    text = text[1:]
-            buff.write(head)
-        ans = buff.getvalue()
-
-        if error:
-            # e.g. Illegal character (oxAB) (0xCB)... 1 NOTE xyz?pqr?lmn
-            self.report_error(_("Illegal character%s") % error, ans)
-        buff.close()
-        return ans
-
     def __init__(self, ifile, __add_msg):
         BaseReader.__init__(self, ifile, "ANSEL", __add_msg)
-        # In theory, we should have been able to skip the encode/decode from
-        # ascii.  But this way allows us to use pythons universal newline
+        # the bytes the codec cannot decode are escaped, so that readline
+        # can report them
         self.ifile = TextIOWrapper(
-            ifile, encoding="ascii", errors="surrogateescape", newline=None
+            ifile, encoding="ansel", errors="surrogateescape", newline=None
         )
 
     def readline(self):
         line = self.ifile.readline()
-        linebytes = line.encode(encoding="ascii", errors="surrogateescape")
-        return self.__ansel_to_unicode(linebytes)
+        if ANSEL_ILLEGAL.search(line) is None:
+            return line
+        error = ""
+
+        def replace(match):
+            nonlocal error
+            code = ord(match.group())
+            if code < 128:
+                # substitute space for disallowed (control) chars
+                error += " (%#X)" % code
+                return " "
+            code -= 0xDC00
+            error += " (%#X)" % code
+            if code in ANSEL_COMBINERS:
+                # just drop the unexpected combiner
+                return ""
+            return "\ufffd"  # "Replacement Char"
+
+        line = ANSEL_ILLEGAL.sub(replace, line)
+        # e.g. Illegal character (oxAB) (0xCB)... 1 NOTE xyz?pqr?lmn
+        self.report_error(_("Illegal character%s") % error, line)
+        return line
 
 
 # -------------------------------------------------------------------------
@@ -2308,6 +1881,8 @@ class GedcomParser(UpdateCallback):
         self.fid2id = {}
         self.rid2id = {}
         self.nid2id = {}
+        # position of the next child of each family, see set_child_ref_order
+        self.child_ref_count = {}
 
         self.place_import = PlaceImport(self.dbase)
 
@@ -3209,8 +2784,8 @@ class GedcomParser(UpdateCallback):
             intid = self.__find_from_handle(gramps_id, self.fid2id)
             family.set_handle(intid)
             family.set_gramps_id(gramps_id)
-        # Add a counter for reordering the children later:
-        family._child_ref_count = 0
+        # Reset the counter for reordering the children later:
+        self.child_ref_count[family.handle] = 0
         return family
 
     def __find_or_create_media(self, gramps_id):
@@ -5642,12 +5217,12 @@ class GedcomParser(UpdateCallback):
     def set_child_ref_order(self, family, child_ref):
         """
         Sets the child_ref in family.child_ref_list to be in the position
-        family.child_ref_count. This reorders the children to be in the
-        order given in the FAM section.
+        self.child_ref_count[family.handle]. This reorders the children to be
+        in the order given in the FAM section.
         """
         family.child_ref_list.remove(child_ref)
-        family.child_ref_list.insert(family._child_ref_count, child_ref)
-        family._child_ref_count += 1
+        family.child_ref_list.insert(self.child_ref_count[family.handle], child_ref)
+        self.child_ref_count[family.handle] += 1
 
     def __family_slgs(self, line, state):
         """
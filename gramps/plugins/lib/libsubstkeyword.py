@@ -354,18 +354,21 @@ class PlaceFormat(GenericFormat):
 
     def __init__(self, database, _in):
         self.database = database
+        self.event_date = None
         GenericFormat.__init__(self, _in)
 
     def get_place(self, database, event):
         """A helper method for retrieving a place from an event"""
         if event:
+            # the place is displayed as it was at the date of the event
+            self.event_date = event.get_date_object()
             bplace_handle = event.get_place_handle()
             if bplace_handle:
                 return database.get_place_from_handle(bplace_handle)
         return None
 
     def _default_format(self, place):
-        return _pd.display(self.database, place, place.event_date)
+        return _pd.display(self.database, place, self.event_date)
 
     def parse_format(self, database, place):
         """Parse the place"""
@@ -451,8 +454,6 @@ class EventFormat(GenericFormat):
             """start formatting a place in this event"""
             place_format = PlaceFormat(self.database, self.string_in)
             place = place_format.get_place(self.database, event)
-            if event and place:
-                place.event_date = event.get_date_object()
             return place_format.parse_format(self.database, place)
 
         def format_attrib():
@@ -916,8 +917,6 @@ class VariableParse:
         return the result"""
         place_f = PlaceFormat(self.database, self._in)
         place = place_f.get_place(self.database, event)
-        if event and place:
-            place.event_date = event.get_date_object()
         if self.empty_item(place):
             return
         return place_f.parse_format(self.database, place)
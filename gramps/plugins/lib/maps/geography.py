@@ -71,6 +71,7 @@ from .selectionlayer import SelectionLayer
 from .placeselection import PlaceSelection
 from .cairoprint import CairoPrintSave
 from .libkml import Kml
+from .markerindex import ColumnLookup, MarkerIndex
 
 gi.require_version("OsmGpsMap", "1.0")
 
@@ -193,6 +194,9 @@ class GeoGraphyView(OsmGps, NavigationView):
         self.geo_mainmap = theme.load_surface("gramps-geo-mainmap", 48, 1, None, 0)
         self.geo_altmap = theme.load_surface("gramps-geo-altmap", 48, 1, None, 0)
         self.sort = []
+        self.marker_index = None
+        self.place_list_lookup = ColumnLookup()
+        self.places_found_lookup = ColumnLookup()
         self.geo_othermap = {}
         for ident in (EventType.BIRTH, EventType.DEATH, EventType.MARRIAGE):
             icon = constants.ICONS.get(int(ident))
@@ -508,83 +512,19 @@ class GeoGraphyView(OsmGps, NavigationView):
         """
         Is there a marker at this position ?
         """
-        found = False
-        mark_selected = []
         self.uistate.set_busy_cursor(True)
-        for mark in self.sort:
-            # as we are not precise with our hand, reduce the precision
-            # depending on the zoom.
-            precision = {
-                1: "%3.0f",
-                2: "%3.1f",
-                3: "%3.1f",
-                4: "%3.1f",
-                5: "%3.2f",
-                6: "%3.2f",
-                7: "%3.2f",
-                8: "%3.3f",
-                9: "%3.3f",
-                10: "%3.3f",
-                11: "%3.3f",
-                12: "%3.3f",
-                13: "%3.3f",
-                14: "%3.4f",
-                15: "%3.4f",
-                16: "%3.4f",
-                17: "%3.4f",
-                18: "%3.4f",
-            }.get(config.get("geography.zoom"), "%3.1f")
-            shift = {
-                1: 5.0,
-                2: 5.0,
-                3: 3.0,
-                4: 1.0,
-                5: 0.5,
-                6: 0.3,
-                7: 0.15,
-                8: 0.06,
-                9: 0.03,
-                10: 0.015,
-                11: 0.005,
-                12: 0.003,
-                13: 0.001,
-                14: 0.0005,
-                15: 0.0003,
-                16: 0.0001,
-                17: 0.0001,
-                18: 0.0001,
-            }.get(config.get("geography.zoom"), 5.0)
-            latp = precision % lat
-            lonp = precision % lon
-            mlatp = precision % float(mark[3])
-            mlonp = precision % float(mark[4])
-            latok = lonok = False
-            _LOG.debug(
-                " compare latitude : %s with %s (precision = %s)" " place='%s'",
-                float(mark[3]),
-                lat,
-                precision,
-                mark[0],
-            )
-            _LOG.debug(
-                "compare longitude : %s with %s (precision = %s)" " zoom=%d",
-                float(mark[4]),
-                lon,
-                precision,
-                config.get("geography.zoom"),
-            )
-            if (float(mlatp) >= (float(latp) - shift)) and (
-                float(mlatp) <= (float(latp) + shift)
-            ):
-                latok = True
-            if (float(mlonp) >= (float(lonp) - shift)) and (
-                float(mlonp) <= (float(lonp) + shift)
-            ):
-                lonok = True
-            if latok and lonok:
-                mark_selected.append(mark)
-                found = True
-        if found:
+        if self.marker_index is None or not self.marker_index.is_current(self.sort):
+            self.marker_index = MarkerIndex(self.sort, 3, 4)
+        zoom = config.get("geography.zoom")
+        mark_selected = self.marker_index.find(lat, lon, zoom)
+        _LOG.debug(
+            "%d markers at latitude %s, longitude %s (zoom=%d)",
+            len(mark_selected),
+            lat,
+            lon,
+            zoom,
+        )
+        if mark_selected:
             self.bubble_message(event, lat, lon, mark_selected)
         self.uistate.set_busy_cursor(False)
 
@@ -656,8 +596,7 @@ class GeoGraphyView(OsmGps, NavigationView):
         """
         Search a string in place_list depending index
         """
-        found = any(p[index] == string for p in self.place_list)
-        return found
+        return self.place_list_lookup.contains(self.place_list, index, string)
 
     def _append_to_places_list(
         self,
@@ -678,7 +617,7 @@ class GeoGraphyView(OsmGps, NavigationView):
         """
         Create a list of places with coordinates.
         """
-        found = any(p[0] == place for p in self.places_found)
+        found = self.places_found_lookup.contains(self.places_found, 0, place)
         if not found and (self.nbplaces < self._config.get("geography.max_places")):
             # We only show the first "geography.max_places".
             # over 3000 or 4000 places, the geography become unusable.
@@ -0,0 +1,195 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"Lookups in the lists of places and markers shown on a map"
+
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+from collections import defaultdict
+from math import floor
+
+# -------------------------------------------------------------------------
+#
+# Constants
+#
+# -------------------------------------------------------------------------
+# As we are not precise with our hand, reduce the precision depending on the
+# zoom: positions are rounded to this number of decimals ...
+ZOOM_PRECISION = {
+    1: 0,
+    2: 1,
+    3: 1,
+    4: 1,
+    5: 2,
+    6: 2,
+    7: 2,
+    8: 3,
+    9: 3,
+    10: 3,
+    11: 3,
+    12: 3,
+    13: 3,
+    14: 4,
+    15: 4,
+    16: 4,
+    17: 4,
+    18: 4,
+}
+
+# ... and a marker is found if it is less than this number of degrees away.
+ZOOM_SHIFT = {
+    1: 5.0,
+    2: 5.0,
+    3: 3.0,
+    4: 1.0,
+    5: 0.5,
+    6: 0.3,
+    7: 0.15,
+    8: 0.06,
+    9: 0.03,
+    10: 0.015,
+    11: 0.005,
+    12: 0.003,
+    13: 0.001,
+    14: 0.0005,
+    15: 0.0003,
+    16: 0.0001,
+    17: 0.0001,
+    18: 0.0001,
+}
+
+
+def round_position(value, zoom):
+    """
+    Round a latitude or a longitude to the precision used at this zoom.
+    """
+    return float("%.*f" % (ZOOM_PRECISION.get(zoom, 1), float(value)))
+
+
+# -------------------------------------------------------------------------
+#
+# MarkerIndex
+#
+# -------------------------------------------------------------------------
+class MarkerIndex:
+    """
+    A grid over a list of markers, to find the markers near a position
+    without comparing it with every marker.
+
+    The grid of a zoom level is built the first time it is needed. The index
+    is only valid for the list it was built for, as long as no marker is
+    added or removed: see :meth:`is_current`.
+    """
+
+    def __init__(self, marks, lat_index, lon_index, skip_repeated=False):
+        """
+        :param marks: the list of markers
+        :param lat_index: the index of the latitude in a marker
+        :param lon_index: the index of the longitude in a marker
+        :param skip_repeated: if True, only index the first of consecutive
+                              markers of the same place, the place being the
+                              first value of a marker
+        """
+        self.marks = marks
+        self.size = len(marks)
+        self.lat_index = lat_index
+        self.lon_index = lon_index
+        self.skip_repeated = skip_repeated
+        self.grids = {}
+
+    def is_current(self, marks):
+        """
+        Return True if the index can be used for this list of markers.
+        """
+        return marks is self.marks and len(marks) == self.size
+
+    def __get_grid(self, zoom):
+        """
+        Return the grid of the markers for a zoom level, as a dictionary of
+        cells, each cell holding the index and the rounded position of its
+        markers.
+        """
+        if zoom not in self.grids:
+            cell = ZOOM_SHIFT.get(zoom, 5.0)
+            grid = defaultdict(list)
+            oldplace = ""
+            for index, mark in enumerate(self.marks):
+                if self.skip_repeated:
+                    if mark[0] == oldplace:
+                        continue
+                    oldplace = mark[0]
+                lat = round_position(mark[self.lat_index], zoom)
+                lon = round_position(mark[self.lon_index], zoom)
+                grid[floor(lat / cell), floor(lon / cell)].append((index, lat, lon))
+            self.grids[zoom] = grid
+        return self.grids[zoom]
+
+    def find(self, lat, lon, zoom):
+        """
+        Return the markers at the given position, in list order.
+        """
+        grid = self.__get_grid(zoom)
+        shift = cell = ZOOM_SHIFT.get(zoom, 5.0)
+        lat = round_position(lat, zoom)
+        lon = round_position(lon, zoom)
+        found = []
+        for row in range(floor((lat - shift) / cell), floor((lat + shift) / cell) + 1):
+            for col in range(
+                floor((lon - shift) / cell), floor((lon + shift) / cell) + 1
+            ):
+                for index, mlat, mlon in grid.get((row, col), ()):
+                    if (lat - shift <= mlat <= lat + shift) and (
+                        lon - shift <= mlon <= lon + shift
+                    ):
+                        found.append(index)
+        return [self.marks[index] for index in sorted(found)]
+
+
+# -------------------------------------------------------------------------
+#
+# ColumnLookup
+#
+# -------------------------------------------------------------------------
+class ColumnLookup:
+    """
+    The sets of values found in the columns of a list of rows, to test if a
+    value is present without scanning the list. The sets follow the rows
+    appended to the list, and are rebuilt if the list is replaced.
+    """
+
+    def __init__(self):
+        self.rows = None
+        self.columns = {}
+
+    def contains(self, rows, index, value):
+        """
+        Return True if a row of the list has this value at this index.
+        """
+        if rows is not self.rows:
+            self.rows = rows
+            self.columns = {}
+        values, size = self.columns.get(index, (None, 0))
+        if values is None or len(rows) < size:
+            values, size = set(), 0
+        if len(rows) > size:
+            values.update(row[index] for row in rows[size:])
+        self.columns[index] = (values, len(rows))
+        return value in values
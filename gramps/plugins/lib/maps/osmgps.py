@@ -57,6 +57,7 @@ from gramps.gui.dialog import ErrorDialog
 from gramps.gen.constfunc import get_env_var
 from .dummylayer import DummyLayer
 from .dummynogps import DummyMapNoGpsPoint
+from .markerindex import MarkerIndex
 from .selectionlayer import SelectionLayer
 from .lifewaylayer import LifeWayLayer
 from .markerlayer import MarkerLayer
@@ -126,6 +127,7 @@ class OsmGps:
         self.end_selection = None
         self.current_map = None
         self.places_found = None
+        self.places_index = None
         self.uistate = uistate
         self.zoom = config.get("geography.zoom")
 
@@ -576,78 +578,23 @@ class OsmGps:
     def is_there_a_place_here(self, lat, lon):
         """
         Is there a place at this position ?
-        If too many places, this function is very time consuming
         """
         mark_selected = []
         if self.no_show_places_in_status_bar:
             return mark_selected
-        oldplace = ""
+        if not self.places_found:
+            return mark_selected
         _LOG.debug(
             "%s",
             time.strftime(
                 "start is_there_a_place_here : " "%a %d %b %Y %H:%M:%S", time.gmtime()
             ),
         )
-        for mark in self.places_found:
-            # as we are not precise with our hand, reduce the precision
-            # depending on the zoom.
-            if mark[0] != oldplace:
-                oldplace = mark[0]
-                precision = {
-                    1: "%3.0f",
-                    2: "%3.1f",
-                    3: "%3.1f",
-                    4: "%3.1f",
-                    5: "%3.2f",
-                    6: "%3.2f",
-                    7: "%3.2f",
-                    8: "%3.3f",
-                    9: "%3.3f",
-                    10: "%3.3f",
-                    11: "%3.3f",
-                    12: "%3.3f",
-                    13: "%3.3f",
-                    14: "%3.4f",
-                    15: "%3.4f",
-                    16: "%3.4f",
-                    17: "%3.4f",
-                    18: "%3.4f",
-                }.get(config.get("geography.zoom"), "%3.1f")
-                shift = {
-                    1: 5.0,
-                    2: 5.0,
-                    3: 3.0,
-                    4: 1.0,
-                    5: 0.5,
-                    6: 0.3,
-                    7: 0.15,
-                    8: 0.06,
-                    9: 0.03,
-                    10: 0.015,
-                    11: 0.005,
-                    12: 0.003,
-                    13: 0.001,
-                    14: 0.0005,
-                    15: 0.0003,
-                    16: 0.0001,
-                    17: 0.0001,
-                    18: 0.0001,
-                }.get(config.get("geography.zoom"), 5.0)
-                latp = precision % lat
-                lonp = precision % lon
-                mlatp = precision % float(mark[1])
-                mlonp = precision % float(mark[2])
-                latok = lonok = False
-                if (float(mlatp) >= (float(latp) - shift)) and (
-                    float(mlatp) <= (float(latp) + shift)
-                ):
-                    latok = True
-                if (float(mlonp) >= (float(lonp) - shift)) and (
-                    float(mlonp) <= (float(lonp) + shift)
-                ):
-                    lonok = True
-                if latok and lonok:
-                    mark_selected.append(mark)
+        if self.places_index is None or not self.places_index.is_current(
+            self.places_found
+        ):
+            self.places_index = MarkerIndex(self.places_found, 1, 2, True)
+        mark_selected = self.places_index.find(lat, lon, config.get("geography.zoom"))
         _LOG.debug(
             "%s",
             time.strftime(
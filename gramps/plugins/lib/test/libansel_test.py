@@ -0,0 +1,120 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the ANSEL codec and of the GEDCOM ANSEL reader
+"""
+
+import codecs
+import io
+import sys
+import unittest
+from timeit import repeat
+
+from gramps.plugins.lib import libansel
+from gramps.plugins.lib.libgedcom import AnselReader, CP1252Reader
+
+ANSEL = b"0 @I1@ INDI\r\n1 NAME Ren\xe2e /\xa1od\xe2z/\r\n1 NOTE \xf2a \xe8o\xb2\n"
+BENCHMARK_SIZE = 100000
+TEXT = "0 @I1@ INDI\n1 NAME Ren\u00e9 /\u0141od\u017a/\n1 NOTE \u1ea1 \u00f6\u00f8\n"
+
+
+class AnselCodecTest(unittest.TestCase):
+    def test_decode(self):
+        self.assertEqual(
+            b"\xe2\xa5\xe3\xa5".decode("ansel", "replace"), "\u01fc\ufffd\u00c6"
+        )
+        self.assertEqual(
+            b"Ren\xe2e \xf2a \xa1".decode("ansel"), "Ren\u00e9 \u1ea1 \u0141"
+        )
+
+    def test_errors(self):
+        self.assertRaises(UnicodeDecodeError, b"a\xff".decode, "ansel")
+        self.assertRaises(UnicodeDecodeError, b"a\xe2\n".decode, "ansel")
+        self.assertEqual(b"a\xffb\xe2".decode("ansel", "replace"), "a\ufffdb\ufffd")
+        self.assertEqual(b"\xe2\xe2e".decode("ansel", "ignore"), "\u00e9")
+
+    def test_incremental(self):
+        """
+        Decoding piece by piece gives the same text, even when a combining
+        form ends a piece.
+        """
+        decoder = codecs.getincrementaldecoder("ansel")()
+        for size in range(1, 8):
+            text = "".join(
+                decoder.decode(ANSEL[pos : pos + size])
+                for pos in range(0, len(ANSEL), size)
+            )
+            text += decoder.decode(b"", final=True)
+            self.assertEqual(text, ANSEL.decode("ansel"))
+
+    def test_encode(self):
+        self.assertEqual("\u0141\u00f3d\u017a".encode("ansel"), b"\xa1\xe2od\xe2z")
+        self.assertEqual("\u1ea1".encode("ansel"), b"\xf2a")
+        self.assertEqual("\u01fc".encode("ansel"), b"\xe2\xa5")
+        self.assertRaises(UnicodeEncodeError, "\u4e2d".encode, "ansel")
+        self.assertEqual("a\u4e2d".encode("ansel", "replace"), b"a?")
+        text = ANSEL.decode("ansel")
+        self.assertEqual(libansel.decode(text.encode("ansel"))[0], text)
+
+
+class AnselReaderTest(unittest.TestCase):
+    def read(self, data):
+        messages = []
+        reader = AnselReader(io.BytesIO(data), messages.append)
+        lines = []
+        line = reader.readline()
+        while line:
+            lines.append(line)
+            line = reader.readline()
+        return "".join(lines), messages
+
+    def test_read(self):
+        self.assertEqual(self.read(ANSEL), (TEXT, []))
+
+    def test_illegal(self):
+        text, messages = self.read(b"1 NOTE a\tb\xffc\xe2\n")
+        self.assertEqual(text, "1 NOTE a b\ufffdc\n")
+        self.assertEqual(len(messages), 1)
+        self.assertIn("(0X9) (0XFF) (0XE2)", messages[0])
+
+
+def benchmark_reader():
+    """
+    Print the time taken to read a GEDCOM file of ANSEL lines with the
+    AnselReader, and with the CP1252Reader, which decodes with a codec of
+    Python, for reference. This is not a unit test: run this module with
+    --benchmark.
+    """
+    data = ANSEL * (BENCHMARK_SIZE // ANSEL.count(b"\n"))
+
+    def read(reader_class):
+        reader = reader_class(io.BytesIO(data), lambda msg: None)
+        while reader.readline():
+            pass
+
+    for reader_class in (AnselReader, CP1252Reader):
+        seconds = min(repeat(lambda: read(reader_class), number=1, repeat=3))
+        print("%s, %d lines: %.4f s" % (reader_class.__name__, BENCHMARK_SIZE, seconds))
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark_reader()
+    else:
+        unittest.main()
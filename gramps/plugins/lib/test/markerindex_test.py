@@ -0,0 +1,162 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the lookups in the markers shown on a map
+"""
+
+import random
+import unittest
+
+from gramps.plugins.lib.maps.markerindex import (
+    ZOOM_PRECISION,
+    ZOOM_SHIFT,
+    ColumnLookup,
+    MarkerIndex,
+)
+
+# the zoom levels of the map, and a level without a precision of its own
+ZOOMS = sorted(ZOOM_SHIFT) + [0]
+
+
+def scan(marks, lat, lon, zoom, lat_index, lon_index, skip_repeated=False):
+    """
+    Return the markers at the given position, comparing it with every
+    marker as the map views did before the index.
+    """
+    precision = "%%3.%df" % ZOOM_PRECISION.get(zoom, 1)
+    shift = ZOOM_SHIFT.get(zoom, 5.0)
+    latp = float(precision % lat)
+    lonp = float(precision % lon)
+    found = []
+    oldplace = ""
+    for mark in marks:
+        if skip_repeated:
+            if mark[0] == oldplace:
+                continue
+            oldplace = mark[0]
+        mlatp = float(precision % float(mark[lat_index]))
+        mlonp = float(precision % float(mark[lon_index]))
+        if (latp - shift <= mlatp <= latp + shift) and (
+            lonp - shift <= mlonp <= lonp + shift
+        ):
+            found.append(mark)
+    return found
+
+
+class MarkerIndexTest(unittest.TestCase):
+    """
+    Compare the markers found with the index with those found by comparing
+    the position with every marker.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        rand = random.Random(1)
+        # markers of places, as the places found by the map, with the
+        # events of a place following each other
+        cls.places = []
+        for place in range(200):
+            lat = "%.6f" % rand.uniform(-90, 90)
+            lon = "%.6f" % rand.uniform(-180, 180)
+            for event in range(rand.randint(1, 3)):
+                cls.places.append(("P%d" % place, lat, lon, "E%d" % event))
+        cls.positions = [
+            (rand.uniform(-90, 90), rand.uniform(-180, 180)) for dummy in range(50)
+        ]
+
+    def check(
+        self, marks, positions, lat_index, lon_index, skip_repeated=False, zooms=ZOOMS
+    ):
+        """
+        Check the markers found at the positions, at the zoom levels.
+        """
+        index = MarkerIndex(marks, lat_index, lon_index, skip_repeated)
+        found = 0
+        for zoom in zooms:
+            for lat, lon in positions:
+                marks_found = index.find(lat, lon, zoom)
+                self.assertEqual(
+                    marks_found,
+                    scan(marks, lat, lon, zoom, lat_index, lon_index, skip_repeated),
+                    (zoom, lat, lon),
+                )
+                found += len(marks_found)
+        self.assertTrue(found)
+
+    def test_places(self):
+        positions = list(self.positions)
+        # the markers themselves, and the positions a shift away from them
+        for dummy, lat, lon, dummy in self.places[::5]:
+            lat, lon = float(lat), float(lon)
+            positions.append((lat, lon))
+            for zoom in (1, 4, 9, 18):
+                shift = ZOOM_SHIFT[zoom]
+                positions.append((lat + shift, lon - shift))
+        self.check(self.places, positions, 1, 2, skip_repeated=True)
+
+    def test_borders(self):
+        # markers and positions on the borders of the cells of a zoom level,
+        # and of the positions they are rounded to
+        for zoom in ZOOMS:
+            cell = ZOOM_SHIFT.get(zoom, 5.0)
+            marks = [
+                ("B", "", "", str(row * cell), str((col + 10) * cell))
+                for row in range(-3, 4)
+                for col in range(-3, 4)
+            ]
+            positions = [(float(mark[3]), float(mark[4])) for mark in marks]
+            positions += [
+                (step * cell / 2, (step + 20) * cell / 2) for step in range(-8, 9)
+            ]
+            self.check(marks, positions, 3, 4, zooms=[zoom])
+
+    def test_is_current(self):
+        marks = list(self.places)
+        index = MarkerIndex(marks, 1, 2)
+        self.assertTrue(index.is_current(marks))
+        self.assertFalse(index.is_current(list(marks)))
+        marks.append(("P", "0.0", "0.0", "E"))
+        self.assertFalse(index.is_current(marks))
+
+
+class ColumnLookupTest(unittest.TestCase):
+    """
+    Test the values found in the columns of a list of rows.
+    """
+
+    def test_contains(self):
+        lookup = ColumnLookup()
+        rows = [("a", 1), ("b", 2)]
+        self.assertTrue(lookup.contains(rows, 0, "a"))
+        self.assertFalse(lookup.contains(rows, 0, "c"))
+        self.assertTrue(lookup.contains(rows, 1, 2))
+        # rows appended to the list
+        rows.append(("c", 3))
+        self.assertTrue(lookup.contains(rows, 0, "c"))
+        self.assertTrue(lookup.contains(rows, 1, 3))
+        # rows removed from the list
+        del rows[0]
+        self.assertFalse(lookup.contains(rows, 0, "a"))
+        # another list
+        self.assertFalse(lookup.contains([("d", 4)], 0, "c"))
+        self.assertTrue(lookup.contains([("d", 4)], 0, "d"))
+
+
+if __name__ == "__main__":
+    unittest.main()
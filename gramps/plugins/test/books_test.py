@@ -0,0 +1,138 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+#
+
+"""
+Unittest for writing books in worker processes
+"""
+
+import os
+import tempfile
+import unittest
+
+import gramps.gen.filters
+from gramps.gen.config import config
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.utils import import_from_filename, make_database
+from gramps.gen.filters import reload_custom_filters
+from gramps.gen.plug.docgen import PaperStyle, PaperSize, StyleSheet
+from gramps.gen.plug.report import BookItem, append_styles, write_book_parallel
+from gramps.gen.user import User
+from gramps.plugins.docgen.rtfdoc import RTFDoc
+
+EXAMPLE = os.path.join(DATA_DIR, "tests", "data.gramps")
+
+
+class ParallelBookTest(unittest.TestCase):
+    """
+    Test a book written in a pool of worker processes.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Import the test data into a tree on disk.
+        """
+        # restored for the tests of the filters, which set their own
+        cls.custom_filters = gramps.gen.filters.CustomFilters
+        reload_custom_filters()
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.db = make_database("sqlite")
+        cls.db.load(cls.tmpdir.name)
+        import_from_filename(cls.db, EXAMPLE, User())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        cls.tmpdir.cleanup()
+        gramps.gen.filters.CustomFilters = cls.custom_filters
+
+    def write_book(self, filename, processes):
+        """
+        Write a book of two items to an RTF file, as the command line does,
+        and return the contents of the file. Return None if the items could
+        not be written in parallel.
+        """
+        items = [BookItem(self.db, name) for name in ("summary", "records")]
+        paper = PaperStyle(PaperSize("Letter", 27.94, 21.59), 0)
+        doc = RTFDoc(None, paper)
+        selected_style = StyleSheet()
+        for item in items:
+            item.option_class.set_document(doc)
+            append_styles(selected_style, item)
+        if processes > 1:
+            rptlist = write_book_parallel(
+                self.db, items, doc, selected_style, processes
+            )
+            if rptlist is None:
+                return None
+        else:
+            rptlist = [
+                (
+                    item.get_write_item()(self.db, item.option_class, User()),
+                    item.get_translated_name(),
+                )
+                for item in items
+            ]
+        path = os.path.join(self.tmpdir.name, filename)
+        doc.set_style_sheet(selected_style)
+        doc.open(path)
+        doc.init()
+        for index, (rpt, dummy) in enumerate(rptlist):
+            if index:
+                doc.page_break()
+            rpt.begin_report()
+            rpt.write_report()
+        doc.close()
+        with open(path, encoding="utf-8") as file:
+            return file.read()
+
+    def test_parallel(self):
+        """
+        Test that a book written by two worker processes is the same as one
+        written serially.
+        """
+        serial = self.write_book("serial.rtf", 1)
+        parallel = self.write_book("parallel.rtf", 2)
+        self.assertIsNotNone(parallel)
+        self.assertEqual(parallel, serial)
+
+    def test_parallel_config(self):
+        """
+        Test that the worker processes use the settings of the session, not
+        those of the config file.
+        """
+        keys = (
+            "behavior.date-before-range",
+            "behavior.date-after-range",
+            "behavior.date-about-range",
+        )
+        saved = [config.get(key) for key in keys]
+        try:
+            for key, value in zip(keys, (9999, 9999, 10)):
+                config.set(key, value)
+            serial = self.write_book("serial.rtf", 1)
+            parallel = self.write_book("parallel.rtf", 2)
+        finally:
+            for key, value in zip(keys, saved):
+                config.set(key, value)
+        self.assertIsNotNone(parallel)
+        self.assertEqual(parallel, serial)
+
+
+if __name__ == "__main__":
+    unittest.main()
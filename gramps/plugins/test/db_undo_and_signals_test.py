@@ -201,16 +201,8 @@ class DbTestClassBase(object):
         sigs = [
             ("person-delete", ["0000000300000003", "0000000400000004"]),
             ("family-delete", ["0000000600000006"]),
-            (
-                "person-update",
-                [
-                    "0000000100000001",
-                    "0000000200000002",
-                    "0000000100000001",
-                    "0000000200000002",
-                ],
-            ),
-            ("family-update", ["0000000500000005", "0000000500000005"]),
+            ("person-update", ["0000000100000001", "0000000200000002"]),
+            ("family-update", ["0000000500000005"]),
         ]
         self.assertEqual(sigs, self.sigs, msg="merge families")
         fam_cnt = self.db.get_number_of_families()
@@ -248,24 +240,8 @@ class DbTestClassBase(object):
         sigs = [
             ("person-add", ["0000000400000004", "0000000300000003"]),
             ("family-add", ["0000000600000006"]),
-            (
-                "person-update",
-                [
-                    "0000000200000002",
-                    "0000000100000001",
-                    "0000000200000002",
-                    "0000000100000001",
-                ],
-            ),
-            (
-                "family-update",
-                [
-                    "0000000500000005",
-                    "0000000600000006",
-                    "0000000600000006",
-                    "0000000500000005",
-                ],
-            ),
+            ("person-update", ["0000000200000002", "0000000100000001"]),
+            ("family-update", ["0000000500000005", "0000000600000006"]),
         ]
         self.assertEqual(sigs, self.sigs, msg="undo merge signals check")
         fam_cnt = self.db.get_number_of_families()
@@ -380,16 +356,8 @@ class DbTestClassBase(object):
         sigs = [
             ("person-delete", ["0000000300000003", "0000000400000004"]),
             ("family-delete", ["0000000600000006"]),
-            (
-                "person-update",
-                [
-                    "0000000100000001",
-                    "0000000200000002",
-                    "0000000100000001",
-                    "0000000200000002",
-                ],
-            ),
-            ("family-update", ["0000000500000005", "0000000500000005"]),
+            ("person-update", ["0000000100000001", "0000000200000002"]),
+            ("family-update", ["0000000500000005"]),
         ]
         self.assertEqual(sigs, self.sigs, msg="merge families")
         fam_cnt = self.db.get_number_of_families()
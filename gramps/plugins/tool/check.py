@@ -77,7 +77,7 @@ from gramps.gen.lib import (
     Tag,
 )
 from gramps.gen.lib.serialize import to_dict
-from gramps.gen.db import DbTxn, CLASS_TO_KEY_MAP
+from gramps.gen.db import DbTxn
 from gramps.gen.config import config
 from gramps.gen.utils.id import create_id
 from gramps.gen.utils.db import family_name
@@ -1351,91 +1351,55 @@ class CheckIntegrity:
 
         total = self.db.get_total()
 
-        self.progress.set_pass(
-            _("Looking for backlink reference problems") + " (1)", total
-        )
+        self.progress.set_pass(_("Looking for backlink reference problems"), total)
         logging.info("Looking for backlink reference problems")
 
-        # dict of object handles indexed by forward link created here
-        my_blinks = defaultdict(list)
-        my_items = 0  # count of my backlinks for progress meter
-        # dict of object handles indexed by forward link from db
-        db_blinks = {}
-        db_items = 0  # count of db backlinks for progress meter
-
-        # first we assemble our own backlinks table, and while we have the
-        # handle, gather up a second table with the db's backlinks
-        for obj_class in CLASS_TO_KEY_MAP.keys():
-            for handle in self.db.method("iter_%s_handles", obj_class)():
-                self.progress.step()
-                blinks = list(self.db.find_backlink_handles(handle))
-                db_blinks[(obj_class, handle)] = blinks
-                db_items += len(blinks)
-                pri_obj = self.db.method("get_%s_from_handle", obj_class)(handle)
-                handle_list = pri_obj.get_referenced_handles_recursively()
-                my_items += len(handle_list)
-
-                for item in handle_list:
-                    my_blinks[item].append((obj_class, handle))
-
-        # Now we go through our backlinks and the dbs table comparing them
-        # check that each real reference has a backlink in the db table
-        self.progress.set_pass(
-            _("Looking for backlink reference problems") + " (2)", my_items
-        )
-        for key, blinks in my_blinks.items():
-            for item in blinks:
-                self.progress.step()
-                if key not in db_blinks:
-                    # object has reference to something not in db;
-                    # should have been found in previous checks
-                    logging.warning(
-                        "    Fail: reference to an object %(obj)s"
-                        " not in the db by %(ref)s!",
-                        {"obj": key, "ref": item},
-                    )
-                    continue
-                if item not in db_blinks[key]:
-                    # Object has reference with no cooresponding backlink
-                    self.bad_backlinks += 1
-                    pri_obj = self.db.method("get_%s_from_handle", key[0])(key[1])
-                    logging.warning(
-                        '    FAIL: the "%(cls)s" [%(gid)s] '
-                        'has a "%(cls2)s" reference'
-                        " with no corresponding backlink.",
-                        {"gid": pri_obj.gramps_id, "cls": key[0], "cls2": item[0]},
-                    )
+        # the references held by the objects which are missing from the
+        # db's backlinks, and the db's backlinks without a reference
+        missing, extra = self.db.find_reference_map_errors(self.callback)
 
-        # Now we go through the db table and make checks against ours
-        # Check for db backlinks that don't have a reference object at all
-        self.progress.set_pass(
-            _("Looking for backlink reference problems") + " (3)", db_items
-        )
-        for key, blinks in db_blinks.items():
-            for item in blinks:
-                self.progress.step()
-                if item not in db_blinks:
-                    # backlink to object entirely missing
-                    self.bad_backlinks += 1
-                    pri_obj = self.db.method("get_%s_from_handle", key[0])(key[1])
-                    logging.warning(
-                        '    FAIL: the "%(cls)s" [%(gid)s] '
-                        "has a backlink to a missing"
-                        ' "%(cls2)s" object.',
-                        {"gid": pri_obj.gramps_id, "cls": key[0], "cls2": item[0]},
-                    )
-                    continue
-                # Check if the object has a reference to the backlinked one
-                if key not in my_blinks or item not in my_blinks[key]:
-                    # backlink to object which doesn't have reference
-                    self.bad_backlinks += 1
-                    pri_obj = self.db.method("get_%s_from_handle", key[0])(key[1])
-                    logging.warning(
-                        '    FAIL: the "%(cls)s" [%(gid)s] '
-                        'has a backlink to a "%(cls2)s"'
-                        " with no corresponding reference.",
-                        {"gid": pri_obj.gramps_id, "cls": key[0], "cls2": item[0]},
-                    )
+        for obj_class, handle, ref_class, ref_handle in missing:
+            if not self.db.method("has_%s_handle", ref_class)(ref_handle):
+                # object has reference to something not in db;
+                # should have been found in previous checks
+                logging.warning(
+                    "    Fail: reference to an object %(obj)s"
+                    " not in the db by %(ref)s!",
+                    {"obj": (ref_class, ref_handle), "ref": (obj_class, handle)},
+                )
+                continue
+            # Object has reference with no cooresponding backlink
+            self.bad_backlinks += 1
+            pri_obj = self.db.method("get_%s_from_handle", ref_class)(ref_handle)
+            logging.warning(
+                '    FAIL: the "%(cls)s" [%(gid)s] '
+                'has a "%(cls2)s" reference'
+                " with no corresponding backlink.",
+                {"gid": pri_obj.gramps_id, "cls": ref_class, "cls2": obj_class},
+            )
+
+        for obj_class, handle, ref_class, ref_handle in extra:
+            if not self.db.method("has_%s_handle", ref_class)(ref_handle):
+                # backlinks of objects not in the db are not used
+                continue
+            pri_obj = self.db.method("get_%s_from_handle", ref_class)(ref_handle)
+            self.bad_backlinks += 1
+            if not self.db.method("has_%s_handle", obj_class)(handle):
+                # backlink to object entirely missing
+                logging.warning(
+                    '    FAIL: the "%(cls)s" [%(gid)s] '
+                    "has a backlink to a missing"
+                    ' "%(cls2)s" object.',
+                    {"gid": pri_obj.gramps_id, "cls": ref_class, "cls2": obj_class},
+                )
+            else:
+                # backlink to object which doesn't have reference
+                logging.warning(
+                    '    FAIL: the "%(cls)s" [%(gid)s] '
+                    'has a backlink to a "%(cls2)s"'
+                    " with no corresponding reference.",
+                    {"gid": pri_obj.gramps_id, "cls": ref_class, "cls2": obj_class},
+                )
 
     def callback(self, *args):
         self.progress.step()
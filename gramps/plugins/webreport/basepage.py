@@ -3688,8 +3688,15 @@ class BasePage:
                     role = "3"
             return role
 
+        # The references of a role are sorted by name, as the order of a set
+        # changes from one process to another
         for bkref_class, bkref_handle, role in sorted(
-            bkref_list, key=lambda x: sort_by_role(x)
+            bkref_list,
+            key=lambda x: (
+                sort_by_role(x),
+                self.report.obj_dict[x[0]][x[1]][1],
+                x[1],
+            ),
         ):
             list_html = Html("li")
             path = self.report.obj_dict[bkref_class][bkref_handle][0]
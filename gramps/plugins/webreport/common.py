@@ -754,14 +754,16 @@ def _find_birth_date(dbase, individual):
 
     @param: dbase      -- The database to use
     @param: individual -- The individual for who we want to find the birth date
+
+    :returns: The date, or None, and whether it is the date of a fallback event
     """
     date_out = None
+    fallback = False
     birth_ref = individual.get_birth_ref()
     if birth_ref:
         birth = dbase.get_event_from_handle(birth_ref.ref)
         if birth:
             date_out = birth.get_date_object()
-            date_out.fallback = False
     else:
         person_evt_ref_list = individual.get_primary_event_ref_list()
         if person_evt_ref_list:
@@ -770,10 +772,10 @@ def _find_birth_date(dbase, individual):
                 if event:
                     if event.get_type().is_birth_fallback():
                         date_out = event.get_date_object()
-                        date_out.fallback = True
+                        fallback = True
                         LOG.debug("setting fallback to true for '%s'", event)
                         break
-    return date_out
+    return date_out, fallback
 
 
 def _find_death_date(dbase, individual):
@@ -782,14 +784,16 @@ def _find_death_date(dbase, individual):
 
     @param: dbase      -- The database to use
     @param: individual -- The individual for who we want to find the death date
+
+    :returns: The date, or None, and whether it is the date of a fallback event
     """
     date_out = None
+    fallback = False
     death_ref = individual.get_death_ref()
     if death_ref:
         death = dbase.get_event_from_handle(death_ref.ref)
         if death:
             date_out = death.get_date_object()
-            date_out.fallback = False
     else:
         person_evt_ref_list = individual.get_primary_event_ref_list()
         if person_evt_ref_list:
@@ -798,10 +802,10 @@ def _find_death_date(dbase, individual):
                 if event:
                     if event.get_type().is_death_fallback():
                         date_out = event.get_date_object()
-                        date_out.fallback = True
+                        fallback = True
                         LOG.debug("setting fallback to true for '%s'", event)
                         break
-    return date_out
+    return date_out, fallback
 
 
 def build_event_data_by_individuals(dbase, ppl_handle_list):
@@ -123,11 +123,13 @@ class EventPages(BasePage):
         with self.r_user.progress(
             progress_title, message, len(event_handle_list) + 1
         ) as step:
-            index = 1
+            pages = []
             for event_handle in event_handle_list:
-                step()
-                index += 1
-                self.eventpage(self.report, the_lang, the_title, event_handle)
+                if self.report.page_needed(Event, event_handle):
+                    pages.append((event_handle,))
+                else:
+                    step()
+            self.report.write_pages(self, "eventpage", pages, the_lang, the_title, step)
             step()
         self.eventlistpage(
             self.report, the_lang, the_title, event_types, event_handle_list
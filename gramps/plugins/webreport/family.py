@@ -118,10 +118,15 @@ class FamilyPages(BasePage):
         with self.r_user.progress(
             progress_title, message, len(self.report.obj_dict[Family]) + 1
         ) as step:
+            pages = []
             for family_handle in self.report.obj_dict[Family]:
-                step()
-                index += 1
-                self.familypage(self.report, the_lang, the_title, family_handle)
+                if self.report.page_needed(Family, family_handle):
+                    pages.append((family_handle,))
+                else:
+                    step()
+            self.report.write_pages(
+                self, "familypage", pages, the_lang, the_title, step
+            )
             step()
             self.familylistpage(
                 self.report, the_lang, the_title, self.report.obj_dict[Family].keys()
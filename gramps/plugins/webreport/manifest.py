@@ -0,0 +1,424 @@
+# -*- coding: utf-8 -*-
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Narrative Web Page generator.
+
+Classe:
+    SiteManifest - remembers which pages were written from which objects,
+                   so that a later run only writes the pages of the objects
+                   which have changed.
+"""
+# ------------------------------------------------
+# python modules
+# ------------------------------------------------
+import json
+import logging
+import os
+
+# ------------------------------------------------
+# Gramps module
+# ------------------------------------------------
+from gramps.gen.errors import HandleError
+from gramps.gen.lib import Person
+from gramps.version import VERSION
+
+LOG = logging.getLogger(".NarrativeWeb")
+
+MANIFEST_NAME = ".narrativeweb-manifest.json"
+
+# The pages written for one object: subdirectory -> class of the object
+_PAGE_DIRS = {
+    "ppl": "Person",
+    "maps": "Person",
+    "addr": "Person",
+    "fam": "Family",
+    "evt": "Event",
+    "plc": "Place",
+    "src": "Source",
+    "repo": "Repository",
+    "img": "Media",
+    "srn": "Surname",
+}
+
+# The classes whose changes are followed, and the methods iterating on them
+_ITER_METHODS = (
+    ("Person", "iter_people"),
+    ("Family", "iter_families"),
+    ("Event", "iter_events"),
+    ("Place", "iter_places"),
+    ("Source", "iter_sources"),
+    ("Citation", "iter_citations"),
+    ("Media", "iter_media"),
+    ("Repository", "iter_repositories"),
+    ("Note", "iter_notes"),
+)
+
+
+def _key(obj_class, handle):
+    """
+    Return the key of a page in the manifest.
+    """
+    return "%s:%s" % (getattr(obj_class, "__name__", obj_class), handle)
+
+
+def _normalize(context):
+    """
+    Return the context of a page as it is stored in the manifest.
+    """
+    return json.loads(json.dumps(context))
+
+
+class SiteManifest:
+    """
+    The manifest of a website in a directory.
+
+    The manifest records the change time of every object of the database and,
+    for each object page, the files written for it and, for pages which also
+    depend on their neighbours, a context (e.g. the previous and next media).
+    Comparing it with the database tells which objects have changed since the
+    website was last written. The back references collected by the report
+    then give the pages which display those objects: these are written again,
+    the other object pages are kept as they are. The index pages are always
+    written.
+
+    Nothing is skipped when the options of the report, or the version of
+    Gramps, differ from the run which wrote the manifest.
+    """
+
+    def __init__(self, report):
+        """
+        @param: report -- The instance of the main report class
+        """
+        self.report = report
+        self.r_db = report.database
+        self.path = os.path.join(report.html_dir, MANIFEST_NAME)
+        options = dict(report.options)
+        options.pop("incremental", None)
+        self.signature = json.dumps(
+            [VERSION, options], sort_keys=True, default=str, ensure_ascii=False
+        )
+        self.old_pages = {}
+        self.old_changes = {}
+        self.full = True
+        self.pages = {}
+        self.changes = {}
+        self.dirty = set()
+        self.written = set()
+        self.__load()
+
+    def __load(self):
+        """
+        Read the manifest of the previous run, if there is one.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as manifest:
+                data = json.load(manifest)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as msg:
+            LOG.warning("Ignoring the website manifest %s: %s", self.path, msg)
+            return
+        if data.get("signature") != self.signature:
+            LOG.debug("The report options changed: writing all pages")
+            return
+        self.old_pages = data.get("pages", {})
+        self.old_changes = data.get("changes", {})
+        # links to the family maps, which are made by the individual pages
+        self.report.fam_link.update(data.get("fam_link", {}))
+        self.full = False
+
+    def __change_times(self):
+        """
+        Return the change times of all the objects of the database.
+        """
+        changes = {}
+        for class_name, iter_objects in _ITER_METHODS:
+            for obj in getattr(self.r_db, iter_objects)():
+                changes[_key(class_name, obj.handle)] = obj.get_change_time()
+        return changes
+
+    def prepare(self, obj_dict, bkref_dict):
+        """
+        Find the objects which changed since the last run, and the pages
+        which display them.
+
+        @param: obj_dict   -- The objects included in the report
+        @param: bkref_dict -- The back references of these objects
+        """
+        referrers = {}
+        referenced = {}
+        for obj_class, handles in obj_dict.items():
+            class_name = obj_class.__name__
+            if class_name not in _PAGE_DIRS.values() and class_name != "Citation":
+                continue
+            for handle in handles:
+                key = _key(class_name, handle)
+                self.pages[key] = {"files": []}
+                for bkref_class, bkref_handle, dummy_role in bkref_dict[obj_class][
+                    handle
+                ]:
+                    if bkref_class:
+                        bkref_key = _key(bkref_class, bkref_handle)
+                        referrers.setdefault(key, set()).add(bkref_key)
+                        referenced.setdefault(bkref_key, set()).add(key)
+
+        self.changes = self.__change_times()
+        if self.full:
+            return
+
+        changed = set(
+            key
+            for key, change in self.changes.items()
+            if self.old_changes.get(key) != change
+        )
+        # objects removed from the database
+        changed.update(key for key in self.old_changes if key not in self.changes)
+        # objects added to or removed from the report change the links on
+        # the pages of other objects
+        changed.update(key for key in self.pages if key not in self.old_pages)
+        changed.update(
+            key
+            for key in self.old_pages
+            if key not in self.pages and not key.startswith("Surname:")
+        )
+
+        # Objects are shown on the pages of the objects which refer to them,
+        # even when the report did not collect the reference (e.g. an
+        # association with a person already included). Objects without a page
+        # of their own, like notes or the places enclosing another, are also
+        # shown on the pages of the objects referring to these.
+        todo = list(changed)
+        seen = set(todo)
+        while todo:
+            handle = todo.pop().split(":", 1)[1]
+            for ref_class, ref_handle in self.r_db.find_backlink_handles(handle):
+                key = _key(ref_class, ref_handle)
+                if key in seen:
+                    continue
+                seen.add(key)
+                if key in self.pages:
+                    changed.add(key)
+                if key not in self.pages or ref_class == "Place":
+                    todo.append(key)
+
+        # Pages which display a changed object, directly or through another
+        # object (e.g. a person citing a changed source), and pages of the
+        # objects a changed object refers to, which list their references.
+        self.dirty = set(changed)
+        for links in (referrers, referenced):
+            seen = set(changed)
+            todo = list(changed)
+            while todo:
+                for key in links.get(todo.pop(), ()):
+                    if key not in seen:
+                        seen.add(key)
+                        todo.append(key)
+            self.dirty |= seen
+
+        # The pages of relatives show the names of people and families
+        for key in changed:
+            class_name, handle = key.split(":", 1)
+            if class_name == "Person":
+                self.__add_relatives(handle)
+            elif class_name == "Family":
+                try:
+                    family = self.r_db.get_family_from_handle(handle)
+                except HandleError:
+                    # Removed from the database
+                    continue
+                if family:
+                    for parent_handle in (
+                        family.get_father_handle(),
+                        family.get_mother_handle(),
+                    ):
+                        if parent_handle:
+                            self.__add_relatives(parent_handle)
+                    for child_ref in family.get_child_ref_list():
+                        self.__add_relatives(child_ref.ref)
+
+        # The family maps show the places of the events of the spouses and
+        # of the children
+        if self.report.options["familymappages"]:
+            events = [key for key in self.dirty if key.startswith("Event:")]
+            for event_key in events:
+                for key in referrers.get(event_key, ()):
+                    class_name, handle = key.split(":", 1)
+                    if class_name == "Person":
+                        person = self.r_db.get_person_from_handle(handle)
+                        family_handles = (
+                            person.get_family_handle_list()
+                            + person.get_parent_family_handle_list()
+                            if person
+                            else []
+                        )
+                    else:
+                        family_handles = [handle] if class_name == "Family" else []
+                    for family_handle in family_handles:
+                        family = self.r_db.get_family_from_handle(family_handle)
+                        if family:
+                            self.__add_family(family)
+        LOG.debug(
+            "%d changed objects, %d pages to write", len(changed), len(self.dirty)
+        )
+
+    def __add_relatives(self, person_handle):
+        """
+        Mark the pages of the people who show this person on their page:
+        the members of the families of the person and of the families of its
+        parents, and the descendants which show it in their ancestor tree.
+        """
+        try:
+            person = self.r_db.get_person_from_handle(person_handle)
+        except HandleError:
+            # Removed from the database
+            return
+        if person is None:
+            return
+        self.dirty.add(_key("Person", person_handle))
+        parents = []
+        for family_handle in person.get_parent_family_handle_list():
+            family = self.r_db.get_family_from_handle(family_handle)
+            if family:
+                self.__add_family(family)
+                parents += [family.get_father_handle(), family.get_mother_handle()]
+        for parent_handle in parents:
+            parent = parent_handle and self.r_db.get_person_from_handle(parent_handle)
+            if parent:
+                for family_handle in parent.get_family_handle_list():
+                    family = self.r_db.get_family_from_handle(family_handle)
+                    if family:
+                        self.__add_family(family)
+
+        generations = max(self.report.options["graphgens"], 2)
+        people = [person]
+        for dummy_gen in range(generations):
+            children = []
+            for parent in people:
+                for family_handle in parent.get_family_handle_list():
+                    family = self.r_db.get_family_from_handle(family_handle)
+                    if family is None:
+                        continue
+                    self.__add_family(family)
+                    for child_ref in family.get_child_ref_list():
+                        child = self.r_db.get_person_from_handle(child_ref.ref)
+                        if child:
+                            children.append(child)
+            people = children
+
+    def __add_family(self, family):
+        """
+        Mark the pages of a family and of its members.
+        """
+        self.dirty.add(_key("Family", family.handle))
+        for parent_handle in (family.get_father_handle(), family.get_mother_handle()):
+            if parent_handle:
+                self.dirty.add(_key("Person", parent_handle))
+        for child_ref in family.get_child_ref_list():
+            self.dirty.add(_key("Person", child_ref.ref))
+
+    def page_needed(self, obj_class, handle, context=None, depends=()):
+        """
+        Return True if the page of an object must be written.
+
+        @param: obj_class -- The class of the object, or "Surname"
+        @param: handle    -- The handle of the object
+        @param: context   -- Anything else shown on the page which must be
+                             the same as on the previous run, e.g. the links
+                             to the previous and next pages
+        @param: depends   -- The (class, handle) of other objects shown on
+                             the page
+        """
+        key = _key(obj_class, handle)
+        page = self.pages.get(key)
+        if page is None:
+            # Not included through the people, e.g. an unused media
+            page = self.pages[key] = {"files": []}
+        if context is not None:
+            page["context"] = _normalize(context)
+        if key in self.written:
+            return True
+        old_page = self.old_pages.get(key)
+        needed = (
+            self.full
+            or key in self.dirty
+            or old_page is None
+            or old_page.get("context") != page.get("context")
+            or any(_key(*obj) in self.dirty for obj in depends)
+        )
+        if needed:
+            self.written.add(key)
+            if obj_class is Person:
+                self.report.fam_link.pop(handle, None)
+        return needed
+
+    def add_file(self, subdir, fname, path):
+        """
+        Record a file written for an object page.
+
+        @param: subdir -- The subdirectory of the page
+        @param: fname  -- The file name of the page, the handle of its object
+        @param: path   -- The path of the file written
+        """
+        class_name = _PAGE_DIRS.get(subdir)
+        if class_name is None:
+            return
+        key = _key(class_name, fname)
+        if key in self.pages:
+            files = self.pages[key]["files"]
+            relpath = os.path.relpath(path, self.report.html_dir)
+            if relpath not in files:
+                files.append(relpath)
+
+    def save(self):
+        """
+        Remove the pages of the objects no longer in the report and write the
+        manifest for the next run.
+        """
+        html_dir = os.path.realpath(self.report.html_dir)
+        for key, old_page in self.old_pages.items():
+            page = self.pages.get(key)
+            if page is None:
+                kept = []
+            elif key in self.written:
+                kept = page["files"]
+            else:
+                # The page was not written again
+                page["files"] = old_page["files"]
+                continue
+            for relpath in old_page["files"]:
+                if relpath not in kept:
+                    # The manifest is only a file in the website: never
+                    # remove anything outside of it
+                    path = os.path.realpath(os.path.join(html_dir, relpath))
+                    if not path.startswith(os.path.join(html_dir, "")):
+                        LOG.warning("Not removing %s, outside of %s", path, html_dir)
+                    elif os.path.isfile(path):
+                        os.remove(path)
+        data = {
+            "signature": self.signature,
+            "pages": self.pages,
+            "changes": self.changes,
+            "fam_link": self.report.fam_link,
+        }
+        try:
+            with open(self.path, "w", encoding="utf-8") as manifest:
+                json.dump(data, manifest)
+        except OSError as msg:
+            LOG.warning("Could not write the website manifest %s: %s", self.path, msg)
@@ -145,6 +145,7 @@ class MediaPages(BasePage):
                 self.report.obj_dict[Media].keys(),
                 key=lambda x: sort_by_desc_and_gid(self.r_db.get_media_from_handle(x)),
             )
+            pages = []
             prev = None
             total = len(sorted_media_handles)
             index = 1
@@ -157,15 +158,12 @@ class MediaPages(BasePage):
                     next_ = self.unused_media_handles[0]
                 else:
                     next_ = None
-                self.mediapage(
-                    self.report,
-                    the_lang,
-                    the_title,
-                    handle,
-                    (prev, next_, index, media_count),
-                )
+                info = (prev, next_, index, media_count)
+                if self.report.page_needed(Media, handle, info):
+                    pages.append((handle, info))
+                else:
+                    step()
                 prev = handle
-                step()
                 index += 1
 
             total = len(self.unused_media_handles)
@@ -178,17 +176,15 @@ class MediaPages(BasePage):
                         next_ = None
                     else:
                         next_ = self.unused_media_handles[idx]
-                    self.mediapage(
-                        self.report,
-                        the_lang,
-                        the_title,
-                        media_handle,
-                        (prev, next_, index, media_count),
-                    )
+                    info = (prev, next_, index, media_count)
+                    if self.report.page_needed(Media, media_handle, info):
+                        pages.append((media_handle, info))
+                    else:
+                        step()
                     prev = media_handle
-                    step()
                     index += 1
                     idx += 1
+            self.report.write_pages(self, "mediapage", pages, the_lang, the_title, step)
 
         self.medialistpage(self.report, the_lang, the_title, sorted_media_handles)
 
@@ -754,8 +750,7 @@ class MediaPages(BasePage):
                     self.report.archive.add(fullpath, str(newpath))
             else:
                 to_dir = os.path.join(self.html_dir, to_dir)
-                if not os.path.isdir(to_dir):
-                    os.makedirs(to_dir)
+                os.makedirs(to_dir, exist_ok=True)
                 new_file = os.path.join(self.html_dir, newpath)
                 if not os.path.exists(newpath):
                     shutil.copyfile(fullpath, new_file)
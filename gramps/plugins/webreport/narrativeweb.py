@@ -127,6 +127,8 @@ from gramps.plugins.webreport.introduction import IntroductionPage
 from gramps.plugins.webreport.addressbook import AddressBookPage
 from gramps.plugins.webreport.addressbooklist import AddressBookListPage
 from gramps.plugins.webreport.calendar import CalendarPage
+from gramps.plugins.webreport.manifest import SiteManifest
+from gramps.plugins.webreport.pagepool import write_pages_parallel
 
 from gramps.plugins.webreport.common import (
     get_gendex_data,
@@ -138,6 +140,7 @@ from gramps.plugins.webreport.common import (
     _NARRATIVEPRINT,
     _WRONGMEDIAPATH,
     sort_people,
+    name_to_md5,
 )
 
 LOG = logging.getLogger(".NarrativeWeb")
@@ -244,6 +247,13 @@ class NavWebReport(Report):
         self.encoding = self.options["encoding"]
 
         self.use_archive = self.options["archive"]
+        # Only write the pages of the objects changed since the last run?
+        self.incremental = self.options["incremental"] and not self.use_archive
+        self.manifest = None
+        # Number of processes writing the pages of the objects
+        self.processes = 1
+        if not self.use_archive:
+            self.processes = config.get("behavior.website-processes")
         self.use_intro = self.options["intronote"] or self.options["introimg"]
         self.use_home = self.options["homenote"] or self.options["homeimg"]
         self.use_contact = self.opts["contactnote"] or self.opts["contactimg"]
@@ -500,6 +510,10 @@ class NavWebReport(Report):
                 if media:
                     self._add_media(media.handle, Media, media.handle)
 
+        if self.incremental:
+            self.manifest = SiteManifest(self)
+            self.manifest.prepare(self.obj_dict, self.bkref_dict)
+
         #################################################
         #
         # Pass 2 Generate the web pages
@@ -588,6 +602,9 @@ class NavWebReport(Report):
         # copy all of the necessary files
         self.copy_narrated_files()
 
+        if self.manifest:
+            self.manifest.save()
+
         # if an archive is being used, close it?
         if self.archive:
             self.archive.close()
@@ -637,8 +654,8 @@ class NavWebReport(Report):
         )
 
         # setup a dictionary of the required structure
-        self.obj_dict = defaultdict(lambda: defaultdict(set))
-        self.bkref_dict = defaultdict(lambda: defaultdict(set))
+        self.obj_dict = defaultdict(partial(defaultdict, set))
+        self.bkref_dict = defaultdict(partial(defaultdict, set))
 
         # initialise the dictionary to empty in case no objects of any
         # particular class are included in the web report
@@ -1399,7 +1416,14 @@ class NavWebReport(Report):
 
             index = 1
             for surname, handle_list in local_list:
-                SurnamePage(self, the_lang, the_title, surname, sorted(handle_list))
+                handle_list = sorted(handle_list)
+                if self.page_needed(
+                    "Surname",
+                    name_to_md5(surname),
+                    handle_list,
+                    [(Person, handle) for handle in handle_list],
+                ):
+                    SurnamePage(self, the_lang, the_title, surname, handle_list)
                 step()
                 index += 1
 
@@ -1475,9 +1499,16 @@ class NavWebReport(Report):
         with self.user.progress(pgr_title, message, addr_size) as step:
             index = 1
             for sort_name, person_handle, add, res, url in url_addr_res:
-                AddressBookPage(
-                    self, self.the_lang, self.the_title, person_handle, add, res, url
-                )
+                if self.page_needed(Person, person_handle):
+                    AddressBookPage(
+                        self,
+                        self.the_lang,
+                        self.the_title,
+                        person_handle,
+                        add,
+                        res,
+                        url,
+                    )
                 step()
                 index += 1
 
@@ -1766,6 +1797,7 @@ class NavWebReport(Report):
         """
         if ext is None:
             ext = self.ext
+        page_dir, page_name = subdir, fname
         if self.usecms and not subdir:
             if self.the_lang:
                 if ext != "index":
@@ -1816,11 +1848,12 @@ class NavWebReport(Report):
             else:
                 fname = os.path.join(self.html_dir, self.cur_fname)
             dir_name = os.path.dirname(fname)
-            if not os.path.isdir(dir_name):
-                os.makedirs(dir_name)
+            os.makedirs(dir_name, exist_ok=True)
             output_file = open(
                 fname, "w", encoding=self.encoding, errors="xmlcharrefreplace"
             )
+            if self.manifest:
+                self.manifest.add_file(page_dir, page_name, fname)
         return (output_file, string_io)
 
     def close_file(self, output_file, string_io, date):
@@ -1906,8 +1939,7 @@ class NavWebReport(Report):
             dest = os.path.join(self.html_dir, to_dir, to_fname)
 
             destdir = os.path.dirname(dest)
-            if not os.path.isdir(destdir):
-                os.makedirs(destdir)
+            os.makedirs(destdir, exist_ok=True)
 
             if from_fname != dest:
                 if not os.path.exists(dest):
@@ -1933,6 +1965,45 @@ class NavWebReport(Report):
                 )
                 self.warn_dir = False
 
+    def page_needed(self, obj_class, handle, context=None, depends=()):
+        """
+        Return True if the page of an object must be written. In incremental
+        mode, the pages of the objects which did not change since the last
+        run are kept as they are.
+
+        @param: obj_class -- The class of the object, or "Surname"
+        @param: handle    -- The handle of the object
+        @param: context   -- Anything else shown on the page which must be
+                             the same as on the last run
+        @param: depends   -- The (class, handle) of other objects shown on
+                             the page
+        """
+        if self.manifest is None:
+            return True
+        return self.manifest.page_needed(obj_class, handle, context, depends)
+
+    def write_pages(self, tab, method, pages, the_lang, the_title, step):
+        """
+        Write the pages of objects, in a pool of worker processes if the
+        preferences ask for more than one process.
+
+        @param: tab       -- The Web Page plugin writing the pages
+        @param: method    -- The name of the method writing one page
+        @param: pages     -- The arguments of the method for each page, after
+                             the report, the_lang and the_title
+        @param: the_lang  -- The lang to process
+        @param: the_title -- The title page related to the language
+        @param: step      -- Steps the progress meter
+        """
+        if self.processes > 1 and len(pages) > 1:
+            pages = write_pages_parallel(
+                self, tab, method, pages, the_lang, the_title, step
+            )
+        write = getattr(tab, method)
+        for args in pages:
+            write(self, the_lang, the_title, *args)
+            step()
+
     def person_in_webreport(self, person_handle):
         """
         Return the handle if we created a page for this person.
@@ -1972,6 +2043,7 @@ class NavWebOptions(MenuReportOptions):
         """
         self.__db = dbase
         self.__archive = None
+        self.__incremental = None
         self.__target = None
         self.__target_uri = None
         self.__pid = None
@@ -2085,6 +2157,18 @@ class NavWebOptions(MenuReportOptions):
         self.__target.set_help(_("The destination directory for the web " "files"))
         addopt("target", self.__target)
 
+        self.__incremental = BooleanOption(
+            _("Only write the pages of changed objects"), False
+        )
+        self.__incremental.set_help(
+            _(
+                "Whether to keep the pages written by the previous run "
+                "for the objects which did not change since then. "
+                "The index pages are always written."
+            )
+        )
+        addopt("incremental", self.__incremental)
+
         self.__archive_changed()
 
         title = StringOption(_("Website title"), _("My Family Tree"))
@@ -2936,8 +3020,10 @@ class NavWebOptions(MenuReportOptions):
         if self.__archive.get_value() is True:
             self.__target.set_extension(".tar.gz")
             self.__target.set_directory_entry(False)
+            self.__incremental.set_available(False)
         else:
             self.__target.set_directory_entry(True)
+            self.__incremental.set_available(True)
             # We don't use an archive. If usecms is True, set it to False
             if self.__usecms:
                 self.__usecms.set_value(False)
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Narrative Web Page generator.
+
+Classe:
+    write_pages_parallel - writes the pages of objects in a pool of worker
+                           processes
+"""
+# ------------------------------------------------
+# python modules
+# ------------------------------------------------
+import importlib
+import logging
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+# ------------------------------------------------
+# Gramps module
+# ------------------------------------------------
+from gramps.gen.const import PLUGINS_DIR, USER_PLUGINS
+from gramps.gen.db.base import DbWriteBase
+from gramps.gen.db.dbconst import DBMODE_R
+from gramps.gen.db.utils import get_dbid_from_database, make_database
+from gramps.gen.plug import BasePluginManager
+from gramps.gen.proxy import CacheProxyDb
+from gramps.gen.proxy.proxybase import ProxyDbBase
+from gramps.gen.user import User
+from gramps.gen.utils.config import apply_config_snapshot, get_config_snapshot
+
+LOG = logging.getLogger(".NarrativeWeb")
+
+# The number of jobs for each worker: the progress meter moves when a job
+# is done, and a job is given to the first worker which is free.
+_JOBS_PER_WORKER = 8
+
+# The plugin of the report, which the workers make again
+_REPORT_ID = "navwebpage"
+
+# What the report has collected before writing the pages of objects
+_REPORT_STATE = (
+    "obj_dict",
+    "bkref_dict",
+    "fam_link",
+    "visited",
+    "languages",
+    "default_lang",
+    "the_lang",
+    "the_title",
+)
+
+
+class _WorkerUser(User):
+    """
+    The user of a worker process, which keeps the warnings for the main
+    process.
+    """
+
+    def __init__(self):
+        User.__init__(self)
+        self.warnings = []
+
+    def warn(self, title, warning=""):
+        self.warnings.append((title, warning))
+
+
+class _PageFiles:
+    """
+    Stands for the manifest of the website in a worker process, and keeps
+    the files written for the pages for the manifest of the main process.
+    """
+
+    def __init__(self):
+        self.files = []
+
+    def add_file(self, subdir, fname, path):
+        self.files.append((subdir, fname, path))
+
+
+def _base_database(database):
+    """
+    Return the database under the proxies.
+    """
+    while isinstance(database, (ProxyDbBase, CacheProxyDb)):
+        database = database.db
+    return database
+
+
+# ------------------------------------------------
+# Worker processes
+# ------------------------------------------------
+_worker = {}
+
+
+def _init_worker(
+    dbid, directory, snapshot, options, state, tab_class, tab_state, method
+):
+    """
+    Register the plugins and open the database read-only in a worker
+    process, and apply the settings of the main process. Then make the
+    report again from its options, with what it has collected, and the Web
+    Page plugin writing the pages.
+
+    The modules of the report are only imported once the plugins they use
+    are registered, so the Web Page plugin is given by its module and name.
+    """
+    from gramps.gen.filters import reload_custom_filters
+
+    pmgr = BasePluginManager.get_instance()
+    pmgr.reg_plugins(PLUGINS_DIR)
+    pmgr.reg_plugins(USER_PLUGINS, load_on_reg=True)
+    reload_custom_filters()
+    database = make_database(dbid)
+    database.load(directory, mode=DBMODE_R)
+    apply_config_snapshot(snapshot, database)
+
+    pdata = pmgr.get_plugin(_REPORT_ID)
+    mod = pmgr.load_plugin(pdata)
+    option_class = getattr(mod, pdata.optionclass)(pdata.id, database)
+    option_class.load_previous_values()
+    menu = option_class.menu
+    for optname, value in options.items():
+        option_class.options_dict[optname] = value
+        menu_option = menu.get_option_by_name(optname)
+        if menu_option:
+            menu_option.set_value(value)
+    report = getattr(mod, pdata.reportclass)(database, option_class, _WorkerUser())
+    vars(report).update(state)
+    module, name = tab_class
+    tab = getattr(importlib.import_module(module), name)(report, None, None)
+    vars(tab).update(tab_state)
+    _worker["write"] = getattr(tab, method)
+    _worker["report"] = report
+    _worker["fam_link"] = dict(report.fam_link)
+
+
+def _write_pages(pages, the_lang, the_title):
+    """
+    Write some pages in a worker process.
+
+    Return the files written for the manifest, the new links to the family
+    maps, the media files not found and the warnings.
+    """
+    from gramps.plugins.webreport.common import _WRONGMEDIAPATH
+
+    report = _worker["report"]
+    write = _worker["write"]
+    if report.manifest is not None:
+        report.manifest.files = []
+    report.user.warnings = []
+    del _WRONGMEDIAPATH[:]
+    for args in pages:
+        write(report, the_lang, the_title, *args)
+
+    fam_link = {
+        handle: url
+        for handle, url in report.fam_link.items()
+        if _worker["fam_link"].get(handle) != url
+    }
+    _worker["fam_link"].update(fam_link)
+    files = report.manifest.files if report.manifest is not None else []
+    return files, fam_link, list(_WRONGMEDIAPATH), report.user.warnings
+
+
+def write_pages_parallel(report, tab, method, pages, the_lang, the_title, step):
+    """
+    Write the pages of objects in a pool of worker processes.
+
+    Each worker opens the database read-only and makes the report again
+    from its options, with what the report and the Web Page plugin have
+    collected so far. The workers then write their share of the pages to
+    their files. What the pages leave in the report, like the links to the
+    family maps, is brought back as the jobs end, and the progress meter is
+    stepped for each page.
+
+    @param: report    -- The instance of the main report class
+    @param: tab       -- The Web Page plugin writing the pages
+    @param: method    -- The name of the method writing one page
+    @param: pages     -- The arguments of the method for each page, after
+                         the report, the_lang and the_title
+    @param: the_lang  -- The lang to process
+    @param: the_title -- The title page related to the language
+    @param: step      -- Steps the progress meter
+
+    :returns: The pages which were not written
+    """
+    from gramps.plugins.webreport.common import _WRONGMEDIAPATH
+
+    database = _base_database(report.database)
+    if not isinstance(database, DbWriteBase):
+        return pages
+    directory = database.get_save_path()
+    if not directory or directory == ":memory:":
+        return pages
+    dbid = get_dbid_from_database(database)
+    if dbid is None:
+        return pages
+    state = {name: getattr(report, name) for name in _REPORT_STATE}
+    state["manifest"] = None if report.manifest is None else _PageFiles()
+    # The objects the Web Page plugin has collected
+    tab_state = {
+        name: value
+        for name, value in vars(tab).items()
+        if isinstance(value, (dict, list))
+    }
+    initargs = (
+        dbid,
+        directory,
+        get_config_snapshot(),
+        report.options,
+        state,
+        (tab.__class__.__module__, tab.__class__.__name__),
+        tab_state,
+        method,
+    )
+    try:
+        pickle.dumps((initargs, pages))
+    except (pickle.PicklingError, TypeError, AttributeError) as err:
+        LOG.debug("Cannot write the pages in parallel: %s", err)
+        return pages
+
+    processes = min(report.processes, len(pages))
+    size = -(-len(pages) // (processes * _JOBS_PER_WORKER))
+    jobs = {}
+    try:
+        with ProcessPoolExecutor(
+            processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=initargs,
+        ) as executor:
+            for start in range(0, len(pages), size):
+                job = pages[start : start + size]
+                jobs[executor.submit(_write_pages, job, the_lang, the_title)] = job
+            for future in as_completed(jobs):
+                files, fam_link, wrong_media, warnings = future.result()
+                if report.manifest is not None:
+                    for subdir, fname, path in files:
+                        report.manifest.add_file(subdir, fname, path)
+                report.fam_link.update(fam_link)
+                _WRONGMEDIAPATH.extend(wrong_media)
+                for title, warning in warnings:
+                    report.user.warn(title, warning)
+                for dummy_page in jobs.pop(future):
+                    step()
+    except BrokenProcessPool as err:
+        LOG.warning("Cannot write the pages in parallel: %s", err)
+        return [page for job in jobs.values() for page in job]
+    return []
@@ -170,12 +170,15 @@ class PersonPages(BasePage):
         with self.r_user.progress(
             progress_title, message, len(self.report.obj_dict[Person]) + 1
         ) as step:
-            index = 1
+            pages = []
             for person_handle in sorted(self.report.obj_dict[Person]):
-                step()
-                index += 1
-                person = self.r_db.get_person_from_handle(person_handle)
-                self.individualpage(self.report, the_lang, the_title, person)
+                if self.report.page_needed(Person, person_handle):
+                    pages.append((person_handle,))
+                else:
+                    step()
+            self.report.write_pages(
+                self, "individualpage", pages, the_lang, the_title, step
+            )
             step()
             self.individuallistpage(
                 self.report, the_lang, the_title, self.report.obj_dict[Person].keys()
@@ -243,9 +246,9 @@ class PersonPages(BasePage):
         if showbirth:
             tcell = Html("td", class_="ColumnBirth", inline=True)
             trow += tcell
-            birth_date = _find_birth_date(self.r_db, person)
+            birth_date, fallback = _find_birth_date(self.r_db, person)
             if birth_date is not None:
-                if birth_date.fallback:
+                if fallback:
                     tcell += Html("em", self.rlocale.get_date(birth_date), inline=True)
                 else:
                     tcell += self.rlocale.get_date(birth_date)
@@ -255,9 +258,9 @@ class PersonPages(BasePage):
         if showdeath:
             tcell = Html("td", class_="ColumnDeath", inline=True)
             trow += tcell
-            death_date = _find_death_date(self.r_db, person)
+            death_date, fallback = _find_death_date(self.r_db, person)
             if death_date is not None:
-                if death_date.fallback:
+                if fallback:
                     tcell += Html("em", self.rlocale.get_date(death_date), inline=True)
                 else:
                     tcell += self.rlocale.get_date(death_date)
@@ -520,16 +523,17 @@ class PersonPages(BasePage):
     #    creates an Individual Page
     #
     #################################################
-    def individualpage(self, report, the_lang, the_title, person):
+    def individualpage(self, report, the_lang, the_title, person_handle):
         """
         Creates an individual page
 
-        @param: report    -- The instance of the main report class
-                             for this report
-        @param: the_lang  -- The lang to process
-        @param: the_title -- The title page related to the language
-        @param: person    -- The person to use for this page.
+        @param: report        -- The instance of the main report class
+                                 for this report
+        @param: the_lang      -- The lang to process
+        @param: the_title     -- The title page related to the language
+        @param: person_handle -- The handle of the person to use for this page.
         """
+        person = report.database.get_person_from_handle(person_handle)
         BasePage.__init__(self, report, the_lang, the_title, person.get_gramps_id())
         place_lat_long = []
 
@@ -1850,7 +1854,7 @@ class PersonPages(BasePage):
                     if death:
                         p_death = _pd.display_event(self.r_db, death, fmt=0)
 
-                death_date = _find_death_date(self.r_db, self.person)
+                death_date, dummy = _find_death_date(self.r_db, self.person)
                 if birth_date and birth_date is not Date.EMPTY:
                     alive = probably_alive(self.person, self.r_db, Today())
 
@@ -168,15 +168,16 @@ class PlacePages(BasePage):
         with self.r_user.progress(
             progress_title, message, len(self.report.obj_dict[Place]) + 1
         ) as step:
-            index = 1
+            pages = []
             for place_name in self.report.obj_dict[PlaceName].keys():
-                step()
                 p_handle = self.report.obj_dict[PlaceName][place_name]
-                index += 1
-                if isinstance(p_handle, tuple):
-                    self.placepage(
-                        self.report, the_lang, the_title, p_handle[0], place_name
-                    )
+                if isinstance(p_handle, tuple) and self.report.page_needed(
+                    Place, p_handle[0]
+                ):
+                    pages.append((p_handle[0], place_name))
+                else:
+                    step()
+            self.report.write_pages(self, "placepage", pages, the_lang, the_title, step)
             step()
         self.placelistpage(self.report, the_lang, the_title)
 
@@ -121,12 +121,16 @@ class RepositoryPages(BasePage):
             # RepositoryListPage Class
             self.repositorylistpage(self.report, the_lang, the_title, repos_dict, keys)
 
-            idx = 1
+            pages = []
             for dummy_index, key in enumerate(keys):
                 (repo, handle) = repos_dict[key]
-                step()
-                idx += 1
-                self.repositorypage(self.report, the_lang, the_title, repo, handle)
+                if self.report.page_needed(Repository, handle):
+                    pages.append((repo, handle))
+                else:
+                    step()
+            self.report.write_pages(
+                self, "repositorypage", pages, the_lang, the_title, step
+            )
 
     def repositorylistpage(self, report, the_lang, the_title, repos_dict, keys):
         """
@@ -113,11 +113,15 @@ class SourcePages(BasePage):
                 self.report, the_lang, the_title, self.report.obj_dict[Source].keys()
             )
 
-            index = 1
+            pages = []
             for source_handle in self.report.obj_dict[Source]:
-                step()
-                index += 1
-                self.sourcepage(self.report, the_lang, the_title, source_handle)
+                if self.report.page_needed(Source, source_handle):
+                    pages.append((source_handle,))
+                else:
+                    step()
+            self.report.write_pages(
+                self, "sourcepage", pages, the_lang, the_title, step
+            )
 
     def sourcelistpage(self, report, the_lang, the_title, source_handles):
         """
@@ -191,9 +191,9 @@ class SurnamePage(BasePage):
                         tcell = Html("td", class_="ColumnBirth", inline=True)
                         trow += tcell
 
-                        birth_date = _find_birth_date(self.r_db, person)
+                        birth_date, fallback = _find_birth_date(self.r_db, person)
                         if birth_date is not None:
-                            if birth_date.fallback:
+                            if fallback:
                                 tcell += Html(
                                     "em", self.rlocale.get_date(birth_date), inline=True
                                 )
@@ -207,9 +207,9 @@ class SurnamePage(BasePage):
                         tcell = Html("td", class_="ColumnDeath", inline=True)
                         trow += tcell
 
-                        death_date = _find_death_date(self.r_db, person)
+                        death_date, fallback = _find_death_date(self.r_db, person)
                         if death_date is not None:
-                            if death_date.fallback:
+                            if fallback:
                                 tcell += Html(
                                     "em", self.rlocale.get_date(death_date), inline=True
                                 )
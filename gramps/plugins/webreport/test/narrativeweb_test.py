@@ -0,0 +1,258 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the Narrated Web Site report
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from gramps.gen.config import config
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import import_from_filename, make_database
+from gramps.gen.filters import reload_custom_filters
+from gramps.gen.plug import BasePluginManager
+from gramps.gen.user import User
+from ..manifest import MANIFEST_NAME
+from ..pagepool import write_pages_parallel
+
+EXAMPLE = os.path.join(DATA_DIR, "tests", "data.gramps")
+
+
+class NarrativeWebTest(unittest.TestCase):
+    """
+    Base class for the tests writing a web site from a tree on disk.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Import the test data into a tree on disk.
+        """
+        reload_custom_filters()
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        # The report keeps its options by the name of the tree
+        path = os.path.join(cls.tmpdir.name, "tree")
+        os.makedirs(path)
+        with open(os.path.join(path, "name.txt"), "w", encoding="utf8") as file:
+            file.write("Narrated Web Site")
+        cls.db = make_database("sqlite")
+        cls.db.load(path)
+        import_from_filename(cls.db, EXAMPLE, User())
+        pmgr = BasePluginManager.get_instance()
+        cls.pdata = pmgr.get_plugin("navwebpage")
+        cls.module = pmgr.load_plugin(cls.pdata)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        cls.tmpdir.cleanup()
+
+    def write_site(self, target, **options):
+        """
+        Write the web site to the target directory with the given options.
+        """
+        option_class = getattr(self.module, self.pdata.optionclass)(
+            self.pdata.id, self.db
+        )
+        option_class.load_previous_values()
+        menu = option_class.menu
+        menu.get_option_by_name("target").set_value(target)
+        for optname, value in options.items():
+            menu.get_option_by_name(optname).set_value(value)
+        report_class = getattr(self.module, self.pdata.reportclass)
+        report = report_class(self.db, option_class, User())
+        report.write_report()
+
+    @staticmethod
+    def read_site(target):
+        """
+        Return the contents of the files of a web site by their path.
+        """
+        contents = {}
+        for dirpath, dummy, filenames in os.walk(target):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                with open(path, "rb") as file:
+                    contents[os.path.relpath(path, target)] = file.read()
+        return contents
+
+
+class ParallelTest(NarrativeWebTest):
+    """
+    Test the pages of objects written in a pool of worker processes.
+    """
+
+    def setUp(self):
+        self.processes = config.get("behavior.website-processes")
+
+    def tearDown(self):
+        config.set("behavior.website-processes", self.processes)
+
+    def test_parallel(self):
+        """
+        Test that a web site written by two worker processes is the same as
+        one written serially.
+        """
+        left = []
+
+        def write_pages(*args):
+            pages = write_pages_parallel(*args)
+            left.append(pages)
+            return pages
+
+        serial = os.path.join(self.tmpdir.name, "serial")
+        config.set("behavior.website-processes", 1)
+        self.write_site(serial)
+
+        parallel = os.path.join(self.tmpdir.name, "parallel")
+        config.set("behavior.website-processes", 2)
+        with patch.object(self.module, "write_pages_parallel", write_pages):
+            self.write_site(parallel)
+
+        self.assertTrue(left)
+        self.assertEqual(left, [[]] * len(left))
+        self.assertEqual(self.read_site(parallel), self.read_site(serial))
+
+
+class IncrementalTest(NarrativeWebTest):
+    """
+    Test the pages kept as they are when writing a web site again.
+    """
+
+    def setUp(self):
+        # Some default options are taken from the directory of the last site
+        self.website_dir = config.get("paths.website-directory")
+        config.set("paths.website-directory", os.path.join(self.tmpdir.name, ""))
+
+    def tearDown(self):
+        config.set("paths.website-directory", self.website_dir)
+
+    @staticmethod
+    def page(subdir, handle):
+        """
+        Return the path of the page of an object in a web site.
+        """
+        return os.path.join(
+            subdir, handle[-1].lower(), handle[-2].lower(), handle + ".html"
+        )
+
+    def write_again(self, target, change):
+        """
+        Write the web site, make a change in the database and write it again.
+        Return the files written by the second run.
+        """
+        self.write_site(target, incremental=True)
+        for dirpath, dummy, filenames in os.walk(target):
+            for filename in filenames:
+                os.utime(os.path.join(dirpath, filename), ns=(0, 0))
+        with DbTxn("Change", self.db) as trans:
+            change(trans)
+        self.write_site(target, incremental=True)
+        written = set()
+        for dirpath, dummy, filenames in os.walk(target):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                if os.stat(path).st_mtime_ns:
+                    written.add(os.path.relpath(path, target))
+        return written
+
+    def test_person(self):
+        """
+        Test that a change of a person writes its page and the pages of its
+        relatives only.
+        """
+
+        def change(trans):
+            person = self.db.get_person_from_gramps_id("I0004")
+            person.get_primary_name().set_first_name("Ingemar")
+            self.db.commit_person(person, trans)
+
+        written = self.write_again(os.path.join(self.tmpdir.name, "person"), change)
+        self.assertIn("index.html", written)
+        self.assertIn("individuals.html", written)
+        self.assertIn(self.page("ppl", "0ONT6DJS5KD5W6EA1P"), written)
+        self.assertNotIn(self.page("ppl", "SKNT6D7FA4WHUUE7Z6"), written)
+        self.assertNotIn(self.page("src", "H9OT6DH812QJAQS5A8"), written)
+
+    def test_note(self):
+        """
+        Test that a change of a note writes the page of the person it is
+        attached to.
+        """
+
+        def change(trans):
+            note = self.db.get_note_from_gramps_id("N0002")
+            note.set("Another text")
+            self.db.commit_note(note, trans)
+
+        written = self.write_again(os.path.join(self.tmpdir.name, "note"), change)
+        self.assertIn(self.page("ppl", "9YNT6DXDSDPO56MX19"), written)
+        self.assertNotIn(self.page("ppl", "SKNT6D7FA4WHUUE7Z6"), written)
+        self.assertNotIn(self.page("src", "H9OT6DH812QJAQS5A8"), written)
+
+    def test_event(self):
+        """
+        Test that a change of an event writes the pages of its participants
+        only.
+        """
+
+        def change(trans):
+            event = self.db.get_event_from_gramps_id("E0040")
+            event.set_description("Another description")
+            self.db.commit_event(event, trans)
+
+        written = self.write_again(os.path.join(self.tmpdir.name, "event"), change)
+        people = {path for path in written if path.startswith("ppl")}
+        self.assertIn(self.page("ppl", "C1OT6DUBMZ3HAD998D"), people)
+        self.assertNotIn(self.page("ppl", "SKNT6D7FA4WHUUE7Z6"), people)
+        self.assertNotIn(self.page("ppl", "0ONT6DJS5KD5W6EA1P"), people)
+        self.assertLess(len(people), 10)
+
+    def test_outside(self):
+        """
+        Test that the files of removed pages are only removed from the
+        web site.
+        """
+        target = os.path.join(self.tmpdir.name, "outside")
+        self.write_site(target, incremental=True)
+        outside = os.path.join(self.tmpdir.name, "outside.html")
+        inside = os.path.join(target, "ppl", "removed.html")
+        for path in (outside, inside):
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("<html></html>")
+        path = os.path.join(target, MANIFEST_NAME)
+        with open(path, encoding="utf-8") as file:
+            manifest = json.load(file)
+        manifest["pages"]["Person:removed"] = {
+            "files": [os.path.join("..", "outside.html"), outside, "ppl/removed.html"]
+        }
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(manifest, file)
+        self.write_site(target, incremental=True)
+        self.assertTrue(os.path.isfile(outside))
+        self.assertFalse(os.path.exists(inside))
+
+
+if __name__ == "__main__":
+    unittest.main()